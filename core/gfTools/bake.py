@@ -0,0 +1,380 @@
+## @package bake
+#  Multi-frame bake engine of the gfTools node prototypes.
+#
+#  Evaluates the math of a node over a whole frame range in one call, without Maya.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools import bake
+    * results = bake.bake("gfIKVChain_P", {"root": rootMatrices, "handle": handleMatrices,
+                                          "poleVector": poleMatrices, "restLengthStart": 5.0})
+    * results["outChain"]    (array with shape (frames, 3, 4, 4))
+    * bake.save("C:/temp/leftArm.npz", results)
+    * bake.bakers()          (the node types that can be baked)
+
+Requirements:
+    * NumPy.
+
+Description:
+    bake() takes the inputs of one node sampled over a frame range, keyed by the attribute long
+    names, and returns the outputs of the node for every frame, keyed by the output long names. The
+    math runs once for all the frames through the gfTools.kernels functions, so it is the same as
+    stepping the timeline and pulling the node at each frame, only much faster.
+    An input with one more axis than its attribute value is animated and its first axis is the frame
+    axis, any other input is a constant and is used in all the frames. All the animated inputs must
+    have the same number of frames. Missing inputs use the attribute default values.
+    The values are arrays in the layout of the gfTools.kernels: matrices are (4, 4) arrays in the Maya
+    row vector layout, angles are in radians, enums and booleans are numbers. Array attributes have
+    the element axis after the frame axis, e.g. the animated target of gfPSDVectorAngle_P is a
+    (frames, targets, 4, 4) array. The children of the targetList compound of gfParentConstraint_P are
+    given as the arrays targetWorldMatrix, targetOffset and targetWeight. Ramp attributes are lists of
+    (position, value, interpolation) entries and can't be animated.
+    The number of elements of the array outputs follows the input arrays. The counts argument sets
+    it like the connected elements of the output plug: the missing elements get the value the node
+    writes for them and the extra ones are dropped. gfTwistExtractor_P has no input to count its
+    twistDistribution, so it is empty unless a count is given.
+
+This code supports Pylint. Rc file in project.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import ikVChain
+from gfTools.kernels import lookAt
+from gfTools.kernels import quaternion
+from gfTools.kernels import ramp
+from gfTools.kernels import transform
+from gfTools.kernels import vectorAngle
+
+
+kBakers = OrderedDict()
+kRampInput = None
+
+
+class _Baker(object):
+    """The attributes and the math of one node type."""
+
+    def __init__(self, className, nodeType, inputs, function):
+        self.className = className
+        self.nodeType = nodeType
+        self.inputs = OrderedDict((name, (default, ndim)) for name, default, ndim in inputs)
+        self.function = function
+
+
+def _register(className, nodeType, inputs):
+    """Decorator that registers a bake function by node class name and node type name.
+
+    Args:
+        className (str): The class name of the node, like "IKVChainSolver".
+        nodeType (str): The registered node type name, like "gfIKVChain_P".
+        inputs (list): The (long name, default value, number of dimensions) of the inputs. Ramp inputs
+            use kRampInput as the number of dimensions.
+    """
+    def decorator(function):
+        baker = _Baker(className, nodeType, inputs, function)
+        kBakers[className] = baker
+        kBakers[nodeType] = baker
+        return function
+    return decorator
+
+
+def bakers():
+    """Return the node types that can be baked.
+
+    Returns:
+        list: The registered node type names.
+    """
+    return [baker.nodeType for key, baker in kBakers.items() if key == baker.className]
+
+
+def bake(nodeType, inputs, counts=None):
+    """Evaluate the math of a node for all the frames of the sampled inputs.
+
+    Args:
+        nodeType (str): The node type name (gfIKVChain_P) or the node class name (IKVChainSolver).
+        inputs (dict): The sampled inputs keyed by attribute long name.
+        counts (dict): The number of elements of the array outputs keyed by attribute long name.
+
+    Returns:
+        OrderedDict: The outputs keyed by attribute long name. Every value has the frame axis first.
+
+    Raises:
+        ValueError: If the node type can't be baked, an input is unknown or the animated inputs don't
+            have the same number of frames.
+    """
+    baker = kBakers.get(nodeType)
+    if baker is None:
+        raise ValueError("[gfTools] Node type %s can't be baked. Bakers: %s" % (nodeType, ", ".join(bakers())))
+    unknown = [name for name in inputs if name not in baker.inputs]
+    if unknown:
+        raise ValueError("[gfTools] Unknown inputs of %s: %s" % (baker.nodeType, ", ".join(sorted(unknown))))
+
+    values = OrderedDict()
+    frames = None
+    for name, (default, ndim) in baker.inputs.items():
+        value = inputs.get(name, default)
+        if ndim is kRampInput:
+            values[name] = value
+            continue
+        value = np.asarray(value)
+        if value.ndim == ndim + 1:
+            if frames is not None and len(value) != frames:
+                raise ValueError("[gfTools] Input %s has %s frames, expected %s." % (name, len(value), frames))
+            frames = len(value)
+        elif value.ndim != ndim:
+            raise ValueError("[gfTools] Input %s must have %s or %s dimensions, got %s." % (name, ndim, ndim + 1, value.ndim))
+        values[name] = value
+    frames = 1 if frames is None else frames
+    for name, (default, ndim) in baker.inputs.items():
+        if ndim is not kRampInput and values[name].ndim == ndim:
+            values[name] = np.broadcast_to(values[name], (frames,) + values[name].shape)
+    return baker.function(values, frames, dict(counts or {}))
+
+
+def save(path, results):
+    """Write the baked outputs to a .npz file, one array per output.
+
+    Args:
+        path (str): The file path.
+        results (dict): The outputs returned by bake().
+    """
+    np.savez(path, **results)
+
+
+def load(path):
+    """Read the baked outputs written by save().
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        OrderedDict: The outputs keyed by attribute long name.
+    """
+    with np.load(path) as data:
+        return OrderedDict((name, data[name]) for name in data.files)
+
+
+# ================================================================================================
+# Helpers
+# ================================================================================================
+
+def _resize(values, count, fill):
+    """Truncate or pad the element axis (axis 1) of the values to count elements."""
+    if count is None or count == values.shape[1]:
+        return values
+    if count < values.shape[1]:
+        return values[:, :count]
+    padding = np.broadcast_to(np.asarray(fill, dtype=values.dtype), (len(values), count - values.shape[1]) + values.shape[2:])
+    return np.concatenate([values, padding], axis=1)
+
+
+def _pad(values, count, fill):
+    """Pad the element axis of the input values with the default of the attribute."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[1] >= count:
+        return values[:, :count]
+    return _resize(values, count, fill)
+
+
+def _eulerToQuaternions(angles, count):
+    """Convert the first count elements of (frames, n, 3) xyz euler rotations, missing ones are identities."""
+    quats = quaternion.identity((len(angles), count))
+    used = min(angles.shape[1], count)
+    quats[:, :used] = euler.toQuaternion(angles[:, :used], euler.kXYZ, dtype=np.float64)
+    return quats
+
+
+@_register("IKVChainSolver", "gfIKVChain_P", [
+    ("root", np.identity(4), 2), ("handle", np.identity(4), 2), ("poleVector", np.identity(4), 2),
+    ("offset", np.zeros((0, 3)), 2), ("jointOrient", np.zeros((0, 3)), 2),
+    ("parentInverseMatrix", np.identity(4), 2), ("restLengthStart", 1.0, 0), ("restLengthEnd", 1.0, 0),
+    ("preferredAngle", 0.0, 0), ("twist", 0.0, 0), ("pvMode", 0, 0), ("hierarchyMode", True, 0),
+    ("flipOrientation", False, 0), ("useStretchAsScale", False, 0), ("compressionLimit", 0.1, 0),
+    ("snapUpVector", 0.0, 0), ("snap", np.identity(4), 2), ("softness", 0.0, 0), ("stretch", 0.0, 0),
+    ("clampStretch", 0.0, 0), ("clampValue", 1.5, 0), ("squash", 0.0, 0),
+    ("squashMultStart", (1.0, 1.0), 1), ("squashMultEnd", (1.0, 1.0), 1)])
+def _bakeIKVChain(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    outChain = ikVChain.solve(
+        inputs["root"], inputs["handle"], inputs["poleVector"],
+        parentInverse=inputs["parentInverseMatrix"],
+        snap=inputs["snap"],
+        offsets=_eulerToQuaternions(inputs["offset"], 2),
+        jointOrients=_eulerToQuaternions(inputs["jointOrient"], 2),
+        restLengthStart=inputs["restLengthStart"],
+        restLengthEnd=inputs["restLengthEnd"],
+        preferredAngle=inputs["preferredAngle"],
+        twist=inputs["twist"],
+        pvMode=inputs["pvMode"],
+        hierarchyMode=inputs["hierarchyMode"],
+        flip=inputs["flipOrientation"],
+        useStretchAsScale=inputs["useStretchAsScale"],
+        compressionLimit=inputs["compressionLimit"],
+        snapUpVector=inputs["snapUpVector"],
+        softness=inputs["softness"],
+        stretch=inputs["stretch"],
+        clampStretch=inputs["clampStretch"],
+        clampValue=inputs["clampValue"],
+        squash=inputs["squash"],
+        squashMultStart=inputs["squashMultStart"],
+        squashMultEnd=inputs["squashMultEnd"])
+    return OrderedDict([("outChain", _resize(outChain, counts.get("outChain"), np.identity(4)))])
+
+
+@_register("BlendTransform", "gfBlendTransforn_P", [
+    ("blender", 0.5, 0), ("rotationInterpolation", 0, 0),
+    ("translate1", np.zeros((0, 3)), 2), ("rotate1", np.zeros((0, 3)), 2), ("scale1", np.zeros((0, 3)), 2),
+    ("rotateOrder1", np.zeros(0, dtype=int), 1),
+    ("translate2", np.zeros((0, 3)), 2), ("rotate2", np.zeros((0, 3)), 2), ("scale2", np.zeros((0, 3)), 2),
+    ("rotateOrder2", np.zeros(0, dtype=int), 1), ("outRotateOrder", np.zeros(0, dtype=int), 1)])
+def _bakeBlendTransform(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    blender = np.asarray(inputs["blender"], dtype=np.float64)
+    blend = blender[:, np.newaxis, np.newaxis]
+
+    count = min(inputs["translate1"].shape[1], inputs["translate2"].shape[1])
+    outTrans = (1.0 - blend) * inputs["translate1"][:, :count] + blend * inputs["translate2"][:, :count]
+
+    count = min(inputs["rotate1"].shape[1], inputs["rotate2"].shape[1])
+    # Missing rotate order elements are kXYZ.
+    orders = [_pad(inputs[name], count, euler.kXYZ).astype(np.intp)
+              for name in ("rotateOrder1", "rotateOrder2", "outRotateOrder")]
+    rot1 = euler.reorder(inputs["rotate1"][:, :count], orders[0], orders[2], dtype=np.float64)
+    rot2 = euler.reorder(inputs["rotate2"][:, :count], orders[1], orders[2], dtype=np.float64)
+    linear = (1.0 - blend) * rot1 + blend * rot2
+    slerp = euler.fromQuaternion(quaternion.slerp(euler.toQuaternion(rot1, orders[2]),
+                                                  euler.toQuaternion(rot2, orders[2]),
+                                                  np.broadcast_to(blender[:, np.newaxis], orders[2].shape)), orders[2])
+    outRot = np.where(inputs["rotationInterpolation"][:, np.newaxis, np.newaxis] == 0, linear, slerp)
+
+    count = min(inputs["scale1"].shape[1], inputs["scale2"].shape[1])
+    outSca = (1.0 - blend) * inputs["scale1"][:, :count] + blend * inputs["scale2"][:, :count]
+
+    # Same threshold of BlendTransform.visibilityCalculation().
+    threshold = 0.25
+    return OrderedDict([
+        ("outTranslate", _resize(outTrans, counts.get("outTranslate"), 0.0)),
+        ("outRotate", _resize(outRot, counts.get("outRotate"), 0.0)),
+        ("outScale", _resize(outSca, counts.get("outScale"), 0.0)),
+        ("visibility", blender > threshold),
+        ("reverseVisibility", blender < 1.0 - threshold)])
+
+
+@_register("VectorAnglePSD", "gfPSDVectorAngle_P", [
+    ("base", np.identity(4), 2), ("source", np.identity(4), 2), ("target", np.zeros((0, 4, 4)), 3),
+    ("targetEnvelope", np.zeros(0), 1), ("targetFalloff", np.zeros(0), 1),
+    ("rampWeights", [(0.0, 0.0, ramp.kLinear), (1.0, 1.0, ramp.kLinear)], kRampInput)])
+def _bakePSDVectorAngle(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    count = min(len(inputs["target"][0]), len(inputs["targetEnvelope"][0]), len(inputs["targetFalloff"][0]))
+    weight = vectorAngle.coneWeights(inputs["base"][:, 3, :3], inputs["source"][:, 3, :3], inputs["target"][:, :count, 3, :3],
+                                     inputs["targetEnvelope"][:, :count], inputs["targetFalloff"][:, :count])
+    outWeights = ramp.evaluate(inputs["rampWeights"], weight)
+    return OrderedDict([("outWeights", _resize(outWeights, counts.get("outWeights"), 0.0))])
+
+
+@_register("TwistExtractor", "gfTwistExtractor_P", [
+    ("rotation", np.zeros(3), 1), ("rotationOrder", 0, 0), ("useUpVector", False, 0),
+    ("upVector", (0.0, 1.0, 0.0), 1), ("inverseTwist", False, 0), ("reverseDistribution", False, 0)])
+def _bakeTwistExtractor(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    qRoll = euler.toQuaternion(inputs["rotation"], inputs["rotationOrder"], dtype=np.float64)
+    twist = quaternion.extractTwist(qRoll, [1.0, 0.0, 0.0], inputs["upVector"], inputs["useUpVector"] != 0)
+    twist = np.where(inputs["inverseTwist"] != 0, -twist, twist)
+
+    outputs = counts.get("twistDistribution", 0)
+    index = np.arange(outputs)
+    index = np.where(inputs["reverseDistribution"][:, np.newaxis] != 0, index, outputs - 1 - index)
+    if outputs > 1:
+        twistDistribution = (twist / (outputs - 1))[:, np.newaxis] * index
+    else:
+        twistDistribution = np.repeat(twist[:, np.newaxis], outputs, axis=1)
+    return OrderedDict([("twist", twist), ("twistDistribution", twistDistribution)])
+
+
+@_register("AimConstraint", "gfAimConstraint_P", [
+    ("upVectorType", 0, 0), ("offset", np.zeros(3), 1), ("worldUpVector", (0.0, 1.0, 0.0), 1),
+    ("worldUpMatrix", np.identity(4), 2), ("angleUp", 0.0, 0), ("targetWorldMatrix", np.identity(4), 2),
+    ("targetWeight", 1.0, 0), ("constraintWorldMatrix", np.identity(4), 2),
+    ("constraintParentInverseMatrix", np.identity(4), 2), ("constraintJointOrient", np.zeros(3), 1),
+    ("constraintRotateOrder", 0, 0)])
+def _bakeAimConstraint(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    eResult = lookAt.constraintRotation(
+        inputs["constraintWorldMatrix"][:, 3, :3], inputs["targetWorldMatrix"][:, 3, :3],
+        inputs["constraintParentInverseMatrix"], inputs["upVectorType"], inputs["worldUpVector"],
+        inputs["worldUpMatrix"][:, 3, :3], inputs["angleUp"], inputs["offset"], inputs["constraintJointOrient"],
+        inputs["constraintRotateOrder"], inputs["targetWeight"])
+    return OrderedDict([("constraint", eResult)])
+
+
+@_register("ParentConstraint", "gfParentConstraint_P", [
+    ("constraintJointOrient", np.zeros(3), 1), ("constraintRotateOrder", 0, 0),
+    ("constraintParentInverseMatrix", np.identity(4), 2), ("constraintParentScale", (1.0, 1.0, 1.0), 1),
+    ("targetWorldMatrix", np.zeros((0, 4, 4)), 3), ("targetOffset", np.zeros((0, 4, 4)), 3),
+    ("targetWeight", np.zeros(0), 1)])
+def _bakeParentConstraint(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    count = max(inputs["targetWorldMatrix"].shape[1], inputs["targetOffset"].shape[1], inputs["targetWeight"].shape[1])
+    mTargetW = _pad(inputs["targetWorldMatrix"], count, np.identity(4))
+    mOffset = _pad(inputs["targetOffset"], count, np.identity(4))
+    targetWeight = _pad(inputs["targetWeight"], count, 1.0)
+
+    # Offset * world of every target, then the same blend and local values as the node.
+    mTargets = transform.blend(np.matmul(mOffset, mTargetW), targetWeight)
+    outTrans, outRot, outSca = transform.localValues(
+        mTargets, inputs["constraintParentInverseMatrix"], inputs["constraintParentScale"],
+        inputs["constraintJointOrient"], inputs["constraintRotateOrder"])
+    return OrderedDict([("constraintTranslate", outTrans), ("constraintRotate", outRot), ("constraintScale", outSca)])
+
+
+@_register("PoleVectorConstraint", "gfPoleVectorConstraint_P", [
+    ("rootWorldMatrix", np.identity(4), 2), ("targetWorldMatrix", np.identity(4), 2), ("targetWeight", 1.0, 0),
+    ("constraintParentInverseMatrix", np.identity(4), 2), ("restPosition", np.zeros(3), 1),
+    ("normalizeOutput", False, 0)])
+def _bakePoleVectorConstraint(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    vRoot = inputs["rootWorldMatrix"][:, 3, :3]
+    mConstParInv = inputs["constraintParentInverseMatrix"][:, :3, :3]
+    vPoleDirection = np.matmul((inputs["targetWorldMatrix"][:, 3, :3] - vRoot)[:, np.newaxis], mConstParInv)[:, 0]
+    vRestDirection = np.matmul((inputs["restPosition"] - vRoot)[:, np.newaxis], mConstParInv)[:, 0]
+    targetWeight = inputs["targetWeight"][:, np.newaxis]
+    vPole = (1.0 - targetWeight) * vRestDirection + targetWeight * vPoleDirection
+    vPole = np.where(inputs["normalizeOutput"][:, np.newaxis] != 0, quaternion.normalizeVector(vPole), vPole)
+    return OrderedDict([("constraint", vPole)])
+
+
+@_register("SpaceConstraint", "gfSpaceConstraint_P", [
+    ("space", 0, 0), ("offset", np.zeros((0, 4, 4)), 3), ("offsetMatch", np.zeros((0, 4, 4)), 3),
+    ("target", np.zeros((0, 4, 4)), 3)])
+def _bakeSpaceConstraint(inputs, frames, counts):
+    # pylint: disable=unused-argument
+    count = min(inputs["offset"].shape[1], inputs["target"].shape[1])
+    if count == 0:
+        mResult = np.broadcast_to(np.identity(4), (frames, 4, 4))
+    else:
+        # Spaces past the last target use the last one. Missing offset matches are identities.
+        curSpace = np.minimum(inputs["space"].astype(np.intp), count - 1)
+        offsetMatch = _pad(inputs["offsetMatch"], count, np.identity(4))
+        frame = np.arange(frames)
+        mResult = np.matmul(np.matmul(offsetMatch[frame, curSpace], inputs["offset"][frame, curSpace]),
+                            inputs["target"][frame, curSpace])
+    outTrans, outRot, outSca, _ = transform.decompose(mResult, euler.kXYZ)
+    return OrderedDict([("constraintTranslate", outTrans), ("constraintRotate", outRot), ("constraintScale", outSca)])
@@ -0,0 +1,262 @@
+## @package cache
+#  Memory mapped cache of the baked outputs of the gfTools nodes.
+#
+#  Writes the per frame outputs as contiguous arrays and reads them back with numpy.memmap.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * Write the outputs baked by gfTools.bake:
+        from gfTools import bake, cache
+        results = bake.bake("gfIKVChain_P", inputs)
+        cache.write("C:/temp/leftArm.gfc", results, startFrame=1001.0)
+    * Read them:
+        armCache = cache.load("C:/temp/leftArm.gfc")
+        armCache.sample("outChain", 1012.5)       ((3, 4, 4) array, blended between 1012 and 1013)
+        armCache.array("outChain")[11]            (the memory mapped frame 1012)
+    * In Maya, the gfCachePlayback_P node plays a channel back.
+
+Requirements:
+    * NumPy.
+
+Description:
+    The file has a fixed 16 bytes preamble, a JSON header and the data:
+        * 8 bytes magic: "GFCACHE" followed by a zero byte.
+        * little endian uint32: format version (kVersion).
+        * little endian uint32: header size in bytes.
+        * JSON header (utf-8): startFrame, frameStep, frames and the channels list. Every channel has
+          its name, kind ("matrix" or "value"), item shape and data offset in bytes from the start of
+          the file.
+        * The channels data, each channel is a contiguous little endian float64 (frames, ...) array
+          aligned to kAlignment bytes.
+    The frames of a channel are contiguous, so reading a frame only touches the pages of that frame.
+    write() writes a temporary file next to the path and moves it over the old file, so Caches that
+    still map the old file keep reading the old data.
+    A Cache maps every channel with numpy.memmap, nothing is read before a frame is sampled.
+    sample() blends the two frames around a time: the values are linearly interpolated and the
+    matrices are decomposed, their rotations slerped and their scales, shears and translations linearly
+    interpolated. Times outside the frame range use the first or last frame.
+
+This code supports Pylint. Rc file in project.
+"""
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
+
+kMagic = b"GFCACHE\x00"
+kVersion = 1
+kAlignment = 64
+kPreamble = struct.Struct("<8sII")
+kDataType = np.dtype("<f8")
+
+kNone = 0
+kLinear = 1
+
+kMatrix = "matrix"
+kValue = "value"
+
+
+def _align(size):
+    """Round a size up to the next multiple of kAlignment."""
+    return (size + kAlignment - 1) // kAlignment * kAlignment
+
+
+def write(path, channels, startFrame=0.0, frameStep=1.0):
+    """Write a cache file.
+
+    Args:
+        path (str): The file path.
+        channels (dict): The (frames, ...) arrays keyed by channel name, like the results of gfTools.bake.bake().
+            Arrays ending in (4, 4) are stored as matrices, booleans as 0.0 and 1.0.
+        startFrame (float): The frame of the first sample.
+        frameStep (float): The frames between two samples.
+
+    Raises:
+        ValueError: If there are no channels or frames, the channels don't have the same number of frames
+            or the step isn't positive.
+    """
+    arrays = [(name, np.ascontiguousarray(value, dtype=kDataType)) for name, value in channels.items()]
+    if not arrays:
+        raise ValueError("[gfTools] A cache needs at least one channel.")
+    frames = len(arrays[0][1]) if arrays[0][1].ndim else 0
+    if any(value.ndim == 0 or len(value) != frames for _, value in arrays):
+        raise ValueError("[gfTools] All the cache channels must have %s frames." % frames)
+    if frames == 0:
+        raise ValueError("[gfTools] A cache needs at least one frame.")
+    if frameStep <= 0.0:
+        raise ValueError("[gfTools] The cache frame step must be positive.")
+
+    header = {"startFrame": float(startFrame), "frameStep": float(frameStep), "frames": frames, "channels": []}
+    # The offsets depend on the header size, so grow the reserved size until the header fits.
+    reserved = kAlignment
+    while True:
+        offset = _align(kPreamble.size + reserved)
+        header["channels"] = []
+        for name, value in arrays:
+            kind = kMatrix if value.shape[-2:] == (4, 4) else kValue
+            header["channels"].append({"name": name, "kind": kind, "shape": list(value.shape[1:]), "offset": offset})
+            offset = _align(offset + value.nbytes)
+        text = json.dumps(header, sort_keys=True).encode("utf-8")
+        if len(text) <= reserved:
+            break
+        reserved = _align(len(text))
+
+    # A Cache may still map the old file, so the new one is written aside and replaces it. Truncating
+    # a mapped file crashes the process reading it.
+    directory, name = os.path.split(os.path.abspath(path))
+    handle, tempPath = tempfile.mkstemp(suffix=".tmp", prefix=name + ".", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as cacheFile:
+            cacheFile.write(kPreamble.pack(kMagic, kVersion, reserved))
+            cacheFile.write(text.ljust(reserved, b" "))
+            for (_, value), channel in zip(arrays, header["channels"]):
+                cacheFile.write(b"\x00" * (channel["offset"] - cacheFile.tell()))
+                cacheFile.write(value.tobytes())
+        # mkstemp() only gives access to the owner, use the permissions of a normally created file.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tempPath, 0o666 & ~umask)
+        _replace(tempPath, path)
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+
+
+def _replace(source, target):
+    """Move a file over another one, atomically where the platform allows it."""
+    if hasattr(os, "replace"):
+        os.replace(source, target)
+    elif os.name != "nt":
+        # Python 2 os.rename() already replaces the target on posix.
+        os.rename(source, target)
+    else:
+        if os.path.exists(target):
+            os.remove(target)
+        os.rename(source, target)
+
+
+def load(path):
+    """Open a cache file.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        Cache: The memory mapped cache.
+    """
+    return Cache(path)
+
+
+class Cache(object):
+    """Memory mapped cache file."""
+
+    def __init__(self, path):
+        """Read the header and map the channels.
+
+        Args:
+            path (str): The file path.
+
+        Raises:
+            ValueError: If the file isn't a gfTools cache, has an unknown version or has no frames.
+        """
+        with open(path, "rb") as cacheFile:
+            preamble = cacheFile.read(kPreamble.size)
+            if len(preamble) < kPreamble.size:
+                raise ValueError("[gfTools] %s is not a gfTools cache." % path)
+            magic, version, size = kPreamble.unpack(preamble)
+            if magic != kMagic:
+                raise ValueError("[gfTools] %s is not a gfTools cache." % path)
+            if version != kVersion:
+                raise ValueError("[gfTools] %s has the cache version %s, expected %s." % (path, version, kVersion))
+            header = json.loads(cacheFile.read(size).decode("utf-8"))
+        self.path = path
+        self.startFrame = header["startFrame"]
+        self.frameStep = header["frameStep"]
+        self.frames = header["frames"]
+        if self.frames < 1:
+            raise ValueError("[gfTools] %s has no frames." % path)
+        self._channels = {}
+        self._names = []
+        for channel in header["channels"]:
+            shape = (self.frames,) + tuple(channel["shape"])
+            if np.prod(shape) == 0:
+                # Empty arrays can't be mapped.
+                data = np.zeros(shape, dtype=kDataType)
+            else:
+                data = np.memmap(path, dtype=kDataType, mode="r", offset=channel["offset"], shape=shape)
+            self._channels[channel["name"]] = (channel["kind"], data)
+            self._names.append(channel["name"])
+
+    def names(self):
+        """Return the channel names, in the order they were written."""
+        return list(self._names)
+
+    def kind(self, name):
+        """Return the kind of a channel, kMatrix or kValue."""
+        return self._channel(name)[0]
+
+    def array(self, name):
+        """Return the memory mapped (frames, ...) array of a channel."""
+        return self._channel(name)[1]
+
+    def frame(self, index):
+        """Return the frame of a sample index."""
+        return self.startFrame + index * self.frameStep
+
+    def sample(self, name, frame, interpolation=kLinear):
+        """Return the value of a channel at any frame.
+
+        Args:
+            name (str): The channel name.
+            frame (float): The frame.
+            interpolation (int): kNone returns the previous sample, kLinear blends the two samples around the frame.
+
+        Returns:
+            numpy.ndarray: A copy of the channel value at the frame.
+        """
+        kind, data = self._channel(name)
+        position = min(max((frame - self.startFrame) / self.frameStep, 0.0), self.frames - 1.0)
+        index = int(np.floor(position))
+        blend = position - index
+        if interpolation == kNone or blend == 0.0 or index + 1 >= self.frames:
+            return np.array(data[index])
+        start = np.array(data[index])
+        end = np.array(data[index + 1])
+        if kind == kValue:
+            return start + (end - start) * blend
+        startTrans, startRot, startSca, startShear = transform.decompose(start)
+        endTrans, endRot, endSca, endShear = transform.decompose(end)
+        return transform.compose(
+            startTrans + (endTrans - startTrans) * blend,
+            quaternion.slerp(startRot, endRot, blend),
+            startSca + (endSca - startSca) * blend,
+            startShear + (endShear - startShear) * blend)
+
+    def _channel(self, name):
+        """Return the kind and the data of a channel."""
+        try:
+            return self._channels[name]
+        except KeyError:
+            raise ValueError("[gfTools] %s has no channel %s. Channels: %s" % (self.path, name, ", ".join(self._names)))
@@ -0,0 +1,218 @@
+## @package ikfk
+#  IK/FK matching of gfIKVChain limbs over frame ranges.
+#
+#  Converts sampled FK chains to IK handles and pole vectors and solved IK chains to FK rotations.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * FK to IK, with the (frames, 3, 4, 4) world matrices of the start, mid and end FK joints:
+        from gfTools import ikfk
+        match = ikfk.fkToIk(fkChains, poleDistance=2.0)
+        match["handle"], match["poleVector"]     ((frames, 4, 4) world matrices)
+        match["preferredAngle"]                  ((frames,) angles for the automatic pole vector)
+    * IK to FK, with the sampled gfIKVChain inputs:
+        fk = ikfk.ikToFk(roots, handles, poles, jointOrients=jointOrients, parentInverse=parentInverses,
+                         restLengthStart=5.0, restLengthEnd=5.0)
+        fk["rotate"]                             ((frames, 3, 3) euler angles in radians)
+    * In Maya, key the result in one go:
+        ikfk.writeKeys(["leftArm_fk_01.rotateX", "leftArm_fk_01.rotateY"], frames, fk["rotate"][:, 0, :2])
+
+Requirements:
+    * NumPy.
+    * Maya, only for writeKeys().
+
+Description:
+    Every function works over all the frames at once, so a match over a frame range doesn't need to
+    step the timeline. The DG is only touched by writeKeys(), which keys each plug with one
+    MFnAnimCurve.addKeys() call.
+    fkToIk() puts the handle on the end joint and the pole vector in the plane of the chain, at the
+    mid joint pushed away from the root to end line, like snippets.getPoleVectorPosition(). Straight
+    chains use the y axis of the mid joint as the bend direction. It also returns the bone lengths,
+    to be used as the rest lengths, and the preferred angle that makes the automatic pole vector mode
+    of gfIKVChain bend the chain in the same plane. findPreferredAngleIK() in snippets measures the
+    pole direction against the world x axis, which is not the angle the solver uses, so the angle here
+    follows gfTools.kernels.ikVChain: the rotation of the secondary axis around the root to handle axis.
+    ikToFk() solves the chains with gfTools.kernels.ikVChain in hierarchy mode, which returns the joint
+    local matrices without the joint orients, and decomposes them in the FK rotate orders.
+
+This code supports Pylint. Rc file in project.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import ikVChain
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
+
+def _dot(vectorA, vectorB):
+    """Row wise dot product keeping the last axis."""
+    return np.sum(vectorA * vectorB, axis=-1, keepdims=True)
+
+
+def _perpendicular(vector, normal):
+    """Return the part of the vectors perpendicular to the unit normals."""
+    return vector - _dot(vector, normal) * normal
+
+
+def preferredAngle(root, handle, poleVector, flip=False):
+    """Find the preferred angle that points the automatic pole vector of gfIKVChain to a position.
+
+    Args:
+        root (array_like): The root positions with shape (..., 3).
+        handle (array_like): The handle positions with shape (..., 3).
+        poleVector (array_like): The pole vector positions with shape (..., 3).
+        flip (array_like): The flipOrientation of the gfIKVChain.
+
+    Returns:
+        numpy.ndarray: The angles in radians, in the [0, 2pi) range of the preferredAngle attribute.
+    """
+    root = np.asarray(root, dtype=np.float64)
+    nAim = quaternion.normalizeVector(np.asarray(handle, dtype=np.float64) - root)
+    secAxis = np.where(np.asarray(flip, dtype=bool)[..., np.newaxis], -1.0, 1.0) * [0.0, 1.0, 0.0]
+    nStart = quaternion.normalizeVector(_perpendicular(secAxis, nAim))
+    nPole = quaternion.normalizeVector(_perpendicular(np.asarray(poleVector, dtype=np.float64) - root, nAim))
+    angle = np.arctan2(_dot(np.cross(nStart, nPole), nAim)[..., 0], _dot(nStart, nPole)[..., 0])
+    return np.mod(angle, 2.0 * np.pi)
+
+
+def fkToIk(chain, poleDistance=1.0, flip=False):
+    """Find the IK handle and pole vector that match FK chains.
+
+    Args:
+        chain (array_like): The world matrices of the start, mid and end joints with shape (..., 3, 4, 4).
+        poleDistance (array_like): The distance multiplier between the chain and the pole vector.
+        flip (array_like): The flipOrientation of the gfIKVChain, used by the preferred angle.
+
+    Returns:
+        OrderedDict: The handle and poleVector world matrices (..., 4, 4), the preferredAngle (...) in
+            radians and the restLengthStart and restLengthEnd (...) bone lengths.
+    """
+    chain = np.asarray(chain, dtype=np.float64)
+    if chain.shape[-3:] != (3, 4, 4):
+        raise ValueError("[gfTools] The FK chains must have the shape (..., 3, 4, 4), got %s." % (chain.shape,))
+    vStart = chain[..., 0, 3, :3]
+    vMid = chain[..., 1, 3, :3]
+    vEnd = chain[..., 2, 3, :3]
+    vStartEnd = vEnd - vStart
+    vStartMid = vMid - vStart
+    startLen = np.sqrt(np.sum(vStartMid * vStartMid, axis=-1))
+    endLen = np.sqrt(np.sum((vEnd - vMid) ** 2, axis=-1))
+
+    # Same construction as snippets.getPoleVectorPosition(), with a fallback for straight chains.
+    nStartEnd = quaternion.normalizeVector(vStartEnd)
+    vArrow = _perpendicular(vStartMid, nStartEnd)
+    arrowLen = np.sqrt(np.sum(vArrow * vArrow, axis=-1, keepdims=True))
+    straight = arrowLen < 1.0e-6 * np.maximum(startLen, 1.0)[..., np.newaxis]
+    vBend = _perpendicular(chain[..., 1, 1, :3], nStartEnd)
+    vBend = quaternion.normalizeVector(vBend) * startLen[..., np.newaxis]
+    vArrow = np.where(straight, vBend, vArrow) * np.asarray(poleDistance, dtype=np.float64)[..., np.newaxis]
+    vPole = vMid + vArrow
+    nCross1 = quaternion.normalizeVector(np.cross(vStartEnd, vArrow))
+    nCross2 = quaternion.normalizeVector(np.cross(nCross1, vArrow))
+    poleVector = np.zeros(vPole.shape[:-1] + (4, 4))
+    poleVector[..., 0, :3] = quaternion.normalizeVector(vArrow)
+    poleVector[..., 1, :3] = nCross1
+    poleVector[..., 2, :3] = nCross2
+    poleVector[..., 3, :3] = vPole
+    poleVector[..., 3, 3] = 1.0
+
+    result = OrderedDict()
+    result["handle"] = np.array(chain[..., 2, :, :])
+    result["poleVector"] = poleVector
+    result["preferredAngle"] = preferredAngle(vStart, vEnd, vPole, flip)
+    result["restLengthStart"] = startLen
+    result["restLengthEnd"] = endLen
+    return result
+
+
+def ikToFk(root, handle, poleVector, order=euler.kXYZ, **settings):
+    """Solve IK chains and return the matching FK joint transformations.
+
+    Args:
+        root (array_like): The world matrices of the root objects, (N, 4, 4) or (4, 4).
+        handle (array_like): The world matrices of the handle objects, (N, 4, 4) or (4, 4).
+        poleVector (array_like): The world matrices of the pole vector objects, (N, 4, 4) or (4, 4).
+        order (int, array_like): The rotate orders of the FK joints, one for all or (3,) for each joint.
+        **settings: Any other gfTools.kernels.ikVChain.solve() argument, like parentInverse (the inverse
+            world matrix of the parent of the start joint), jointOrients or the rest lengths.
+            hierarchyMode is always on.
+
+    Returns:
+        OrderedDict: The rotate (N, 3, 3) in radians, translate (N, 3, 3) and scale (N, 3, 3) of the
+            start, mid and end FK joints.
+    """
+    settings["hierarchyMode"] = True
+    local = ikVChain.solve(root, handle, poleVector, **settings)
+    translation, rotation, scale, _ = transform.decompose(local, order)
+    result = OrderedDict()
+    result["rotate"] = rotation
+    result["translate"] = translation
+    result["scale"] = scale
+    return result
+
+
+def writeKeys(attributes, frames, values, tangentType=None, dgModifier=None, curveChange=None):
+    """Key sampled values with one MFnAnimCurve.addKeys() call per plug.
+
+    Args:
+        attributes (list): The plug names, like "leftArm_fk_01.rotateX". Plugs without an animation
+            curve get a new one.
+        frames (array_like): The frames with shape (F,), in the current time unit.
+        values (array_like): The values with shape (F, len(attributes)) in internal units (radians and
+            centimeters). The existing keys at other frames are kept.
+        tangentType (int): The in and out tangent type of the keys, like MFnAnimCurve.kTangentStep.
+            None uses the global tangents.
+        dgModifier (MDGModifier): Creates and connects the new animation curves, so they can be undone.
+            Its doIt() is called before returning.
+        curveChange (MAnimCurveChange): Records the added keys, so they can be undone.
+
+    Raises:
+        ValueError: If the values don't match the frames and the attributes.
+    """
+    # Maya is only imported here, so the math above runs outside Maya too.
+    import maya.api._OpenMaya_py2 as om2
+    import maya.api._OpenMayaAnim_py2 as oma2
+
+    frames = np.asarray(frames, dtype=np.float64).ravel()
+    values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+    if values.shape[1] != len(attributes):
+        raise ValueError("[gfTools] Got %s value columns for %s attributes." % (values.shape[1], len(attributes)))
+
+    selection = om2.MSelectionList()
+    for attribute in attributes:
+        selection.add(attribute)
+    unit = om2.MTime.uiUnit()
+    times = om2.MTimeArray([om2.MTime(frame, unit) for frame in frames])
+    if tangentType is None:
+        tangentType = oma2.MFnAnimCurve.kTangentGlobal
+    curveFn = oma2.MFnAnimCurve()
+    for index in range(len(attributes)):
+        plug = selection.getPlug(index)
+        sources = plug.connectedTo(True, False)
+        if sources and sources[0].node().hasFn(om2.MFn.kAnimCurve):
+            curveFn.setObject(sources[0].node())
+        elif dgModifier is not None:
+            curveFn.create(plug, modifier=dgModifier)
+        else:
+            curveFn.create(plug)
+        curveFn.addKeys(times, values[:, index].tolist(), tangentType, tangentType, True, curveChange)
+    if dgModifier is not None:
+        dgModifier.doIt()
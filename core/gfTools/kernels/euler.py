@@ -0,0 +1,342 @@
+## @package euler
+#  Vectorized euler rotation conversions for the six Maya rotation orders.
+#
+#  Every function works over arrays of any leading shape, with one rotation order for all the
+#  rotations or one rotation order per rotation.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import euler
+    * quat = euler.toQuaternion(angles, euler.kZXY)
+    * angles = euler.reorder(angles, rotateOrders, euler.kXYZ)
+
+Requirements:
+    * NumPy.
+
+Description:
+    Euler rotations are stored as (..., 3) arrays of x, y and z angles in radians, the same layout of
+    om2.MEulerRotation. The rotation orders are the om2.MEulerRotation enum (kXYZ = 0 to kZYX = 5), which
+    is also the order of the rotateOrder attribute of the transforms. kXYZ rotates around x first, then
+    y and then z. The order arguments can be an int or an int array broadcastable to the leading shape of
+    the rotations, the rotations are converted in one vectorized pass per distinct order.
+    Quaternions are (..., 4) arrays in (x, y, z, w) order and matrices use the Maya row vector layout,
+    like gfTools.kernels.quaternion. The results match the om2 conversions (MEulerRotation.asQuaternion(),
+    asMatrix(), reorderIt(), closestSolution() and MEulerRotation.decompose()).
+    float32 inputs are computed in float32, everything else in float64. The dtype argument forces one
+    of them.
+    gfTools.testing.accuracy checks the conversions of every rotation order, the gimbal lock and the
+    float32 path against the om2 stand-in and plain Python references.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import quaternion
+
+
+kXYZ = 0
+kYZX = 1
+kZXY = 2
+kXZY = 3
+kYXZ = 4
+kZYX = 5
+
+## The (first, middle, last) rotation axes of each rotation order.
+kAxes = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+## Sine of the middle angle above which a matrix is handled as a gimbal lock.
+kGimbalSine = 1.0 - 1.0e-12
+
+
+def _floatType(value, dtype):
+    """Return the dtype used to compute the value."""
+    if dtype is not None:
+        return np.dtype(dtype)
+    if isinstance(value, np.ndarray) and value.dtype == np.float32:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _checkOrder(order):
+    """Return the rotation orders as an int or an int array.
+
+    Raises:
+        ValueError: If an order is not between kXYZ and kZYX.
+    """
+    if not isinstance(order, (int, np.integer)):
+        order = np.asarray(order)
+    if np.ndim(order) == 0:
+        order = int(order)
+        if order < kXYZ or order > kZYX:
+            raise ValueError("[gfTools] Invalid rotation order: %s" % order)
+        return order
+    order = order.astype(np.intp)
+    if order.size and (order.min() < kXYZ or order.max() > kZYX):
+        raise ValueError("[gfTools] Invalid rotation orders: %s" % np.unique(order[(order < kXYZ) | (order > kZYX)]))
+    return order
+
+
+def _perOrder(function, order, values, itemShapes, outShape):
+    """Call function(order, *values) once per distinct rotation order.
+
+    Args:
+        function (callable): Converts arrays that share one rotation order.
+        order (int, numpy.ndarray): The rotation orders, from _checkOrder().
+        values (list): The input arrays.
+        itemShapes (list): The trailing shape of each input array, like (3,) for euler rotations.
+        outShape (tuple): The trailing shape of the output array.
+
+    Returns:
+        numpy.ndarray: The converted arrays.
+    """
+    if isinstance(order, int):
+        return function(order, *values)
+    leading = [np.broadcast_to(False, value.shape[:value.ndim - len(itemShape)])
+               for value, itemShape in zip(values, itemShapes)]
+    shape = np.broadcast(order, *leading).shape
+    order = np.broadcast_to(order, shape)
+    values = [np.broadcast_to(value, shape + tuple(itemShape)) for value, itemShape in zip(values, itemShapes)]
+    result = np.empty(shape + tuple(outShape), dtype=values[0].dtype)
+    for current in np.unique(order):
+        mask = order == current
+        result[mask] = function(int(current), *[value[mask] for value in values])
+    return result
+
+
+def _elementMatrices(angle, axis):
+    """Return the row vector rotation matrices of angles around one axis."""
+    cos = np.cos(angle)
+    sin = np.sin(angle)
+    matrix = np.zeros(angle.shape + (3, 3), dtype=angle.dtype)
+    second = (axis + 1) % 3
+    third = (axis + 2) % 3
+    matrix[..., axis, axis] = 1.0
+    matrix[..., second, second] = cos
+    matrix[..., second, third] = sin
+    matrix[..., third, second] = -sin
+    matrix[..., third, third] = cos
+    return matrix
+
+
+def _toMatrix(order, angles):
+    """Convert euler rotations that share one rotation order to (..., 3, 3) matrices."""
+    first, middle, last = kAxes[order]
+    matrix = np.matmul(_elementMatrices(angles[..., first], first), _elementMatrices(angles[..., middle], middle))
+    return np.matmul(matrix, _elementMatrices(angles[..., last], last))
+
+
+def _toQuaternion(order, angles):
+    """Convert euler rotations that share one rotation order to (..., 4) quaternions."""
+    halfAngles = angles * 0.5
+    sin = np.sin(halfAngles)
+    cos = np.cos(halfAngles)
+    first, middle, last = kAxes[order]
+    quat = np.zeros(angles.shape[:-1] + (4,), dtype=angles.dtype)
+    quat[..., first] = sin[..., first]
+    quat[..., 3] = cos[..., first]
+    for axis in (middle, last):
+        # Product with a rotation around a single axis, same as quaternion.multiply(quat, axisQuat).
+        axisSin = sin[..., axis]
+        axisCos = cos[..., axis]
+        other1 = (axis + 1) % 3
+        other2 = (axis + 2) % 3
+        result = quat * axisCos[..., np.newaxis]
+        result[..., axis] += quat[..., 3] * axisSin
+        result[..., other1] -= quat[..., other2] * axisSin
+        result[..., other2] += quat[..., other1] * axisSin
+        result[..., 3] -= quat[..., axis] * axisSin
+        quat = result
+    return quat
+
+
+def _fromMatrix(order, column):
+    """Extract euler rotations that share one rotation order from (..., 3, 3) column vector matrices."""
+    first, middle, last = kAxes[order]
+    sign = 1.0 if order < kXZY else -1.0
+    sinMiddle = np.clip(-sign * column[..., last, first], -1.0, 1.0)
+    gimbal = np.abs(sinMiddle) >= kGimbalSine
+    angles = np.empty(column.shape[:-2] + (3,), dtype=column.dtype)
+    angles[..., middle] = np.arcsin(sinMiddle)
+    angles[..., first] = np.where(gimbal,
+                                  np.arctan2(-sign * column[..., middle, last], column[..., middle, middle]),
+                                  np.arctan2(sign * column[..., last, middle], column[..., last, last]))
+    angles[..., last] = np.where(gimbal, 0.0, np.arctan2(sign * column[..., middle, first], column[..., first, first]))
+    return angles
+
+
+def _alternateSolution(order, angles):
+    """Return the alternate solutions of euler rotations that share one rotation order."""
+    first, middle, last = kAxes[order]
+    result = np.array(angles)
+    result[..., first] += np.pi
+    result[..., middle] = np.pi - result[..., middle]
+    result[..., last] += np.pi
+    return bound(result)
+
+
+def toMatrix(angles, order=kXYZ, dtype=None):
+    """Convert euler rotations to rotation matrices, same as om2.MEulerRotation.asMatrix().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        order (int, array_like): The rotation orders.
+        dtype (numpy.dtype): The dtype of the computation and of the result.
+
+    Returns:
+        numpy.ndarray: The rotation matrices with shape (..., 3, 3).
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, dtype))
+    return _perOrder(_toMatrix, _checkOrder(order), [angles], [(3,)], (3, 3))
+
+
+def toQuaternion(angles, order=kXYZ, dtype=None):
+    """Convert euler rotations to quaternions, same as om2.MEulerRotation.asQuaternion().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        order (int, array_like): The rotation orders.
+        dtype (numpy.dtype): The dtype of the computation and of the result.
+
+    Returns:
+        numpy.ndarray: The unit quaternions with shape (..., 4).
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, dtype))
+    return _perOrder(_toQuaternion, _checkOrder(order), [angles], [(3,)], (4,))
+
+
+def fromMatrix(matrix, order=kXYZ, dtype=None):
+    """Extract euler rotations from rotation matrices, same as om2.MEulerRotation.decompose().
+
+    Args:
+        matrix (array_like): Matrices with shape (..., 3, 3) or (..., 4, 4) in the Maya row vector
+            layout. The rows are normalized, so scaled matrices are accepted. Sheared matrices are not.
+        order (int, array_like): The rotation orders.
+        dtype (numpy.dtype): The dtype of the computation and of the result.
+
+    Returns:
+        numpy.ndarray: The euler rotations in radians with shape (..., 3).
+    """
+    matrix = np.asarray(matrix, dtype=_floatType(matrix, dtype))[..., :3, :3]
+    length = np.sqrt(np.sum(matrix * matrix, axis=-1, keepdims=True))
+    column = np.swapaxes(matrix / np.where(length > quaternion.kEpsilon, length, 1.0), -1, -2)
+    return _perOrder(_fromMatrix, _checkOrder(order), [column], [(3, 3)], (3,))
+
+
+def fromQuaternion(quat, order=kXYZ, dtype=None):
+    """Convert quaternions to euler rotations, same as om2.MQuaternion.asEulerRotation().reorderIt(order).
+
+    Args:
+        quat (array_like): Quaternions with shape (..., 4). They don't need to be normalized.
+        order (int, array_like): The rotation orders.
+        dtype (numpy.dtype): The dtype of the result.
+
+    Returns:
+        numpy.ndarray: The euler rotations in radians with shape (..., 3).
+    """
+    floatType = _floatType(quat, dtype)
+    matrix = quaternion.asMatrix(quaternion.normalize(quat))
+    return fromMatrix(matrix.astype(floatType, copy=False), order)
+
+
+def reorder(angles, order, newOrder, dtype=None):
+    """Change the rotation order keeping the same orientations, same as om2.MEulerRotation.reorderIt().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        order (int, array_like): The current rotation orders.
+        newOrder (int, array_like): The new rotation orders.
+        dtype (numpy.dtype): The dtype of the computation and of the result.
+
+    Returns:
+        numpy.ndarray: The reordered euler rotations. Rotations that keep their order are copied unchanged.
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, dtype))
+    order = _checkOrder(order)
+    newOrder = _checkOrder(newOrder)
+    if isinstance(order, int) and isinstance(newOrder, int) and order == newOrder:
+        return angles.copy()
+    matrix = toMatrix(angles, order)
+    result = _perOrder(_fromMatrix, newOrder, [np.swapaxes(matrix, -1, -2)], [(3, 3)], (3,))
+    same = np.asarray(order) == np.asarray(newOrder)
+    if np.any(same):
+        result = np.where(same[..., np.newaxis], angles, result)
+    return result
+
+
+def bound(angles):
+    """Wrap every angle to [-pi, pi), same as om2.MEulerRotation.boundIt().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+
+    Returns:
+        numpy.ndarray: The bounded euler rotations.
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, None))
+    return np.mod(angles + np.pi, 2.0 * np.pi) - np.pi
+
+
+def alternateSolution(angles, order=kXYZ):
+    """Return the other angles that produce the same orientations, same as om2.MEulerRotation.alternateSolution().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        order (int, array_like): The rotation orders.
+
+    Returns:
+        numpy.ndarray: The bounded alternate euler rotations.
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, None))
+    return _perOrder(_alternateSolution, _checkOrder(order), [angles], [(3,)], (3,))
+
+
+def closestCut(angles, target):
+    """Shift every angle by multiples of 2pi to be closest to the target, same as om2.MEulerRotation.closestCut().
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        target (array_like): The target euler rotations, broadcastable to angles.
+
+    Returns:
+        numpy.ndarray: The shifted euler rotations.
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, None))
+    turns = np.round((np.asarray(target, dtype=angles.dtype) - angles) / (2.0 * np.pi))
+    return angles + turns * (2.0 * np.pi)
+
+
+def closestSolution(angles, order, target):
+    """Return the solution closest to the target, same as om2.MEulerRotation.closestSolution().
+
+    The candidates are the rotations and their alternate solutions for the given rotation orders, both
+    shifted to the closest cut. Use it to keep baked or blended rotations free of flips between frames.
+
+    Args:
+        angles (array_like): The euler rotations in radians with shape (..., 3).
+        order (int, array_like): The rotation orders of the rotations and of the targets.
+        target (array_like): The target euler rotations, like the previous frame.
+
+    Returns:
+        numpy.ndarray: The closest euler rotations.
+    """
+    angles = np.asarray(angles, dtype=_floatType(angles, None))
+    target = np.asarray(target, dtype=angles.dtype)
+    first = closestCut(angles, target)
+    second = closestCut(alternateSolution(angles, order), target)
+    useSecond = np.sum((second - target) ** 2, axis=-1) < np.sum((first - target) ** 2, axis=-1)
+    return np.where(useSecond[..., np.newaxis], second, first)
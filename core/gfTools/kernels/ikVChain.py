@@ -0,0 +1,239 @@
+## @package ikVChain
+#  Vectorized IK V-Chain solver.
+#
+#  Maya-free version of the gfRigIKVChain node math, solving any number of chains at once.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import ikVChain
+    * outChain = ikVChain.solve(rootMatrices, handleMatrices, poleMatrices, stretch=1.0)
+
+Requirements:
+    * NumPy.
+
+Description:
+    Solves N two bones chains in a single call. Matrices are (N, 4, 4) arrays in the Maya row vector
+    layout (translation in the last row), quaternions are (N, 4) arrays in (x, y, z, w) order and every
+    setting can be a scalar or an array with one value per chain. The result is a (N, 3, 4, 4) array with
+    the start, mid and end matrices of each chain, matching the outChain plug of the gfRigIKVChain node.
+    The chain turns around the aim by the signed angle to the pole normal. With a snapUpVector between
+    0.0 and 1.0 the pole and snap normals are blended first. The gfRigIKVChain node used to take the
+    mirrored angle there, so those chains differ from scenes saved with the older node.
+    gfTools.testing.accuracy checks solve() against a per chain om2 solve, in both hierarchy modes.
+
+Sources:
+    * https://www.desmos.com/calculator/wthlznq4aj
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
+
+def solve(root, handle, poleVector, parentInverse=None, snap=None, offsets=None, jointOrients=None,
+          restLengthStart=1.0, restLengthEnd=1.0, preferredAngle=0.0, twist=0.0, pvMode=0,
+          hierarchyMode=True, flip=False, useStretchAsScale=False, compressionLimit=0.1,
+          snapUpVector=0.0, softness=0.0, stretch=0.0, clampStretch=0.0, clampValue=1.5,
+          squash=0.0, squashMultStart=(1.0, 1.0), squashMultEnd=(1.0, 1.0)):
+    """Solve a batch of IK V-Chains.
+
+    Args:
+        root (array_like): The world matrices of the root objects, (N, 4, 4) or (4, 4).
+        handle (array_like): The world matrices of the handle objects, (N, 4, 4) or (4, 4).
+        poleVector (array_like): The world matrices of the pole vector objects, (N, 4, 4) or (4, 4).
+        parentInverse (array_like): The inverse world matrices of the parents of the output chains.
+        snap (array_like): The world matrices of the snap objects.
+        offsets (array_like): The offset quaternions of the start and mid outputs, (N, 2, 4) or (2, 4).
+        jointOrients (array_like): The joint orient quaternions of the start and mid outputs, (N, 2, 4) or (2, 4).
+        restLengthStart (array_like): The length of the first bone.
+        restLengthEnd (array_like): The length of the second bone.
+        preferredAngle (array_like): The preferred angle in radians used by the automatic pole vector.
+        twist (array_like): The twist angle in radians used by the automatic pole vector.
+        pvMode (array_like): 0 to use the pole vector object and 1 to use the automatic pole vector.
+        hierarchyMode (array_like): Output local matrices to drive a joint hierarchy.
+        flip (array_like): Flip the primary and secondary axes.
+        useStretchAsScale (array_like): Output the stretch as scale instead of translation.
+        compressionLimit (array_like): The compression limit of the chains.
+        snapUpVector (array_like): The weight of the snap object.
+        softness (array_like): The softness of the solver.
+        stretch (array_like): The stretch weight.
+        clampStretch (array_like): The clamp stretch weight.
+        clampValue (array_like): The maximum stretch when clamping.
+        squash (array_like): The squash weight.
+        squashMultStart (array_like): The squash multipliers of the first bone, (N, 2) or (2,).
+        squashMultEnd (array_like): The squash multipliers of the second bone, (N, 2) or (2,).
+
+    Returns:
+        numpy.ndarray: The output chain matrices with shape (N, 3, 4, 4).
+    """
+    # pylint: disable=too-many-locals, too-many-statements
+    root = np.asarray(root, dtype=np.float64)
+    handle = np.asarray(handle, dtype=np.float64)
+    poleVector = np.asarray(poleVector, dtype=np.float64)
+    count = max(_count(root, 2), _count(handle, 2), _count(poleVector, 2))
+    if parentInverse is None:
+        parentInverse = np.eye(4)
+    if snap is None:
+        snap = np.eye(4)
+    if offsets is None:
+        offsets = quaternion.identity(2)
+    if jointOrients is None:
+        jointOrients = quaternion.identity(2)
+
+    root = _broadcast(root, count, (4, 4))
+    handle = _broadcast(handle, count, (4, 4))
+    poleVector = _broadcast(poleVector, count, (4, 4))
+    parentInverse = _broadcast(parentInverse, count, (4, 4))
+    snap = _broadcast(snap, count, (4, 4))
+    offsets = _broadcast(offsets, count, (2, 4))
+    jointOrients = _broadcast(jointOrients, count, (2, 4))
+    restLengthStart = _broadcast(restLengthStart, count)
+    restLengthEnd = _broadcast(restLengthEnd, count)
+    angle = _broadcast(preferredAngle, count) + _broadcast(twist, count)
+    autoPv = _broadcast(pvMode, count) != 0
+    hierarchyMode = _broadcast(hierarchyMode, count).astype(bool)
+    flip = _broadcast(flip, count).astype(bool)
+    useScale = _broadcast(useStretchAsScale, count).astype(bool)
+    compressionLimit = _broadcast(compressionLimit, count)
+    snapWeight = _broadcast(snapUpVector, count)
+    softVal = _broadcast(softness, count)
+    stretch = _broadcast(stretch, count)
+    clampStretch = _broadcast(clampStretch, count)
+    clampValue = _broadcast(clampValue, count)
+    squash = _broadcast(squash, count)
+    squashMultStart = _broadcast(squashMultStart, count, (2,))
+    squashMultEnd = _broadcast(squashMultEnd, count, (2,))
+
+    # Get Basis Quaternion
+    vRoot = root[:, 3, :3]
+    vHandle = handle[:, 3, :3]
+    vPoleVector = poleVector[:, 3, :3]
+    vSnap = snap[:, 3, :3]
+
+    axisSign = np.where(flip, -1.0, 1.0)[:, np.newaxis]
+    primAxis = axisSign * [1.0, 0.0, 0.0]
+    secAxis = axisSign * [0.0, 1.0, 0.0]
+    binAxis = np.cross(primAxis, secAxis)
+
+    vAim = vHandle - vRoot
+    nAim = quaternion.normalizeVector(vAim)
+    qAim = quaternion.fromTwoVectors(primAxis, nAim)
+
+    vStartSnap = vSnap - vRoot
+    vEndSnap = vSnap - vHandle
+
+    vUpAuto = quaternion.rotateVector(secAxis, quaternion.fromAxisAngle(nAim, angle))
+    vUp = np.where(autoPv[:, np.newaxis], vUpAuto, vPoleVector - vRoot)
+    nNormalPole = quaternion.normalizeVector(vUp - _dot(vUp, nAim) * nAim)
+    nNormalSnap = quaternion.normalizeVector(vStartSnap - _dot(vStartSnap, nAim) * nAim)
+    snapBlend = (1.0 - snapWeight[:, np.newaxis]) * nNormalPole + snapWeight[:, np.newaxis] * nNormalSnap
+    nNormal = np.where(snapWeight[:, np.newaxis] > 0.0, snapBlend, nNormalPole)
+
+    nUp = quaternion.rotateVector(secAxis, qAim)
+    normalAngle = np.arctan2(_dot(np.cross(nUp, nNormal), nAim)[:, 0], _dot(nUp, nNormal)[:, 0])
+    qBasis = quaternion.multiply(qAim, quaternion.fromAxisAngle(nAim, normalAngle))
+
+    # Solver Triangle
+    startSnapLen = _length(vStartSnap)
+    endSnapLen = _length(vEndSnap)
+    startLen = (1.0 - snapWeight) * restLengthStart + snapWeight * startSnapLen
+    endLen = (1.0 - snapWeight) * restLengthEnd + snapWeight * endSnapLen
+    chainLen = (1.0 - snapWeight) * (restLengthStart + restLengthEnd) + snapWeight * (startSnapLen + endSnapLen)
+    handleLen = _length(vAim)
+
+    rigidLen = np.maximum(np.minimum(handleLen, chainLen), chainLen * compressionLimit)
+    da = (1.0 - softVal) * chainLen
+    isSoft = (handleLen > da) & (softVal > 0.0)
+    ds = np.where(isSoft, chainLen - da, 1.0)
+    softLen = ds * (1.0 - np.exp((da - handleLen) / ds)) + da
+    solverLen = np.where(isSoft, (1.0 - snapWeight) * softLen + snapWeight * rigidLen, rigidLen)
+
+    # Pre Calculations
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaleFactor = np.where(isSoft, handleLen / solverLen, handleLen / chainLen)
+        clampFactor = (1.0 - clampStretch) * scaleFactor + clampStretch * np.minimum(scaleFactor, clampValue)
+        stretchFactor = np.where(handleLen >= da, (1.0 - stretch) + stretch * clampFactor, 1.0)
+        stretchFactor = np.where(stretch > 0.0, stretchFactor, 1.0)
+        squashFactor = (1.0 - squash) + squash * (1.0 / np.sqrt(stretchFactor))
+        squashFactor = np.where(stretch > 0.0, squashFactor, 1.0)
+
+    stretchScale = np.where(useScale, stretchFactor, 1.0)
+    stretchTranslate = np.where(useScale, 1.0, stretchFactor)
+    offsetInv = quaternion.inverse(offsets)
+    jointOrientInv = quaternion.inverse(jointOrients)
+
+    # First Output
+    firstSca = np.column_stack([stretchScale, squashFactor[:, np.newaxis] * squashMultStart])
+    betaCos = (startLen * startLen + solverLen * solverLen - endLen * endLen) / (2.0 * startLen * solverLen)
+    beta = np.arccos(np.clip(betaCos, -1.0, 1.0))
+    qFirstRotW = quaternion.multiply(quaternion.fromAxisAngle(binAxis, beta), qBasis)
+    qFirstRot = quaternion.multiply(quaternion.multiply(offsetInv[:, 0], qFirstRotW), jointOrientInv[:, 0])
+    mFirst = np.matmul(transform.compose(vRoot, qFirstRot, firstSca), parentInverse)
+
+    # Second Output
+    secondSca = np.column_stack([stretchScale, squashFactor[:, np.newaxis] * squashMultEnd])
+    gammaCos = (startLen * startLen + endLen * endLen - solverLen * solverLen) / (2.0 * startLen * endLen)
+    gammaCmp = np.arccos(np.clip(gammaCos, -1.0, 1.0)) + beta - np.pi
+    qSecondRotW = quaternion.multiply(quaternion.fromAxisAngle(binAxis, gammaCmp), qBasis)
+    qSecondLocal = quaternion.multiply(quaternion.inverse(qFirstRotW), offsets[:, 0])
+    qSecondRot = quaternion.multiply(offsetInv[:, 1], qSecondRotW)
+    qSecondRot = np.where(hierarchyMode[:, np.newaxis], quaternion.multiply(qSecondRot, qSecondLocal), qSecondRot)
+    qSecondRot = quaternion.multiply(qSecondRot, jointOrientInv[:, 1])
+    vSecondLocal = primAxis * (startLen * stretchTranslate)[:, np.newaxis]
+    vSecondOri = quaternion.rotateVector(nAim, quaternion.fromAxisAngle(np.cross(nAim, nNormal), beta))
+    vSecondWorld = vRoot + vSecondOri * (startLen * stretchTranslate)[:, np.newaxis]
+    vSecondPos = np.where(hierarchyMode[:, np.newaxis], vSecondLocal, vSecondWorld)
+    mSecond = transform.compose(vSecondPos, qSecondRot, secondSca)
+
+    # Third Output
+    qThirdLocal = quaternion.multiply(quaternion.multiply(qBasis, quaternion.inverse(qSecondRotW)), offsets[:, 1])
+    qThirdRot = np.where(hierarchyMode[:, np.newaxis], qThirdLocal, qBasis)
+    vThirdLocal = primAxis * (endLen * stretchTranslate)[:, np.newaxis]
+    vThirdWorld = vRoot + nAim * (solverLen * stretchTranslate)[:, np.newaxis]
+    vThirdPos = np.where(hierarchyMode[:, np.newaxis], vThirdLocal, vThirdWorld)
+    mThird = transform.compose(vThirdPos, qThirdRot)
+
+    # Only the start matrix is parent relative when solving a joint hierarchy
+    worldSpace = ~hierarchyMode[:, np.newaxis, np.newaxis]
+    mSecond = np.where(worldSpace, np.matmul(mSecond, parentInverse), mSecond)
+    mThird = np.where(worldSpace, np.matmul(mThird, parentInverse), mThird)
+
+    return np.stack([mFirst, mSecond, mThird], axis=1)
+
+
+def _count(array, itemDims):
+    """Return the number of items of a batched array or 1 if the array is a single item."""
+    return array.shape[0] if array.ndim > itemDims else 1
+
+
+def _broadcast(value, count, itemShape=()):
+    """Broadcast a single value or a batch of values to (count,) + itemShape."""
+    value = np.asarray(value, dtype=np.float64)
+    return np.array(np.broadcast_to(value, (count,) + tuple(itemShape)))
+
+
+def _dot(vectorA, vectorB):
+    """Row wise dot product keeping the last axis."""
+    return np.sum(vectorA * vectorB, axis=-1, keepdims=True)
+
+
+def _length(vector):
+    """Row wise vector length."""
+    return np.sqrt(np.sum(vector * vector, axis=-1))
@@ -0,0 +1,126 @@
+## @package lookAt
+#  Vectorized look-at rotations.
+#
+#  Maya-free version of the gfUtilAimConstraint node math, aiming any number of objects at once.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import lookAt
+    * quats = lookAt.rotation(positions, targets)
+    * quats = lookAt.rotation(positions, targets, lookAt.kObjectUp, worldUpPosition=upPositions)
+    * angles = lookAt.constraintRotation(positions, targets, parentInverses, lookAt.kWorldUp, order=rotateOrders)
+
+Requirements:
+    * NumPy.
+
+Description:
+    The x axis aims from the position to the target and, unless the up type is kNone, the y axis is
+    turned around the aim to the up vector projected in the plane perpendicular to the aim. The up types
+    are the upVectorType enum of the gfUtilAimConstraint node:
+        * kNone: Only the shortest arc from the x axis to the aim.
+        * kWorldUp: The up is the worldUpVector.
+        * kObjectUp: The up is the direction from the position to the worldUpPosition.
+        * kAngleUp: The up is the world y axis rotated by angleUp around the aim.
+    constraintRotation() gives the rotate values of the aiming objects, the output of the
+    gfUtilAimConstraint nodes: the offset is removed before the aim, the rotation is taken to the parent
+    space, the joint orient is removed and the euler angles are scaled by the weight.
+    Every argument is broadcast, so positions, targets, up types and up vectors can be (N, ...) arrays
+    or single values shared by all the objects.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
+
+kNone = 0
+kWorldUp = 1
+kObjectUp = 2
+kAngleUp = 3
+
+kAimAxis = (1.0, 0.0, 0.0)
+kUpAxis = (0.0, 1.0, 0.0)
+
+
+def rotation(position, target, upType=kNone, worldUpVector=kUpAxis, worldUpPosition=(0.0, 0.0, 0.0), angleUp=0.0):
+    """Find the rotations that aim the x axis from positions to targets.
+
+    Args:
+        position (array_like): The positions of the aiming objects with shape (..., 3).
+        target (array_like): The positions of the targets with shape (..., 3).
+        upType (int, array_like): kNone, kWorldUp, kObjectUp or kAngleUp.
+        worldUpVector (array_like): The up vectors of kWorldUp with shape (..., 3).
+        worldUpPosition (array_like): The positions of the up objects of kObjectUp with shape (..., 3).
+        angleUp (float, array_like): The angles of kAngleUp in radians.
+
+    Returns:
+        numpy.ndarray: The (..., 4) unit quaternions. Up vectors parallel to the aim don't turn the y axis.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    upType = np.asarray(upType)
+    nAim = quaternion.normalizeVector(np.asarray(target, dtype=np.float64) - position)
+    qAim = quaternion.fromTwoVectors(kAimAxis, nAim)
+    if not np.any(upType != kNone):
+        return qAim
+
+    vUp = np.where((upType == kWorldUp)[..., np.newaxis], worldUpVector,
+                   np.asarray(worldUpPosition, dtype=np.float64) - position)
+    angleUpVector = quaternion.rotateVector(kUpAxis, quaternion.fromAxisAngle(nAim, angleUp))
+    vUp = np.where((upType == kAngleUp)[..., np.newaxis], angleUpVector, vUp)
+    vNormal = vUp - np.sum(vUp * nAim, axis=-1, keepdims=True) * nAim
+    valid = np.sum(vNormal * vNormal, axis=-1) > quaternion.kEpsilon
+    nNormal = quaternion.normalizeVector(vNormal)
+
+    # Signed angle around the aim from the y axis of the aim rotation to the up normal.
+    nUp = quaternion.rotateVector(kUpAxis, qAim)
+    angle = np.arctan2(np.sum(np.cross(nUp, nNormal) * nAim, axis=-1), np.sum(nUp * nNormal, axis=-1))
+    angle = np.where(valid & (upType != kNone), angle, 0.0)
+    return quaternion.multiply(qAim, quaternion.fromAxisAngle(nAim, angle))
+
+
+def constraintRotation(position, target, parentInverse, upType=kNone, worldUpVector=kUpAxis,
+                       worldUpPosition=(0.0, 0.0, 0.0), angleUp=0.0, offset=(0.0, 0.0, 0.0),
+                       jointOrient=(0.0, 0.0, 0.0), order=euler.kXYZ, weight=1.0):
+    """Find the rotate values that aim objects at targets.
+
+    Args:
+        position (array_like): The positions of the aiming objects with shape (..., 3).
+        target (array_like): The positions of the targets with shape (..., 3).
+        parentInverse (array_like): The parent inverse matrices of the aiming objects with shape (..., 4, 4).
+        upType (int, array_like): kNone, kWorldUp, kObjectUp or kAngleUp.
+        worldUpVector (array_like): The up vectors of kWorldUp with shape (..., 3).
+        worldUpPosition (array_like): The positions of the up objects of kObjectUp with shape (..., 3).
+        angleUp (float, array_like): The angles of kAngleUp in radians.
+        offset (array_like): The xyz offset rotations in radians with shape (..., 3).
+        jointOrient (array_like): The xyz joint orients in radians with shape (..., 3).
+        order (int, array_like): The rotation orders of the aiming objects.
+        weight (float, array_like): The weights of the targets.
+
+    Returns:
+        numpy.ndarray: The (..., 3) euler rotations in radians.
+    """
+    qAim = rotation(position, target, upType, worldUpVector, worldUpPosition, angleUp)
+    qParentInverse = transform.decompose(parentInverse)[1]
+    qOffset = euler.toQuaternion(offset, euler.kXYZ, dtype=np.float64)
+    qJointOrient = euler.toQuaternion(jointOrient, euler.kXYZ, dtype=np.float64)
+    qResult = quaternion.multiply(quaternion.conjugate(qOffset), qAim)
+    qResult = quaternion.multiply(quaternion.multiply(qResult, qParentInverse), quaternion.conjugate(qJointOrient))
+    return euler.fromQuaternion(qResult, order) * np.asarray(weight, dtype=np.float64)[..., np.newaxis]
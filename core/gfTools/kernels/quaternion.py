@@ -0,0 +1,377 @@
+## @package quaternion
+#  Vectorized quaternion math following the Maya API conventions.
+#
+#  Every function works over arrays of any leading shape.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import quaternion
+
+Requirements:
+    * NumPy.
+
+Description:
+    Quaternions are stored as (..., 4) arrays in (x, y, z, w) order, the same layout of om2.MQuaternion.
+    The product follows the Maya convention: multiply(a, b) is the rotation a followed by the rotation b,
+    so asMatrix(multiply(a, b)) == asMatrix(a) * asMatrix(b) using row vectors.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+
+kEpsilon = 1.0e-10
+
+
+def identity(shape=()):
+    """Return an array of identity quaternions.
+
+    Args:
+        shape (tuple): The leading shape of the output array.
+
+    Returns:
+        numpy.ndarray: Identity quaternions with shape (shape + (4,)).
+    """
+    if isinstance(shape, int):
+        shape = (shape,)
+    quat = np.zeros(tuple(shape) + (4,))
+    quat[..., 3] = 1.0
+    return quat
+
+
+def normalize(quat):
+    """Return the unit length version of the quaternions.
+
+    Args:
+        quat (array_like): Quaternions with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: Unit quaternions. Zero quaternions become identities.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    length = np.sqrt(np.sum(quat * quat, axis=-1, keepdims=True))
+    safe = np.where(length > kEpsilon, length, 1.0)
+    result = quat / safe
+    result[..., 3] = np.where(length[..., 0] > kEpsilon, result[..., 3], 1.0)
+    return result
+
+
+def conjugate(quat):
+    """Return the conjugate of the quaternions.
+
+    Args:
+        quat (array_like): Quaternions with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: The conjugated quaternions.
+    """
+    result = np.array(quat, dtype=np.float64)
+    result[..., :3] *= -1.0
+    return result
+
+
+def inverse(quat):
+    """Return the inverse of the quaternions, same as om2.MQuaternion.inverse().
+
+    Args:
+        quat (array_like): Quaternions with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: The inverted quaternions.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    lengthSquared = np.sum(quat * quat, axis=-1, keepdims=True)
+    return conjugate(quat) / np.where(lengthSquared > kEpsilon, lengthSquared, 1.0)
+
+
+def multiply(quatA, quatB):
+    """Multiply two arrays of quaternions, same as quatA * quatB in om2.
+
+    Args:
+        quatA (array_like): The first rotations with shape (..., 4).
+        quatB (array_like): The rotations applied after quatA with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: The resulting quaternions.
+    """
+    quatA = np.asarray(quatA, dtype=np.float64)
+    quatB = np.asarray(quatB, dtype=np.float64)
+    ax, ay, az, aw = quatA[..., 0], quatA[..., 1], quatA[..., 2], quatA[..., 3]
+    bx, by, bz, bw = quatB[..., 0], quatB[..., 1], quatB[..., 2], quatB[..., 3]
+    return np.stack([
+        bw * ax + aw * bx + by * az - bz * ay,
+        bw * ay + aw * by + bz * ax - bx * az,
+        bw * az + aw * bz + bx * ay - by * ax,
+        bw * aw - bx * ax - by * ay - bz * az
+    ], axis=-1)
+
+
+def slerp(quatA, quatB, blend, spin=0):
+    """Spherical interpolation along the shortest path, same as om2.MQuaternion.slerp(quatA, quatB, blend, spin).
+
+    Args:
+        quatA (array_like): The start unit quaternions with shape (..., 4).
+        quatB (array_like): The end unit quaternions with shape (..., 4).
+        blend (array_like): The interpolation parameters with shape (...), 0.0 returns quatA.
+        spin (array_like): The number of extra half turns with shape (...).
+
+    Returns:
+        numpy.ndarray: The interpolated quaternions.
+    """
+    start = np.asarray(quatA, dtype=np.float64)
+    end = np.asarray(quatB, dtype=np.float64)
+    blend = np.asarray(blend, dtype=np.float64)[..., np.newaxis]
+    cosTheta = np.sum(start * end, axis=-1, keepdims=True)
+    end = np.where(cosTheta < 0.0, -end, end)
+    cosTheta = np.abs(cosTheta)
+    # Nearly equal quaternions fall back to a normalized linear interpolation.
+    linear = cosTheta > 1.0 - kEpsilon
+    theta = np.arccos(np.minimum(cosTheta, 1.0))
+    phi = theta + np.asarray(spin, dtype=np.float64)[..., np.newaxis] * np.pi
+    sinTheta = np.where(linear, 1.0, np.sin(theta))
+    startWeight = np.sin(theta - blend * phi) / sinTheta
+    endWeight = np.sin(blend * phi) / sinTheta
+    result = start * startWeight + end * endWeight
+    if np.any(linear):
+        result = np.where(linear, normalize(start + (end - start) * blend), result)
+    return result
+
+
+def average(quat, weights, iterations=3):
+    """Weighted average of quaternions.
+
+    The eigenvector of the largest eigenvalue of sum(w * q * qT) is refined by a few iterations of the
+    geodesic mean, so the average of two quaternions is the same as slerp().
+
+    Args:
+        quat (array_like): Unit quaternions with shape (..., K, 4). q and -q are the same rotation.
+        weights (array_like): The non negative weights with shape (..., K). They don't need to be normalized.
+        iterations (int): The number of geodesic mean iterations.
+
+    Returns:
+        numpy.ndarray: The average unit quaternions with shape (..., 4), in the hemisphere of the heaviest
+            quaternion. Zero total weights return identities.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), quat.shape[:-1])
+    total = np.sum(weights, axis=-1)
+    weights = weights / np.where(total > kEpsilon, total, 1.0)[..., np.newaxis]
+    matrix = np.einsum("...k,...ki,...kj->...ij", weights, quat, quat)
+    result = np.linalg.eigh(matrix)[1][..., :, -1]
+    for _ in range(iterations):
+        # Mean of the rotations from the current average to every quaternion, as rotation vectors.
+        relative = multiply(quat, conjugate(result)[..., np.newaxis, :])
+        relative = np.where(relative[..., 3:] < 0.0, -relative, relative)
+        sinHalf = np.sqrt(np.sum(relative[..., :3] ** 2, axis=-1))
+        angle = 2.0 * np.arctan2(sinHalf, relative[..., 3])
+        rotVector = relative[..., :3] * (angle / np.where(sinHalf > kEpsilon, sinHalf, 1.0))[..., np.newaxis]
+        step = np.sum(rotVector * weights[..., np.newaxis], axis=-2)
+        result = normalize(multiply(fromAxisAngle(step, np.sqrt(np.sum(step * step, axis=-1))), result))
+    heaviest = np.arange(quat.shape[-2]) == np.argmax(weights, axis=-1)[..., np.newaxis]
+    heaviest = np.sum(quat * heaviest[..., np.newaxis], axis=-2)
+    result = np.where(np.sum(result * heaviest, axis=-1, keepdims=True) < 0.0, -result, result)
+    return np.where(total[..., np.newaxis] > kEpsilon, result, identity(result.shape[:-1]))
+
+
+def fromAxisAngle(axis, angle):
+    """Build quaternions from a rotation axis and an angle, same as om2.MQuaternion(angle, axis).
+
+    Args:
+        axis (array_like): The rotation axes with shape (..., 3). They don't need to be normalized.
+        angle (array_like): The rotation angles in radians with shape (...).
+
+    Returns:
+        numpy.ndarray: The resulting quaternions.
+    """
+    axis = normalizeVector(axis)
+    halfAngle = np.asarray(angle, dtype=np.float64) * 0.5
+    sinHalf = np.sin(halfAngle)[..., np.newaxis]
+    cosHalf = np.cos(halfAngle)[..., np.newaxis]
+    axis, sinHalf, cosHalf = np.broadcast_arrays(axis, sinHalf, cosHalf)
+    return np.concatenate([axis * sinHalf, cosHalf[..., :1]], axis=-1)
+
+
+def fromTwoVectors(vectorA, vectorB):
+    """Build the shortest arc rotation from vectorA to vectorB, same as om2.MQuaternion(vectorA, vectorB).
+
+    Args:
+        vectorA (array_like): The source directions with shape (..., 3).
+        vectorB (array_like): The target directions with shape (..., 3).
+
+    Returns:
+        numpy.ndarray: The resulting quaternions.
+    """
+    nA = normalizeVector(vectorA)
+    nB = normalizeVector(vectorB)
+    nA, nB = np.broadcast_arrays(nA, nB)
+    cross = np.cross(nA, nB)
+    dot = np.sum(nA * nB, axis=-1, keepdims=True)
+    quat = np.concatenate([cross, 1.0 + dot], axis=-1)
+    # Opposite vectors have no unique arc, so rotate 180 degrees around any perpendicular axis.
+    opposite = (1.0 + dot[..., 0]) < 1.0e-8
+    if np.any(opposite):
+        fallback = np.cross(nA, [1.0, 0.0, 0.0])
+        parallel = np.sum(fallback * fallback, axis=-1) < 1.0e-8
+        fallback[parallel] = np.cross(nA[parallel], [0.0, 1.0, 0.0])
+        quat[opposite, :3] = fallback[opposite]
+        quat[opposite, 3] = 0.0
+    return normalize(quat)
+
+
+def rotateVector(vector, quat):
+    """Rotate vectors by quaternions, same as om2.MVector.rotateBy(quat).
+
+    Args:
+        vector (array_like): The vectors with shape (..., 3).
+        quat (array_like): Unit quaternions with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: The rotated vectors.
+    """
+    vector = np.asarray(vector, dtype=np.float64)
+    quat = np.asarray(quat, dtype=np.float64)
+    imaginary = quat[..., :3]
+    temp = 2.0 * np.cross(imaginary, vector)
+    return vector + quat[..., 3:] * temp + np.cross(imaginary, temp)
+
+
+def swingTwist(quat, axis):
+    """Split rotations in a twist around an axis followed by a swing that moves the axis.
+
+    Args:
+        quat (array_like): Unit quaternions with shape (..., 4).
+        axis (array_like): The twist axes with shape (..., 3), in the space before the rotation.
+            They don't need to be normalized.
+
+    Returns:
+        tuple: The swing and twist quaternions, multiply(twist, swing) == quat. The swing is the shortest
+            arc from the axis to the rotated axis. Rotations that flip the axis have no twist.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    axis = normalizeVector(axis)
+    projection = np.sum(quat[..., :3] * axis, axis=-1, keepdims=True) * axis
+    real = np.broadcast_to(quat[..., 3:], projection.shape[:-1] + (1,))
+    twist = normalize(np.concatenate([projection, real], axis=-1))
+    return multiply(conjugate(twist), quat), twist
+
+
+def twistAngle(quat, axis):
+    """Return the angle of the twist part of rotations, see swingTwist().
+
+    Args:
+        quat (array_like): Unit quaternions with shape (..., 4).
+        axis (array_like): The twist axes with shape (..., 3). They don't need to be normalized.
+
+    Returns:
+        numpy.ndarray: The (...) angles in radians, in the [-pi, pi) range.
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    angle = 2.0 * np.arctan2(np.sum(quat[..., :3] * normalizeVector(axis), axis=-1), quat[..., 3])
+    return np.mod(angle + np.pi, 2.0 * np.pi) - np.pi
+
+
+def extractTwist(quat, axis, upVector=None, useUpVector=True, reference=(0.0, 1.0, 0.0)):
+    """Return the twist angles of rotations around an axis, optionally measured from an up vector.
+
+    Args:
+        quat (array_like): Unit quaternions with shape (..., 4).
+        axis (array_like): The twist axes with shape (..., 3). They don't need to be normalized.
+        upVector (array_like): The up vectors with shape (..., 3). None returns twistAngle().
+        useUpVector (bool, array_like): Where the up vector is used.
+        reference (array_like): The direction perpendicular to the axis that has no twist, with shape (..., 3).
+
+    Returns:
+        numpy.ndarray: The (...) angles in radians, in the [-pi, pi) range. With the up vector, the twist is
+            measured from the up vector brought back by the swing, so an up vector that follows the swing of
+            the axis gives no twist.
+    """
+    qSwing, qTwist = swingTwist(quat, axis)
+    twist = twistAngle(qTwist, axis)
+    if upVector is None:
+        return twist
+    # The up vector in the space of the rotation without twist, its angle around the axis is its twist.
+    nAxis = normalizeVector(axis)
+    vUp = rotateVector(upVector, conjugate(qSwing))
+    upTwist = np.arctan2(np.sum(np.cross(reference, vUp) * nAxis, axis=-1), np.sum(np.asarray(reference) * vUp, axis=-1))
+    return np.where(useUpVector, np.mod(twist - upTwist + np.pi, 2.0 * np.pi) - np.pi, twist)
+
+
+def asMatrix(quat):
+    """Return the rotation matrices of the quaternions, using the Maya row vector layout.
+
+    Args:
+        quat (array_like): Unit quaternions with shape (..., 4).
+
+    Returns:
+        numpy.ndarray: The rotation matrices with shape (..., 3, 3).
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    x, y, z, w = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    return np.stack([
+        np.stack([1.0 - 2.0 * (yy + zz), 2.0 * (xy + wz), 2.0 * (xz - wy)], axis=-1),
+        np.stack([2.0 * (xy - wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz + wx)], axis=-1),
+        np.stack([2.0 * (xz + wy), 2.0 * (yz - wx), 1.0 - 2.0 * (xx + yy)], axis=-1)
+    ], axis=-2)
+
+
+def fromMatrix(matrix):
+    """Build quaternions from rotation matrices in the Maya row vector layout.
+
+    Args:
+        matrix (array_like): Orthonormal matrices with shape (..., 3, 3) or (..., 4, 4).
+
+    Returns:
+        numpy.ndarray: The unit quaternions with shape (..., 4).
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)[..., :3, :3]
+    m00, m01, m02 = matrix[..., 0, 0], matrix[..., 0, 1], matrix[..., 0, 2]
+    m10, m11, m12 = matrix[..., 1, 0], matrix[..., 1, 1], matrix[..., 1, 2]
+    m20, m21, m22 = matrix[..., 2, 0], matrix[..., 2, 1], matrix[..., 2, 2]
+    # Pick the largest component to divide by, to keep the conversion stable.
+    case = np.argmax(np.stack([m00 + m11 + m22, m00, m11, m22], axis=-1), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sW = np.sqrt(np.maximum(1.0 + m00 + m11 + m22, 0.0)) * 2.0
+        sX = np.sqrt(np.maximum(1.0 + m00 - m11 - m22, 0.0)) * 2.0
+        sY = np.sqrt(np.maximum(1.0 - m00 + m11 - m22, 0.0)) * 2.0
+        sZ = np.sqrt(np.maximum(1.0 - m00 - m11 + m22, 0.0)) * 2.0
+        candidates = np.stack([
+            np.stack([(m12 - m21) / sW, (m20 - m02) / sW, (m01 - m10) / sW, 0.25 * sW], axis=-1),
+            np.stack([0.25 * sX, (m01 + m10) / sX, (m02 + m20) / sX, (m12 - m21) / sX], axis=-1),
+            np.stack([(m01 + m10) / sY, 0.25 * sY, (m12 + m21) / sY, (m20 - m02) / sY], axis=-1),
+            np.stack([(m02 + m20) / sZ, (m12 + m21) / sZ, 0.25 * sZ, (m01 - m10) / sZ], axis=-1)
+        ], axis=-2)
+    flat = candidates.reshape(-1, 4, 4)
+    quat = flat[np.arange(len(flat)), case.ravel()].reshape(case.shape + (4,))
+    return normalize(quat)
+
+
+def normalizeVector(vector):
+    """Return the unit length version of the vectors, same as om2.MVector.normal().
+
+    Args:
+        vector (array_like): The vectors with shape (..., 3).
+
+    Returns:
+        numpy.ndarray: The normalized vectors. Zero vectors are returned unchanged.
+    """
+    vector = np.asarray(vector, dtype=np.float64)
+    length = np.sqrt(np.sum(vector * vector, axis=-1, keepdims=True))
+    return vector / np.where(length > kEpsilon, length, 1.0)
@@ -0,0 +1,138 @@
+## @package ramp
+#  Vectorized evaluation of Maya curve ramps.
+#
+#  Evaluates one ramp at any number of positions.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import ramp
+    * weights = ramp.evaluate([(0.0, 0.0, ramp.kSmooth), (1.0, 1.0, ramp.kSmooth)], positions)
+    * table = ramp.lookupTable(entries)
+      weights = ramp.evaluateTable(table, positions)
+
+Requirements:
+    * NumPy.
+
+Description:
+    A ramp is a list of (position, value, interpolation) entries, the data of a curve
+    om2.MRampAttribute. The interpolations use the om2.MRampAttribute enum: kNone holds the value of
+    the entry, kLinear, kSmooth (smoothstep) and kSpline (Catmull-Rom) blend towards the next entry.
+    Positions before the first entry or after the last one get the value of that entry.
+    A lookup table samples a ramp once over a range, so a ramp that doesn't change can be evaluated many
+    times with a linear interpolation of the samples. The entry positions are sampled exactly and the
+    kNone steps keep their jumps, so linear and stepped ramps have no error. Smooth and spline spans
+    have an error below 1e-5 with the default kTableSize.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+
+kNone = 0
+kLinear = 1
+kSmooth = 2
+kSpline = 3
+
+kTableSize = 1024
+
+
+def evaluate(entries, position):
+    """Evaluate a ramp, same as om2.MRampAttribute.getValueAtPosition().
+
+    Args:
+        entries (list): The (position, value, interpolation) entries of the ramp, in any order.
+        position (array_like): The positions to evaluate.
+
+    Returns:
+        numpy.ndarray: The ramp values with the shape of position. An empty ramp returns zeros.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    if not entries:
+        return np.zeros(position.shape)
+    points = sorted((float(entry[0]), float(entry[1]), int(entry[2])) for entry in entries)
+    keys = np.array([point[0] for point in points])
+    values = np.array([point[1] for point in points])
+    interps = np.array([point[2] for point in points])
+    if len(points) == 1:
+        return np.full(position.shape, values[0])
+
+    index = np.clip(np.searchsorted(keys, position, side="left"), 1, len(points) - 1)
+    startKey = keys[index - 1]
+    startValue = values[index - 1]
+    endValue = values[index]
+    span = keys[index] - startKey
+    with np.errstate(divide="ignore", invalid="ignore"):
+        blend = np.where(span > 0.0, (position - startKey) / span, 0.0)
+    interp = interps[index - 1]
+
+    smooth = blend * blend * (3.0 - 2.0 * blend)
+    linearBlend = np.where(interp == kSmooth, smooth, blend)
+    result = startValue + (endValue - startValue) * linearBlend
+
+    # Catmull-Rom tangents, the missing neighbours at the ends repeat the span values.
+    spline = interp == kSpline
+    if np.any(spline):
+        before = np.where(index > 1, values[np.maximum(index - 2, 0)], startValue)
+        after = np.where(index + 1 < len(points), values[np.minimum(index + 1, len(points) - 1)], endValue)
+        tangentStart = 0.5 * (endValue - before)
+        tangentEnd = 0.5 * (after - startValue)
+        blendSquared = blend * blend
+        blendCubed = blendSquared * blend
+        splineValue = ((2.0 * blendCubed - 3.0 * blendSquared + 1.0) * startValue +
+                       (blendCubed - 2.0 * blendSquared + blend) * tangentStart +
+                       (-2.0 * blendCubed + 3.0 * blendSquared) * endValue +
+                       (blendCubed - blendSquared) * tangentEnd)
+        result = np.where(spline, splineValue, result)
+    result = np.where(interp == kNone, startValue, result)
+
+    result = np.where(position <= keys[0], values[0], result)
+    return np.where(position >= keys[-1], values[-1], result)
+
+
+def lookupTable(entries, size=kTableSize, start=0.0, end=1.0):
+    """Sample a ramp for evaluateTable().
+
+    Args:
+        entries (list): The (position, value, interpolation) entries of the ramp, in any order.
+        size (int): The number of evenly spaced samples between start and end.
+        start (float): The first position of the table.
+        end (float): The last position of the table.
+
+    Returns:
+        tuple: The sorted (positions, values) arrays of the samples.
+    """
+    positions = np.linspace(start, end, size)
+    keys = np.array([float(entry[0]) for entry in entries])
+    keys = keys[(keys > start) & (keys < end)]
+    # The samples around the entries keep the steps of kNone spans.
+    positions = np.union1d(positions, np.concatenate([np.nextafter(keys, -np.inf), keys, np.nextafter(keys, np.inf)]))
+    return positions, evaluate(entries, positions)
+
+
+def evaluateTable(table, position):
+    """Evaluate a ramp sampled by lookupTable().
+
+    Args:
+        table (tuple): The (positions, values) arrays of lookupTable().
+        position (array_like): The positions to evaluate. Positions outside the table get the value of
+            the nearest end.
+
+    Returns:
+        numpy.ndarray: The ramp values with the shape of position.
+    """
+    return np.interp(position, table[0], table[1])
@@ -0,0 +1,131 @@
+## @package rbf
+#  Vectorized radial basis function interpolation of poses.
+#
+#  Solves the RBF weight matrix of a set of pose directions and evaluates it for any number of poses.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import rbf
+    * solveMatrix = rbf.solve(targetDirections, rbf.kGaussian, radius=math.radians(60.0))
+    * weights = rbf.evaluate(solveMatrix, targetDirections, sourceDirection, rbf.kGaussian, math.radians(60.0))
+
+Requirements:
+    * NumPy.
+
+Description:
+    A pose is a direction, like the vector from a shoulder to the wrist in the space of the clavicle.
+    The distance between two poses is the angle between their directions, in radians.
+    solve() builds the (N, N) kernel matrix of the distances between the N target poses, adds the
+    regularization to its diagonal and inverts it. The inverse maps the kernel values of a pose to the
+    weights of the targets, where every target pose gives 1.0 to itself and 0.0 to the others. It only
+    depends on the targets and the kernel settings, so it can be kept until they change, and evaluate()
+    is one distance vector and one matrix product per pose.
+    The kernels use the distance divided by the radius (r):
+        * kGaussian: exp(-r * r).
+        * kInverseMultiquadric: 1 / sqrt(1 + r * r).
+        * kLinear: r.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import quaternion
+
+
+kGaussian = 0
+kInverseMultiquadric = 1
+kLinear = 2
+
+
+def distance(directionsA, directionsB):
+    """Return the angles between two sets of directions.
+
+    Args:
+        directionsA (array_like): The directions with shape (..., N, 3). They don't need to be normalized.
+        directionsB (array_like): The directions with shape (..., M, 3).
+
+    Returns:
+        numpy.ndarray: The (..., N, M) angles in radians.
+    """
+    nA = quaternion.normalizeVector(directionsA)
+    nB = quaternion.normalizeVector(directionsB)
+    return np.arccos(np.clip(np.einsum("...ni,...mi->...nm", nA, nB), -1.0, 1.0))
+
+
+def kernel(distances, function=kGaussian, radius=1.0):
+    """Evaluate a radial basis function.
+
+    Args:
+        distances (array_like): The distances, in radians.
+        function (int): kGaussian, kInverseMultiquadric or kLinear.
+        radius (float): The radius of the function, in radians.
+
+    Returns:
+        numpy.ndarray: The kernel values with the shape of distances.
+
+    Raises:
+        ValueError: If the function is unknown.
+    """
+    ratio = np.asarray(distances, dtype=np.float64) / max(float(radius), quaternion.kEpsilon)
+    if function == kGaussian:
+        return np.exp(-ratio * ratio)
+    if function == kInverseMultiquadric:
+        return 1.0 / np.sqrt(1.0 + ratio * ratio)
+    if function == kLinear:
+        return ratio
+    raise ValueError("[gfTools] Unknown RBF kernel: %s" % function)
+
+
+def solve(targets, function=kGaussian, radius=1.0, regularization=0.0):
+    """Solve the weight matrix of the target poses.
+
+    Args:
+        targets (array_like): The (N, 3) directions of the target poses.
+        function (int): kGaussian, kInverseMultiquadric or kLinear.
+        radius (float): The radius of the function, in radians.
+        regularization (float): Added to the diagonal of the kernel matrix. Higher values smooth the
+            interpolation, the targets no longer get exactly 1.0.
+
+    Returns:
+        numpy.ndarray: The (N, N) weight matrix. Singular kernel matrices, like duplicated targets, use
+            the pseudo inverse.
+    """
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+    matrix = kernel(distance(targets, targets), function, radius) + regularization * np.identity(len(targets))
+    try:
+        return np.linalg.solve(matrix, np.identity(len(targets)))
+    except np.linalg.LinAlgError:
+        return np.linalg.pinv(matrix)
+
+
+def evaluate(solveMatrix, targets, poses, function=kGaussian, radius=1.0):
+    """Interpolate the target weights of poses.
+
+    Args:
+        solveMatrix (array_like): The (N, N) weight matrix of solve().
+        targets (array_like): The (N, 3) directions of the target poses, the same given to solve().
+        poses (array_like): The directions of the poses with shape (..., 3).
+        function (int): The kernel given to solve().
+        radius (float): The radius given to solve().
+
+    Returns:
+        numpy.ndarray: The (..., N) weights of the targets. They aren't clamped.
+    """
+    poses = np.asarray(poses, dtype=np.float64)
+    values = kernel(distance(poses[..., np.newaxis, :], targets)[..., 0, :], function, radius)
+    return np.dot(values, solveMatrix)
@@ -0,0 +1,216 @@
+## @package transform
+#  Vectorized matrix decomposition and composition following om2.MTransformationMatrix.
+#
+#  Every function works over arrays of any leading shape.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import transform
+    * translation, quat, scale, shear = transform.decompose(worldMatrices)
+    * translation, angles, scale, shear = transform.decompose(worldMatrices, euler.kZXY)
+    * matrices = transform.compose(translation, angles, scale, order=euler.kZXY)
+    * inverse = transform.rigidInverse(matrices)
+    * matrix = transform.blend(targetMatrices, weights)
+    * translation, angles, scale = transform.localValues(matrix, parentInverse, parentScale, jointOrient, order)
+
+Requirements:
+    * NumPy.
+
+Description:
+    Matrices are (..., 4, 4) arrays in the Maya row vector layout (translation in the last row). They are
+    composed as scale * shear * rotation * translation, the MTransformationMatrix.asMatrix() layout, where
+    the shear (xy, xz, yz) is the lower triangular matrix [[1, 0, 0], [xy, 1, 0], [xz, yz, 1]].
+    decompose() splits the rows with Gram-Schmidt like MTransformationMatrix(matrix): the x row gives the
+    x scale and axis, the y and z rows are sheared against the previous axes. Matrices with a negative
+    determinant get all the scales negated. Rotations are quaternions in (x, y, z, w) order or, when a
+    rotation order is given, euler angles in radians using the gfTools.kernels.euler orders
+    (om2.MEulerRotation enum).
+    blend() mixes K matrices without the shear of a weighted matrix sum: translations and scales are
+    blended linearly and rotations with quaternion.average().
+    localValues() finds the translate, rotate and scale values that put a joint or transform at a world
+    matrix, the outputs of the gfUtilParentConstraint nodes. The joint orient is removed from the rotation.
+    rigidInverse() is the cheap inverse of matrices with only rotation and translation: the transposed
+    rotation and the rotated negative translation.
+    gfTools.testing.accuracy checks compose() and decompose() round trips of sheared and mirrored
+    matrices against the om2 stand-in and plain Python references.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+
+
+def _unitRows(rows, fallback):
+    """Return the lengths and the normalized rows, using the fallback rows for zero lengths."""
+    length = np.sqrt(np.sum(rows * rows, axis=-1))
+    valid = length > 0.0
+    unit = rows / np.where(valid, length, 1.0)[..., np.newaxis]
+    return length, np.where(valid[..., np.newaxis], unit, fallback)
+
+
+def decompose(matrix, order=None):
+    """Decompose matrices in translation, rotation, scale and shear, same as om2.MTransformationMatrix(matrix).
+
+    Args:
+        matrix (array_like): The matrices with shape (..., 4, 4).
+        order (int, array_like): The rotation orders of the euler rotations. None returns quaternions.
+
+    Returns:
+        tuple: The translations (..., 3), the rotations ((..., 4) quaternions or (..., 3) euler angles),
+            the scales (..., 3) and the shears (..., 3).
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    translation = np.array(matrix[..., 3, :3])
+    rowX = matrix[..., 0, :3]
+    rowY = matrix[..., 1, :3]
+    rowZ = matrix[..., 2, :3]
+
+    scaleX, axisX = _unitRows(rowX, [1.0, 0.0, 0.0])
+    shearXY = np.sum(rowY * axisX, axis=-1)
+    scaleY, axisY = _unitRows(rowY - shearXY[..., np.newaxis] * axisX, [0.0, 1.0, 0.0])
+    shearXZ = np.sum(rowZ * axisX, axis=-1)
+    shearYZ = np.sum(rowZ * axisY, axis=-1)
+    residual = rowZ - shearXZ[..., np.newaxis] * axisX - shearYZ[..., np.newaxis] * axisY
+    scaleZ, axisZ = _unitRows(residual, np.cross(axisX, axisY))
+
+    scale = np.stack([scaleX, scaleY, scaleZ], axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shear = np.stack([np.where(scaleY > 0.0, shearXY / scaleY, 0.0),
+                          np.where(scaleZ > 0.0, shearXZ / scaleZ, 0.0),
+                          np.where(scaleZ > 0.0, shearYZ / scaleZ, 0.0)], axis=-1)
+    rotation = np.stack([axisX, axisY, axisZ], axis=-2)
+    # Mirrored matrices keep a right handed rotation with negative scales.
+    flip = np.linalg.det(rotation) < 0.0
+    if np.any(flip):
+        sign = np.where(flip, -1.0, 1.0)[..., np.newaxis]
+        scale *= sign
+        rotation *= sign[..., np.newaxis]
+
+    if order is None:
+        rotation = quaternion.fromMatrix(rotation)
+    else:
+        rotation = euler.fromMatrix(rotation, order)
+    return translation, rotation, scale, shear
+
+
+def compose(translation=None, rotation=None, scale=None, shear=None, order=None):
+    """Compose matrices from their components, same as om2.MTransformationMatrix.asMatrix().
+
+    Every component is optional and they are broadcast together.
+
+    Args:
+        translation (array_like): The translations with shape (..., 3).
+        rotation (array_like): Quaternions with shape (..., 4) or euler angles in radians with shape (..., 3)
+            when the order is given.
+        scale (array_like): The scales with shape (..., 3).
+        shear (array_like): The xy, xz and yz shears with shape (..., 3).
+        order (int, array_like): The rotation orders of the euler rotations.
+
+    Returns:
+        numpy.ndarray: The matrices with shape (..., 4, 4).
+    """
+    if rotation is None:
+        basis = np.identity(3)
+    elif order is None:
+        basis = quaternion.asMatrix(quaternion.normalize(rotation))
+    else:
+        basis = euler.toMatrix(rotation, order, dtype=np.float64)
+    if shear is not None:
+        shear = np.asarray(shear, dtype=np.float64)
+        # Rows of shear * rotation: x stays, y adds xy * x, z adds xz * x + yz * y.
+        basis = np.array(np.broadcast_to(basis, np.broadcast(basis, shear[..., np.newaxis]).shape))
+        basis[..., 2, :] += shear[..., 1, np.newaxis] * basis[..., 0, :] + shear[..., 2, np.newaxis] * basis[..., 1, :]
+        basis[..., 1, :] += shear[..., 0, np.newaxis] * basis[..., 0, :]
+    if scale is not None:
+        basis = np.asarray(scale, dtype=np.float64)[..., np.newaxis] * basis
+    if translation is None:
+        translation = np.zeros(3)
+    translation = np.asarray(translation, dtype=np.float64)
+    shape = np.broadcast(basis[..., 0], translation).shape[:-1]
+    matrix = np.zeros(shape + (4, 4))
+    matrix[..., :3, :3] = basis
+    matrix[..., 3, :3] = translation
+    matrix[..., 3, 3] = 1.0
+    return matrix
+
+
+def rigidInverse(matrix):
+    """Invert matrices that only have rotation and translation, faster than numpy.linalg.inv().
+
+    Args:
+        matrix (array_like): Matrices with shape (..., 4, 4), without scale or shear.
+
+    Returns:
+        numpy.ndarray: The inverted matrices.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    rotation = np.swapaxes(matrix[..., :3, :3], -1, -2)
+    result = np.zeros(matrix.shape)
+    result[..., :3, :3] = rotation
+    result[..., 3, :3] = -np.matmul(matrix[..., 3, np.newaxis, :3], rotation)[..., 0, :]
+    result[..., 3, 3] = 1.0
+    return result
+
+
+def blend(matrix, weights, iterations=0):
+    """Blend matrices with weights, linear translations and scales and a weighted quaternion average.
+
+    Args:
+        matrix (array_like): The matrices to blend with shape (..., K, 4, 4). Their shears are ignored.
+        weights (array_like): The weights with shape (..., K). They are normalized and negative weights
+            count as 0.0.
+        iterations (int): The geodesic mean iterations of quaternion.average(). The default 0 keeps only
+            the eigenvector average, which is enough for close rotations and much cheaper.
+
+    Returns:
+        numpy.ndarray: The blended matrices with shape (..., 4, 4), without shear. Zero total weights
+            and empty matrix lists return identities.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape[-3] == 0:
+        return np.array(np.broadcast_to(np.identity(4), matrix.shape[:-3] + (4, 4)))
+    translation, quat, scale, _ = decompose(matrix)
+    weights = np.maximum(np.broadcast_to(np.asarray(weights, dtype=np.float64), translation.shape[:-1]), 0.0)
+    total = np.sum(weights, axis=-1)
+    valid = (total > quaternion.kEpsilon)[..., np.newaxis]
+    normalized = (weights / np.where(valid, total[..., np.newaxis], 1.0))[..., np.newaxis]
+    translation = np.sum(translation * normalized, axis=-2)
+    scale = np.where(valid, np.sum(scale * normalized, axis=-2), 1.0)
+    return compose(translation, quaternion.average(quat, weights, iterations), scale)
+
+
+def localValues(matrix, parentInverse, parentScale=(1.0, 1.0, 1.0), jointOrient=(0.0, 0.0, 0.0), order=euler.kXYZ):
+    """Find the translate, rotate and scale values of objects from their world matrices.
+
+    Args:
+        matrix (array_like): The world matrices with shape (..., 4, 4).
+        parentInverse (array_like): The parent inverse matrices of the objects with shape (..., 4, 4).
+        parentScale (array_like): The scales of the parents with shape (..., 3).
+        jointOrient (array_like): The xyz joint orients in radians with shape (..., 3).
+        order (int, array_like): The rotation orders of the objects.
+
+    Returns:
+        tuple: The translations (..., 3), the euler rotations in radians (..., 3) and the scales (..., 3).
+    """
+    mLocal = np.matmul(np.matmul(matrix, parentInverse), compose(scale=parentScale))
+    translation, quat, scale, _ = decompose(mLocal)
+    qJointOrient = euler.toQuaternion(jointOrient, euler.kXYZ, dtype=np.float64)
+    rotation = euler.fromQuaternion(quaternion.multiply(quat, quaternion.conjugate(qJointOrient)), order)
+    return translation, rotation, scale
@@ -0,0 +1,63 @@
+## @package vectorAngle
+#  Vectorized vector angle pose reader weights.
+#
+#  Maya-free version of the gfRigPSDVectorAngle node math, reading any number of poses at once.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools.kernels import vectorAngle
+    * weights = vectorAngle.coneWeights(basePositions, sourcePositions, targetPositions, envelopes, falloffs)
+
+Requirements:
+    * NumPy.
+
+Description:
+    A pose is the direction from the base position to the source position and every target defines a
+    cone around the direction from the base to the target. The weight of a target is its envelope when
+    the pose points to the target and falls linearly to 0.0 when the angle between them reaches the
+    falloff angle of the target. A zero falloff only gives weight to the exact pose.
+    The weights are the values before the ramp of the node, ramp.evaluate() or ramp.evaluateTable()
+    remaps them.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools.kernels import quaternion
+
+
+def coneWeights(base, source, targets, envelopes, falloffs):
+    """Calculate the weights of the targets of poses.
+
+    Args:
+        base (array_like): The base positions with shape (..., 3).
+        source (array_like): The source positions with shape (..., 3).
+        targets (array_like): The target positions with shape (..., N, 3).
+        envelopes (array_like): The target envelopes with shape (..., N).
+        falloffs (array_like): The target falloff angles in degrees with shape (..., N).
+
+    Returns:
+        numpy.ndarray: The (..., N) weights.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    nCurPose = quaternion.normalizeVector(np.asarray(source, dtype=np.float64) - base)
+    nTargetPose = quaternion.normalizeVector(np.asarray(targets, dtype=np.float64) - base[..., np.newaxis, :])
+    theta = np.arccos(np.clip(np.sum(nTargetPose * nCurPose[..., np.newaxis, :], axis=-1), -1.0, 1.0))
+    falloffs = np.radians(falloffs)
+    ratio = np.where(falloffs > 0.0, theta / np.where(falloffs > 0.0, falloffs, 1.0), np.where(theta > 0.0, 1.0, 0.0))
+    return np.asarray(envelopes, dtype=np.float64) * (1.0 - np.minimum(ratio, 1.0))
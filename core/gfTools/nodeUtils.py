@@ -0,0 +1,78 @@
+## @package nodeUtils
+#  Data block helpers shared by the gfTools node prototypes.
+#
+#  Reads array attributes to numpy arrays and walks plugs, the code every node compute() repeats.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools import nodeUtils
+    * In compute():
+        targets = nodeUtils.readArray(dataBlock.inputArrayValue(Node.inTarget), nodeUtils.matrixPosition, (0.0, 0.0, 0.0))
+        envelopes = nodeUtils.readArray(dataBlock.inputArrayValue(Node.inEnvelope), om2.MDataHandle.asFloat, 1.0)
+    * In setDependentsDirty():
+        if nodeUtils.topAttribute(plugBeingDirtied) == Node.inTargetList:
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    The functions only call methods of the om2 objects they get, so they work with any om2 version and
+    with the gfTools.testing stand-ins.
+    readArray() visits the elements of an array data handle by physical index, so sparse arrays are
+    read in one pass without creating the missing elements, and returns them indexed by logical index.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+
+def readArray(arrayHandle, getter, default, dtype=np.float64):
+    """Read all the elements of an array data handle to a numpy array indexed by logical index.
+
+    Args:
+        arrayHandle (om2.MArrayDataHandle): The array handle.
+        getter (callable): Returns the value of an element from its input om2.MDataHandle.
+        default (float, tuple): The value of the missing logical indices, it also sets the item shape.
+        dtype (numpy.dtype): The type of the array.
+
+    Returns:
+        numpy.ndarray: The (max logical index + 1, ...) values.
+    """
+    values = {}
+    for i in range(len(arrayHandle)):
+        arrayHandle.jumpToPhysicalElement(i)
+        values[arrayHandle.elementLogicalIndex()] = getter(arrayHandle.inputValue())
+    result = np.empty((max(values) + 1 if values else 0,) + np.shape(default), dtype=dtype)
+    result[...] = default
+    if values:
+        result[list(values.keys())] = list(values.values())
+    return result
+
+
+def matrixPosition(dataHandle):
+    """Return the translation of a float matrix data handle as a (3,) numpy array."""
+    mtx = dataHandle.asFloatMatrix()
+    return np.array([mtx[12], mtx[13], mtx[14]])
+
+
+def topAttribute(plug):
+    """Return the attribute of the top level plug of an element or child plug."""
+    while plug.isChild or plug.isElement:
+        plug = plug.parent() if plug.isChild else plug.array()
+    return plug.attribute()
@@ -0,0 +1,282 @@
+## @package profiling
+#  Opt-in compute() profiling of the gfTools node prototypes.
+#
+#  Counts the compute calls and their wall time per node type, node instance and requested plug.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * Decorate the node class:
+        @profiling.profiled
+        class SpaceConstraint(om2.MPxNode):
+    * Profile a scene:
+        from gfTools import profiling
+        profiling.enable()
+        (play the scene)
+        profiling.dump("C:/temp/gfProfile.json")   (or .csv)
+        profiling.disable()
+    * Set the GFTOOLS_PROFILE environment variable to 1 to enable it when Maya starts.
+
+Requirements:
+    * None.
+
+Description:
+    The profiled decorator only registers the node class, the class is returned untouched. While the
+    profiling is disabled the nodes run their original compute(), so it costs nothing. enable() swaps
+    the compute() of every registered class with a timed version and disable() puts the original back.
+    Every call is recorded by node type (class name), node instance (node name) and requested plug
+    (attribute long name, without the element indices). The calls that return kUnknownParameter are
+    counted apart as "unknown".
+    Times are wall clock seconds measured around compute().
+
+This code supports Pylint. Rc file in project.
+"""
+import os
+import re
+import sys
+import csv
+import json
+import timeit
+import threading
+from collections import OrderedDict
+
+
+_kLock = threading.Lock()
+_kClasses = OrderedDict()
+_kStats = {}
+_kState = {"enabled": False}
+_kTimer = timeit.default_timer
+_kIndices = re.compile(r"\[\d+\]")
+
+kCSVHeader = ("type", "node", "plug", "calls", "unknown", "totalTime", "meanTime", "minTime", "maxTime")
+
+
+def profiled(nodeClass):
+    """Class decorator that registers a node class to be profiled.
+
+    Args:
+        nodeClass (class): The MPxNode subclass with a compute() method.
+
+    Returns:
+        class: The same class.
+    """
+    key = "%s.%s" % (nodeClass.__module__, nodeClass.__name__)
+    with _kLock:
+        # Reloaded modules create new classes, the old ones are dropped.
+        oldClass = _kClasses.get(key)
+        if oldClass is not None and oldClass is not nodeClass:
+            _restore(oldClass)
+        _kClasses[key] = nodeClass
+        if _kState["enabled"]:
+            _instrument(nodeClass)
+    return nodeClass
+
+
+def isEnabled():
+    """Check if the profiling is enabled.
+
+    Returns:
+        bool: True if the compute calls are being recorded.
+    """
+    return _kState["enabled"]
+
+
+def enable():
+    """Start recording the compute calls of every registered node class."""
+    with _kLock:
+        _kState["enabled"] = True
+        for nodeClass in _kClasses.values():
+            _instrument(nodeClass)
+
+
+def disable():
+    """Stop recording and restore the original compute methods. The recorded data is kept."""
+    with _kLock:
+        _kState["enabled"] = False
+        for nodeClass in _kClasses.values():
+            _restore(nodeClass)
+
+
+def reset():
+    """Clear the recorded data."""
+    with _kLock:
+        _kStats.clear()
+
+
+def registeredClasses():
+    """Return the registered node classes.
+
+    Returns:
+        list: The node classes.
+    """
+    return list(_kClasses.values())
+
+
+def _unknownParameter():
+    """Return the kUnknownParameter of the loaded OpenMaya module, if any."""
+    om2 = sys.modules.get("maya.api._OpenMaya_py2") or sys.modules.get("maya.api.OpenMaya")
+    return getattr(om2, "kUnknownParameter", None)
+
+
+def _instrument(nodeClass):
+    """Replace the compute method of a class with the timed version."""
+    if "_gfProfilingCompute" in nodeClass.__dict__:
+        return
+    compute = nodeClass.__dict__.get("compute")
+    if compute is None:
+        return
+    nodeClass._gfProfilingCompute = compute
+    nodeClass.compute = _timedCompute(compute, nodeClass.__name__)
+
+
+def _restore(nodeClass):
+    """Put back the original compute method of a class."""
+    compute = nodeClass.__dict__.get("_gfProfilingCompute")
+    if compute is None:
+        return
+    nodeClass.compute = compute
+    del nodeClass._gfProfilingCompute
+
+
+def _timedCompute(compute, typeName):
+    """Wrap a compute method to record its calls."""
+    unknownParameter = _unknownParameter()
+
+    def timedCompute(self, plug, dataBlock):
+        """Timed compute, see the original method of the node class."""
+        result = None
+        start = _kTimer()
+        try:
+            result = compute(self, plug, dataBlock)
+            return result
+        finally:
+            elapsed = _kTimer() - start
+            plugName = _kIndices.sub("", plug.partialName(useLongNames=True))
+            _record((typeName, self.name(), plugName), elapsed, unknownParameter is not None and result is unknownParameter)
+
+    timedCompute.__name__ = compute.__name__
+    timedCompute.gfOriginal = compute
+    return timedCompute
+
+
+def _record(key, elapsed, unknown):
+    """Add one call to the statistics of a (type, node, plug) key."""
+    with _kLock:
+        stats = _kStats.get(key)
+        if stats is None:
+            _kStats[key] = [1, int(unknown), elapsed, elapsed, elapsed]
+            return
+        stats[0] += 1
+        stats[1] += int(unknown)
+        stats[2] += elapsed
+        if elapsed < stats[3]:
+            stats[3] = elapsed
+        if elapsed > stats[4]:
+            stats[4] = elapsed
+
+
+def _summary(records):
+    """Aggregate a list of [calls, unknown, total, min, max] records."""
+    calls = sum(record[0] for record in records)
+    total = sum(record[2] for record in records)
+    summary = OrderedDict()
+    summary["calls"] = calls
+    summary["unknown"] = sum(record[1] for record in records)
+    summary["totalTime"] = total
+    summary["meanTime"] = total / calls if calls else 0.0
+    summary["minTime"] = min(record[3] for record in records)
+    summary["maxTime"] = max(record[4] for record in records)
+    return summary
+
+
+def _group(items, keyIndex):
+    """Group (key, stats) items by one element of the key, sorted by total time."""
+    groups = OrderedDict()
+    for key, stats in items:
+        groups.setdefault(key[keyIndex], []).append((key, stats))
+    return sorted(groups.items(), key=lambda group: -sum(stats[2] for _, stats in group[1]))
+
+
+def report():
+    """Return the recorded data aggregated per node type and per node instance, sorted by total time.
+
+    Returns:
+        OrderedDict: {"enabled": bool, "types": {type: summary}, "nodes": {node: summary}}. Every summary
+            has calls, unknown, totalTime, meanTime, minTime, maxTime and a "plugs" dictionary with the same
+            values per requested plug. The node summaries also have the node "type".
+    """
+    with _kLock:
+        items = [(key, list(stats)) for key, stats in _kStats.items()]
+    result = OrderedDict()
+    result["enabled"] = isEnabled()
+    for section, keyIndex in (("types", 0), ("nodes", 1)):
+        entries = OrderedDict()
+        for name, group in _group(items, keyIndex):
+            entry = _summary([stats for _, stats in group])
+            if keyIndex == 1:
+                entry["type"] = group[0][0][0]
+            plugs = OrderedDict()
+            for plugName, plugGroup in _group(group, 2):
+                plugs[plugName] = _summary([stats for _, stats in plugGroup])
+            entry["plugs"] = plugs
+            entries[name] = entry
+        result[section] = entries
+    return result
+
+
+def rows():
+    """Return one row per node instance and plug, sorted by total time.
+
+    Returns:
+        list: Tuples with the values of kCSVHeader.
+    """
+    with _kLock:
+        items = [(key, list(stats)) for key, stats in _kStats.items()]
+    items.sort(key=lambda item: -item[1][2])
+    result = []
+    for key, stats in items:
+        summary = _summary([stats])
+        result.append(key + tuple(summary.values()))
+    return result
+
+
+def dump(path, fileFormat=None):
+    """Write the recorded data to a file.
+
+    Args:
+        path (str): The output file path.
+        fileFormat (str): "json" (the report() data) or "csv" (the rows() data). Defaults to the file extension.
+
+    Returns:
+        str: The output file path.
+    """
+    fileFormat = (fileFormat or os.path.splitext(path)[1][1:] or "json").lower()
+    if fileFormat == "json":
+        with open(path, "w") as outFile:
+            json.dump(report(), outFile, indent=4)
+    elif fileFormat == "csv":
+        with open(path, "w") as outFile:
+            writer = csv.writer(outFile, lineterminator="\n")
+            writer.writerow(kCSVHeader)
+            writer.writerows(rows())
+    else:
+        raise ValueError("[gfTools] Unknown profiling file format: %s" % fileFormat)
+    return path
+
+
+if os.environ.get("GFTOOLS_PROFILE", "0") not in ("", "0"):
+    enable()
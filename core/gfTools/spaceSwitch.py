@@ -0,0 +1,294 @@
+## @package spaceSwitch
+#  Space switch of gfSpaceConstraint over whole animation ranges.
+#
+#  Changes the space of a gfSpaceConstraint on many frames and compensates the keys of the animated control.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * In Maya, with gfTools_P loaded, switch the hand control to the space 2 between the frames 1 and 500,
+      undoable with ctrl+z:
+        cmds.gfSpaceSwitch_P(constraint="leftHand_spaceConstraint", control="leftHand_ctrl", space=2,
+                             startFrame=1, endFrame=500)
+    * The same from Python, outside the undo queue:
+        from gfTools import spaceSwitch
+        frames = spaceSwitch.keyFrames("leftHand_ctrl", 1, 500)
+        modifier = spaceSwitch.switch("leftHand_spaceConstraint", "leftHand_ctrl", 2, frames)
+        modifier.undoIt()                        (revert all the keys at once)
+    * The math alone, with sampled (frames, 4, 4) matrices:
+        oldSpace = spaceSwitch.constraintMatrices(offsetMatches, offsets, oldTargets)
+        newSpace = spaceSwitch.constraintMatrices(offsetMatch, offset, newTargets)
+        local = spaceSwitch.compensate(local, oldSpace, newSpace)
+
+Requirements:
+    * NumPy.
+    * Maya, only for keyFrames() and switch().
+
+Description:
+    The control is an animated transform under the object driven by the gfSpaceConstraint, directly
+    or through other transforms. When the space changes the constrained object moves, so the control
+    keys must change to keep the control in the same world position.
+    switch() samples, in one pass over the frames, the space plug, the targets of the old and new
+    spaces, the control channels and the matrices between the control and the constrained object.
+    compensate() then finds the new local matrices of all the frames at once and the control channels
+    and the space plug are keyed with gfTools.ikfk.writeKeys(), one addKeys() call per plug. Step keys
+    with the old space around the switched range keep the rest of the animation in its space. Every
+    change goes through one Modifier, which undoes and redoes the whole switch. The gfSpaceSwitch_P
+    command of the plugin runs switch() and puts its Modifier in the Maya undo queue.
+    The control is expected to have no joint orient, pivots or rotate axis.
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+
+from gfTools import ikfk
+from gfTools.kernels import euler
+from gfTools.kernels import transform
+
+
+kChannels = ("translateX", "translateY", "translateZ", "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ")
+
+
+class Modifier(object):
+    """The animation curves created and the keys added by switch(), undone and redone together."""
+
+    def __init__(self):
+        # Maya is only imported here, so the math below runs outside Maya too.
+        import maya.api._OpenMaya_py2 as om2
+        import maya.api._OpenMayaAnim_py2 as oma2
+
+        self.dgModifier = om2.MDGModifier()
+        self.curveChange = oma2.MAnimCurveChange()
+
+    def undoIt(self):
+        """Remove the keys and the animation curves."""
+        self.curveChange.undoIt()
+        self.dgModifier.undoIt()
+
+    def redoIt(self):
+        """Create the animation curves and the keys again."""
+        self.dgModifier.doIt()
+        self.curveChange.redoIt()
+
+
+def constraintMatrices(offsetMatch, offset, target):
+    """Return the output matrices of gfSpaceConstraint, offsetMatch * offset * target.
+
+    Args:
+        offsetMatch (array_like): The offset match matrices with shape (..., 4, 4).
+        offset (array_like): The offset matrices with shape (..., 4, 4).
+        target (array_like): The target matrices with shape (..., 4, 4).
+
+    Returns:
+        numpy.ndarray: The (..., 4, 4) matrices.
+    """
+    return np.matmul(np.matmul(np.asarray(offsetMatch, dtype=np.float64), offset), target)
+
+
+def compensate(local, oldSpace, newSpace, between=None):
+    """Find the local matrices that keep a control in place when the space of its gfSpaceConstraint changes.
+
+    Args:
+        local (array_like): The local matrices of the control with shape (..., 4, 4).
+        oldSpace (array_like): The output matrices of the constraint in the old space, (..., 4, 4).
+        newSpace (array_like): The output matrices of the constraint in the new space, (..., 4, 4).
+        between (array_like): The matrices from the parent of the control to the constrained object,
+            parentMatrix * inverse(constrained worldMatrix), with shape (..., 4, 4). None when the
+            control is a child of the constrained object.
+
+    Returns:
+        numpy.ndarray: The new (..., 4, 4) local matrices.
+    """
+    local = np.asarray(local, dtype=np.float64)
+    change = np.matmul(oldSpace, np.linalg.inv(newSpace))
+    if between is None:
+        return np.matmul(local, change)
+    return np.matmul(np.matmul(np.matmul(local, between), change), np.linalg.inv(between))
+
+
+def keyFrames(control, start, end):
+    """Return the frames to switch in a range, the keys of the control channels plus the range ends.
+
+    Args:
+        control (str): The control name.
+        start (float): The first frame.
+        end (float): The last frame.
+
+    Returns:
+        numpy.ndarray: The sorted frames. Every frame of the range if the control has no keys in it.
+    """
+    import maya.api._OpenMaya_py2 as om2
+
+    controlFn = om2.MFnDependencyNode(om2.MSelectionList().add(control).getDependNode(0))
+    keys = np.concatenate([_keyTimes(controlFn.findPlug(channel, False))[1] for channel in kChannels])
+    keys = keys[(keys >= start) & (keys <= end)]
+    if len(keys) == 0:
+        return np.arange(start, end + 1.0)
+    return np.unique(np.concatenate([[start, end], keys]))
+
+
+def _keyTimes(plug):
+    """Return the animation curve function set driving a plug and its key frames, (None, []) if it isn't animated."""
+    import maya.api._OpenMaya_py2 as om2
+    import maya.api._OpenMayaAnim_py2 as oma2
+
+    sources = plug.connectedTo(True, False)
+    if not sources or not sources[0].node().hasFn(om2.MFn.kAnimCurve):
+        return None, np.zeros(0)
+    curveFn = oma2.MFnAnimCurve(sources[0].node())
+    unit = om2.MTime.uiUnit()
+    return curveFn, np.array([curveFn.input(index).asUnits(unit) for index in range(curveFn.numKeys)], dtype=np.float64)
+
+
+def _matrix(plug, context):
+    """Read a matrix plug in a context as a (4, 4) array."""
+    import maya.api._OpenMaya_py2 as om2
+
+    return np.reshape(list(om2.MFnMatrixData(plug.asMObject(context)).matrix()), (4, 4))
+
+
+def _readMatrices(arrayPlug, count):
+    """Read the first count elements of a matrix array plug, missing elements are identities."""
+    import maya.api._OpenMaya_py2 as om2
+
+    matrices = np.array(np.broadcast_to(np.identity(4), (count, 4, 4)))
+    for index in arrayPlug.getExistingArrayAttributeIndices():
+        if index < count:
+            matrices[index] = _matrix(arrayPlug.elementByLogicalIndex(index), om2.MDGContext.kNormal)
+    return matrices
+
+
+def switch(constraint, control, space, frames):
+    """Switch a gfSpaceConstraint to a space on many frames, keeping the world animation of a control.
+
+    The frames outside the switched range keep their space: a step key with the old space is added on the
+    frame after the range and, when the space curve doesn't already hold the old space before the range,
+    on the frame before it. So the control keys outside the range don't need to be compensated.
+
+    Args:
+        constraint (str): The gfSpaceConstraint node name.
+        control (str): The animated control under the constrained object.
+        space (int): The new space.
+        frames (array_like): The frames to switch, like the ones of keyFrames(), in the current time unit.
+            The space keys between the first and the last frame are switched too. Frames already in the
+            space are left untouched.
+
+    Returns:
+        Modifier: The changes of the switch.
+
+    Raises:
+        ValueError: If the space doesn't exist or the constraint doesn't drive any object.
+    """
+    # pylint: disable=too-many-locals
+    import maya.api._OpenMaya_py2 as om2
+    import maya.api._OpenMayaAnim_py2 as oma2
+
+    selection = om2.MSelectionList()
+    selection.add(constraint)
+    selection.add(control)
+    constraintFn = om2.MFnDependencyNode(selection.getDependNode(0))
+    controlFn = om2.MFnDependencyNode(selection.getDependNode(1))
+    spacePlug = constraintFn.findPlug("space", False)
+    targetPlug = constraintFn.findPlug("target", False)
+    offsetPlug = constraintFn.findPlug("offset", False)
+    count = min(targetPlug.numElements(), offsetPlug.numElements())
+    if not 0 <= space < count:
+        raise ValueError("[gfTools] %s has %s spaces, got the space %s." % (constraint, count, space))
+    offsets = _readMatrices(offsetPlug, count)
+    offsetMatches = _readMatrices(constraintFn.findPlug("offsetMatch", False), count)
+    constrained = None
+    for output in ("constraintTranslate", "constraintRotate", "constraintScale"):
+        destinations = constraintFn.findPlug(output, False).connectedTo(False, True)
+        if destinations:
+            constrained = destinations[0].node()
+            break
+    if constrained is None:
+        raise ValueError("[gfTools] %s doesn't drive any object." % constraint)
+    worldPlug = om2.MFnDependencyNode(constrained).findPlug("worldMatrix", False).elementByLogicalIndex(0)
+    parentPlug = controlFn.findPlug("parentMatrix", False).elementByLogicalIndex(0)
+    channelPlugs = [controlFn.findPlug(channel, False) for channel in kChannels]
+    rotateOrder = controlFn.findPlug("rotateOrder", False).asShort()
+    unit = om2.MTime.uiUnit()
+
+    def spaceAt(frame):
+        """Return the current space at a frame."""
+        return min(spacePlug.asShort(om2.MDGContext(om2.MTime(frame, unit))), count - 1)
+
+    # The existing space keys inside the range would switch back in the middle of it.
+    frames = np.unique(np.asarray(frames, dtype=np.float64).ravel())
+    spaceCurveFn, spaceKeys = _keyTimes(spacePlug)
+    if len(frames):
+        frames = np.union1d(frames, spaceKeys[(spaceKeys >= frames[0]) & (spaceKeys <= frames[-1])])
+
+    # Sample every frame in one pass, the math below runs for all of them at once.
+    oldSpaces = np.zeros(len(frames), dtype=np.intp)
+    oldTargets = np.zeros((len(frames), 4, 4))
+    newTargets = np.zeros((len(frames), 4, 4))
+    between = np.zeros((len(frames), 4, 4))
+    channels = np.zeros((len(frames), len(kChannels)))
+    for index, frame in enumerate(frames):
+        context = om2.MDGContext(om2.MTime(frame, unit))
+        oldSpaces[index] = min(spacePlug.asShort(context), count - 1)
+        oldTargets[index] = _matrix(targetPlug.elementByLogicalIndex(int(oldSpaces[index])), context)
+        newTargets[index] = _matrix(targetPlug.elementByLogicalIndex(space), context)
+        between[index] = np.dot(_matrix(parentPlug, context), np.linalg.inv(_matrix(worldPlug, context)))
+        channels[index] = [plug.asDouble(context) for plug in channelPlugs]
+
+    modifier = Modifier()
+    changed = oldSpaces != space
+    if not np.any(changed):
+        return modifier
+    local = transform.compose(channels[:, :3], channels[:, 3:6], channels[:, 6:], order=rotateOrder)
+    oldSpace = constraintMatrices(offsetMatches[oldSpaces], offsets[oldSpaces], oldTargets)
+    newSpace = constraintMatrices(offsetMatches[space], offsets[space], newTargets)
+    local = compensate(local[changed], oldSpace[changed], newSpace[changed], between[changed])
+    translation, rotation, scale, _ = transform.decompose(local, rotateOrder)
+    rotation = euler.closestSolution(rotation, rotateOrder, channels[changed, 3:6])
+
+    # The old spaces around the switched range, read before any key changes.
+    frames = frames[changed]
+    spaceFrames = [frames]
+    spaceValues = [np.full(len(frames), float(space))]
+    after = frames[-1] + 1.0
+    afterSpace = spaceAt(after)
+    if afterSpace != space:
+        spaceFrames.append([after])
+        spaceValues.append([float(afterSpace)])
+    before = frames[0] - 1.0
+    previous = np.flatnonzero(spaceKeys < frames[0])
+    # A new first key moves the pre infinity and a non step key interpolates towards the new space.
+    holds = len(previous) and spaceCurveFn.outTangentType(int(previous[-1])) == oma2.MFnAnimCurve.kTangentStep
+    beforeSpace = spaceAt(before)
+    if not holds and beforeSpace != space:
+        spaceFrames.append([before])
+        spaceValues.append([float(beforeSpace)])
+    spaceFrames = np.concatenate(spaceFrames)
+    spaceValues = np.concatenate(spaceValues)
+    order = np.argsort(spaceFrames)
+
+    ikfk.writeKeys(["%s.%s" % (control, channel) for channel in kChannels], frames,
+                   np.concatenate([translation, rotation, scale], axis=-1),
+                   dgModifier=modifier.dgModifier, curveChange=modifier.curveChange)
+    ikfk.writeKeys(["%s.space" % constraint], spaceFrames[order], spaceValues[order, np.newaxis],
+                   tangentType=oma2.MFnAnimCurve.kTangentStep, dgModifier=modifier.dgModifier,
+                   curveChange=modifier.curveChange)
+
+    # The keys already keep the control in place, the node must not match the new space again.
+    userNode = constraintFn.userNode()
+    if userNode is not None:
+        userNode.lastSpace = None
+    return modifier
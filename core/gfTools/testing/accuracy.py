@@ -0,0 +1,804 @@
+## @package accuracy
+#  Accuracy checks of the gfTools math kernels.
+#
+#  Compares the vectorized kernels with the om2 stand-in and with plain Python references.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * From a shell, with the core folder in the PYTHONPATH:
+        python -m gfTools.testing.accuracy                  (run every check)
+        python -m gfTools.testing.accuracy -f Euler -n 256  (256 samples per rotation order of the euler checks)
+    * From Python:
+        from gfTools.testing import accuracy
+        mismatches = accuracy.run()
+
+Requirements:
+    * NumPy.
+
+Description:
+    The om2 stand-in of gfTools.testing.openMaya is built on the kernels, so matching it only proves that
+    the nodes see the kernel results through the om2 API. Every check also builds the expected values with
+    plain Python math, one sample at a time: the euler rotations as products of the single axis matrices of
+    the rotation order and the transforms as scale * shear * rotation * translation.
+    The euler checks cover the six rotation orders, mixed order arrays, the gimbal lock band of
+    euler.fromMatrix() and the float32 path. Near the gimbal lock only the matrix of the extracted angles is
+    checked, the angles themselves aren't unique there.
+    The transform checks compose and decompose sheared matrices with every rotation order, mirrored
+    matrices included. A mirrored matrix decomposes with all the scales negated, so only matrices with the
+    three scales negative give back their own components, the others are checked by composing them again.
+    The IK V-Chain check solves random chains with ikVChain.solve() and with a per chain om2 solve, the
+    compute of the gfRigIKVChain node before the kernel. That solve took the mirrored pole angle for a
+    snapUpVector between 0.0 and 1.0 (see gfTools.kernels.ikVChain), so the reference takes the signed angle
+    there and the old angle is only compared for the snapUpVector values the change doesn't affect.
+    The samples are seeded, so a failure is repeatable with the same --seed.
+
+This code supports Pylint. Rc file in project.
+"""
+from __future__ import print_function
+
+import sys
+import math
+import argparse
+from collections import OrderedDict
+
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import ikVChain
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+from gfTools.testing import openMaya
+
+
+kDefaultSamples = 64
+kTolerance = 1.0e-9
+kFloatTolerance = 1.0e-5
+## The om2 solve finds the pole angle with an arccos, which loses precision near 0 and pi.
+kIKVChainTolerance = 1.0e-6
+
+## Matrix error allowed for angles extracted inside the gimbal band of euler.fromMatrix(): twice the widest
+#  middle angle of the band, the rotation the extraction is allowed to drop.
+kGimbalTolerance = 2.0 * math.sqrt(2.0 * (1.0 - euler.kGimbalSine))
+## Same for float32 matrices, where the band is as wide as the float32 resolution of the middle sine.
+kFloatGimbalTolerance = 2.0 * math.sqrt(2.0 * float(np.finfo(np.float32).eps))
+
+## Distance of the middle angle to the gimbal lock in the gimbal samples.
+kGimbalOffsets = (0.0, 1.0e-9, 1.0e-7, 1.0e-5, 1.0e-3)
+
+kOrderNames = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+
+# ================================================================================================
+# References
+# ================================================================================================
+
+def _axisMatrix(angle, axis):
+    """Return the row vector rotation matrix of an angle around the x, y or z axis."""
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+    if axis == 0:
+        return [[1.0, 0.0, 0.0], [0.0, cos, sin], [0.0, -sin, cos]]
+    if axis == 1:
+        return [[cos, 0.0, -sin], [0.0, 1.0, 0.0], [sin, 0.0, cos]]
+    return [[cos, sin, 0.0], [-sin, cos, 0.0], [0.0, 0.0, 1.0]]
+
+
+def _matrixProduct(left, right):
+    """Return the product of two 3x3 matrices stored as lists of rows."""
+    return [[sum(left[row][index] * right[index][col] for index in range(3)) for col in range(3)] for row in range(3)]
+
+
+def _eulerMatrix(angles, order):
+    """Return the rotation matrix of one euler rotation, rotating around the first axis of the order first."""
+    first, middle, last = euler.kAxes[order]
+    matrix = _matrixProduct(_axisMatrix(float(angles[first]), first), _axisMatrix(float(angles[middle]), middle))
+    return _matrixProduct(matrix, _axisMatrix(float(angles[last]), last))
+
+
+def _quaternionMatrix(quat):
+    """Return the rotation matrix of one quaternion, the rows are the x, y and z axes rotated by it."""
+    length = math.sqrt(sum(float(value) ** 2 for value in quat))
+    x, y, z, w = [float(value) / length for value in quat]
+    rows = []
+    for axis in ([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]):
+        # v + 2w (u x v) + 2 u x (u x v)
+        cross = [2.0 * (y * axis[2] - z * axis[1]), 2.0 * (z * axis[0] - x * axis[2]), 2.0 * (x * axis[1] - y * axis[0])]
+        rows.append([axis[0] + w * cross[0] + y * cross[2] - z * cross[1],
+                     axis[1] + w * cross[1] + z * cross[0] - x * cross[2],
+                     axis[2] + w * cross[2] + x * cross[1] - y * cross[0]])
+    return rows
+
+
+def _eulerMatrices(angles, order):
+    """Return the (N, 3, 3) reference matrices of (N, 3) euler rotations. The order can be an (N,) array."""
+    orders = np.broadcast_to(order, angles.shape[:1])
+    return np.array([_eulerMatrix(each, int(eachOrder)) for each, eachOrder in zip(angles, orders)])
+
+
+def _transformMatrix(translation, angles, scale, shear, order):
+    """Return the 4x4 matrix scale * shear * rotation * translation of one transform."""
+    shearMatrix = [[1.0, 0.0, 0.0], [float(shear[0]), 1.0, 0.0], [float(shear[1]), float(shear[2]), 1.0]]
+    basis = _matrixProduct(shearMatrix, _eulerMatrix(angles, order))
+    rows = [[float(scale[row]) * value for value in basis[row]] + [0.0] for row in range(3)]
+    return np.array(rows + [[float(value) for value in translation] + [1.0]])
+
+
+def _transformMatrices(translation, angles, scale, shear, order):
+    """Return the (N, 4, 4) reference matrices of N transforms. The order can be an (N,) array."""
+    orders = np.broadcast_to(order, angles.shape[:1])
+    return np.array([_transformMatrix(*(values + (int(eachOrder),)))
+                     for values, eachOrder in zip(zip(translation, angles, scale, shear), orders)])
+
+
+def _om2Matrix(matrix):
+    """Return the 4x4 array of a om2 matrix."""
+    return np.reshape([matrix[index] for index in range(16)], (4, 4))
+
+
+def _paddedMatrix(matrix):
+    """Return a 3x3 rotation matrix as a flat 4x4 matrix list."""
+    padded = np.identity(4)
+    padded[:3, :3] = matrix
+    return padded.ravel().tolist()
+
+
+def _ikVChainSolve(values, legacySnap=False):
+    """Solve one IK V-Chain with the om2 compute of the gfRigIKVChain node before the kernel.
+
+    Args:
+        values (dict): The ikVChain.solve() arguments of one chain.
+        legacySnap (bool): Take the pole angle of the old node, mirrored for a snapUpVector between 0.0 and 1.0.
+
+    Returns:
+        numpy.ndarray: The start, mid and end matrices with shape (3, 4, 4).
+    """
+    # pylint: disable=too-many-locals, too-many-statements
+    om2 = openMaya
+    vRoot = om2.MVector(list(values["root"][3, :3]))
+    vHandle = om2.MVector(list(values["handle"][3, :3]))
+    vPoleVector = om2.MVector(list(values["poleVector"][3, :3]))
+    vSnap = om2.MVector(list(values["snap"][3, :3]))
+    mParInv = om2.MMatrix(values["parentInverse"].tolist())
+    offsetList = [om2.MQuaternion(list(each)) for each in values["offsets"]]
+    jntOriList = [om2.MQuaternion(list(each)) for each in values["jointOrients"]]
+    snap = float(values["snapUpVector"])
+    softVal = float(values["softness"])
+    stretch = float(values["stretch"])
+    hierarchyMode = bool(values["hierarchyMode"])
+    useScale = bool(values["useStretchAsScale"])
+
+    primAxis = om2.MVector(1.0, 0.0, 0.0)
+    secAxis = om2.MVector(0.0, 1.0, 0.0)
+    if values["flip"]:
+        primAxis = -primAxis
+        secAxis = -secAxis
+    binAxis = primAxis ^ secAxis
+
+    vAim = vHandle - vRoot
+    nAim = vAim.normal()
+    qAim = om2.MQuaternion(primAxis, nAim)
+    vStartSnap = vSnap - vRoot
+    vEndSnap = vSnap - vHandle
+    if values["pvMode"] == 0:
+        vUp = vPoleVector - vRoot
+    else:
+        vUp = secAxis.rotateBy(om2.MQuaternion(float(values["preferredAngle"] + values["twist"]), nAim))
+    nNormalPole = (vUp - ((vUp * nAim) * nAim)).normal()
+    nNormal = nNormalPole
+    if snap > 0.0:
+        nNormalSnap = (vStartSnap - ((vStartSnap * nAim) * nAim)).normal()
+        nNormal = (1.0 - snap) * nNormalPole + snap * nNormalSnap
+    nUp = secAxis.rotateBy(qAim)
+    angle = nUp.angle(nNormal)
+    # The old node compared the blended normal without normalizing it.
+    compared = nNormal if legacySnap else nNormal.normal()
+    if not compared.isEquivalent(nUp.rotateBy(om2.MQuaternion(angle, nAim)), 1.0e-5):
+        angle = 2.0 * math.pi - angle
+    qBasis = qAim * om2.MQuaternion(angle, nAim)
+
+    restStartLen = float(values["restLengthStart"])
+    restEndLen = float(values["restLengthEnd"])
+    startSnapLen = vStartSnap.length()
+    endSnapLen = vEndSnap.length()
+    startLen = (1.0 - snap) * restStartLen + snap * startSnapLen
+    endLen = (1.0 - snap) * restEndLen + snap * endSnapLen
+    chainLen = (1.0 - snap) * (restStartLen + restEndLen) + snap * (startSnapLen + endSnapLen)
+    handleLen = vAim.length()
+    rigidLen = max(min(handleLen, chainLen), chainLen * float(values["compressionLimit"]))
+    da = (1.0 - softVal) * chainLen
+    isSoft = handleLen > da and softVal > 0.0
+    if isSoft:
+        ds = chainLen - da
+        softLen = ds * (1.0 - math.exp((da - handleLen) / ds)) + da
+        solverLen = (1.0 - snap) * softLen + snap * rigidLen
+    else:
+        solverLen = rigidLen
+
+    stretchFactor = 1.0
+    squashFactor = 1.0
+    if stretch > 0.0:
+        scaleFactor = handleLen / solverLen if isSoft else handleLen / chainLen
+        if handleLen >= da:
+            clampStretch = float(values["clampStretch"])
+            clampFactor = (1.0 - clampStretch) * scaleFactor + clampStretch * min(scaleFactor, float(values["clampValue"]))
+            stretchFactor = (1.0 - stretch) + stretch * clampFactor
+        squash = float(values["squash"])
+        squashFactor = (1.0 - squash) + squash * (1.0 / math.sqrt(stretchFactor))
+    stretchScale = stretchFactor if useScale else 1.0
+    stretchTranslate = 1.0 if useScale else stretchFactor
+
+    def matrix(translation, rotation, scale=(1.0, 1.0, 1.0)):
+        """Compose one output matrix."""
+        mtxFn = om2.MTransformationMatrix()
+        mtxFn.setScale(list(scale), om2.MSpace.kTransform)
+        mtxFn.setRotation(rotation)
+        mtxFn.setTranslation(translation, om2.MSpace.kTransform)
+        return mtxFn.asMatrix()
+
+    # First Output
+    betaCos = (startLen ** 2 + solverLen ** 2 - endLen ** 2) / (2.0 * startLen * solverLen)
+    beta = math.acos(min(max(betaCos, -1.0), 1.0))
+    qFirstRotW = om2.MQuaternion(beta, binAxis) * qBasis
+    qFirstRot = offsetList[0].inverse() * qFirstRotW * jntOriList[0].inverse()
+    firstSca = [stretchScale] + [squashFactor * value for value in values["squashMultStart"]]
+    mFirst = matrix(vRoot, qFirstRot, firstSca) * mParInv
+
+    # Second Output
+    gammaCos = (startLen ** 2 + endLen ** 2 - solverLen ** 2) / (2.0 * startLen * endLen)
+    gammaCmp = math.acos(min(max(gammaCos, -1.0), 1.0)) + beta - math.pi
+    qSecondRotW = om2.MQuaternion(gammaCmp, binAxis) * qBasis
+    qSecondRot = offsetList[1].inverse() * qSecondRotW
+    if hierarchyMode:
+        qSecondRot *= qFirstRotW.inverse() * offsetList[0]
+        vSecondPos = primAxis * (startLen * stretchTranslate)
+    else:
+        vSecondPos = vRoot + nAim.rotateBy(om2.MQuaternion(beta, nAim ^ nNormal)) * (startLen * stretchTranslate)
+    qSecondRot *= jntOriList[1].inverse()
+    secondSca = [stretchScale] + [squashFactor * value for value in values["squashMultEnd"]]
+    mSecond = matrix(vSecondPos, qSecondRot, secondSca)
+
+    # Third Output
+    if hierarchyMode:
+        mThird = matrix(primAxis * (endLen * stretchTranslate), qBasis * qSecondRotW.inverse() * offsetList[1])
+    else:
+        mThird = matrix(vRoot + nAim * (solverLen * stretchTranslate), qBasis)
+        mSecond *= mParInv
+        mThird *= mParInv
+    return np.array([_om2Matrix(mFirst), _om2Matrix(mSecond), _om2Matrix(mThird)])
+
+
+# ================================================================================================
+# Samples
+# ================================================================================================
+
+def _eulerAngles(rng, count, order):
+    """Return random euler rotations in the range euler.fromMatrix() returns, away from the gimbal lock."""
+    angles = rng.uniform(-np.pi, np.pi, (count, 3))
+    angles[:, euler.kAxes[order][1]] = rng.uniform(-0.5 * np.pi + 0.1, 0.5 * np.pi - 0.1, count)
+    return angles
+
+
+def _gimbalAngles(rng, count, order, offset):
+    """Return random euler rotations whose middle angle is offset from +-pi/2, half of each sign."""
+    angles = rng.uniform(-np.pi, np.pi, (count, 3))
+    sign = np.where(np.arange(count) % 2, -1.0, 1.0)
+    angles[:, euler.kAxes[order][1]] = sign * (0.5 * np.pi - offset)
+    return angles
+
+
+def _transformValues(rng, count, order, scaleSigns=None):
+    """Return random translations, euler rotations, scales and shears.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator.
+        count (int): The number of transforms.
+        order (int): The rotation order of the euler rotations.
+        scaleSigns (array_like): The signs of the scales. None uses positive scales.
+
+    Returns:
+        tuple: The (count, 3) translations, euler rotations, scales and shears.
+    """
+    translation = rng.uniform(-10.0, 10.0, (count, 3))
+    angles = _eulerAngles(rng, count, order)
+    scale = rng.uniform(0.1, 10.0, (count, 3))
+    if scaleSigns is not None:
+        scale *= scaleSigns
+    shear = rng.uniform(-1.0, 1.0, (count, 3))
+    return translation, angles, scale, shear
+
+
+def _mirrorSigns(rng, count):
+    """Return scale signs with one or three negative axes, the scales of a negative determinant."""
+    signs = np.ones((count, 3))
+    signs[np.arange(count), rng.randint(0, 3, count)] = -1.0
+    signs[::4] = -1.0
+    return signs
+
+
+def _om2Transform(translation, angles, scale, shear, order):
+    """Return the om2 stand-in MTransformationMatrix of one transform."""
+    matrix = openMaya.MTransformationMatrix()
+    matrix.setScale(list(scale), openMaya.MSpace.kTransform)
+    matrix.setShear(list(shear), openMaya.MSpace.kTransform)
+    matrix.setRotation(openMaya.MEulerRotation(list(angles), order))
+    matrix.setTranslation(openMaya.MVector(list(translation)), openMaya.MSpace.kTransform)
+    return matrix
+
+
+def _ikVChainValues(rng, count):
+    """Return the ikVChain.solve() arguments of random chains, every setting varying per chain.
+
+    The snapUpVector is 0.0, 1.0 or a fraction, a third of the chains each.
+    """
+    def positions():
+        """Return random world matrices with only a translation."""
+        matrices = np.tile(np.identity(4), (count, 1, 1))
+        matrices[:, 3, :3] = rng.uniform(-5.0, 5.0, (count, 3))
+        return matrices
+
+    parents = transform.compose(rng.uniform(-5.0, 5.0, (count, 3)), _eulerAngles(rng, count, euler.kXYZ),
+                                rng.uniform(0.5, 2.0, (count, 3)), order=euler.kXYZ)
+    snapUpVector = rng.uniform(0.05, 0.95, count)
+    snapUpVector[0::3] = 0.0
+    snapUpVector[1::3] = 1.0
+    return {
+        "root": positions(),
+        "handle": positions(),
+        "poleVector": positions(),
+        "parentInverse": np.linalg.inv(parents),
+        "snap": positions(),
+        "offsets": euler.toQuaternion(rng.uniform(-np.pi, np.pi, (count, 2, 3))),
+        "jointOrients": euler.toQuaternion(rng.uniform(-np.pi, np.pi, (count, 2, 3))),
+        "restLengthStart": rng.uniform(1.0, 4.0, count),
+        "restLengthEnd": rng.uniform(1.0, 4.0, count),
+        "preferredAngle": rng.uniform(-np.pi, np.pi, count),
+        "twist": rng.uniform(-np.pi, np.pi, count),
+        "pvMode": rng.randint(0, 2, count),
+        "hierarchyMode": rng.randint(0, 2, count).astype(bool),
+        "flip": rng.randint(0, 2, count).astype(bool),
+        "useStretchAsScale": rng.randint(0, 2, count).astype(bool),
+        "compressionLimit": rng.uniform(0.0, 0.5, count),
+        "snapUpVector": snapUpVector,
+        "softness": np.where(rng.randint(0, 2, count), rng.uniform(0.0, 0.5, count), 0.0),
+        "stretch": np.where(rng.randint(0, 2, count), rng.uniform(0.0, 1.0, count), 0.0),
+        "clampStretch": rng.uniform(0.0, 1.0, count),
+        "clampValue": rng.uniform(1.0, 2.0, count),
+        "squash": rng.uniform(0.0, 1.0, count),
+        "squashMultStart": rng.uniform(0.5, 1.5, (count, 2)),
+        "squashMultEnd": rng.uniform(0.5, 1.5, (count, 2)),
+    }
+
+
+def _gimbalTolerance(offset, tolerance, gimbalTolerance):
+    """Return the matrix tolerance of the gimbal samples with a middle angle offset from +-pi/2."""
+    return gimbalTolerance if offset < gimbalTolerance else tolerance
+
+
+def _compare(mismatches, label, result, expected, tolerance, dtype=None):
+    """Append a description of the difference between the result and the expected values to mismatches."""
+    result = np.asarray(result)
+    if dtype is not None and result.dtype != dtype:
+        mismatches.append("%s: dtype %s, expected %s" % (label, result.dtype, np.dtype(dtype)))
+        return
+    expected = np.asarray(expected, dtype=np.float64)
+    if result.shape != expected.shape:
+        mismatches.append("%s: shape %s, expected %s" % (label, result.shape, expected.shape))
+        return
+    error = np.abs(result.astype(np.float64) - expected)
+    if not np.all(error <= tolerance):
+        mismatches.append("%s: max error %g, tolerance %g" % (label, np.nanmax(error), tolerance))
+
+
+# ================================================================================================
+# Euler checks
+# ================================================================================================
+
+def checkEulerToMatrix(rng, samples=kDefaultSamples):
+    """Check the euler to matrix and quaternion conversions of every rotation order.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        angles = _eulerAngles(rng, samples, order)
+        expected = _eulerMatrices(angles, order)
+        _compare(mismatches, "%s toMatrix" % name, euler.toMatrix(angles, order), expected, kTolerance)
+        quats = euler.toQuaternion(angles, order)
+        _compare(mismatches, "%s toQuaternion" % name, [_quaternionMatrix(quat) for quat in quats], expected, kTolerance)
+        om2Rotations = [openMaya.MEulerRotation(list(each), order) for each in angles]
+        _compare(mismatches, "%s om2 asMatrix" % name,
+                 [_om2Matrix(rotation.asMatrix())[:3, :3] for rotation in om2Rotations], expected, kTolerance)
+        _compare(mismatches, "%s om2 asQuaternion" % name,
+                 [_quaternionMatrix(list(rotation.asQuaternion())) for rotation in om2Rotations], expected, kTolerance)
+
+    orders = rng.randint(euler.kXYZ, euler.kZYX + 1, samples)
+    angles = rng.uniform(-np.pi, np.pi, (samples, 3))
+    expected = _eulerMatrices(angles, orders)
+    _compare(mismatches, "mixed orders toMatrix", euler.toMatrix(angles, orders), expected, kTolerance)
+    _compare(mismatches, "mixed orders toQuaternion",
+             [_quaternionMatrix(quat) for quat in euler.toQuaternion(angles, orders)], expected, kTolerance)
+    return mismatches
+
+
+def checkEulerFromMatrix(rng, samples=kDefaultSamples):
+    """Check the matrix and quaternion to euler conversions of every rotation order, away from the gimbal lock.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        angles = _eulerAngles(rng, samples, order)
+        matrices = np.zeros((samples, 4, 4))
+        matrices[:, :3, :3] = _eulerMatrices(angles, order)
+        matrices[:, 3, 3] = 1.0
+        _compare(mismatches, "%s fromMatrix" % name, euler.fromMatrix(matrices, order), angles, kTolerance)
+        scaled = np.array(matrices)
+        scaled[:, :3, :3] *= rng.uniform(0.1, 10.0, (samples, 3, 1))
+        scaled[:, 3, :3] = rng.normal(size=(samples, 3))
+        _compare(mismatches, "%s fromMatrix scaled" % name, euler.fromMatrix(scaled, order), angles, kTolerance)
+        quats = euler.toQuaternion(angles, order)
+        _compare(mismatches, "%s fromQuaternion" % name, euler.fromQuaternion(quats, order), angles, kTolerance)
+        _compare(mismatches, "%s om2 decompose" % name,
+                 [list(openMaya.MEulerRotation.decompose(openMaya.MMatrix(each.tolist()), order)) for each in scaled],
+                 angles, kTolerance)
+        _compare(mismatches, "%s om2 asEulerRotation" % name,
+                 [list(openMaya.MQuaternion(list(quat)).asEulerRotation().reorderIt(order)) for quat in quats],
+                 angles, kTolerance)
+
+    orders = rng.randint(euler.kXYZ, euler.kZYX + 1, samples)
+    angles = np.array([_eulerAngles(rng, 1, order)[0] for order in orders])
+    _compare(mismatches, "mixed orders fromMatrix", euler.fromMatrix(_eulerMatrices(angles, orders), orders),
+             angles, kTolerance)
+    return mismatches
+
+
+def checkEulerGimbal(rng, samples=kDefaultSamples):
+    """Check the matrix to euler conversions of every rotation order at and around the gimbal lock.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order and offset.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        middle, last = euler.kAxes[order][1:]
+        for offset in kGimbalOffsets:
+            label = "%s gimbal offset %g" % (name, offset)
+            tolerance = _gimbalTolerance(offset, kTolerance, kGimbalTolerance)
+            angles = _gimbalAngles(rng, samples, order, offset)
+            expected = _eulerMatrices(angles, order)
+            result = euler.fromMatrix(expected, order)
+            _compare(mismatches, "%s fromMatrix" % label, _eulerMatrices(result, order), expected, tolerance)
+            om2Result = np.array([list(openMaya.MEulerRotation.decompose(openMaya.MMatrix(_paddedMatrix(each)), order))
+                                  for each in expected])
+            _compare(mismatches, "%s om2 decompose" % label, _eulerMatrices(om2Result, order), expected, tolerance)
+            quatResult = euler.fromQuaternion(euler.toQuaternion(angles, order), order)
+            _compare(mismatches, "%s fromQuaternion" % label, _eulerMatrices(quatResult, order), expected,
+                     _gimbalTolerance(offset, kTolerance, 2.0 * kGimbalTolerance))
+            if offset == 0.0:
+                # At the lock the whole rotation around the shared axis goes to the first angle.
+                _compare(mismatches, "%s middle angle" % label, result[:, middle], angles[:, middle], kTolerance)
+                _compare(mismatches, "%s last angle" % label, result[:, last], np.zeros(samples), 0.0)
+            for newOrder, newName in enumerate(kOrderNames):
+                reordered = euler.reorder(angles, order, newOrder)
+                _compare(mismatches, "%s reorder to %s" % (label, newName), _eulerMatrices(reordered, newOrder),
+                         expected, kGimbalTolerance)
+    return mismatches
+
+
+def checkEulerReorder(rng, samples=kDefaultSamples):
+    """Check the reorder, alternate solution and closest solution of every pair of rotation orders.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        angles = _eulerAngles(rng, samples, order)
+        expected = _eulerMatrices(angles, order)
+        for newOrder, newName in enumerate(kOrderNames):
+            label = "%s reorder to %s" % (name, newName)
+            result = euler.reorder(angles, order, newOrder)
+            _compare(mismatches, label, _eulerMatrices(result, newOrder), expected, kTolerance)
+            _compare(mismatches, "%s om2" % label,
+                     [list(openMaya.MEulerRotation(list(each), order).reorder(newOrder)) for each in angles],
+                     result, kTolerance)
+        _compare(mismatches, "%s reorder mixed" % name,
+                 _eulerMatrices(euler.reorder(angles, order, np.arange(samples) % 6), np.arange(samples) % 6),
+                 expected, kTolerance)
+
+        alternate = euler.alternateSolution(angles, order)
+        _compare(mismatches, "%s alternateSolution" % name, _eulerMatrices(alternate, order), expected, kTolerance)
+        # The target is the alternate solution, some turns away and slightly off, so the closest solution is
+        # the alternate one moved by the same turns.
+        turns = 2.0 * np.pi * rng.randint(-2, 3, (samples, 3))
+        target = alternate + turns + rng.uniform(-0.1, 0.1, (samples, 3))
+        closest = euler.closestSolution(angles, order, target)
+        _compare(mismatches, "%s closestSolution" % name, _eulerMatrices(closest, order), expected, kTolerance)
+        _compare(mismatches, "%s closestSolution angles" % name, closest, alternate + turns, kTolerance)
+        _compare(mismatches, "%s om2 closestSolution" % name,
+                 [list(openMaya.MEulerRotation(list(each), order).closestSolution(
+                     openMaya.MEulerRotation(list(eachTarget), order))) for each, eachTarget in zip(angles, target)],
+                 closest, kTolerance)
+    return mismatches
+
+
+def checkEulerFloat32(rng, samples=kDefaultSamples):
+    """Check that float32 rotations are converted in float32 with float32 accuracy.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        angles = _eulerAngles(rng, samples, order).astype(np.float32)
+        expected = _eulerMatrices(angles, order)
+        _compare(mismatches, "%s toMatrix" % name, euler.toMatrix(angles, order), expected, kFloatTolerance,
+                 np.float32)
+        quats = euler.toQuaternion(angles, order)
+        _compare(mismatches, "%s toQuaternion dtype" % name, quats, quats, 0.0, np.float32)
+        _compare(mismatches, "%s toQuaternion" % name, [_quaternionMatrix(quat) for quat in quats], expected,
+                 kFloatTolerance)
+        _compare(mismatches, "%s toMatrix as float64" % name, euler.toMatrix(angles, order, dtype=np.float64),
+                 expected, kTolerance, np.float64)
+        _compare(mismatches, "%s reorder dtype" % name, euler.reorder(angles, order, (order + 1) % 6),
+                 euler.reorder(angles.astype(np.float64), order, (order + 1) % 6), kFloatTolerance, np.float32)
+
+        matrices = expected.astype(np.float32)
+        _compare(mismatches, "%s fromMatrix" % name, euler.fromMatrix(matrices, order), angles, kFloatTolerance,
+                 np.float32)
+        _compare(mismatches, "%s fromQuaternion" % name, euler.fromQuaternion(quats, order), angles, kFloatTolerance,
+                 np.float32)
+        _compare(mismatches, "%s om2 decompose float matrix" % name,
+                 [list(openMaya.MEulerRotation.decompose(openMaya.MFloatMatrix(_paddedMatrix(each)), order))
+                  for each in matrices], angles, kFloatTolerance)
+
+        # The float32 arcsin of the middle sine is also inaccurate just outside the band, so every gimbal
+        # sample uses the float32 band tolerance.
+        for offset in kGimbalOffsets:
+            gimbal = _gimbalAngles(rng, samples, order, offset)
+            gimbalMatrices = _eulerMatrices(gimbal, order)
+            result = euler.fromMatrix(gimbalMatrices.astype(np.float32), order)
+            _compare(mismatches, "%s gimbal offset %g fromMatrix" % (name, offset), _eulerMatrices(result, order),
+                     gimbalMatrices, kFloatGimbalTolerance)
+    return mismatches
+
+
+# ================================================================================================
+# Transform checks
+# ================================================================================================
+
+def checkTransformCompose(rng, samples=kDefaultSamples):
+    """Check the composition of sheared and mirrored matrices with every rotation order.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        for label, signs in (("%s" % name, None), ("%s mirrored" % name, _mirrorSigns(rng, samples))):
+            translation, angles, scale, shear = _transformValues(rng, samples, order, signs)
+            expected = _transformMatrices(translation, angles, scale, shear, order)
+            _compare(mismatches, "%s compose" % label, transform.compose(translation, angles, scale, shear, order),
+                     expected, kTolerance)
+            quats = euler.toQuaternion(angles, order)
+            _compare(mismatches, "%s compose quaternion" % label, transform.compose(translation, quats, scale, shear),
+                     expected, kTolerance)
+            _compare(mismatches, "%s om2 asMatrix" % label,
+                     [_om2Matrix(_om2Transform(*(values + (order,))).asMatrix())
+                      for values in zip(translation, angles, scale, shear)], expected, kTolerance)
+
+    orders = np.arange(samples) % 6
+    translation, angles, scale, shear = _transformValues(rng, samples, euler.kXYZ, _mirrorSigns(rng, samples))
+    _compare(mismatches, "mixed orders compose", transform.compose(translation, angles, scale, shear, orders),
+             _transformMatrices(translation, angles, scale, shear, orders), kTolerance)
+    return mismatches
+
+
+def checkTransformDecompose(rng, samples=kDefaultSamples):
+    """Check the decomposition of sheared and mirrored matrices with every rotation order.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        # Positive and all negative scales give back the components they were composed with.
+        for label, sign in (("%s" % name, 1.0), ("%s negative scales" % name, -1.0)):
+            translation, angles, scale, shear = _transformValues(rng, samples, order, sign)
+            matrices = _transformMatrices(translation, angles, scale, shear, order)
+            result = transform.decompose(matrices, order)
+            for component, value, expected in zip(("translation", "rotation", "scale", "shear"), result,
+                                                  (translation, angles, scale, shear)):
+                _compare(mismatches, "%s decompose %s" % (label, component), value, expected, kTolerance)
+            quats = transform.decompose(matrices)[1]
+            _compare(mismatches, "%s decompose quaternion" % label, [_quaternionMatrix(quat) for quat in quats],
+                     _eulerMatrices(angles, order), kTolerance)
+            om2Results = [openMaya.MTransformationMatrix(openMaya.MMatrix(each.tolist())) for each in matrices]
+            for each in om2Results:
+                each.reorderRotation(order + 1)
+            _compare(mismatches, "%s om2 rotation" % label, [list(each.rotation()) for each in om2Results], angles,
+                     kTolerance)
+            _compare(mismatches, "%s om2 scale" % label,
+                     [each.scale(openMaya.MSpace.kTransform) for each in om2Results], scale, kTolerance)
+            _compare(mismatches, "%s om2 shear" % label,
+                     [each.shear(openMaya.MSpace.kTransform) for each in om2Results], shear, kTolerance)
+    return mismatches
+
+
+def checkTransformRoundTrip(rng, samples=kDefaultSamples):
+    """Check that decomposed sheared and mirrored matrices compose back to the same matrices.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of samples per rotation order.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for order, name in enumerate(kOrderNames):
+        for label, signs in (("%s" % name, None), ("%s mirrored" % name, _mirrorSigns(rng, samples))):
+            matrices = _transformMatrices(*(_transformValues(rng, samples, order, signs) + (order,)))
+            translation, angles, scale, shear = transform.decompose(matrices, order)
+            # The reference composes a right handed rotation, so a mirror has to end up in the scales.
+            _compare(mismatches, "%s round trip" % label, _transformMatrices(translation, angles, scale, shear, order),
+                     matrices, kTolerance)
+            _compare(mismatches, "%s round trip compose" % label,
+                     transform.compose(translation, angles, scale, shear, order), matrices, kTolerance)
+            translation, quats, scale, shear = transform.decompose(matrices)
+            _compare(mismatches, "%s round trip quaternion" % label, transform.compose(translation, quats, scale, shear),
+                     matrices, kTolerance)
+            if signs is not None:
+                # Mirrored matrices keep one sign for the three scales.
+                _compare(mismatches, "%s scale signs" % label, np.sign(scale), -np.ones((samples, 3)), 0.0)
+            _compare(mismatches, "%s om2 round trip" % label,
+                     [_om2Matrix(openMaya.MTransformationMatrix(openMaya.MMatrix(each.tolist())).asMatrix())
+                      for each in matrices], matrices, kTolerance)
+
+        translation, angles = _transformValues(rng, samples, order)[:2]
+        rigid = _transformMatrices(translation, angles, np.ones((samples, 3)), np.zeros((samples, 3)), order)
+        _compare(mismatches, "%s rigidInverse" % name, transform.rigidInverse(rigid), np.linalg.inv(rigid), kTolerance)
+        _compare(mismatches, "%s rigidInverse quaternion" % name,
+                 [_quaternionMatrix(quat) for quat in quaternion.conjugate(euler.toQuaternion(angles, order))],
+                 transform.rigidInverse(rigid)[:, :3, :3], kTolerance)
+    return mismatches
+
+
+# ================================================================================================
+# IK V-Chain checks
+# ================================================================================================
+
+def checkIKVChain(rng, samples=kDefaultSamples):
+    """Check the batched IK V-Chain solve against the per chain om2 solve.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator of the samples.
+        samples (int): The number of chains per output mode.
+
+    Returns:
+        list: The description of every mismatch.
+    """
+    mismatches = []
+    for label, hierarchyMode in (("hierarchy", True), ("world", False)):
+        values = _ikVChainValues(rng, samples)
+        values["hierarchyMode"][:] = hierarchyMode
+        result = ikVChain.solve(**values)
+        chains = [dict((key, value[index]) for key, value in values.items()) for index in range(samples)]
+        expected = np.array([_ikVChainSolve(chain) for chain in chains])
+        _compare(mismatches, "%s solve" % label, result, expected, kIKVChainTolerance)
+        # The old pole angle only differs for a fractional snapUpVector.
+        unchanged = (values["snapUpVector"] == 0.0) | (values["snapUpVector"] == 1.0)
+        _compare(mismatches, "%s solve with a fractional snapUpVector" % label, result[~unchanged],
+                 expected[~unchanged], kIKVChainTolerance)
+        _compare(mismatches, "%s solve against the old snap blend" % label, result[unchanged],
+                 [_ikVChainSolve(chain, legacySnap=True) for chain, same in zip(chains, unchanged) if same],
+                 kIKVChainTolerance)
+        single = ikVChain.solve(**dict((key, value[0]) for key, value in values.items()))
+        _compare(mismatches, "%s single chain" % label, single, result[:1], kTolerance)
+    return mismatches
+
+
+## The checks by name, in the order they run.
+kChecks = OrderedDict([
+    ("EulerToMatrix", checkEulerToMatrix),
+    ("EulerFromMatrix", checkEulerFromMatrix),
+    ("EulerGimbal", checkEulerGimbal),
+    ("EulerReorder", checkEulerReorder),
+    ("EulerFloat32", checkEulerFloat32),
+    ("TransformCompose", checkTransformCompose),
+    ("TransformDecompose", checkTransformDecompose),
+    ("TransformRoundTrip", checkTransformRoundTrip),
+    ("IKVChain", checkIKVChain),
+])
+
+
+def run(samples=kDefaultSamples, nameFilter=None, seed=0):
+    """Run every check.
+
+    Args:
+        samples (int): The number of samples of each check, per rotation order for the euler checks.
+        nameFilter (str): Run only the checks containing this text in the name.
+        seed (int): The seed of the random samples. Every check starts from it.
+
+    Returns:
+        OrderedDict: The mismatches of every check by check name.
+    """
+    results = OrderedDict()
+    for name, check in kChecks.items():
+        if nameFilter and nameFilter.lower() not in name.lower():
+            continue
+        results[name] = check(np.random.RandomState(seed), samples)
+    return results
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Returns:
+        int: 1 if any check doesn't match, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Check the accuracy of the gfTools math kernels.")
+    parser.add_argument("-n", "--samples", type=int, default=kDefaultSamples, help="Samples per check.")
+    parser.add_argument("-f", "--filter", default=None, help="Run only the checks containing this text.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random samples.")
+    options = parser.parse_args(args)
+
+    results = run(options.samples, options.filter, options.seed)
+    failed = False
+    for name, mismatches in results.items():
+        print("%-22s %s" % (name, "FAILED" if mismatches else "ok"))
+        for mismatch in mismatches[:10]:
+            print("    %s" % mismatch)
+        if len(mismatches) > 10:
+            print("    ... %s more" % (len(mismatches) - 10))
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
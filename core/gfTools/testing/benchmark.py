@@ -0,0 +1,776 @@
+## @package benchmark
+#  Benchmark suite of the gfTools node prototypes.
+#
+#  Drives every node compute() through the testing harness and compares the timings with stored baselines.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * From a shell, with the core folder in the PYTHONPATH:
+        python -m gfTools.testing.benchmark                      (run and compare with the baseline)
+        python -m gfTools.testing.benchmark --save-baseline      (run and store the new baseline)
+        python -m gfTools.testing.benchmark -f Constraint -n 500 (run only the matching cases)
+    * From Python:
+        from gfTools.testing import benchmark
+        results = benchmark.run()
+        regressions = benchmark.compare(results, benchmark.loadBaseline())
+
+Requirements:
+    * NumPy.
+
+Description:
+    Every node registered by gfTools_P.py with a compute() has one case, and one more for each mode with
+    its own code path, like the Weighted mode of gfBlendTransform. A case sets synthetic inputs at
+    realistic array sizes (chains, targets, spaces, outputs), then each evaluation changes the driver
+    inputs, like an animated scene, and pulls every output of the node. Only the pulls are timed. As in
+    Maya, an output is only computed when it's dirty, so the nodes that compute all their outputs at the
+    first request are not called again for the other outputs.
+    The report gives evaluations per second and the per evaluation latency percentiles in microseconds.
+    The baseline is a JSON file with the results of a previous run, core/benchmarks/benchmarkBaseline.json
+    in the source tree. It isn't installed with the package, so an installed copy needs the --baseline
+    argument or the GFTOOLS_BENCHMARK_BASELINE environment variable. A case regresses when its median
+    latency is slower than the baseline median by more than the tolerance. The command line exits
+    with code 1 when any case regresses, when the baseline file is missing or when a case has no
+    baseline; --save-baseline adds the new cases.
+    The draw override nodes (debug nodes, mesh controller) and gfDistributeAlongSurface can't run
+    outside Maya, so they have no case. The gfDistributeAlongCurve prototype isn't registered yet, but it
+    has a case so its kParallel scheduling is checked by gfTools.testing.parallel.
+
+This code supports Pylint. Rc file in project.
+"""
+from __future__ import print_function
+
+import os
+import sys
+import json
+import math
+import argparse
+import platform
+import tempfile
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+
+from gfTools import cache
+from gfTools.kernels import quaternion
+from gfTools.testing import harness
+from gfTools.testing import openMaya
+
+
+kBaselinePath = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             "benchmarks", "benchmarkBaseline.json")
+kBaselineVersion = 1
+kDefaultEvaluations = 200
+kDefaultWarmup = 20
+kDefaultTolerance = 0.25
+kPercentiles = (50, 90, 99)
+kLimbs = 24
+kDrivers = 8
+kJoints = 16
+
+
+def randomMatrix(rng, translation=10.0, scale=None):
+    """Build a random transformation matrix.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator.
+        translation (float): The maximum absolute translation.
+        scale (tuple): The (min, max) random scale. No scale if None.
+
+    Returns:
+        numpy.ndarray: The (4,4) matrix.
+    """
+    matrix = np.identity(4)
+    matrix[:3, :3] = quaternion.asMatrix(quaternion.normalize(rng.normal(size=4)))
+    if scale is not None:
+        matrix[:3, :3] *= rng.uniform(scale[0], scale[1], size=3)[:, np.newaxis]
+    matrix[3, :3] = rng.uniform(-translation, translation, size=3)
+    return matrix
+
+
+def translationMatrix(x, y, z):
+    """Build a translation matrix.
+
+    Returns:
+        numpy.ndarray: The (4,4) matrix.
+    """
+    matrix = np.identity(4)
+    matrix[3, :3] = (x, y, z)
+    return matrix
+
+
+def randomAngles(rng, count=None, limit=math.pi):
+    """Return random angles in radians.
+
+    Args:
+        rng (numpy.random.RandomState): The random generator.
+        count (int): The number of (x, y, z) triples. A single triple if None.
+        limit (float): The maximum absolute angle.
+
+    Returns:
+        list: A (x, y, z) tuple or a list of tuples.
+    """
+    if count is None:
+        return tuple(rng.uniform(-limit, limit, size=3))
+    return [tuple(value) for value in rng.uniform(-limit, limit, size=(count, 3))]
+
+
+class BenchmarkCase(object):
+    """Description of how to benchmark one node."""
+
+    def __init__(self, name, moduleName, className, outputs, setup, drive, arrayOutputs=None):
+        """
+        Args:
+            name (str): The case name, used in the reports and in the baseline.
+            moduleName (str): The node module, like "n_gfRigIKVChain".
+            className (str): The node class inside the module.
+            outputs (list): The output plug paths pulled on every evaluation.
+            setup (function): Called once with (nodeHarness, rng) to set the static inputs.
+            drive (function): Called before every evaluation with (nodeHarness, rng, frame) to change the
+                animated inputs.
+            arrayOutputs (dict): The number of elements to create for each output array.
+        """
+        self.name = name
+        self.moduleName = moduleName
+        self.className = className
+        self.outputs = outputs
+        self.setup = setup
+        self.drive = drive
+        self.arrayOutputs = arrayOutputs or {}
+
+    def createNode(self, rng):
+        """Create and set up the harness of the node.
+
+        Args:
+            rng (numpy.random.RandomState): The random generator.
+
+        Returns:
+            NodeHarness: The node ready to be evaluated.
+        """
+        module = harness.loadNodeModule(self.moduleName)
+        node = harness.NodeHarness(getattr(module, self.className))
+        for path, count in self.arrayOutputs.items():
+            node.addOutputElements(path, count)
+        self.setup(node, rng)
+        return node
+
+
+# ================================================================================================
+# Cases
+# ================================================================================================
+
+def _setupIKVChain(node, rng):
+    # pylint: disable=unused-argument
+    node.setInput("root", translationMatrix(0.0, 10.0, 0.0))
+    node.setInput("poleVector", translationMatrix(0.0, 9.0, 5.0))
+    node.setInput("offset", [(0.0, 0.0, 0.0), (0.0, 0.0, 0.0)])
+    node.setInput("jointOrient", [(0.0, 0.0, -0.5), (0.0, 0.0, 1.0)])
+    node.setInput("restLengthStart", 5.0)
+    node.setInput("restLengthEnd", 5.0)
+    node.setInput("softness", 0.1)
+    node.setInput("stretch", 1.0)
+    node.setInput("squash", 1.0)
+
+
+def _driveIKVChain(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("handle", translationMatrix(*(rng.uniform(-6.0, 6.0, size=3) + (0.0, 10.0, 0.0))))
+
+
+def _setupIKVChainArray(node, rng):
+    # pylint: disable=unused-argument
+    for limb in range(kLimbs):
+        path = "limb[%s]." % limb
+        node.setInput(path + "root", translationMatrix(limb * 2.0, 10.0, 0.0))
+        node.setInput(path + "poleVector", translationMatrix(limb * 2.0, 9.0, 5.0))
+        node.setInput(path + "startJointOrient", (0.0, 0.0, -0.5))
+        node.setInput(path + "midJointOrient", (0.0, 0.0, 1.0))
+        node.setInput(path + "restLengthStart", 5.0)
+        node.setInput(path + "restLengthEnd", 5.0)
+        node.setInput(path + "softness", 0.1)
+        node.setInput(path + "stretch", 1.0)
+        node.setInput(path + "squash", 1.0)
+
+
+def _driveIKVChainArray(node, rng, frame):
+    # pylint: disable=unused-argument
+    for limb in range(kLimbs):
+        offset = rng.uniform(-6.0, 6.0, size=3) + (limb * 2.0, 10.0, 0.0)
+        node.setInput("limb[%s].handle" % limb, translationMatrix(*offset))
+
+
+def _setupBlendTransform(node, rng):
+    count = 10
+    node.setInput("rotationInterpolation", 1)
+    node.setInput("translate1", [tuple(row) for row in rng.uniform(-10.0, 10.0, size=(count, 3))])
+    node.setInput("translate2", [tuple(row) for row in rng.uniform(-10.0, 10.0, size=(count, 3))])
+    node.setInput("rotate1", randomAngles(rng, count))
+    node.setInput("rotate2", randomAngles(rng, count))
+    node.setInput("scale1", [(1.0, 1.0, 1.0)] * count)
+    node.setInput("scale2", [tuple(row) for row in rng.uniform(0.5, 2.0, size=(count, 3))])
+    node.setInput("rotateOrder1", [index % 6 for index in range(count)])
+    node.setInput("rotateOrder2", [0] * count)
+    node.setInput("outRotateOrder", [(index + 3) % 6 for index in range(count)])
+
+
+def _driveBlendTransform(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("blender", rng.uniform(0.0, 1.0))
+
+
+def _setupBlendTransformWeighted(node, rng):
+    count = 10
+    node.setInput("blendMode", 1)
+    node.setInput("rotationInterpolation", 1)
+    for space in range(3):
+        node.setInput("transform[%s].translate" % space, [tuple(row) for row in rng.uniform(-10.0, 10.0, size=(count, 3))])
+        node.setInput("transform[%s].rotate" % space, randomAngles(rng, count))
+        node.setInput("transform[%s].scale" % space, [tuple(row) for row in rng.uniform(0.5, 2.0, size=(count, 3))])
+        node.setInput("transform[%s].rotateOrder" % space, [(index + space) % 6 for index in range(count)])
+    node.setInput("outRotateOrder", [(index + 3) % 6 for index in range(count)])
+
+
+def _driveBlendTransformWeighted(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("weight", list(rng.uniform(0.0, 1.0, size=3)))
+
+
+def _setupBlendTransformWeightedSparse(node, rng):
+    count = 10
+    node.setInput("blendMode", 1)
+    node.setInput("rotationInterpolation", 1)
+    # Every space has rotations, but not every space has translations or scales.
+    for space in range(3):
+        node.setInput("transform[%s].rotate" % space, randomAngles(rng, count))
+    node.setInput("transform[0].translate", [tuple(row) for row in rng.uniform(-10.0, 10.0, size=(count, 3))])
+    node.setInput("transform[2].scale", [tuple(row) for row in rng.uniform(0.5, 2.0, size=(count, 3))])
+
+
+def _setupPSDVectorAngle(node, rng):
+    count = 12
+    node.setInput("base", np.identity(4))
+    node.setInput("target", [translationMatrix(*vector) for vector in rng.normal(size=(count, 3))])
+    node.setInput("targetEnvelope", [1.0] * count)
+    node.setInput("targetFalloff", list(rng.uniform(30.0, 120.0, size=count)))
+    node.setInput("rampWeights", [(0.0, 0.0, openMaya.MRampAttribute.kSmooth), (1.0, 1.0, openMaya.MRampAttribute.kSmooth)])
+
+
+def _drivePSDVectorAngle(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("source", translationMatrix(*rng.normal(size=3)))
+
+
+def _setupPSDVectorAngleArray(node, rng):
+    count = 12
+    for driver in range(kDrivers):
+        path = "driver[%s]." % driver
+        node.setInput(path + "base", np.identity(4))
+        node.setInput(path + "target", [translationMatrix(*vector) for vector in rng.normal(size=(count, 3))])
+        node.setInput(path + "targetEnvelope", [1.0] * count)
+        node.setInput(path + "targetFalloff", list(rng.uniform(30.0, 120.0, size=count)))
+    node.setInput("rampWeights", [(0.0, 0.0, openMaya.MRampAttribute.kSmooth), (1.0, 1.0, openMaya.MRampAttribute.kSmooth)])
+
+
+def _drivePSDVectorAngleArray(node, rng, frame):
+    # pylint: disable=unused-argument
+    for driver in range(kDrivers):
+        node.setInput("driver[%s].source" % driver, translationMatrix(*rng.normal(size=3)))
+
+
+def _setupPSDRBF(node, rng):
+    count = 32
+    node.setInput("base", randomMatrix(rng))
+    node.setInput("target", [translationMatrix(*vector) for vector in rng.normal(size=(count, 3))])
+    node.setInput("targetEnvelope", [1.0] * count)
+
+
+def _drivePSDRBF(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("source", randomMatrix(rng))
+
+
+def _setupTwistExtractor(node, rng):
+    # pylint: disable=unused-argument
+    node.setInput("rotationOrder", 2)
+
+
+def _driveTwistExtractor(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("rotation", randomAngles(rng))
+
+
+def _setupTwistExtractorArray(node, rng):
+    for joint in range(kJoints):
+        path = "joint[%s]." % joint
+        node.setInput(path + "rotationOrder", joint % 6)
+        node.setInput(path + "useUpVector", joint % 2 == 0)
+        node.setInput(path + "upVector", tuple(rng.normal(size=3)))
+
+
+def _driveTwistExtractorArray(node, rng, frame):
+    # pylint: disable=unused-argument
+    for joint in range(kJoints):
+        node.setInput("joint[%s].rotation" % joint, randomAngles(rng))
+
+
+def _setupAimConstraint(node, rng):
+    node.setInput("upVectorType", 1)
+    node.setInput("worldUpMatrix", randomMatrix(rng))
+    node.setInput("constraintWorldMatrix", randomMatrix(rng))
+    node.setInput("constraintParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+    node.setInput("constraintJointOrient", randomAngles(rng, limit=0.5))
+
+
+def _driveAimConstraint(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("targetWorldMatrix", randomMatrix(rng))
+
+
+def _setupAimConstraintArray(node, rng):
+    for joint in range(kJoints):
+        path = "constrained[%s]." % joint
+        node.setInput(path + "upVectorType", joint % 4)
+        node.setInput(path + "worldUpMatrix", randomMatrix(rng))
+        node.setInput(path + "constraintWorldMatrix", randomMatrix(rng))
+        node.setInput(path + "constraintParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+        node.setInput(path + "constraintJointOrient", randomAngles(rng, limit=0.5))
+
+
+def _driveAimConstraintArray(node, rng, frame):
+    # pylint: disable=unused-argument
+    for joint in range(kJoints):
+        node.setInput("constrained[%s].targetWorldMatrix" % joint, randomMatrix(rng))
+
+
+def _setupParentConstraint(node, rng):
+    count = 4
+    node.setInput("constraintParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+    node.setInput("constraintJointOrient", randomAngles(rng, limit=0.5))
+    node.setInput("constraintRotateOrder", 3)
+    node.setInput("constraintParentScale", (1.0, 1.0, 1.0))
+    for index in range(count):
+        node.setInput("targetList[%s].targetOffset" % index, randomMatrix(rng, 2.0))
+        node.setInput("targetList[%s].targetWeight" % index, 1.0 / count)
+
+
+def _driveParentConstraint(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("targetList[0].targetWorldMatrix", randomMatrix(rng, scale=(0.5, 2.0)))
+
+
+def _setupParentConstraintArray(node, rng):
+    count = 4
+    for joint in range(kJoints):
+        path = "constrained[%s]." % joint
+        node.setInput(path + "constraintParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+        node.setInput(path + "constraintJointOrient", randomAngles(rng, limit=0.5))
+        node.setInput(path + "constraintRotateOrder", joint % 6)
+    for index in range(count):
+        node.setInput("targetList[%s].targetOffset" % index, randomMatrix(rng, 2.0))
+        node.setInput("targetList[%s].targetWeight" % index, 1.0 / count)
+
+
+def _driveParentConstraintArray(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("targetList[0].targetWorldMatrix", randomMatrix(rng, scale=(0.5, 2.0)))
+
+
+def _setupPoleVectorConstraint(node, rng):
+    node.setInput("rootWorldMatrix", randomMatrix(rng))
+    node.setInput("constraintParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+    node.setInput("restPosition", (0.0, 0.0, 5.0))
+
+
+def _drivePoleVectorConstraint(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("targetWorldMatrix", randomMatrix(rng))
+
+
+def _setupSpaceConstraint(node, rng):
+    count = 6
+    node.setInput("target", [randomMatrix(rng) for _ in range(count)])
+    node.setInput("offset", [randomMatrix(rng, 2.0) for _ in range(count)])
+    node.setInput("offsetMatch", [np.identity(4)] * count)
+
+
+def _driveSpaceConstraint(node, rng, frame):
+    node.setInput("space", frame % 6)
+    node.setInput("target[%s]" % (frame % 6), randomMatrix(rng))
+
+
+def _setupHelperJoint(node, rng):
+    count = 4
+    node.setInput("sourceParent", randomMatrix(rng))
+    node.setInput("targetParentInverseMatrix", np.linalg.inv(randomMatrix(rng)))
+    node.setInput("sourceParentScale", (1.0, 1.0, 1.0))
+    for index in range(count):
+        node.setInput("targetList[%s].positionOffset" % index, tuple(rng.uniform(-1.0, 1.0, size=3)))
+        node.setInput("targetList[%s].rotationOffset" % index, tuple(rng.uniform(-1.0, 1.0, size=3)))
+        node.setInput("targetList[%s].restAngle" % index, rng.uniform(-0.5, 0.5))
+        node.setInput("targetList[%s].positiveMultiplier" % index, 0.5)
+        node.setInput("targetList[%s].negativeMultiplier" % index, 0.25)
+
+
+def _driveHelperJoint(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("source", randomMatrix(rng))
+
+
+def _setupQuadraticCurve(node, rng):
+    node.setInput("lockLength", 0.5)
+    node.setInput("restLength", 10.0)
+
+
+def _driveQuadraticCurve(node, rng, frame):
+    # pylint: disable=unused-argument
+    points = [(0.0, 0.0, 0.0), tuple(rng.uniform(2.0, 8.0, size=3)), (10.0, 0.0, 0.0)]
+    node.setInput("controlPoints", [translationMatrix(*point) for point in points])
+
+
+def _setupFindParamFromLength(node, rng):
+    # pylint: disable=unused-argument
+    curveData = openMaya.MFnNurbsCurveData().create()
+    points = openMaya.MPointArray([openMaya.MPoint(0.0, 0.0, 0.0), openMaya.MPoint(5.0, 5.0, 0.0),
+                                   openMaya.MPoint(10.0, 0.0, 0.0)])
+    openMaya.MFnNurbsCurve().create(points, openMaya.MDoubleArray([0.0, 0.0, 1.0, 1.0]), 2,
+                                    openMaya.MFnNurbsCurve.kOpen, False, False, curveData)
+    node.setInput("inputCurve", curveData)
+
+
+def _driveFindParamFromLength(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("arcLength", rng.uniform(0.0, 11.0))
+
+
+def _setupCachePlayback(node, rng):
+    frames = 240
+    path = os.path.join(tempfile.gettempdir(), "gfToolsBenchmarkCache.gfc")
+    chains = [[randomMatrix(rng, scale=(0.5, 2.0)) for _ in range(3)] for _ in range(frames)]
+    cache.write(path, {"outChain": np.array(chains)}, startFrame=1.0)
+    node.setInput("cacheFile", path)
+
+
+def _driveCachePlayback(node, rng, frame):
+    # pylint: disable=unused-argument
+    node.setInput("frame", rng.uniform(1.0, 240.0))
+
+
+def _setupNone(node, rng):
+    # pylint: disable=unused-argument
+    pass
+
+
+def _setupOperation(operation):
+    """Return a setup function that selects the operation of a math node."""
+    def setup(node, rng):
+        # pylint: disable=unused-argument
+        node.setInput("operation", operation)
+    return setup
+
+
+def _driveInputs(**inputs):
+    """Return a drive function that sets random values to the inputs.
+
+    Args:
+        **inputs: The input paths and the random functions, called with rng.
+    """
+    def drive(node, rng, frame):
+        # pylint: disable=unused-argument
+        for path, function in inputs.items():
+            node.setInput(path, function(rng))
+    return drive
+
+
+def _angle(rng):
+    return rng.uniform(-math.pi, math.pi)
+
+
+kCases = [
+    BenchmarkCase("IKVChain", "n_gfRigIKVChain", "IKVChainSolver", ["outChain"],
+                  _setupIKVChain, _driveIKVChain, {"outChain": 3}),
+    BenchmarkCase("IKVChainArray", "n_gfRigIKVChainArray", "IKVChainArraySolver", ["outLimb"],
+                  _setupIKVChainArray, _driveIKVChainArray,
+                  dict(("outLimb[%s].outChain" % limb, 3) for limb in range(kLimbs))),
+    BenchmarkCase("BlendTransform", "n_gfUtilBlendTransform", "BlendTransform",
+                  ["outTranslate", "outRotate", "outScale", "visibility", "reverseVisibility"],
+                  _setupBlendTransform, _driveBlendTransform, {"outTranslate": 10, "outRotate": 10, "outScale": 10}),
+    BenchmarkCase("BlendTransformWeighted", "n_gfUtilBlendTransform", "BlendTransform",
+                  ["outTranslate", "outRotate", "outScale", "visibility", "reverseVisibility"],
+                  _setupBlendTransformWeighted, _driveBlendTransformWeighted,
+                  {"outTranslate": 10, "outRotate": 10, "outScale": 10}),
+    BenchmarkCase("BlendTransformWeightedSparse", "n_gfUtilBlendTransform", "BlendTransform",
+                  ["outTranslate", "outRotate", "outScale", "visibility", "reverseVisibility"],
+                  _setupBlendTransformWeightedSparse, _driveBlendTransformWeighted,
+                  {"outTranslate": 10, "outRotate": 10, "outScale": 10}),
+    BenchmarkCase("PSDVectorAngle", "n_gfRigPSDVectorAngle", "VectorAnglePSD", ["outWeights"],
+                  _setupPSDVectorAngle, _drivePSDVectorAngle, {"outWeights": 12}),
+    BenchmarkCase("PSDVectorAngleArray", "n_gfRigPSDVectorAngleArray", "VectorAnglePSDArray", ["outDriver"],
+                  _setupPSDVectorAngleArray, _drivePSDVectorAngleArray,
+                  dict(("outDriver[%s].outWeights" % driver, 12) for driver in range(kDrivers))),
+    BenchmarkCase("PSDRBF", "n_gfRigPSDRBF", "RBFPSD", ["outWeights"], _setupPSDRBF, _drivePSDRBF, {"outWeights": 32}),
+    BenchmarkCase("TwistExtractor", "n_gfRigTwistExtractor", "TwistExtractor", ["twist", "twistDistribution"],
+                  _setupTwistExtractor, _driveTwistExtractor, {"twistDistribution": 5}),
+    BenchmarkCase("TwistExtractorArray", "n_gfRigTwistExtractorArray", "TwistExtractorArray", ["outJoint"],
+                  _setupTwistExtractorArray, _driveTwistExtractorArray,
+                  dict(("outJoint[%s].twistDistribution" % joint, 5) for joint in range(kJoints))),
+    BenchmarkCase("AimConstraint", "n_gfUtilAimConstraint", "AimConstraint", ["constraint"],
+                  _setupAimConstraint, _driveAimConstraint),
+    BenchmarkCase("AimConstraintArray", "n_gfUtilAimConstraintArray", "AimConstraintArray", ["constraint"],
+                  _setupAimConstraintArray, _driveAimConstraintArray, {"constraint": kJoints}),
+    BenchmarkCase("ParentConstraint", "n_gfUtilParentConstraint", "ParentConstraint",
+                  ["constraintTranslate", "constraintRotate", "constraintScale"],
+                  _setupParentConstraint, _driveParentConstraint),
+    BenchmarkCase("ParentConstraintArray", "n_gfUtilParentConstraintArray", "ParentConstraintArray", ["outConstrained"],
+                  _setupParentConstraintArray, _driveParentConstraintArray, {"outConstrained": kJoints}),
+    BenchmarkCase("PoleVectorConstraint", "n_gfUtilPoleVectorConstraint", "PoleVectorConstraint", ["constraint"],
+                  _setupPoleVectorConstraint, _drivePoleVectorConstraint),
+    BenchmarkCase("SpaceConstraint", "n_gfUtilSpaceConstraint", "SpaceConstraint",
+                  ["constraintTranslate", "constraintRotate", "constraintScale"],
+                  _setupSpaceConstraint, _driveSpaceConstraint),
+    BenchmarkCase("HelperJoint", "n_gfRigHelperJoint", "HelperJoint", ["outTransform"],
+                  _setupHelperJoint, _driveHelperJoint, {"outTransform": 4}),
+    BenchmarkCase("QuadraticCurve", "n_gfRigQuadraticCurve", "QuadraticCurve", ["outTransforms", "outCurve"],
+                  _setupQuadraticCurve, _driveQuadraticCurve, {"outTransforms": 12}),
+    BenchmarkCase("DistributeAlongCurve", "n_gfRigDistributeAlongCurve", "TestNode", ["outAttr"],
+                  _setupNone, _driveInputs(inAttr=lambda rng: tuple(rng.normal(size=3)))),
+    BenchmarkCase("FindParamFromLength", "n_gfUtilFindParamFromCurveLength", "FindParamFromLength", ["outParam"],
+                  _setupFindParamFromLength, _driveFindParamFromLength),
+    BenchmarkCase("CachePlayback", "n_gfUtilCachePlayback", "CachePlayback", ["outMatrix", "outValue"],
+                  _setupCachePlayback, _driveCachePlayback, {"outMatrix": 3}),
+    BenchmarkCase("DecomposeRowMatrix", "n_gfUtilDecompRowMatrix", "DecomposeRowMatrix", ["row1", "row2", "row3", "row4"],
+                  _setupNone, _driveInputs(inputMatrix=randomMatrix)),
+    BenchmarkCase("AngleMath", "n_gfUtilAngleMath", "AngularMath", ["outAngle"],
+                  _setupOperation(1), _driveInputs(angle1=_angle, angle2=_angle)),
+    BenchmarkCase("AngleScalarMath", "n_gfUtilAngleScalarMath", "AngularScalarMath", ["outAngle"],
+                  _setupOperation(2), _driveInputs(angle=_angle, scalar=lambda rng: rng.uniform(-2.0, 2.0))),
+    BenchmarkCase("AngleTrigMath", "n_gfUtilAngleTrigMath", "AngularTrigMath", ["outAngle"],
+                  _setupOperation(1), _driveInputs(angle1=_angle, angle2=_angle)),
+    BenchmarkCase("AngleToDouble", "n_gfUtilAngleToDouble", "AngleToDouble", ["outDouble"],
+                  _setupNone, _driveInputs(angle=_angle)),
+    BenchmarkCase("DoubleToAngle", "n_gfUtilDoubleToAngle", "DoubleToAngle", ["outAngle"],
+                  _setupNone, _driveInputs(double=lambda rng: rng.uniform(-180.0, 180.0))),
+    BenchmarkCase("EulerMath", "n_gfUtilEulerMath", "EulerMath", ["outEuler"],
+                  _setupOperation(1), _driveInputs(euler1=randomAngles, euler2=randomAngles)),
+    BenchmarkCase("EulerScalarMath", "n_gfUtilEulerScalarMath", "EulerScalarMath", ["outEuler"],
+                  _setupOperation(2), _driveInputs(euler=randomAngles, scalar=lambda rng: rng.uniform(-2.0, 2.0))),
+    BenchmarkCase("EulerToVector", "n_gfUtilEulerToVector", "EulerToVector", ["outVector"],
+                  _setupNone, _driveInputs(euler=randomAngles)),
+    BenchmarkCase("VectorToEuler", "n_gfUtilVectorToEuler", "VectorToEuler", ["outEuler"],
+                  _setupNone, _driveInputs(vector=lambda rng: tuple(rng.uniform(-180.0, 180.0, size=3))))
+]
+
+
+# ================================================================================================
+# Running and reporting
+# ================================================================================================
+
+def runCase(case, evaluations=kDefaultEvaluations, warmup=kDefaultWarmup, seed=0):
+    """Benchmark one case.
+
+    Args:
+        case (BenchmarkCase): The case to run.
+        evaluations (int): The number of timed evaluations.
+        warmup (int): The number of evaluations before the timed ones.
+        seed (int): The seed of the random inputs.
+
+    Returns:
+        OrderedDict: The statistics of the case: evaluations, evalsPerSecond, mean and the percentiles
+            of the latency in microseconds.
+    """
+    rng = np.random.RandomState(seed)
+    node = case.createNode(rng)
+    latencies = np.zeros(evaluations)
+    timer = timeit.default_timer
+    try:
+        for frame in range(warmup + evaluations):
+            case.drive(node, rng, frame)
+            start = timer()
+            for path in case.outputs:
+                node.pull(path)
+            if frame >= warmup:
+                latencies[frame - warmup] = timer() - start
+    finally:
+        node.delete()
+    latencies *= 1.0e6
+    result = OrderedDict()
+    result["evaluations"] = evaluations
+    result["evalsPerSecond"] = float(1.0e6 / np.mean(latencies))
+    result["mean"] = float(np.mean(latencies))
+    for percentile in kPercentiles:
+        result["p%s" % percentile] = float(np.percentile(latencies, percentile))
+    return result
+
+
+def run(evaluations=kDefaultEvaluations, warmup=kDefaultWarmup, nameFilter=None, seed=0, cases=None):
+    """Benchmark every case.
+
+    Args:
+        evaluations (int): The number of timed evaluations per case.
+        warmup (int): The number of evaluations before the timed ones.
+        nameFilter (str): Run only the cases containing this text in the name.
+        seed (int): The seed of the random inputs.
+        cases (list): The cases to run. Defaults to kCases.
+
+    Returns:
+        OrderedDict: The statistics of every case by case name.
+    """
+    results = OrderedDict()
+    for case in kCases if cases is None else cases:
+        if nameFilter and nameFilter.lower() not in case.name.lower():
+            continue
+        results[case.name] = runCase(case, evaluations, warmup, seed)
+    return results
+
+
+def loadBaseline(path=kBaselinePath):
+    """Read a baseline file.
+
+    Args:
+        path (str): The JSON file path.
+
+    Returns:
+        dict: The statistics of every case by case name.
+
+    Raises:
+        ValueError: If the file doesn't exist or has an unsupported version.
+    """
+    if not os.path.isfile(path):
+        raise ValueError("[gfTools] No benchmark baseline in %s. Run with --save-baseline to create it." % path)
+    with open(path, "r") as baselineFile:
+        data = json.load(baselineFile)
+    if data.get("version") != kBaselineVersion:
+        raise ValueError("[gfTools] Unsupported benchmark baseline version in %s" % path)
+    return data["results"]
+
+
+def saveBaseline(results, path=kBaselinePath, merge=True):
+    """Write the results as the new baseline.
+
+    Args:
+        results (dict): The statistics returned by run().
+        path (str): The JSON file path.
+        merge (bool): Keep the baseline of the cases that were not run.
+    """
+    baseline = OrderedDict(loadBaseline(path)) if merge and os.path.isfile(path) else OrderedDict()
+    baseline.update(results)
+    data = OrderedDict()
+    data["version"] = kBaselineVersion
+    data["python"] = platform.python_version()
+    data["numpy"] = np.__version__
+    data["platform"] = platform.platform()
+    data["results"] = baseline
+    if not os.path.isdir(os.path.dirname(os.path.abspath(path))):
+        os.makedirs(os.path.dirname(os.path.abspath(path)))
+    with open(path, "w") as baselineFile:
+        json.dump(data, baselineFile, indent=4)
+
+
+def compare(results, baseline, tolerance=kDefaultTolerance):
+    """Find the cases slower than the baseline.
+
+    Args:
+        results (dict): The statistics returned by run().
+        baseline (dict): The statistics returned by loadBaseline().
+        tolerance (float): The accepted slowdown of the median latency, 0.25 means 25%.
+
+    Returns:
+        OrderedDict: The ratio between the current and the baseline median latency of the regressed cases.
+
+    Raises:
+        ValueError: If a case has no baseline.
+    """
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        raise ValueError("[gfTools] No benchmark baseline for %s. Run with --save-baseline to add them."
+                         % ", ".join(missing))
+    regressions = OrderedDict()
+    for name, stats in results.items():
+        ratio = stats["p50"] / baseline[name]["p50"]
+        if ratio > 1.0 + tolerance:
+            regressions[name] = ratio
+    return regressions
+
+
+def formatReport(results, baseline=None):
+    """Build a text table with the results.
+
+    Args:
+        results (dict): The statistics returned by run().
+        baseline (dict): The statistics returned by loadBaseline(), used to show the median change.
+
+    Returns:
+        str: The report.
+    """
+    baseline = baseline or {}
+    header = "%-28s %12s %10s %10s %10s %10s %9s" % ("Node", "evals/s", "mean(us)", "p50(us)", "p90(us)", "p99(us)", "vs base")
+    lines = [header, "-" * len(header)]
+    for name, stats in results.items():
+        change = ""
+        if name in baseline:
+            change = "%+.1f%%" % ((stats["p50"] / baseline[name]["p50"] - 1.0) * 100.0)
+        lines.append("%-28s %12.1f %10.1f %10.1f %10.1f %10.1f %9s" % (name, stats["evalsPerSecond"], stats["mean"],
+                                                                     stats["p50"], stats["p90"], stats["p99"], change))
+    return "\n".join(lines)
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Returns:
+        int: 1 if any case regressed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the gfTools node prototypes.")
+    parser.add_argument("-n", "--evaluations", type=int, default=kDefaultEvaluations, help="Timed evaluations per node.")
+    parser.add_argument("-w", "--warmup", type=int, default=kDefaultWarmup, help="Evaluations before timing.")
+    parser.add_argument("-f", "--filter", default=None, help="Run only the nodes containing this text.")
+    parser.add_argument("-b", "--baseline", default=os.environ.get("GFTOOLS_BENCHMARK_BASELINE", kBaselinePath),
+                        help="Baseline JSON file.")
+    parser.add_argument("-t", "--tolerance", type=float, default=kDefaultTolerance,
+                        help="Accepted median slowdown before failing, 0.25 means 25%%.")
+    parser.add_argument("-s", "--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("-o", "--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random inputs.")
+    options = parser.parse_args(args)
+
+    results = run(options.evaluations, options.warmup, options.filter, options.seed)
+    if options.output:
+        with open(options.output, "w") as outputFile:
+            json.dump(results, outputFile, indent=4)
+    if options.save_baseline:
+        print(formatReport(results))
+        saveBaseline(results, options.baseline)
+        print("\nBaseline saved to %s" % options.baseline)
+        return 0
+    try:
+        baseline = loadBaseline(options.baseline)
+        print(formatReport(results, baseline))
+        regressions = compare(results, baseline, options.tolerance)
+    except ValueError as error:
+        print(formatReport(results))
+        print("\n%s" % error)
+        return 1
+    if regressions:
+        print("\nRegressions (median latency above the %.0f%% tolerance):" % (options.tolerance * 100.0))
+        for name, ratio in regressions.items():
+            print("    %s: %.2fx slower" % (name, ratio))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+## @package harness
+#  Run the compute() of the gfTools node prototypes outside Maya.
+#
+#  Installs the NumPy stand-ins as the maya.api modules and drives one node instance.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * from gfTools import testing
+      module = testing.loadNodeModule("n_gfRigIKVChain")
+      node = testing.NodeHarness(module.IKVChainSolver)
+      node.setInput("handle", numpy.identity(4))
+      node.addOutputElements("outChain", 3)
+      chain = node.pull("outChain")
+
+Requirements:
+    * NumPy.
+
+Description:
+    install() registers gfTools.testing.openMaya and gfTools.testing.openMayaAnim as the
+    maya.api modules, so the node modules can be imported as they are. It refuses to run when the
+    real Maya modules were already imported.
+    NodeHarness creates one node instance: setInput() sets an input plug and dirties the affected
+    outputs (calling setDependentsDirty() and the attribute changed callbacks), pull() calls compute()
+    when the output is dirty and returns its value as Python data: floats, tuples, (4,4) numpy
+    arrays for matrices, lists for arrays and dicts for compounds.
+    Plugs are given as paths: "inTarget[2]", "targetList[0].targetWeight", "outEuler.outEulerX".
+    Long and short attribute names are accepted.
+
+This code supports Pylint. Rc file in project.
+"""
+# pylint: disable=protected-access
+import os
+import re
+import sys
+import types
+import importlib
+
+from gfTools.testing import openMaya
+from gfTools.testing import openMayaAnim
+
+
+kNodesPath = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                           "..", "..", "..", "plugin", "maya", "nodes", "python"))
+
+kModules = {
+    "maya.api._OpenMaya_py2": openMaya,
+    "maya.api.OpenMaya": openMaya,
+    "maya.api._OpenMayaAnim_py2": openMayaAnim,
+    "maya.api.OpenMayaAnim": openMayaAnim
+}
+
+_PATH_TOKEN = re.compile(r"^(\w+)(?:\[(\d+)\])?$")
+
+
+def install():
+    """Register the stand-in modules in sys.modules. Calling it again does nothing.
+
+    Raises:
+        RuntimeError: If the real maya package is already imported.
+    """
+    maya = sys.modules.get("maya")
+    if maya is not None:
+        if not getattr(maya, "gfTestingStandIn", False):
+            raise RuntimeError("[gfTools] The maya package is already imported. The testing stand-in can't be installed.")
+        return
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    maya.gfTestingStandIn = True
+    api = types.ModuleType("maya.api")
+    api.__path__ = []
+    maya.api = api
+    sys.modules["maya"] = maya
+    sys.modules["maya.api"] = api
+    for name, module in kModules.items():
+        sys.modules[name] = module
+        setattr(api, name.rsplit(".", 1)[-1], module)
+
+
+def uninstall():
+    """Remove the stand-in modules from sys.modules."""
+    maya = sys.modules.get("maya")
+    if maya is None or not getattr(maya, "gfTestingStandIn", False):
+        return
+    for name in list(kModules) + ["maya.api", "maya"]:
+        sys.modules.pop(name, None)
+
+
+def loadNodeModule(moduleName, path=None):
+    """Import a node module using the stand-in modules.
+
+    Args:
+        moduleName (str): The module name, like "n_gfRigIKVChain".
+        path (str): The folder of the node modules. Defaults to the GFTOOLS_NODES_PATH environment
+            variable or to the plugin/maya/nodes/python folder of this repository.
+
+    Returns:
+        module: The imported node module.
+    """
+    install()
+    path = path or os.environ.get("GFTOOLS_NODES_PATH") or kNodesPath
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(moduleName)
+
+
+class NodeHarness(object):
+    """Drive one instance of a node class: set inputs, pull outputs."""
+
+    def __init__(self, nodeClass, name=None):
+        """Initialize the node class if needed, create the node and call its postConstructor().
+
+        Args:
+            nodeClass (class): The om2.MPxNode subclass, with creator() and initialize() staticmethods.
+            name (str): The node name. Defaults to the class name followed by "1".
+        """
+        install()
+        if not nodeClass.__dict__.get("_gfInitialized", False):
+            nodeClass.initialize()
+            nodeClass._gfInitialized = True
+        self.nodeClass = nodeClass
+        self.state = openMaya._NodeState(nodeClass, name or "%s1" % nodeClass.__name__)
+        self.node = nodeClass.creator() if hasattr(nodeClass, "creator") else nodeClass()
+        self.node._gfState = self.state
+        self.state.node = self.node
+        self.node.postConstructor()
+
+    def mobject(self):
+        """Return the MObject of the node."""
+        return self.state.mobject()
+
+    def plug(self, path):
+        """Return the MPlug of an attribute path.
+
+        Args:
+            path (str): The attribute path, like "targetList[0].targetWeight".
+
+        Returns:
+            MPlug: The plug of the attribute.
+        """
+        # Attribute names are unique in a node, so the path can start at any child attribute.
+        candidates = []
+        for root in self.state.cells:
+            candidates.extend([root] + root.descendants())
+        spec = None
+        indices = {}
+        for token in path.split("."):
+            match = _PATH_TOKEN.match(token)
+            if match is None:
+                raise ValueError("[gfTools] Invalid attribute path: %s" % path)
+            name, index = match.groups()
+            found = [candidate for candidate in candidates if name in (candidate.longName, candidate.shortName)]
+            if not found:
+                raise ValueError("[gfTools] Attribute %s not found in %s" % (name, self.nodeClass.__name__))
+            spec = found[0]
+            if index is not None:
+                if not spec.flags["array"]:
+                    raise ValueError("[gfTools] Attribute %s is not an array" % name)
+                indices[spec] = int(index)
+            candidates = spec.children
+        return openMaya.MPlug._create(self.state, spec, indices)
+
+    def setInput(self, path, value):
+        """Set the value of a plug and dirty the attributes it affects.
+
+        Args:
+            path (str): The attribute path.
+            value (object): A Python value (float, int, bool, sequence, (4,4) array, list of
+                elements for arrays, dict for compounds) or an om2 stand-in object
+                (MMatrix, MVector, MAngle, MEulerRotation, MObject).
+        """
+        plug = self.plug(path)
+        if isinstance(value, openMaya.MObject) and plug._spec.kind == "matrix":
+            value = value._data.matrix
+        elif isinstance(value, openMaya.MObject):
+            value = openMaya.MObject(value)
+        elif isinstance(value, (openMaya._Vector, openMaya._Point)):
+            value = value._v[:3]
+        self.state.setValue(plug, value)
+
+    def getInput(self, path):
+        """Return the stored value of a plug, without computing it.
+
+        Args:
+            path (str): The attribute path.
+
+        Returns:
+            object: The value as Python data.
+        """
+        return openMaya._toPython(self.plug(path)._resolve(create=True))
+
+    def addOutputElements(self, path, count):
+        """Create the elements of an output array, as the connections would do inside Maya.
+
+        Args:
+            path (str): The path of the array attribute.
+            count (int): The number of elements, created with the logical indices 0 to count - 1.
+        """
+        cell = self.plug(path)._resolve(create=True)
+        for index in range(count):
+            cell.element(index, create=True)
+        self.state.dirtyAttribute(cell.spec)
+
+    def isDirty(self, path):
+        """Check if the attribute of a plug path needs to be computed."""
+        return not self.state.isClean(self.plug(path)._spec)
+
+    def pull(self, path, force=False):
+        """Compute a plug if it's dirty and return its value.
+
+        When compute() returns kUnknownParameter, it's called again with the parent plug (the
+        compound of a child plug or the array of an element plug), like Maya does.
+
+        Args:
+            path (str): The attribute path.
+            force (bool): Compute even if the plug is clean.
+
+        Returns:
+            object: The value as Python data.
+
+        Raises:
+            RuntimeError: If no plug of the path is computed by the node.
+        """
+        plug = self.plug(path)
+        if force or not self.state.isClean(plug._spec):
+            target = plug
+            with self.state.lock:
+                while self.node.compute(target, openMaya.MDataBlock(self.state)) is openMaya.kUnknownParameter:
+                    if target.isChild:
+                        target = target.parent()
+                    elif target.isElement:
+                        target = target.array()
+                    else:
+                        raise RuntimeError("[gfTools] %s doesn't compute %s" % (self.nodeClass.__name__, path))
+        return openMaya._toPython(plug._resolve(create=True))
+
+    def sendTimeChange(self, time=0.0):
+        """Call the time changed callbacks.
+
+        Args:
+            time (float): The new time.
+        """
+        openMaya._MessageRegistry.send("timeChange", time)
+
+    def delete(self):
+        """Call the node about to delete and destroyed callbacks and remove every callback of the node."""
+        mob = self.mobject()
+        for function, clientData in openMaya._MessageRegistry.find("nodePreRemoval", self.state):
+            function(mob, clientData)
+        for function, clientData in openMaya._MessageRegistry.find("nodeDestroyed", self.state):
+            function(clientData)
+        for callbackId in openMaya.MMessage.nodeCallbacks(mob):
+            openMaya.MMessage.removeCallback(callbackId)
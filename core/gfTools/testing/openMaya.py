@@ -0,0 +1,3481 @@
+## @package openMaya
+#  NumPy backed stand-in of the maya.api.OpenMaya module.
+#
+#  Implements the subset of the Python API 2.0 used by the gfTools node prototypes.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * Don't import this module directly. Use gfTools.testing.install() to register it
+      as maya.api._OpenMaya_py2 and maya.api.OpenMaya.
+
+Requirements:
+    * NumPy.
+
+Description:
+    The math classes (MVector, MMatrix, MQuaternion, MEulerRotation, MTransformationMatrix...) follow
+    the Maya conventions: row vectors, translation in the last row, quaternion products applying the
+    left operand first and euler rotation orders applying the first axis first.
+    The dependency graph side (attributes, plugs, data block and data handles) stores the node data
+    in plain Python objects, so a node compute() can run with no Maya license. Only one node is
+    evaluated at a time, there are no connections between nodes.
+
+Todo:
+    * Connections between nodes.
+    * Geometry data other than nurbs curves.
+
+This code supports Pylint. Rc file in project.
+"""
+# pylint: disable=invalid-name, too-many-lines, protected-access, too-many-public-methods
+import math
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
+
+kUnknownParameter = "kUnknownParameter"
+
+kLogger = logging.getLogger("gfTools.testing")
+
+
+class _Constant(object):
+    """Class constant that returns a new copy on every access, so in place operators are safe."""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __get__(self, instance, owner):
+        return self.factory(owner)
+
+
+def _isNumber(value):
+    """Check if the value is a real number."""
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+# ================================================================================================
+# Units and enumerations
+# ================================================================================================
+
+class MSpace(object):
+    """Transformation spaces."""
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kObject = 2
+    kPostTransform = 3
+    kWorld = 4
+    kLast = 5
+
+
+class MFn(object):
+    """Function set types of MObjects."""
+    kInvalid = 0
+    kBase = 1
+    kNamedObject = 2
+    kDependencyNode = 4
+    kPluginDependNode = 5
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kAttribute = 554
+    kNumericAttribute = 555
+    kUnitAttribute = 556
+    kTypedAttribute = 557
+    kCompoundAttribute = 558
+    kEnumAttribute = 559
+    kMatrixAttribute = 560
+    kData = 570
+    kMatrixData = 571
+    kNurbsCurveData = 572
+    kNurbsCurve = 267
+
+
+class MAngle(object):
+    """Angle value with units. The internal unit is radians."""
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+    kAngMinutes = 3
+    kAngSeconds = 4
+    kLast = 5
+
+    _kToRadians = {1: 1.0, 2: math.pi / 180.0, 3: math.pi / 10800.0, 4: math.pi / 648000.0}
+
+    def __init__(self, value=0.0, unit=1):
+        if isinstance(value, MAngle):
+            self._unit = value._unit
+            self._value = value._value
+        else:
+            self._unit = unit
+            self._value = float(value)
+
+    @property
+    def unit(self):
+        """The unit of the angle."""
+        return self._unit
+
+    @unit.setter
+    def unit(self, value):
+        self._unit = value
+
+    @property
+    def value(self):
+        """The value of the angle in its unit."""
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = float(value)
+
+    def asUnits(self, unit):
+        """Return the angle in the given unit."""
+        return self.asRadians() / MAngle._kToRadians[unit]
+
+    def asRadians(self):
+        """Return the angle in radians."""
+        return self._value * MAngle._kToRadians[self._unit]
+
+    def asDegrees(self):
+        """Return the angle in degrees."""
+        return self.asUnits(MAngle.kDegrees)
+
+    def asAngMinutes(self):
+        """Return the angle in minutes."""
+        return self.asUnits(MAngle.kAngMinutes)
+
+    def asAngSeconds(self):
+        """Return the angle in seconds."""
+        return self.asUnits(MAngle.kAngSeconds)
+
+    @staticmethod
+    def uiUnit():
+        """Return the angle unit of the user interface."""
+        return MAngle.kDegrees
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MAngle(%s, %s)" % (self._value, self._unit)
+
+
+class MDistance(object):
+    """Distance value with units. Only centimeters are supported."""
+    kInvalid = 0
+    kInches = 1
+    kFeet = 2
+    kYards = 3
+    kMiles = 4
+    kMillimeters = 5
+    kCentimeters = 6
+    kKilometers = 7
+    kMeters = 8
+
+    def __init__(self, value=0.0, unit=6):
+        self.value = float(value)
+        self.unit = unit
+
+    def asCentimeters(self):
+        """Return the distance in centimeters."""
+        return self.value
+
+    def asUnits(self, unit):
+        """Return the distance in the given unit."""
+        # pylint: disable=unused-argument
+        return self.value
+
+    @staticmethod
+    def uiUnit():
+        """Return the distance unit of the user interface."""
+        return MDistance.kCentimeters
+
+
+# ================================================================================================
+# Vectors and points
+# ================================================================================================
+
+class _Vector(object):
+    """Base class of the three components vectors."""
+
+    __slots__ = ("_v",)
+    _kDtype = np.float64
+
+    def __init__(self, *args):
+        self._v = np.zeros(3, dtype=self._kDtype)
+        if len(args) == 1:
+            source = args[0]
+            if isinstance(source, (_Vector, _Point)):
+                self._v[:] = source._v[:3]
+            else:
+                values = list(source)
+                self._v[:len(values[:3])] = values[:3]
+        elif len(args) in (2, 3):
+            self._v[:len(args)] = args
+
+    @classmethod
+    def _fromArray(cls, array):
+        result = cls()
+        result._v[:] = array
+        return result
+
+    x = property(lambda self: float(self._v[0]), lambda self, value: self._v.__setitem__(0, value))
+    y = property(lambda self: float(self._v[1]), lambda self, value: self._v.__setitem__(1, value))
+    z = property(lambda self: float(self._v[2]), lambda self, value: self._v.__setitem__(2, value))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        if index < -3 or index > 2:
+            raise IndexError("index out of range")
+        return float(self._v[index])
+
+    def __setitem__(self, index, value):
+        self._v[index] = value
+
+    def __add__(self, other):
+        return self._fromArray(self._v + other._v[:3])
+
+    def __iadd__(self, other):
+        self._v += other._v[:3]
+        return self
+
+    def __sub__(self, other):
+        return self._fromArray(self._v - other._v[:3])
+
+    def __isub__(self, other):
+        self._v -= other._v[:3]
+        return self
+
+    def __neg__(self):
+        return self._fromArray(-self._v)
+
+    def __mul__(self, other):
+        if _isNumber(other):
+            return self._fromArray(self._v * other)
+        if isinstance(other, _Matrix):
+            return self._fromArray(np.dot(self._v, other._m[:3, :3]))
+        if isinstance(other, (_Vector, _Point)):
+            return float(np.dot(self._v, other._v[:3]))
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if _isNumber(other):
+            return self._fromArray(self._v * other)
+        return NotImplemented
+
+    def __imul__(self, other):
+        if _isNumber(other):
+            self._v *= other
+        elif isinstance(other, _Matrix):
+            self._v[:] = np.dot(self._v, other._m[:3, :3])
+        else:
+            return NotImplemented
+        return self
+
+    def __truediv__(self, other):
+        return self._fromArray(self._v / other)
+
+    __div__ = __truediv__
+
+    def __itruediv__(self, other):
+        self._v /= other
+        return self
+
+    __idiv__ = __itruediv__
+
+    def __xor__(self, other):
+        return self._fromArray(np.cross(self._v, other._v[:3]))
+
+    def __eq__(self, other):
+        if not isinstance(other, (_Vector, _Point)):
+            return False
+        return self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.%s(%s, %s, %s)" % (type(self).__name__, self.x, self.y, self.z)
+
+    def __str__(self):
+        return "(%g, %g, %g)" % (self.x, self.y, self.z)
+
+    def length(self):
+        """Return the length of the vector."""
+        return float(np.sqrt(np.dot(self._v, self._v)))
+
+    def normal(self):
+        """Return a normalized copy of the vector."""
+        return self._fromArray(self._v).normalize()
+
+    def normalize(self):
+        """Normalize the vector in place."""
+        length = self.length()
+        if length > 0.0:
+            self._v /= length
+        return self
+
+    def angle(self, other):
+        """Return the angle in radians between this vector and the other."""
+        lengths = self.length() * other.length()
+        if lengths == 0.0:
+            return 0.0
+        return math.acos(min(max(float(np.dot(self._v, other._v[:3])) / lengths, -1.0), 1.0))
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two vectors are the same within the tolerance."""
+        return bool(np.all(np.abs(self._v - other._v[:3]) <= tolerance))
+
+    def isParallel(self, other, tolerance=1.0e-10):
+        """Check if the two vectors are parallel within the tolerance."""
+        return abs(1.0 - abs(math.cos(self.angle(other)))) <= tolerance
+
+    def rotateBy(self, rotation):
+        """Return the vector rotated by a MQuaternion or a MEulerRotation."""
+        if isinstance(rotation, MEulerRotation):
+            rotation = rotation.asQuaternion()
+        return self._fromArray(quaternion.rotateVector(self._v, rotation._q))
+
+    def rotateTo(self, other):
+        """Return the quaternion that rotates this vector to the other."""
+        return MQuaternion(self, other)
+
+    def transformAsNormal(self, matrix):
+        """Return the vector transformed as a normal by the matrix."""
+        inverse = np.linalg.inv(matrix._m)
+        return self._fromArray(np.dot(inverse[:3, :3], self._v))
+
+
+class MVector(_Vector):
+    """Double precision vector."""
+
+    __slots__ = ()
+
+    kZeroVector = _Constant(lambda cls: MVector(0.0, 0.0, 0.0))
+    kOneVector = _Constant(lambda cls: MVector(1.0, 1.0, 1.0))
+    kXaxisVector = _Constant(lambda cls: MVector(1.0, 0.0, 0.0))
+    kYaxisVector = _Constant(lambda cls: MVector(0.0, 1.0, 0.0))
+    kZaxisVector = _Constant(lambda cls: MVector(0.0, 0.0, 1.0))
+    kXnegAxisVector = _Constant(lambda cls: MVector(-1.0, 0.0, 0.0))
+    kYnegAxisVector = _Constant(lambda cls: MVector(0.0, -1.0, 0.0))
+    kZnegAxisVector = _Constant(lambda cls: MVector(0.0, 0.0, -1.0))
+    kTolerance = 1.0e-10
+
+
+class MFloatVector(_Vector):
+    """Single precision vector."""
+
+    __slots__ = ()
+    _kDtype = np.float32
+
+    kZeroVector = _Constant(lambda cls: MFloatVector(0.0, 0.0, 0.0))
+    kOneVector = _Constant(lambda cls: MFloatVector(1.0, 1.0, 1.0))
+    kXaxisVector = _Constant(lambda cls: MFloatVector(1.0, 0.0, 0.0))
+    kYaxisVector = _Constant(lambda cls: MFloatVector(0.0, 1.0, 0.0))
+    kZaxisVector = _Constant(lambda cls: MFloatVector(0.0, 0.0, 1.0))
+    kTolerance = 1.0e-5
+
+    def isEquivalent(self, other, tolerance=1.0e-5):
+        """Check if the two vectors are the same within the tolerance."""
+        return _Vector.isEquivalent(self, other, tolerance)
+
+
+class _Point(object):
+    """Base class of the homogeneous points."""
+
+    __slots__ = ("_v",)
+    _kDtype = np.float64
+    _kVectorClass = MVector
+
+    def __init__(self, *args):
+        self._v = np.array([0.0, 0.0, 0.0, 1.0], dtype=self._kDtype)
+        if len(args) == 1:
+            source = args[0]
+            if isinstance(source, _Point):
+                self._v[:] = source._v
+            elif isinstance(source, _Vector):
+                self._v[:3] = source._v
+            else:
+                values = list(source)[:4]
+                self._v[:len(values)] = values
+        elif args:
+            self._v[:len(args)] = args
+
+    @classmethod
+    def _fromArray(cls, array):
+        result = cls()
+        result._v[:len(array)] = array
+        return result
+
+    x = property(lambda self: float(self._v[0]), lambda self, value: self._v.__setitem__(0, value))
+    y = property(lambda self: float(self._v[1]), lambda self, value: self._v.__setitem__(1, value))
+    z = property(lambda self: float(self._v[2]), lambda self, value: self._v.__setitem__(2, value))
+    w = property(lambda self: float(self._v[3]), lambda self, value: self._v.__setitem__(3, value))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return float(self._v[index])
+
+    def __setitem__(self, index, value):
+        self._v[index] = value
+
+    def __add__(self, other):
+        return self._fromArray(self.cartesianize()._v[:3] + other._v[:3])
+
+    def __sub__(self, other):
+        if isinstance(other, _Point):
+            return self._kVectorClass._fromArray(self.cartesianize()._v[:3] - other.cartesianize()._v[:3])
+        return self._fromArray(self.cartesianize()._v[:3] - other._v[:3])
+
+    def __mul__(self, other):
+        if _isNumber(other):
+            return self._fromArray(self._v * other)
+        if isinstance(other, _Matrix):
+            return self._fromArray(np.dot(self._v, other._m))
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if _isNumber(other):
+            return self._fromArray(self._v * other)
+        return NotImplemented
+
+    def __imul__(self, other):
+        if isinstance(other, _Matrix):
+            self._v[:] = np.dot(self._v, other._m)
+            return self
+        self._v *= other
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, _Point):
+            return False
+        return self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.%s(%s, %s, %s, %s)" % (type(self).__name__, self.x, self.y, self.z, self.w)
+
+    def cartesianize(self):
+        """Convert the point to cartesian form in place."""
+        if self._v[3] not in (0.0, 1.0):
+            self._v[:3] /= self._v[3]
+            self._v[3] = 1.0
+        return self
+
+    def homogenize(self):
+        """Convert the point to homogeneous form in place."""
+        self._v[:3] *= self._v[3]
+        return self
+
+    def distanceTo(self, other):
+        """Return the distance between the two points."""
+        delta = self.cartesianize()._v[:3] - other.cartesianize()._v[:3]
+        return float(np.sqrt(np.dot(delta, delta)))
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two points are the same within the tolerance."""
+        return bool(np.all(np.abs(self._v - other._v) <= tolerance))
+
+
+class MPoint(_Point):
+    """Double precision point."""
+
+    __slots__ = ()
+    kOrigin = _Constant(lambda cls: MPoint())
+    kTolerance = 1.0e-10
+
+
+class MFloatPoint(_Point):
+    """Single precision point."""
+
+    __slots__ = ()
+    _kDtype = np.float32
+    _kVectorClass = MFloatVector
+    kOrigin = _Constant(lambda cls: MFloatPoint())
+    kTolerance = 1.0e-5
+
+
+# ================================================================================================
+# Matrices
+# ================================================================================================
+
+class _Matrix(object):
+    """Base class of the 4x4 matrices."""
+
+    __slots__ = ("_m",)
+    _kDtype = np.float64
+
+    def __init__(self, source=None):
+        if source is None:
+            self._m = np.identity(4, dtype=self._kDtype)
+        elif isinstance(source, _Matrix):
+            self._m = np.array(source._m, dtype=self._kDtype)
+        else:
+            self._m = np.array(source, dtype=self._kDtype).reshape(4, 4)
+
+    @classmethod
+    def _fromArray(cls, array):
+        result = cls.__new__(cls)
+        result._m = np.array(array, dtype=cls._kDtype)
+        return result
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            return float(self._m[index])
+        if index < -16 or index > 15:
+            raise IndexError("index out of range")
+        return float(self._m.flat[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            self._m[index] = value
+        else:
+            self._m.flat[index] = value
+
+    def __mul__(self, other):
+        if isinstance(other, _Matrix):
+            return self._fromArray(np.dot(self._m, other._m))
+        if _isNumber(other):
+            return self._fromArray(self._m * other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if _isNumber(other):
+            return self._fromArray(self._m * other)
+        return NotImplemented
+
+    def __imul__(self, other):
+        if isinstance(other, _Matrix):
+            self._m[:] = np.dot(self._m, other._m)
+        else:
+            self._m *= other
+        return self
+
+    def __add__(self, other):
+        return self._fromArray(self._m + other._m)
+
+    def __iadd__(self, other):
+        self._m += other._m
+        return self
+
+    def __sub__(self, other):
+        return self._fromArray(self._m - other._m)
+
+    def __isub__(self, other):
+        self._m -= other._m
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, _Matrix):
+            return False
+        return self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.%s(%s)" % (type(self).__name__, self._m.tolist())
+
+    def __str__(self):
+        return str(tuple(tuple(row) for row in self._m.tolist()))
+
+    def getElement(self, row, col):
+        """Return the element at the given row and column."""
+        return float(self._m[row, col])
+
+    def setElement(self, row, col, value):
+        """Set the element at the given row and column."""
+        self._m[row, col] = value
+        return self
+
+    def setToIdentity(self):
+        """Set the matrix to identity."""
+        self._m[:] = np.identity(4)
+        return self
+
+    def setToProduct(self, left, right):
+        """Set the matrix to the product of left and right."""
+        self._m[:] = np.dot(left._m, right._m)
+        return self
+
+    def inverse(self):
+        """Return the inverse of the matrix."""
+        return self._fromArray(np.linalg.inv(self._m))
+
+    def transpose(self):
+        """Return the transpose of the matrix."""
+        return self._fromArray(self._m.T)
+
+    def adjoint(self):
+        """Return the adjoint of the matrix."""
+        return self._fromArray(np.linalg.inv(self._m) * np.linalg.det(self._m))
+
+    def homogenize(self):
+        """Return a homogenized copy of the matrix."""
+        return self._fromArray(self._m / self._m[3, 3])
+
+    def det4x4(self):
+        """Return the determinant of the matrix."""
+        return float(np.linalg.det(self._m))
+
+    def det3x3(self):
+        """Return the determinant of the upper left 3x3 matrix."""
+        return float(np.linalg.det(self._m[:3, :3]))
+
+    def isSingular(self):
+        """Check if the matrix is singular."""
+        return abs(self.det4x4()) < 1.0e-10
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two matrices are the same within the tolerance."""
+        return bool(np.all(np.abs(self._m - other._m) <= tolerance))
+
+
+class MMatrix(_Matrix):
+    """Double precision matrix."""
+
+    __slots__ = ()
+    kIdentity = _Constant(lambda cls: MMatrix())
+    kTolerance = 1.0e-10
+
+
+class MFloatMatrix(_Matrix):
+    """Single precision matrix."""
+
+    __slots__ = ()
+    _kDtype = np.float32
+    kIdentity = _Constant(lambda cls: MFloatMatrix())
+    kTolerance = 1.0e-5
+
+    def isEquivalent(self, other, tolerance=1.0e-5):
+        """Check if the two matrices are the same within the tolerance."""
+        return _Matrix.isEquivalent(self, other, tolerance)
+
+
+# ================================================================================================
+# Rotations
+# ================================================================================================
+
+class MQuaternion(object):
+    """Quaternion rotation in (x, y, z, w) order. The product a * b applies a first and b after."""
+
+    __slots__ = ("_q",)
+
+    kIdentity = _Constant(lambda cls: MQuaternion())
+    kTolerance = 1.0e-10
+
+    def __init__(self, *args):
+        if not args:
+            self._q = quaternion.identity()
+        elif len(args) == 1:
+            source = args[0]
+            self._q = np.array(source._q if isinstance(source, MQuaternion) else list(source), dtype=np.float64)
+        elif len(args) == 4:
+            self._q = np.array(args, dtype=np.float64)
+        elif _isNumber(args[0]):
+            self._q = quaternion.fromAxisAngle(args[1]._v, args[0])
+        else:
+            self._q = quaternion.fromTwoVectors(args[0]._v[:3], args[1]._v[:3])
+            if len(args) > 2 and args[2] != 1.0:
+                self._q = MQuaternion.slerp(MQuaternion(), self, args[2])._q
+
+    @classmethod
+    def _fromArray(cls, array):
+        result = cls.__new__(cls)
+        result._q = np.array(array, dtype=np.float64)
+        return result
+
+    x = property(lambda self: float(self._q[0]), lambda self, value: self._q.__setitem__(0, value))
+    y = property(lambda self: float(self._q[1]), lambda self, value: self._q.__setitem__(1, value))
+    z = property(lambda self: float(self._q[2]), lambda self, value: self._q.__setitem__(2, value))
+    w = property(lambda self: float(self._q[3]), lambda self, value: self._q.__setitem__(3, value))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return float(self._q[index])
+
+    def __setitem__(self, index, value):
+        self._q[index] = value
+
+    def __mul__(self, other):
+        if isinstance(other, MQuaternion):
+            return MQuaternion._fromArray(quaternion.multiply(self._q, other._q))
+        if _isNumber(other):
+            return MQuaternion._fromArray(self._q * other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if _isNumber(other):
+            return MQuaternion._fromArray(self._q * other)
+        return NotImplemented
+
+    def __imul__(self, other):
+        if isinstance(other, MQuaternion):
+            self._q[:] = quaternion.multiply(self._q, other._q)
+        else:
+            self._q *= other
+        return self
+
+    def __add__(self, other):
+        return MQuaternion._fromArray(self._q + other._q)
+
+    def __sub__(self, other):
+        return MQuaternion._fromArray(self._q - other._q)
+
+    def __neg__(self):
+        return MQuaternion._fromArray(-self._q)
+
+    def __eq__(self, other):
+        if not isinstance(other, MQuaternion):
+            return False
+        return self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MQuaternion(%s, %s, %s, %s)" % (self.x, self.y, self.z, self.w)
+
+    def setValue(self, *args):
+        """Set the value of the quaternion. Accepts the same arguments of the constructor."""
+        self._q = MQuaternion(*args)._q
+        return self
+
+    def inverse(self):
+        """Return the inverse of the quaternion."""
+        return MQuaternion._fromArray(quaternion.inverse(self._q))
+
+    def invertIt(self):
+        """Invert the quaternion in place."""
+        self._q[:] = quaternion.inverse(self._q)
+        return self
+
+    def conjugate(self):
+        """Return the conjugate of the quaternion."""
+        return MQuaternion._fromArray(quaternion.conjugate(self._q))
+
+    def conjugateIt(self):
+        """Conjugate the quaternion in place."""
+        self._q[:3] *= -1.0
+        return self
+
+    def negateIt(self):
+        """Negate the quaternion in place."""
+        self._q *= -1.0
+        return self
+
+    def normal(self):
+        """Return a normalized copy of the quaternion."""
+        return MQuaternion._fromArray(quaternion.normalize(self._q))
+
+    def normalizeIt(self):
+        """Normalize the quaternion in place."""
+        self._q[:] = quaternion.normalize(self._q)
+        return self
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two quaternions are the same within the tolerance."""
+        return bool(np.all(np.abs(self._q - other._q) <= tolerance))
+
+    def asMatrix(self):
+        """Return the rotation matrix of the quaternion."""
+        matrix = MMatrix()
+        matrix._m[:3, :3] = quaternion.asMatrix(quaternion.normalize(self._q))
+        return matrix
+
+    def asEulerRotation(self):
+        """Return the rotation as a MEulerRotation in xyz order."""
+        angles = euler.fromQuaternion(self._q, MEulerRotation.kXYZ)
+        return MEulerRotation(angles, MEulerRotation.kXYZ)
+
+    def asAxisAngle(self):
+        """Return a tuple with the rotation axis (MVector) and angle in radians."""
+        quat = quaternion.normalize(self._q)
+        sinHalf = float(np.sqrt(np.dot(quat[:3], quat[:3])))
+        if sinHalf < 1.0e-10:
+            return (MVector(0.0, 0.0, 1.0), 0.0)
+        return (MVector._fromArray(quat[:3] / sinHalf), 2.0 * math.atan2(sinHalf, quat[3]))
+
+    def setToXAxis(self, angle):
+        """Set the quaternion as a rotation around the x axis."""
+        self._q = quaternion.fromAxisAngle([1.0, 0.0, 0.0], angle)
+        return self
+
+    def setToYAxis(self, angle):
+        """Set the quaternion as a rotation around the y axis."""
+        self._q = quaternion.fromAxisAngle([0.0, 1.0, 0.0], angle)
+        return self
+
+    def setToZAxis(self, angle):
+        """Set the quaternion as a rotation around the z axis."""
+        self._q = quaternion.fromAxisAngle([0.0, 0.0, 1.0], angle)
+        return self
+
+    def log(self):
+        """Return the natural log of the quaternion."""
+        axis, angle = self.asAxisAngle()
+        return MQuaternion._fromArray(np.append(axis._v * angle * 0.5, 0.0))
+
+    def exp(self):
+        """Return the exponential of a pure quaternion."""
+        halfAngle = float(np.sqrt(np.dot(self._q[:3], self._q[:3])))
+        if halfAngle < 1.0e-10:
+            return MQuaternion()
+        axis = self._q[:3] / halfAngle
+        return MQuaternion._fromArray(np.append(axis * math.sin(halfAngle), math.cos(halfAngle)))
+
+    @staticmethod
+    def slerp(quatA, quatB, blend, spin=0):
+        """Spherical interpolation along the shortest path between two quaternions."""
+        return MQuaternion._fromArray(quaternion.slerp(quatA._q, quatB._q, blend, spin))
+
+
+class MEulerRotation(object):
+    """Euler rotation in radians. The rotation order kXYZ rotates around x first, then y and then z."""
+
+    __slots__ = ("_e", "order")
+
+    kXYZ = 0
+    kYZX = 1
+    kZXY = 2
+    kXZY = 3
+    kYXZ = 4
+    kZYX = 5
+    kIdentity = _Constant(lambda cls: MEulerRotation())
+    kTolerance = 1.0e-10
+
+    def __init__(self, *args):
+        self._e = np.zeros(3)
+        self.order = MEulerRotation.kXYZ
+        if not args:
+            return
+        source = args[0]
+        if isinstance(source, MEulerRotation):
+            self._e[:] = source._e
+            self.order = source.order
+        elif isinstance(source, _Vector):
+            self._e[:] = source._v
+            if len(args) > 1:
+                self.order = int(args[1])
+        elif _isNumber(source):
+            self._e[:] = args[:3]
+            if len(args) > 3:
+                self.order = int(args[3])
+        else:
+            self._e[:] = list(source)[:3]
+            if len(args) > 1:
+                self.order = int(args[1])
+
+    @classmethod
+    def _fromArray(cls, array, order):
+        result = cls.__new__(cls)
+        result._e = np.array(array, dtype=np.float64)
+        result.order = order
+        return result
+
+    x = property(lambda self: float(self._e[0]), lambda self, value: self._e.__setitem__(0, value))
+    y = property(lambda self: float(self._e[1]), lambda self, value: self._e.__setitem__(1, value))
+    z = property(lambda self: float(self._e[2]), lambda self, value: self._e.__setitem__(2, value))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        if index < -3 or index > 2:
+            raise IndexError("index out of range")
+        return float(self._e[index])
+
+    def __setitem__(self, index, value):
+        self._e[index] = value
+
+    def __add__(self, other):
+        return MEulerRotation._fromArray(self._e + other._e, self.order)
+
+    def __iadd__(self, other):
+        self._e += other._e
+        return self
+
+    def __sub__(self, other):
+        return MEulerRotation._fromArray(self._e - other._e, self.order)
+
+    def __isub__(self, other):
+        self._e -= other._e
+        return self
+
+    def __neg__(self):
+        return MEulerRotation._fromArray(-self._e, self.order)
+
+    def __mul__(self, other):
+        if _isNumber(other):
+            return MEulerRotation._fromArray(self._e * other, self.order)
+        if isinstance(other, (MEulerRotation, MQuaternion)):
+            otherQuat = other.asQuaternion() if isinstance(other, MEulerRotation) else other
+            quat = quaternion.multiply(self.asQuaternion()._q, otherQuat._q)
+            return MEulerRotation._fromArray(euler.fromQuaternion(quat, self.order), self.order)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if _isNumber(other):
+            return MEulerRotation._fromArray(self._e * other, self.order)
+        return NotImplemented
+
+    def __imul__(self, other):
+        result = self * other
+        self._e[:] = result._e
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, MEulerRotation):
+            return False
+        return self.order == other.order and bool(np.all(self._e == other._e))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MEulerRotation(%s, %s, %s, %s)" % (self.x, self.y, self.z, self.order)
+
+    def setValue(self, *args):
+        """Set the value of the rotation. Accepts the same arguments of the constructor."""
+        other = MEulerRotation(*args)
+        self._e[:] = other._e
+        self.order = other.order
+        return self
+
+    def asQuaternion(self):
+        """Return the rotation as a MQuaternion."""
+        return MQuaternion._fromArray(euler.toQuaternion(self._e, self.order))
+
+    def asMatrix(self):
+        """Return the rotation matrix."""
+        return self.asQuaternion().asMatrix()
+
+    def asVector(self):
+        """Return the three angles as a MVector."""
+        return MVector._fromArray(self._e)
+
+    def reorder(self, order):
+        """Return a copy of the rotation with a new rotation order, keeping the same orientation."""
+        return MEulerRotation(self).reorderIt(order)
+
+    def reorderIt(self, order):
+        """Change the rotation order in place, keeping the same orientation."""
+        order = int(order)
+        if order != self.order:
+            self._e[:] = euler.reorder(self._e, self.order, order)
+            self.order = order
+        return self
+
+    def bound(self):
+        """Return a copy with every angle wrapped to [-pi, pi]."""
+        return MEulerRotation(self).boundIt()
+
+    def boundIt(self):
+        """Wrap every angle to [-pi, pi] in place."""
+        self._e[:] = euler.bound(self._e)
+        return self
+
+    def inverse(self):
+        """Return the inverse rotation."""
+        quat = quaternion.inverse(self.asQuaternion()._q)
+        return MEulerRotation._fromArray(euler.fromQuaternion(quat, self.order), self.order)
+
+    def invertIt(self):
+        """Invert the rotation in place."""
+        self._e[:] = self.inverse()._e
+        return self
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two rotations are the same within the tolerance."""
+        return self.order == other.order and bool(np.all(np.abs(self._e - other._e) <= tolerance))
+
+    def isZero(self, tolerance=1.0e-10):
+        """Check if every angle is zero within the tolerance."""
+        return bool(np.all(np.abs(self._e) <= tolerance))
+
+    def alternateSolution(self):
+        """Return the alternate angles that produce the same orientation."""
+        return MEulerRotation._fromArray(euler.alternateSolution(self._e, self.order), self.order)
+
+    def setToAlternateSolution(self):
+        """Set the rotation to its alternate solution."""
+        self._e[:] = self.alternateSolution()._e
+        return self
+
+    def closestCut(self, target):
+        """Return the rotation with every angle shifted by 2pi multiples to be closest to target."""
+        return MEulerRotation._fromArray(euler.closestCut(self._e, target._e), self.order)
+
+    def setToClosestCut(self, target):
+        """Shift every angle by 2pi multiples to be closest to target."""
+        self._e[:] = self.closestCut(target)._e
+        return self
+
+    def closestSolution(self, target):
+        """Return the solution closest to target between this rotation and its alternate solution."""
+        return MEulerRotation._fromArray(euler.closestSolution(self._e, self.order, target._e), self.order)
+
+    def setToClosestSolution(self, target):
+        """Set the rotation to the solution closest to target."""
+        self._e[:] = self.closestSolution(target)._e
+        return self
+
+    @staticmethod
+    def decompose(matrix, order):
+        """Extract the rotation of a matrix using the given rotation order."""
+        return MEulerRotation(euler.fromMatrix(matrix._m, order), order)
+
+
+class MTransformationMatrix(object):
+    """Transformation decomposed in scale, shear, rotation and translation. Composed as S * Sh * R * T."""
+
+    kInvalid = 0
+    kXYZ = 1
+    kYZX = 2
+    kZXY = 3
+    kXZY = 4
+    kYXZ = 5
+    kZYX = 6
+    kLast = 7
+    kTolerance = 1.0e-10
+    kIdentity = _Constant(lambda cls: MTransformationMatrix())
+
+    def __init__(self, source=None):
+        self._t = np.zeros(3)
+        self._q = quaternion.identity()
+        self._euler = None
+        self._order = MEulerRotation.kXYZ
+        self._s = np.ones(3)
+        self._sh = np.zeros(3)
+        if isinstance(source, MTransformationMatrix):
+            self._t[:] = source._t
+            self._q[:] = source._q
+            self._euler = None if source._euler is None else np.array(source._euler)
+            self._order = source._order
+            self._s[:] = source._s
+            self._sh[:] = source._sh
+        elif source is not None:
+            self._decompose(np.asarray(source._m, dtype=np.float64))
+
+    def _decompose(self, matrix):
+        """Decompose a 4x4 matrix in translation, rotation, scale and shear."""
+        self._t[:], self._q[:], self._s[:], self._sh[:] = transform.decompose(matrix)
+        self._euler = None
+
+    def _rotationMatrix(self):
+        return quaternion.asMatrix(self._q)
+
+    def asMatrix(self, percent=None):
+        """Return the composed matrix."""
+        if percent is not None:
+            blend = MTransformationMatrix(self)
+            blend._t *= percent
+            blend._s = 1.0 + (self._s - 1.0) * percent
+            blend._sh *= percent
+            blend._q = MQuaternion.slerp(MQuaternion(), MQuaternion._fromArray(self._q), percent)._q
+            return blend.asMatrix()
+        return MMatrix._fromArray(transform.compose(self._t, self._q, self._s, self._sh))
+
+    def asMatrixInverse(self):
+        """Return the inverse of the composed matrix."""
+        return self.asMatrix().inverse()
+
+    def asRotateMatrix(self):
+        """Return the rotation matrix."""
+        return MQuaternion._fromArray(self._q).asMatrix()
+
+    def asScaleMatrix(self):
+        """Return the scale and shear matrix."""
+        matrix = MTransformationMatrix()
+        matrix._s[:] = self._s
+        matrix._sh[:] = self._sh
+        return matrix.asMatrix()
+
+    def translation(self, space=MSpace.kTransform):
+        """Return the translation as a MVector."""
+        # pylint: disable=unused-argument
+        return MVector._fromArray(self._t)
+
+    def setTranslation(self, vector, space=MSpace.kTransform):
+        """Set the translation."""
+        # pylint: disable=unused-argument
+        self._t[:] = list(vector)[:3]
+        return self
+
+    def translateBy(self, vector, space=MSpace.kTransform):
+        """Add a translation."""
+        # pylint: disable=unused-argument
+        self._t += list(vector)[:3]
+        return self
+
+    def rotation(self, asQuaternion=False):
+        """Return the rotation as a MEulerRotation in the rotation order or as a MQuaternion."""
+        if asQuaternion:
+            return MQuaternion._fromArray(self._q)
+        if self._euler is not None:
+            return MEulerRotation._fromArray(self._euler, self._order)
+        return MEulerRotation(euler.fromMatrix(self._rotationMatrix(), self._order), self._order)
+
+    def rotationComponents(self, asQuaternion=False):
+        """Return the rotation as a list of 3 angles or 4 quaternion components."""
+        if asQuaternion:
+            return self._q.tolist()
+        return self.rotation()._e.tolist()
+
+    def setRotation(self, rotation):
+        """Set the rotation from a MQuaternion or a MEulerRotation."""
+        if isinstance(rotation, MEulerRotation):
+            self._q[:] = euler.toQuaternion(rotation._e, rotation.order)
+            self._euler = np.array(rotation._e)
+            self._order = rotation.order
+        else:
+            self._q[:] = rotation._q
+            self._euler = None
+        return self
+
+    def rotateBy(self, rotation, space=MSpace.kTransform):
+        """Add a rotation. Object space rotations are applied before the current rotation."""
+        if isinstance(rotation, MEulerRotation):
+            rotation = rotation.asQuaternion()
+        if space in (MSpace.kObject, MSpace.kPreTransform):
+            self._q[:] = quaternion.multiply(rotation._q, self._q)
+        else:
+            self._q[:] = quaternion.multiply(self._q, rotation._q)
+        self._euler = None
+        return self
+
+    def rotationOrder(self):
+        """Return the rotation order, using the MTransformationMatrix enumeration."""
+        return self._order + 1
+
+    def reorderRotation(self, order):
+        """Change the rotation order, using the MTransformationMatrix enumeration."""
+        self._order = int(order) - 1
+        self._euler = None
+        return self
+
+    def scale(self, space=MSpace.kTransform):
+        """Return the scale as a list of 3 floats."""
+        # pylint: disable=unused-argument
+        return self._s.tolist()
+
+    def setScale(self, scale, space=MSpace.kTransform):
+        """Set the scale."""
+        # pylint: disable=unused-argument
+        self._s[:] = list(scale)[:3]
+        return self
+
+    def scaleBy(self, scale, space=MSpace.kTransform):
+        """Multiply the scale."""
+        # pylint: disable=unused-argument
+        self._s *= list(scale)[:3]
+        return self
+
+    def shear(self, space=MSpace.kTransform):
+        """Return the shear as a list of 3 floats."""
+        # pylint: disable=unused-argument
+        return self._sh.tolist()
+
+    def setShear(self, shear, space=MSpace.kTransform):
+        """Set the shear."""
+        # pylint: disable=unused-argument
+        self._sh[:] = list(shear)[:3]
+        return self
+
+    def shearBy(self, shear, space=MSpace.kTransform):
+        """Multiply the shear."""
+        # pylint: disable=unused-argument
+        self._sh *= list(shear)[:3]
+        return self
+
+    def isEquivalent(self, other, tolerance=1.0e-10):
+        """Check if the two transformations are the same within the tolerance."""
+        return self.asMatrix().isEquivalent(other.asMatrix(), tolerance)
+
+    def __eq__(self, other):
+        return isinstance(other, MTransformationMatrix) and self.isEquivalent(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+# ================================================================================================
+# Arrays
+# ================================================================================================
+
+class _Array(list):
+    """Base class of the om2 array types."""
+
+    def __init__(self, *args):
+        if len(args) == 2 and isinstance(args[0], int):
+            list.__init__(self, [args[1]] * args[0])
+        elif len(args) == 1 and isinstance(args[0], int):
+            list.__init__(self, [self._kDefault()] * args[0])
+        elif args:
+            list.__init__(self, args[0])
+        else:
+            list.__init__(self)
+
+    @staticmethod
+    def _kDefault():
+        return 0
+
+    def clear(self):
+        """Remove every element."""
+        del self[:]
+
+    def remove(self, index):
+        """Remove the element at the given index."""
+        del self[index]
+
+    def setLength(self, length):
+        """Resize the array."""
+        if length < len(self):
+            del self[length:]
+        else:
+            self.extend([self._kDefault()] * (length - len(self)))
+
+    def copy(self, source):
+        """Replace the content with a copy of the source array."""
+        self[:] = list(source)
+        return self
+
+
+class MIntArray(_Array):
+    """Array of ints."""
+
+
+class MFloatArray(_Array):
+    """Array of floats."""
+
+    @staticmethod
+    def _kDefault():
+        return 0.0
+
+
+class MDoubleArray(MFloatArray):
+    """Array of doubles."""
+
+
+class MPointArray(_Array):
+    """Array of MPoints."""
+
+    @staticmethod
+    def _kDefault():
+        return MPoint()
+
+
+class MVectorArray(_Array):
+    """Array of MVectors."""
+
+    @staticmethod
+    def _kDefault():
+        return MVector()
+
+
+class MMatrixArray(_Array):
+    """Array of MMatrix."""
+
+    @staticmethod
+    def _kDefault():
+        return MMatrix()
+
+
+class MPlugArray(_Array):
+    """Array of MPlugs."""
+
+    @staticmethod
+    def _kDefault():
+        return MPlug()
+
+
+class MObjectArray(_Array):
+    """Array of MObjects."""
+
+    @staticmethod
+    def _kDefault():
+        return MObject()
+
+
+class MCallbackIdArray(_Array):
+    """Array of callback ids."""
+
+
+# ================================================================================================
+# Objects and globals
+# ================================================================================================
+
+class MObject(object):
+    """Handle to an internal object: an attribute, a node or a data object."""
+
+    __slots__ = ("_data",)
+
+    kNullObj = _Constant(lambda cls: MObject())
+
+    def __init__(self, source=None):
+        self._data = source._data if isinstance(source, MObject) else None
+
+    @classmethod
+    def _wrap(cls, data):
+        result = cls()
+        result._data = data
+        return result
+
+    def isNull(self):
+        """Check if the object is empty."""
+        return self._data is None
+
+    def hasFn(self, fnType):
+        """Check if the object is compatible with the function set type."""
+        if self._data is None:
+            return False
+        return fnType in self._data.kFnTypes
+
+    def apiType(self):
+        """Return the type of the object."""
+        if self._data is None:
+            return MFn.kInvalid
+        return self._data.kFnTypes[-1]
+
+    def apiTypeStr(self):
+        """Return the name of the object type."""
+        for name, value in vars(MFn).items():
+            if value == self.apiType() and name.startswith("k"):
+                return name
+        return "kInvalid"
+
+    def __eq__(self, other):
+        if isinstance(other, MPlug):
+            return other.__eq__(self)
+        if not isinstance(other, MObject):
+            return False
+        return self._data is other._data
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return id(self._data)
+
+    def __repr__(self):
+        if self._data is None:
+            return "maya.api.OpenMaya.MObject(null)"
+        return "maya.api.OpenMaya.MObject(%r)" % self._data
+
+
+class MTypeId(object):
+    """Unique id of a node type."""
+
+    def __init__(self, first=0, second=None):
+        self._id = first if second is None else ((first << 8) | second)
+
+    def id(self):
+        """Return the id as an int."""
+        return self._id
+
+    def __eq__(self, other):
+        return isinstance(other, MTypeId) and other._id == self._id
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._id)
+
+
+class MGlobal(object):
+    """Global functions. Messages are sent to the gfTools.testing logger."""
+
+    kInteractive = 0
+    kBatch = 1
+    kLibraryApp = 2
+
+    @staticmethod
+    def displayInfo(msg):
+        """Log an information message."""
+        kLogger.info(msg)
+
+    @staticmethod
+    def displayWarning(msg):
+        """Log a warning message."""
+        kLogger.warning(msg)
+
+    @staticmethod
+    def displayError(msg):
+        """Log an error message."""
+        kLogger.error(msg)
+
+    @staticmethod
+    def mayaState():
+        """Return the application state."""
+        return MGlobal.kLibraryApp
+
+
+# ================================================================================================
+# Attributes
+# ================================================================================================
+
+class _AttributeSpec(object):
+    """Static description of an attribute."""
+
+    kFnTypes = (MFn.kBase, MFn.kAttribute)
+    kFlags = ("readable", "writable", "storable", "keyable", "array", "channelBox", "hidden", "connectable",
+              "cached", "indexMatters", "usesArrayDataBuilder", "affectsAppearance", "affectsWorldSpace",
+              "internal", "isProxyAttribute", "worldSpace", "renderSource", "dynamic")
+
+    def __init__(self, kind, longName, shortName, dataType=None, default=None, fnType=MFn.kAttribute):
+        self.kind = kind
+        self.longName = longName
+        self.shortName = shortName
+        self.dataType = dataType
+        self.default = default
+        self.children = []
+        self.parent = None
+        self.fields = OrderedDict()
+        self.limits = {}
+        self.flags = dict((flag, False) for flag in _AttributeSpec.kFlags)
+        self.flags.update(readable=True, writable=True, storable=True, connectable=True, cached=True,
+                          indexMatters=True)
+        self.kFnTypes = _AttributeSpec.kFnTypes + (fnType,)
+
+    def __repr__(self):
+        return "Attribute(%s)" % self.longName
+
+    def ancestors(self):
+        """Return the list of parents from the root to this attribute."""
+        chain = [self]
+        while chain[0].parent is not None:
+            chain.insert(0, chain[0].parent)
+        return chain
+
+    def descendants(self):
+        """Return every child of this attribute, recursively."""
+        result = []
+        for child in self.children:
+            result.append(child)
+            result.extend(child.descendants())
+        return result
+
+    def clamp(self, value):
+        """Clamp a scalar value to the hard limits."""
+        if "min" in self.limits and _isNumber(value):
+            value = max(value, self.limits["min"])
+        if "max" in self.limits and _isNumber(value):
+            value = min(value, self.limits["max"])
+        return value
+
+
+def _attributeFlag(name):
+    """Create a property that reads and writes a flag of the current attribute."""
+    def getter(self):
+        return self._spec.flags[name]
+
+    def setter(self, value):
+        self._spec.flags[name] = bool(value)
+    return property(getter, setter)
+
+
+class MFnBase(object):
+    """Base class of the function sets."""
+
+    def __init__(self, mob=None):
+        self._object = MObject() if mob is None else MObject(mob)
+
+    def object(self):
+        """Return the object attached to the function set."""
+        return MObject(self._object)
+
+    def setObject(self, mob):
+        """Attach the function set to an object."""
+        self._object = MObject(mob)
+        return self
+
+    def hasObj(self, mob):
+        """Check if the object is compatible with the function set."""
+        return not mob.isNull()
+
+
+class MFnAttribute(MFnBase):
+    """Base function set of the attributes."""
+
+    kNothing = 0
+    kDelete = 1
+    kReset = 2
+
+    def __init__(self, mob=None):
+        MFnBase.__init__(self, mob)
+
+    @property
+    def _spec(self):
+        if self._object.isNull():
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        return self._object._data
+
+    def _createSpec(self, kind, longName, shortName, dataType=None, default=None, fnType=MFn.kAttribute):
+        spec = _AttributeSpec(kind, longName, shortName, dataType, default, fnType)
+        self._object = MObject._wrap(spec)
+        return MObject(self._object)
+
+    @property
+    def name(self):
+        """The long name of the attribute."""
+        return self._spec.longName
+
+    @property
+    def shortName(self):
+        """The short name of the attribute."""
+        return self._spec.shortName
+
+    @property
+    def parent(self):
+        """The parent attribute."""
+        return MObject._wrap(self._spec.parent)
+
+    @property
+    def disconnectBehavior(self):
+        """What happens to the attribute when disconnected."""
+        return self._spec.flags.get("disconnectBehavior", MFnAttribute.kNothing)
+
+    @disconnectBehavior.setter
+    def disconnectBehavior(self, value):
+        self._spec.flags["disconnectBehavior"] = value
+
+    def accepts(self, dataType):
+        """Check if the attribute accepts the data type."""
+        return self._spec.dataType == dataType
+
+    def setNiceNameOverride(self, name):
+        """Set the nice name of the attribute."""
+        self._spec.flags["niceName"] = name
+
+    def addToCategory(self, category):
+        """Add the attribute to a category."""
+        self._spec.flags.setdefault("categories", []).append(category)
+
+
+for _flag in _AttributeSpec.kFlags:
+    setattr(MFnAttribute, _flag, _attributeFlag(_flag))
+
+
+class MFnData(MFnBase):
+    """Base function set of the data objects."""
+    kInvalid = 0
+    kNumeric = 1
+    kPlugin = 2
+    kPluginGeometry = 3
+    kString = 4
+    kMatrix = 5
+    kStringArray = 6
+    kDoubleArray = 7
+    kFloatArray = 8
+    kIntArray = 9
+    kPointArray = 10
+    kVectorArray = 11
+    kMatrixArray = 12
+    kComponentList = 13
+    kMesh = 14
+    kLattice = 15
+    kNurbsCurve = 16
+    kNurbsSurface = 17
+    kSphere = 18
+    kDynArrayAttrs = 19
+    kSubdSurface = 20
+    kLast = 21
+
+
+class MFnNumericData(MFnData):
+    """Numeric data types."""
+    kInvalid = 0
+    kBoolean = 1
+    kByte = 2
+    kChar = 3
+    kShort = 4
+    k2Short = 5
+    k3Short = 6
+    kLong = 7
+    kInt = 7
+    k2Long = 8
+    k2Int = 8
+    k3Long = 9
+    k3Int = 9
+    kInt64 = 10
+    kFloat = 11
+    k2Float = 12
+    k3Float = 13
+    kDouble = 14
+    k2Double = 15
+    k3Double = 16
+    k4Double = 17
+    kAddr = 18
+    kLast = 19
+
+
+_kFloatTypes = (MFnNumericData.kFloat, MFnNumericData.k2Float, MFnNumericData.k3Float)
+_kIntTypes = (MFnNumericData.kBoolean, MFnNumericData.kByte, MFnNumericData.kChar, MFnNumericData.kShort,
+              MFnNumericData.kLong, MFnNumericData.kInt64)
+
+
+class MFnNumericAttribute(MFnAttribute):
+    """Function set of the numeric attributes."""
+
+    def create(self, longName, shortName, dataTypeOrChild, defaultOrChild=0, child3=None):
+        """Create a numeric attribute, or a numeric compound when the children are given."""
+        if isinstance(dataTypeOrChild, MObject):
+            children = [dataTypeOrChild, defaultOrChild]
+            if child3 is not None and not child3.isNull():
+                children.append(child3)
+            childTypes = set(child._data.dataType for child in children)
+            dataType = childTypes.pop() if len(childTypes) == 1 else MFnNumericData.kDouble
+            mob = self._createSpec("numeric", longName, shortName, dataType, None, MFn.kNumericAttribute)
+            for child in children:
+                child._data.parent = self._spec
+                self._spec.children.append(child._data)
+            return mob
+        default = defaultOrChild
+        if dataTypeOrChild == MFnNumericData.kBoolean:
+            default = bool(default)
+        elif dataTypeOrChild in _kIntTypes:
+            default = int(default)
+        else:
+            default = float(default)
+        return self._createSpec("numeric", longName, shortName, dataTypeOrChild, default, MFn.kNumericAttribute)
+
+    def _createTriple(self, longName, shortName, suffixes):
+        children = [self.create(longName + suffix, shortName + suffix.lower(), MFnNumericData.kFloat, 0.0)
+                    for suffix in suffixes]
+        return self.create(longName, shortName, children[0], children[1], children[2])
+
+    def createPoint(self, longName, shortName):
+        """Create a float3 compound with X, Y and Z children."""
+        return self._createTriple(longName, shortName, ("X", "Y", "Z"))
+
+    def createColor(self, longName, shortName):
+        """Create a float3 compound with R, G and B children."""
+        mob = self._createTriple(longName, shortName, ("R", "G", "B"))
+        self._spec.flags["usedAsColor"] = True
+        return mob
+
+    def createAddr(self, longName, shortName, default=0):
+        """Create an address attribute."""
+        return self.create(longName, shortName, MFnNumericData.kAddr, default)
+
+    def numericType(self):
+        """Return the numeric data type."""
+        return self._spec.dataType
+
+    def _setLimit(self, key, value):
+        spec = self._spec
+        if spec.children:
+            for child, childValue in zip(spec.children, value):
+                child.limits[key] = childValue
+        else:
+            spec.limits[key] = value
+
+    def setMin(self, *args):
+        """Set the minimum value."""
+        self._setLimit("min", args[0] if len(args) == 1 else args)
+
+    def setMax(self, *args):
+        """Set the maximum value."""
+        self._setLimit("max", args[0] if len(args) == 1 else args)
+
+    def setSoftMin(self, *args):
+        """Set the soft minimum value."""
+        self._setLimit("softMin", args[0] if len(args) == 1 else args)
+
+    def setSoftMax(self, *args):
+        """Set the soft maximum value."""
+        self._setLimit("softMax", args[0] if len(args) == 1 else args)
+
+    def getMin(self):
+        """Return the minimum value."""
+        return self._spec.limits.get("min")
+
+    def getMax(self):
+        """Return the maximum value."""
+        return self._spec.limits.get("max")
+
+    def hasMin(self):
+        """Check if the attribute has a minimum value."""
+        return "min" in self._spec.limits
+
+    def hasMax(self):
+        """Check if the attribute has a maximum value."""
+        return "max" in self._spec.limits
+
+    @property
+    def default(self):
+        """The default value of the attribute."""
+        spec = self._spec
+        if spec.children:
+            return tuple(child.default for child in spec.children)
+        return spec.default
+
+    @default.setter
+    def default(self, value):
+        spec = self._spec
+        if spec.children:
+            for child, childValue in zip(spec.children, value):
+                child.default = childValue
+        else:
+            spec.default = value
+
+
+class MFnUnitAttribute(MFnAttribute):
+    """Function set of the unit attributes. Angles are stored in radians."""
+    kInvalid = 0
+    kAngle = 1
+    kDistance = 2
+    kTime = 3
+    kLast = 4
+
+    def create(self, longName, shortName, unitType, default=0.0):
+        """Create a unit attribute."""
+        if isinstance(default, (MAngle, MDistance)):
+            default = default.asRadians() if isinstance(default, MAngle) else default.value
+        return self._createSpec("unit", longName, shortName, unitType, float(default), MFn.kUnitAttribute)
+
+    def unitType(self):
+        """Return the unit type."""
+        return self._spec.dataType
+
+    @staticmethod
+    def _value(value):
+        if isinstance(value, MAngle):
+            return value.asRadians()
+        if isinstance(value, MDistance):
+            return value.value
+        return float(value)
+
+    def setMin(self, value):
+        """Set the minimum value."""
+        self._spec.limits["min"] = self._value(value)
+
+    def setMax(self, value):
+        """Set the maximum value."""
+        self._spec.limits["max"] = self._value(value)
+
+    def setSoftMin(self, value):
+        """Set the soft minimum value."""
+        self._spec.limits["softMin"] = self._value(value)
+
+    def setSoftMax(self, value):
+        """Set the soft maximum value."""
+        self._spec.limits["softMax"] = self._value(value)
+
+    @property
+    def default(self):
+        """The default value of the attribute."""
+        return self._spec.default
+
+    @default.setter
+    def default(self, value):
+        self._spec.default = self._value(value)
+
+
+class MFnEnumAttribute(MFnAttribute):
+    """Function set of the enum attributes."""
+
+    def create(self, longName, shortName, default=0):
+        """Create an enum attribute."""
+        return self._createSpec("enum", longName, shortName, MFnNumericData.kShort, int(default), MFn.kEnumAttribute)
+
+    def addField(self, fieldName, value):
+        """Add a field to the enum."""
+        self._spec.fields[fieldName] = int(value)
+
+    def fieldName(self, value):
+        """Return the name of the field with the given value."""
+        for name, fieldValue in self._spec.fields.items():
+            if fieldValue == value:
+                return name
+        raise RuntimeError("(kInvalidParameter): Value not found")
+
+    def fieldValue(self, fieldName):
+        """Return the value of the field with the given name."""
+        return self._spec.fields[fieldName]
+
+    def getMin(self):
+        """Return the smallest field value."""
+        return min(self._spec.fields.values())
+
+    def getMax(self):
+        """Return the biggest field value."""
+        return max(self._spec.fields.values())
+
+    @property
+    def default(self):
+        """The default value of the attribute."""
+        return self._spec.default
+
+    @default.setter
+    def default(self, value):
+        self._spec.default = int(value)
+
+
+class MFnMatrixAttribute(MFnAttribute):
+    """Function set of the matrix attributes."""
+    kFloat = 0
+    kDouble = 1
+
+    def create(self, longName, shortName, matrixType=1):
+        """Create a matrix attribute."""
+        return self._createSpec("matrix", longName, shortName, matrixType, None, MFn.kMatrixAttribute)
+
+    @property
+    def default(self):
+        """The default value of the attribute."""
+        return MMatrix() if self._spec.default is None else MMatrix(self._spec.default)
+
+    @default.setter
+    def default(self, value):
+        self._spec.default = np.array(value._m, dtype=np.float64)
+
+
+class MFnTypedAttribute(MFnAttribute):
+    """Function set of the typed attributes."""
+
+    def create(self, longName, shortName, dataType, default=None):
+        """Create a typed attribute."""
+        default = None if default is None or default.isNull() else MObject(default)
+        return self._createSpec("typed", longName, shortName, dataType, default, MFn.kTypedAttribute)
+
+    def attrType(self):
+        """Return the data type."""
+        return self._spec.dataType
+
+    @property
+    def default(self):
+        """The default value of the attribute."""
+        return MObject() if self._spec.default is None else MObject(self._spec.default)
+
+    @default.setter
+    def default(self, value):
+        self._spec.default = MObject(value)
+
+
+class MFnCompoundAttribute(MFnAttribute):
+    """Function set of the compound attributes."""
+
+    def create(self, longName, shortName):
+        """Create a compound attribute."""
+        return self._createSpec("compound", longName, shortName, None, None, MFn.kCompoundAttribute)
+
+    def addChild(self, child):
+        """Add a child attribute."""
+        child._data.parent = self._spec
+        self._spec.children.append(child._data)
+
+    def removeChild(self, child):
+        """Remove a child attribute."""
+        self._spec.children.remove(child._data)
+        child._data.parent = None
+
+    def numChildren(self):
+        """Return the number of children."""
+        return len(self._spec.children)
+
+    def child(self, index):
+        """Return the child attribute at the given index."""
+        return MObject._wrap(self._spec.children[index])
+
+
+class MFnGenericAttribute(MFnAttribute):
+    """Function set of the generic attributes."""
+
+    def create(self, longName, shortName):
+        """Create a generic attribute."""
+        return self._createSpec("typed", longName, shortName, None, None, MFn.kTypedAttribute)
+
+    def addDataType(self, dataType):
+        """Accept a data type."""
+        pass
+
+    def addNumericType(self, numericType):
+        """Accept a numeric data type."""
+        pass
+
+
+class MRampAttribute(object):
+    """Curve ramp attribute. Entries are stored as (position, value, interpolation) tuples."""
+    kNone = 0
+    kLinear = 1
+    kSmooth = 2
+    kSpline = 3
+
+    def __init__(self, node=None, attribute=None):
+        if isinstance(node, MPlug):
+            self._cell = node._resolve(create=True)
+        elif node is not None:
+            self._cell = MPlug(node, attribute)._resolve(create=True)
+        else:
+            self._cell = None
+
+    @staticmethod
+    def createCurveRamp(longName, shortName):
+        """Create a curve ramp attribute."""
+        fnAttr = MFnAttribute()
+        return fnAttr._createSpec("ramp", longName, shortName, None, [(0.0, 0.0, MRampAttribute.kLinear)],
+                                  MFn.kCompoundAttribute)
+
+    @staticmethod
+    def createColorRamp(longName, shortName):
+        """Create a color ramp attribute. Only the curve ramp evaluation is supported."""
+        return MRampAttribute.createCurveRamp(longName, shortName)
+
+    @property
+    def _entries(self):
+        return self._cell.value
+
+    def isCurveRamp(self):
+        """Check if the ramp is a curve ramp."""
+        return True
+
+    def isColorRamp(self):
+        """Check if the ramp is a color ramp."""
+        return False
+
+    def numEntries(self):
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def getEntries(self):
+        """Return a tuple with the indices, positions, values and interpolations of the entries."""
+        entries = self._entries
+        return (MIntArray(range(len(entries))), MFloatArray([entry[0] for entry in entries]),
+                MFloatArray([entry[1] for entry in entries]), MIntArray([entry[2] for entry in entries]))
+
+    def addEntries(self, positions, values, interps):
+        """Add entries to the ramp."""
+        for entry in zip(positions, values, interps):
+            self._entries.append((float(entry[0]), float(entry[1]), int(entry[2])))
+
+    def deleteEntries(self, indices):
+        """Delete entries from the ramp."""
+        for index in sorted(indices, reverse=True):
+            del self._entries[index]
+
+    def setValueAtIndex(self, value, index):
+        """Set the value of an entry."""
+        entry = self._entries[index]
+        self._entries[index] = (entry[0], float(value), entry[2])
+
+    def setPositionAtIndex(self, position, index):
+        """Set the position of an entry."""
+        entry = self._entries[index]
+        self._entries[index] = (float(position), entry[1], entry[2])
+
+    def setInterpolationAtIndex(self, interp, index):
+        """Set the interpolation of an entry."""
+        entry = self._entries[index]
+        self._entries[index] = (entry[0], entry[1], int(interp))
+
+    def getValueAtPosition(self, position):
+        """Evaluate the ramp at the given position."""
+        return _evaluateRamp(self._entries, position)
+
+
+def _evaluateRamp(entries, position):
+    """Evaluate a list of ramp entries at the given position."""
+    if not entries:
+        return 0.0
+    points = sorted(entries)
+    if position <= points[0][0]:
+        return points[0][1]
+    if position >= points[-1][0]:
+        return points[-1][1]
+    index = 1
+    while points[index][0] < position:
+        index += 1
+    start = points[index - 1]
+    end = points[index]
+    span = end[0] - start[0]
+    blend = (position - start[0]) / span if span > 0.0 else 0.0
+    interp = start[2]
+    if interp == MRampAttribute.kNone:
+        return start[1]
+    if interp == MRampAttribute.kSmooth:
+        blend = blend * blend * (3.0 - 2.0 * blend)
+    elif interp == MRampAttribute.kSpline:
+        before = points[index - 2][1] if index > 1 else start[1]
+        after = points[index + 1][1] if index + 1 < len(points) else end[1]
+        tangentStart = 0.5 * (end[1] - before)
+        tangentEnd = 0.5 * (after - start[1])
+        blendSquared = blend * blend
+        blendCubed = blendSquared * blend
+        return ((2.0 * blendCubed - 3.0 * blendSquared + 1.0) * start[1] +
+                (blendCubed - 2.0 * blendSquared + blend) * tangentStart +
+                (-2.0 * blendCubed + 3.0 * blendSquared) * end[1] +
+                (blendCubed - blendSquared) * tangentEnd)
+    return start[1] + (end[1] - start[1]) * blend
+
+
+# ================================================================================================
+# Data objects
+# ================================================================================================
+
+class _MatrixData(object):
+    """Matrix data object."""
+    kFnTypes = (MFn.kData, MFn.kMatrixData)
+
+    def __init__(self, matrix=None):
+        self.matrix = MMatrix() if matrix is None else MMatrix(matrix)
+
+
+class _NurbsCurveData(object):
+    """Nurbs curve data object."""
+    kFnTypes = (MFn.kData, MFn.kNurbsCurveData, MFn.kNurbsCurve)
+
+    def __init__(self):
+        self.cvs = np.zeros((0, 3))
+        self.knots = np.zeros(0)
+        self.degree = 1
+        self.form = 1
+        self._lengthTable = None
+
+
+class MFnMatrixData(MFnData):
+    """Function set of the matrix data objects."""
+
+    def create(self, matrix=None):
+        """Create a matrix data object."""
+        self._object = MObject._wrap(_MatrixData(matrix))
+        return MObject(self._object)
+
+    def matrix(self):
+        """Return the matrix."""
+        return MMatrix(self._object._data.matrix)
+
+    def set(self, matrix):
+        """Set the matrix."""
+        self._object._data.matrix = MMatrix(matrix)
+        return self
+
+    def transformation(self):
+        """Return the matrix as a MTransformationMatrix."""
+        return MTransformationMatrix(self._object._data.matrix)
+
+    def isTransformation(self):
+        """Check if the data was set with a MTransformationMatrix."""
+        return False
+
+
+class MFnNurbsCurveData(MFnData):
+    """Function set of the nurbs curve data objects."""
+
+    def create(self):
+        """Create an empty nurbs curve data object."""
+        self._object = MObject._wrap(_NurbsCurveData())
+        return MObject(self._object)
+
+
+class MFnNurbsCurve(MFnBase):
+    """Function set of the nurbs curves. Only the evaluation methods used by the nodes are supported.
+    Knots follow the Maya convention: numCVs + degree - 1 values."""
+    kInvalid = 0
+    kOpen = 1
+    kClosed = 2
+    kPeriodic = 3
+    kLast = 4
+
+    kLengthSamples = 512
+
+    @property
+    def _curve(self):
+        if self._object.isNull():
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        return self._object._data
+
+    def create(self, cvs, knots, degree, form, is2D, rational, parent=None):
+        """Create a curve inside the parent data object."""
+        # pylint: disable=unused-argument, too-many-arguments
+        if parent is None or parent.isNull():
+            parent = MFnNurbsCurveData().create()
+        self._object = MObject(parent)
+        curve = self._curve
+        curve.cvs = np.array([[point[0], point[1], point[2]] for point in cvs], dtype=np.float64)
+        curve.knots = np.array(list(knots), dtype=np.float64)
+        curve.degree = int(degree)
+        curve.form = form
+        curve._lengthTable = None
+        return MObject(parent)
+
+    def updateCurve(self):
+        """Notify the curve changed."""
+        self._curve._lengthTable = None
+
+    @property
+    def numCVs(self):
+        """The number of cvs."""
+        return len(self._curve.cvs)
+
+    @property
+    def degree(self):
+        """The degree of the curve."""
+        return self._curve.degree
+
+    @property
+    def numSpans(self):
+        """The number of spans."""
+        return len(self._curve.cvs) - self._curve.degree
+
+    @property
+    def knotDomain(self):
+        """The (min, max) parameter of the curve."""
+        curve = self._curve
+        return (float(curve.knots[curve.degree - 1]), float(curve.knots[-curve.degree]))
+
+    def cvPositions(self, space=MSpace.kObject):
+        """Return the cvs as a MPointArray."""
+        # pylint: disable=unused-argument
+        return MPointArray([MPoint(cv) for cv in self._curve.cvs])
+
+    def knots(self):
+        """Return the knots as a MDoubleArray."""
+        return MDoubleArray(self._curve.knots.tolist())
+
+    def _evaluate(self, params):
+        """Evaluate the curve at an array of parameters with the de Boor algorithm."""
+        curve = self._curve
+        degree = curve.degree
+        knots = np.concatenate([curve.knots[:1], curve.knots, curve.knots[-1:]])
+        params = np.clip(np.asarray(params, dtype=np.float64), *self.knotDomain)
+        spans = np.searchsorted(knots, params, side="right") - 1
+        spans = np.clip(spans, degree, len(curve.cvs) - 1)
+        points = np.stack([curve.cvs[spans - degree + i] for i in range(degree + 1)], axis=1)
+        for level in range(1, degree + 1):
+            for i in range(degree, level - 1, -1):
+                left = knots[spans - degree + i]
+                right = knots[spans + 1 + i - level]
+                denom = np.where(right - left > 0.0, right - left, 1.0)
+                alpha = ((params - left) / denom)[:, np.newaxis]
+                points[:, i] = (1.0 - alpha) * points[:, i - 1] + alpha * points[:, i]
+        return points[:, degree]
+
+    def _lengths(self):
+        """Return the parameters and cumulative lengths used to measure the curve."""
+        curve = self._curve
+        if curve._lengthTable is None:
+            start, end = self.knotDomain
+            params = np.linspace(start, end, MFnNurbsCurve.kLengthSamples + 1)
+            points = self._evaluate(params)
+            segments = np.sqrt(np.sum(np.diff(points, axis=0) ** 2, axis=1))
+            curve._lengthTable = (params, np.concatenate([[0.0], np.cumsum(segments)]))
+        return curve._lengthTable
+
+    def getPointAtParam(self, param, space=MSpace.kObject):
+        """Return the point at the given parameter."""
+        # pylint: disable=unused-argument
+        return MPoint(self._evaluate([param])[0])
+
+    def length(self, tolerance=1.0e-3):
+        """Return the arc length of the curve."""
+        # pylint: disable=unused-argument
+        return float(self._lengths()[1][-1])
+
+    def findParamFromLength(self, length, tolerance=1.0e-3):
+        """Return the parameter at the given arc length."""
+        # pylint: disable=unused-argument
+        params, lengths = self._lengths()
+        return float(np.interp(length, lengths, params))
+
+    def findLengthFromParam(self, param):
+        """Return the arc length at the given parameter."""
+        params, lengths = self._lengths()
+        return float(np.interp(param, params, lengths))
+
+
+# ================================================================================================
+# Node data: cells, data handles and data block
+# ================================================================================================
+
+class _Cell(object):
+    """Storage of one attribute instance. Arrays store elements, compounds store children."""
+
+    __slots__ = ("spec", "value", "children", "elements")
+
+    def __init__(self, spec, isElement=False):
+        self.spec = spec
+        self.value = None
+        self.children = None
+        self.elements = None
+        if spec.flags["array"] and not isElement:
+            self.elements = {}
+        elif spec.kind == "ramp":
+            self.value = list(spec.default)
+        elif spec.children:
+            self.children = OrderedDict((child, _Cell(child)) for child in spec.children)
+        elif spec.kind == "matrix":
+            self.value = np.identity(4) if spec.default is None else np.array(spec.default)
+        else:
+            self.value = spec.default
+
+    def element(self, index, create=False):
+        """Return the element cell at the logical index."""
+        cell = self.elements.get(index)
+        if cell is None:
+            if not create:
+                raise RuntimeError("(kInvalidParameter): Element %s of %s does not exist" % (index, self.spec.longName))
+            cell = _Cell(self.spec, isElement=True)
+            self.elements[index] = cell
+        return cell
+
+    def indices(self):
+        """Return the existing logical indices, sorted."""
+        return sorted(self.elements)
+
+
+def _toFloat(spec, value):
+    """Convert a value to the storage precision of the attribute."""
+    if spec.dataType in _kFloatTypes:
+        return float(np.float32(value))
+    return float(value)
+
+
+def _assign(cell, value):
+    """Store a Python value into a cell, converting om2 types and sequences."""
+    spec = cell.spec
+    if cell.elements is not None:
+        cell.elements.clear()
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for index, item in items:
+            _assign(cell.element(int(index), create=True), item)
+    elif spec.kind == "ramp":
+        cell.value = [(float(entry[0]), float(entry[1]), int(entry[2]) if len(entry) > 2 else MRampAttribute.kLinear)
+                      for entry in value]
+    elif cell.children is not None:
+        if isinstance(value, dict):
+            lookup = dict((child.longName, child) for child in spec.children)
+            lookup.update((child.shortName, child) for child in spec.children)
+            for name, item in value.items():
+                _assign(cell.children[lookup[name]], item)
+        else:
+            if isinstance(value, MEulerRotation):
+                value = value._e
+            for child, item in zip(cell.children.values(), list(value)):
+                _assign(child, item)
+    elif spec.kind == "matrix":
+        if isinstance(value, _Matrix):
+            value = value._m
+        dtype = np.float32 if spec.dataType == MFnMatrixAttribute.kFloat else np.float64
+        cell.value = np.array(value, dtype=dtype).reshape(4, 4)
+    elif spec.kind == "typed":
+        cell.value = value
+    elif spec.kind == "unit":
+        cell.value = spec.clamp(value.asRadians() if isinstance(value, MAngle) else float(value))
+    elif spec.kind == "enum":
+        cell.value = int(value)
+    elif spec.dataType == MFnNumericData.kBoolean:
+        cell.value = bool(value)
+    elif spec.dataType in _kIntTypes:
+        cell.value = int(spec.clamp(int(value)))
+    else:
+        cell.value = _toFloat(spec, spec.clamp(value))
+
+
+def _toPython(cell):
+    """Convert a cell to a Python value: floats, tuples, numpy matrices, lists and dicts."""
+    if cell.elements is not None:
+        return [_toPython(cell.elements[index]) for index in cell.indices()]
+    if cell.spec.kind == "ramp":
+        return list(cell.value)
+    if cell.children is not None:
+        if cell.spec.kind == "numeric":
+            return tuple(child.value for child in cell.children.values())
+        return OrderedDict((child.longName, _toPython(childCell)) for child, childCell in cell.children.items())
+    if cell.spec.kind == "matrix":
+        return np.array(cell.value, dtype=np.float64)
+    return cell.value
+
+
+class MDataHandle(object):
+    """Access to the data of one attribute instance."""
+
+    __slots__ = ("_cell", "_state")
+
+    def __init__(self, cell=None, state=None):
+        if isinstance(cell, MDataHandle):
+            self._cell = cell._cell
+            self._state = cell._state
+        else:
+            self._cell = cell
+            self._state = state
+
+    def _childValues(self):
+        return [child.value for child in self._cell.children.values()]
+
+    def isNull(self):
+        """Check if the handle is empty."""
+        return self._cell is None
+
+    def isNumeric(self):
+        """Check if the handle contains numeric data."""
+        return self._cell.spec.kind in ("numeric", "unit", "enum")
+
+    def type(self):
+        """Return the data type of the handle."""
+        spec = self._cell.spec
+        if spec.kind == "matrix":
+            return MFnData.kMatrix
+        if spec.kind == "typed":
+            return spec.dataType
+        return MFnData.kNumeric
+
+    def numericType(self):
+        """Return the numeric data type."""
+        return self._cell.spec.dataType
+
+    def attribute(self):
+        """Return the attribute of the handle."""
+        return MObject._wrap(self._cell.spec)
+
+    def data(self):
+        """Return the data object of the handle."""
+        return self.asMObject()
+
+    def child(self, attribute):
+        """Return the handle of a child attribute."""
+        spec = attribute._data if isinstance(attribute, MObject) else attribute.attribute()._data
+        return MDataHandle(self._cell.children[spec], self._state)
+
+    def asBool(self):
+        """Return the value as bool."""
+        return bool(self._cell.value)
+
+    def asChar(self):
+        """Return the value as char."""
+        return int(self._cell.value)
+
+    asShort = asChar
+    asInt = asChar
+    asLong = asChar
+    asInt64 = asChar
+
+    def asFloat(self):
+        """Return the value as float."""
+        return float(np.float32(self._cell.value))
+
+    def asDouble(self):
+        """Return the value as double."""
+        return float(self._cell.value)
+
+    asDistance = asDouble
+
+    def asAngle(self):
+        """Return the value as MAngle."""
+        return MAngle(self._cell.value)
+
+    def asGenericDouble(self):
+        """Return a generic attribute value as double."""
+        return float(self._cell.value)
+
+    def asFloat2(self):
+        """Return the value as a list of 2 floats."""
+        return [float(np.float32(value)) for value in self._childValues()[:2]]
+
+    def asDouble2(self):
+        """Return the value as a list of 2 doubles."""
+        return [float(value) for value in self._childValues()[:2]]
+
+    def asFloat3(self):
+        """Return the value as a list of 3 floats."""
+        return [float(np.float32(value)) for value in self._childValues()[:3]]
+
+    def asDouble3(self):
+        """Return the value as a list of 3 doubles."""
+        return [float(value) for value in self._childValues()[:3]]
+
+    def asShort2(self):
+        """Return the value as a list of 2 ints."""
+        return [int(value) for value in self._childValues()[:2]]
+
+    def asShort3(self):
+        """Return the value as a list of 3 ints."""
+        return [int(value) for value in self._childValues()[:3]]
+
+    asInt2 = asShort2
+    asInt3 = asShort3
+
+    def asVector(self):
+        """Return the value as MVector."""
+        return MVector(self._childValues())
+
+    def asFloatVector(self):
+        """Return the value as MFloatVector."""
+        return MFloatVector(self._childValues())
+
+    def asMatrix(self):
+        """Return the value as MMatrix."""
+        value = self._cell.value
+        if isinstance(value, MObject):
+            return value._data.matrix
+        return MMatrix._fromArray(value)
+
+    def asFloatMatrix(self):
+        """Return the value as MFloatMatrix."""
+        return MFloatMatrix._fromArray(self._cell.value)
+
+    def asString(self):
+        """Return the value as string."""
+        return "" if self._cell.value is None else str(self._cell.value)
+
+    def asMObject(self):
+        """Return the value as a data MObject."""
+        spec = self._cell.spec
+        if spec.kind == "matrix":
+            return MFnMatrixData().create(MMatrix._fromArray(self._cell.value))
+        value = self._cell.value
+        return MObject() if value is None else MObject(value)
+
+    asNurbsCurve = asMObject
+    asNurbsSurface = asMObject
+    asMesh = asMObject
+
+    def asMDataHandle(self):
+        """Return the handle itself."""
+        return self
+
+    def _set(self, value):
+        _assign(self._cell, value)
+
+    def setBool(self, value):
+        """Set a bool value."""
+        self._cell.value = bool(value)
+
+    def setChar(self, value):
+        """Set an int value."""
+        self._cell.value = int(value)
+
+    setShort = setChar
+    setInt = setChar
+    setInt64 = setChar
+
+    def setFloat(self, value):
+        """Set a float value."""
+        self._cell.value = float(np.float32(value))
+
+    def setDouble(self, value):
+        """Set a double value."""
+        self._cell.value = float(value)
+
+    setGenericDouble = setDouble
+
+    def setMAngle(self, value):
+        """Set an angle value."""
+        self._cell.value = value.asRadians()
+
+    def setMDistance(self, value):
+        """Set a distance value."""
+        self._cell.value = value.value
+
+    def set2Float(self, x, y):
+        """Set a float2 value."""
+        self._set((x, y))
+
+    set2Double = set2Float
+    set2Short = set2Float
+    set2Int = set2Float
+
+    def set3Float(self, x, y, z):
+        """Set a float3 value."""
+        self._set((x, y, z))
+
+    set3Double = set3Float
+    set3Short = set3Float
+    set3Int = set3Float
+
+    def setMVector(self, value):
+        """Set a vector value."""
+        self._set(value._v[:3])
+
+    setMFloatVector = setMVector
+
+    def setMMatrix(self, value):
+        """Set a matrix value."""
+        self._set(value._m)
+
+    setMFloatMatrix = setMMatrix
+
+    def setString(self, value):
+        """Set a string value."""
+        self._cell.value = str(value)
+
+    def setMObject(self, value):
+        """Set a data object."""
+        if self._cell.spec.kind == "matrix":
+            self._set(value._data.matrix)
+        else:
+            self._cell.value = MObject(value)
+
+    def copy(self, other):
+        """Copy the data of another handle."""
+        if other._cell.elements is not None or other._cell.children is not None:
+            _assign(self._cell, _toPython(other._cell))
+        else:
+            self._cell.value = other._cell.value
+
+    def setClean(self):
+        """Mark the attribute as clean."""
+        if self._state is not None:
+            self._state.setClean(self._cell.spec)
+
+
+class MArrayDataBuilder(object):
+    """Builder used to add and remove elements of an array."""
+
+    def __init__(self, *args):
+        if len(args) == 3:
+            dataBlock, attribute, count = args
+            self._cell = dataBlock.outputArrayValue(attribute)._cell
+            self._state = dataBlock._state
+        else:
+            self._cell, self._state, count = args
+        self._elements = dict(self._cell.elements)
+        self._spec = self._cell.spec
+        self._reserved = count
+
+    def __len__(self):
+        return len(self._elements)
+
+    def addElement(self, index):
+        """Add an element at the logical index and return its handle."""
+        cell = self._elements.get(index)
+        if cell is None:
+            cell = _Cell(self._spec, isElement=True)
+            self._elements[index] = cell
+        return MDataHandle(cell, self._state)
+
+    def addElementArray(self, index):
+        """Add an element at the logical index and return its array handle."""
+        return MArrayDataHandle(self.addElement(index))
+
+    def addLast(self):
+        """Add an element after the last one and return its handle."""
+        index = max(self._elements) + 1 if self._elements else 0
+        return self.addElement(index)
+
+    def addLastArray(self):
+        """Add an element after the last one and return its array handle."""
+        return MArrayDataHandle(self.addLast())
+
+    def removeElement(self, index):
+        """Remove the element at the logical index."""
+        if index not in self._elements:
+            raise RuntimeError("(kInvalidParameter): Element %s does not exist" % index)
+        del self._elements[index]
+        return self
+
+    def elementCount(self):
+        """Return the number of elements."""
+        return len(self._elements)
+
+    def growArray(self, count):
+        """Reserve space for more elements."""
+        self._reserved += count
+        return self
+
+    def setGrowSize(self, size):
+        """Set the grow size of the builder."""
+        pass
+
+
+class MArrayDataHandle(object):
+    """Access to the elements of an array attribute."""
+
+    __slots__ = ("_cell", "_state", "_indices", "_position")
+
+    def __init__(self, handle, state=None):
+        if isinstance(handle, (MDataHandle, MArrayDataHandle)):
+            self._cell = handle._cell
+            self._state = handle._state
+        else:
+            self._cell = handle
+            self._state = state
+        if self._cell.elements is None:
+            raise RuntimeError("(kInvalidParameter): Data handle is not an array")
+        self._indices = self._cell.indices()
+        self._position = 0
+
+    def __len__(self):
+        return len(self._indices)
+
+    def elementCount(self):
+        """Return the number of elements."""
+        return len(self._indices)
+
+    def jumpToLogicalElement(self, index):
+        """Move to the element at the logical index."""
+        if index not in self._cell.elements:
+            raise RuntimeError("(kInvalidParameter): Element %s of %s does not exist" % (index, self._cell.spec.longName))
+        self._position = self._indices.index(index)
+
+    jumpToElement = jumpToLogicalElement
+
+    def jumpToPhysicalElement(self, position):
+        """Move to the element at the physical position."""
+        if position < 0 or position >= len(self._indices):
+            raise RuntimeError("(kInvalidParameter): Element position %s is out of range" % position)
+        self._position = position
+
+    def elementLogicalIndex(self):
+        """Return the logical index of the current element."""
+        if self._position >= len(self._indices):
+            raise RuntimeError("(kFailure): Array handle is at the end")
+        return self._indices[self._position]
+
+    elementIndex = elementLogicalIndex
+
+    def next(self):
+        """Move to the next element. Return False at the end of the array."""
+        self._position += 1
+        return self._position < len(self._indices)
+
+    def _current(self):
+        if self._position >= len(self._indices):
+            raise RuntimeError("(kFailure): Array handle is at the end")
+        return self._cell.elements[self._indices[self._position]]
+
+    def inputValue(self):
+        """Return the handle of the current element."""
+        return MDataHandle(self._current(), self._state)
+
+    outputValue = inputValue
+
+    def inputArrayValue(self):
+        """Return the array handle of the current element."""
+        return MArrayDataHandle(self.inputValue())
+
+    outputArrayValue = inputArrayValue
+
+    def builder(self):
+        """Return a builder with the current elements."""
+        return MArrayDataBuilder(self._cell, self._state, len(self._indices))
+
+    def set(self, builder):
+        """Replace the elements with the builder elements."""
+        self._cell.elements.clear()
+        self._cell.elements.update(builder._elements)
+        self._indices = self._cell.indices()
+        self._position = 0
+
+    def setClean(self):
+        """Mark the array as clean."""
+        if self._state is not None:
+            self._state.setClean(self._cell.spec)
+
+    setAllClean = setClean
+
+
+class MDataBlock(object):
+    """Data of one node, passed to compute()."""
+
+    def __init__(self, state):
+        self._state = state
+
+    def _cell(self, attribute):
+        if isinstance(attribute, MPlug):
+            return attribute._resolve(create=True)
+        return self._state.rootCell(attribute._data)
+
+    def inputValue(self, attribute):
+        """Return the handle of an attribute or plug."""
+        return MDataHandle(self._cell(attribute), self._state)
+
+    outputValue = inputValue
+
+    def inputArrayValue(self, attribute):
+        """Return the array handle of an attribute or plug."""
+        return MArrayDataHandle(self._cell(attribute), self._state)
+
+    outputArrayValue = inputArrayValue
+
+    def setClean(self, attribute):
+        """Mark an attribute or plug as clean."""
+        spec = attribute._spec if isinstance(attribute, MPlug) else attribute._data
+        self._state.setClean(spec)
+
+    def isClean(self, attribute):
+        """Check if an attribute or plug is clean."""
+        spec = attribute._spec if isinstance(attribute, MPlug) else attribute._data
+        return self._state.isClean(spec)
+
+    def context(self):
+        """Return the evaluation context."""
+        return MDGContext()
+
+
+class MDGContext(object):
+    """Evaluation context. Only the normal context exists."""
+
+    kNormal = _Constant(lambda cls: MDGContext())
+
+    def isNormal(self):
+        """Check if this is the normal context."""
+        return True
+
+    def getTime(self):
+        """Return the time of the context."""
+        return 0.0
+
+
+# ================================================================================================
+# Plugs
+# ================================================================================================
+
+class MPlug(object):
+    """Plug of a node attribute. The path stores the logical index of every array in the attribute chain."""
+
+    __slots__ = ("_state", "_spec", "_indices")
+
+    def __init__(self, node=None, attribute=None):
+        if isinstance(node, MPlug):
+            self._state = node._state
+            self._spec = node._spec
+            self._indices = dict(node._indices)
+        else:
+            self._state = None if node is None else node._data
+            self._spec = None if attribute is None else attribute._data
+            self._indices = {}
+
+    @classmethod
+    def _create(cls, state, spec, indices=None):
+        plug = cls.__new__(cls)
+        plug._state = state
+        plug._spec = spec
+        plug._indices = dict(indices or {})
+        return plug
+
+    def _resolve(self, create=False):
+        """Return the cell of the plug."""
+        chain = self._spec.ancestors()
+        cell = self._state.rootCell(chain[0])
+        for depth, spec in enumerate(chain):
+            if depth > 0:
+                cell = cell.children[spec]
+            if cell.elements is not None:
+                if spec not in self._indices:
+                    if depth == len(chain) - 1:
+                        return cell
+                    raise RuntimeError("(kInvalidParameter): Plug %s has no logical index" % spec.longName)
+                cell = cell.element(self._indices[spec], create=create)
+        return cell
+
+    @property
+    def isNull(self):
+        """The plug is empty."""
+        return self._spec is None
+
+    @property
+    def isArray(self):
+        """The plug is an array."""
+        return self._spec.flags["array"] and self._spec not in self._indices
+
+    @property
+    def isElement(self):
+        """The plug is an element of an array."""
+        return self._spec.flags["array"] and self._spec in self._indices
+
+    @property
+    def isCompound(self):
+        """The plug has children."""
+        return bool(self._spec.children)
+
+    @property
+    def isChild(self):
+        """The plug is a child of a compound."""
+        return self._spec.parent is not None
+
+    @property
+    def isConnected(self):
+        """The plug is connected. Connections are not supported."""
+        return False
+
+    isDestination = isConnected
+    isSource = isConnected
+
+    @property
+    def isKeyable(self):
+        """The plug is keyable."""
+        return self._spec.flags["keyable"]
+
+    @property
+    def isDynamic(self):
+        """The plug is dynamic."""
+        return False
+
+    @property
+    def info(self):
+        """The plug name."""
+        return self.name()
+
+    def attribute(self):
+        """Return the attribute of the plug."""
+        return MObject._wrap(self._spec)
+
+    def node(self):
+        """Return the node of the plug."""
+        return self._state.mobject()
+
+    def logicalIndex(self):
+        """Return the logical index of the element."""
+        if not self.isElement:
+            raise RuntimeError("(kInvalidParameter): Plug is not an array element")
+        return self._indices[self._spec]
+
+    def elementByLogicalIndex(self, index):
+        """Return the element plug at the logical index."""
+        plug = MPlug._create(self._state, self._spec, self._indices)
+        plug._indices[self._spec] = int(index)
+        return plug
+
+    def elementByPhysicalIndex(self, position):
+        """Return the element plug at the physical position."""
+        return self.elementByLogicalIndex(self._resolve().indices()[position])
+
+    def numElements(self):
+        """Return the number of existing elements."""
+        return len(self._resolve().elements)
+
+    evaluateNumElements = numElements
+
+    def getExistingArrayAttributeIndices(self):
+        """Return the logical indices of the existing elements."""
+        return MIntArray(self._resolve().indices())
+
+    def array(self):
+        """Return the array plug of an element."""
+        plug = MPlug._create(self._state, self._spec, self._indices)
+        plug._indices.pop(self._spec, None)
+        return plug
+
+    def numChildren(self):
+        """Return the number of children."""
+        return len(self._spec.children)
+
+    def child(self, childOrIndex):
+        """Return the plug of a child by index or attribute."""
+        spec = self._spec.children[childOrIndex] if isinstance(childOrIndex, int) else childOrIndex._data
+        return MPlug._create(self._state, spec, self._indices)
+
+    def parent(self):
+        """Return the plug of the parent compound."""
+        return MPlug._create(self._state, self._spec.parent, self._indices)
+
+    def partialName(self, includeNodeName=False, includeNonMandatoryIndices=False, includeInstancedIndices=False,
+                    useAlias=False, useFullAttributePath=False, useLongNames=False):
+        """Return the name of the plug."""
+        # pylint: disable=unused-argument, too-many-arguments
+        chain = self._spec.ancestors()
+        names = []
+        for spec in chain:
+            name = spec.longName if useLongNames else spec.shortName
+            if spec in self._indices:
+                name = "%s[%s]" % (name, self._indices[spec])
+            names.append(name)
+        hasIndices = any(spec in self._indices for spec in chain[:-1])
+        name = ".".join(names) if useFullAttributePath or hasIndices else names[-1]
+        if includeNodeName:
+            name = "%s.%s" % (self._state.name, name)
+        return name
+
+    def name(self):
+        """Return the node name and the plug long name."""
+        return self.partialName(includeNodeName=True, useLongNames=True)
+
+    def connectedTo(self, asDst, asSrc):
+        """Return the plugs connected to this plug. Connections are not supported."""
+        # pylint: disable=unused-argument
+        return MPlugArray()
+
+    def source(self):
+        """Return the source plug of the connection. Connections are not supported."""
+        return MPlug()
+
+    def destinations(self):
+        """Return the destination plugs of the connections. Connections are not supported."""
+        return MPlugArray()
+
+    def asMDataHandle(self):
+        """Return a data handle of the plug, creating the element if it doesn't exists."""
+        return MDataHandle(self._resolve(create=True), self._state)
+
+    def _value(self):
+        return self._resolve(create=True).value
+
+    def asBool(self):
+        """Return the value as bool."""
+        return bool(self._value())
+
+    def asInt(self):
+        """Return the value as int."""
+        return int(self._value())
+
+    asShort = asInt
+    asChar = asInt
+
+    def asFloat(self):
+        """Return the value as float."""
+        return float(np.float32(self._value()))
+
+    def asDouble(self):
+        """Return the value as double."""
+        return float(self._value())
+
+    def asMAngle(self):
+        """Return the value as MAngle."""
+        return MAngle(self._value())
+
+    def asString(self):
+        """Return the value as string."""
+        return str(self._value())
+
+    def asMObject(self):
+        """Return the value as a data MObject."""
+        return self.asMDataHandle().asMObject()
+
+    def _setValue(self, value):
+        self._state.setValue(self, value)
+
+    def setBool(self, value):
+        """Set a bool value."""
+        self._setValue(bool(value))
+
+    def setInt(self, value):
+        """Set an int value."""
+        self._setValue(int(value))
+
+    setShort = setInt
+    setChar = setInt
+
+    def setFloat(self, value):
+        """Set a float value."""
+        self._setValue(float(value))
+
+    setDouble = setFloat
+
+    def setMAngle(self, value):
+        """Set an angle value."""
+        self._setValue(value.asRadians())
+
+    def setString(self, value):
+        """Set a string value."""
+        self._setValue(str(value))
+
+    def setMObject(self, value):
+        """Set a data object."""
+        if self._spec.kind == "matrix":
+            self._setValue(value._data.matrix)
+        else:
+            self._setValue(MObject(value))
+
+    def setMDataHandle(self, handle):
+        """Set the value from a data handle."""
+        self._setValue(_toPython(handle._cell))
+
+    def __eq__(self, other):
+        if isinstance(other, MObject):
+            return self._spec is other._data
+        if isinstance(other, MPlug):
+            return self._state is other._state and self._spec is other._spec and self._indices == other._indices
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self._state), id(self._spec), tuple(sorted((id(k), v) for k, v in self._indices.items()))))
+
+    def __repr__(self):
+        if self._spec is None:
+            return "maya.api.OpenMaya.MPlug(null)"
+        return "maya.api.OpenMaya.MPlug(%s)" % self.name()
+
+
+# ================================================================================================
+# Nodes
+# ================================================================================================
+
+class _NodeState(object):
+    """Data and dirty state of one node instance."""
+
+    kFnTypes = (MFn.kBase, MFn.kNamedObject, MFn.kDependencyNode, MFn.kPluginDependNode)
+
+    def __init__(self, nodeClass, name):
+        self.nodeClass = nodeClass
+        self.name = name
+        self.node = None
+        self.cells = OrderedDict((spec, _Cell(spec)) for spec in MPxNode._gfAllAttributes(nodeClass))
+        self.clean = set()
+        self.lock = threading.RLock()
+
+    def __repr__(self):
+        return "Node(%s)" % self.name
+
+    def mobject(self):
+        """Return a MObject of the node."""
+        return MObject._wrap(self)
+
+    def rootCell(self, spec):
+        """Return the cell of an attribute, walking through non array parents."""
+        chain = spec.ancestors()
+        cell = self.cells[chain[0]]
+        for child in chain[1:]:
+            if cell.elements is not None:
+                raise RuntimeError("(kInvalidParameter): Attribute %s is inside an array, use a plug" % spec.longName)
+            cell = cell.children[child]
+        return cell
+
+    def setClean(self, spec):
+        """Mark an attribute and its children as clean."""
+        self.clean.add(spec)
+        self.clean.update(spec.descendants())
+
+    def isClean(self, spec):
+        """Check if an attribute is clean."""
+        return spec in self.clean
+
+    def dirtyAttribute(self, spec):
+        """Mark an attribute, its parents and its children as dirty."""
+        self.clean.discard(spec)
+        self.clean.difference_update(spec.ancestors())
+        self.clean.difference_update(spec.descendants())
+
+    def affectedBy(self, spec):
+        """Return the attributes affected by a change in the given attribute."""
+        affects = MPxNode._gfAllAffects(self.nodeClass)
+        sources = spec.ancestors() + spec.descendants()
+        result = []
+        for source in sources:
+            for target in affects.get(source, ()):
+                if target not in result:
+                    result.append(target)
+        return result
+
+    def setValue(self, plug, value):
+        """Set the value of a plug and propagate dirty to the affected attributes."""
+        with self.lock:
+            _assign(plug._resolve(create=True), value)
+            self.propagateDirty(plug)
+        _MessageRegistry.attributeChanged(self, plug)
+
+    def propagateDirty(self, plug):
+        """Mark the attributes affected by the plug as dirty and call setDependentsDirty()."""
+        affected = MPlugArray(MPlug._create(self, target) for target in self.affectedBy(plug._spec))
+        self.node.setDependentsDirty(plug, affected)
+        callbacks = _MessageRegistry.find("nodeDirtyPlug", self)
+        for target in affected:
+            self.dirtyAttribute(target._spec)
+            for function, clientData in callbacks:
+                function(self.mobject(), target, clientData)
+
+
+class MPxNode(object):
+    """Base class of the custom nodes."""
+
+    kDependNode = 0
+    kLocatorNode = 1
+    kDeformerNode = 2
+    kManipContainer = 3
+    kSurfaceShape = 4
+    kFieldNode = 5
+    kEmitterNode = 6
+    kSpringNode = 7
+    kIkSolverNode = 8
+    kHardwareShader = 9
+    kHwShaderNode = 10
+    kTransformNode = 11
+    kObjectSet = 12
+    kFluidEmitterNode = 13
+    kImagePlaneNode = 14
+    kParticleAttributeMapperNode = 15
+    kCameraSetNode = 16
+    kConstraintNode = 17
+    kManipulatorNode = 18
+    kMotionPathNode = 19
+    kClientDeviceNode = 20
+    kThreadedDeviceNode = 21
+    kAssemblyNode = 22
+    kSkinCluster = 23
+    kGeometryFilter = 24
+    kBlendShape = 25
+    kLast = 26
+
+    kDefaultScheduleType = 0
+    kParallel = 1
+    kSerial = 2
+    kGloballySerial = 3
+    kUntrusted = 4
+
+    def __init__(self):
+        self._gfState = None
+
+    @classmethod
+    def addAttribute(cls, attribute):
+        """Add a static attribute to the node class."""
+        if "_gfAttributes" not in cls.__dict__:
+            cls._gfAttributes = []
+        cls._gfAttributes.append(attribute._data)
+
+    @classmethod
+    def attributeAffects(cls, source, target):
+        """Declare that the source attribute affects the target attribute."""
+        if "_gfAffects" not in cls.__dict__:
+            cls._gfAffects = {}
+        cls._gfAffects.setdefault(source._data, []).append(target._data)
+
+    @classmethod
+    def inheritAttributesFrom(cls, parentClassName):
+        """Inherit the attributes of another node type. Not supported."""
+        raise NotImplementedError("inheritAttributesFrom is not supported by gfTools.testing")
+
+    @staticmethod
+    def _gfAllAttributes(nodeClass):
+        """Return the static attributes of a node class and its bases."""
+        specs = []
+        for cls in reversed(nodeClass.__mro__):
+            specs.extend(cls.__dict__.get("_gfAttributes", []))
+        return specs
+
+    @staticmethod
+    def _gfAllAffects(nodeClass):
+        """Return the attributeAffects table of a node class and its bases."""
+        affects = {}
+        for cls in reversed(nodeClass.__mro__):
+            for source, targets in cls.__dict__.get("_gfAffects", {}).items():
+                affects.setdefault(source, []).extend(targets)
+        return affects
+
+    def thisMObject(self):
+        """Return the MObject of this node."""
+        return self._gfState.mobject()
+
+    def name(self):
+        """Return the node name."""
+        return self._gfState.name
+
+    def typeName(self):
+        """Return the node type name."""
+        return getattr(self, "kNodeName", "") or type(self).__name__
+
+    def typeId(self):
+        """Return the node type id."""
+        return getattr(self, "kNodeID", MTypeId())
+
+    def postConstructor(self):
+        """Called after the node is created."""
+        pass
+
+    def compute(self, plug, dataBlock):
+        """Compute the requested plug."""
+        # pylint: disable=unused-argument
+        return kUnknownParameter
+
+    def setDependentsDirty(self, plug, plugArray):
+        """Called when a plug is dirtied. Append plugs to plugArray to dirty them as well."""
+        pass
+
+    def connectionMade(self, plug, otherPlug, asSrc):
+        """Called when a connection is made."""
+        # pylint: disable=unused-argument
+        return kUnknownParameter
+
+    def connectionBroken(self, plug, otherPlug, asSrc):
+        """Called when a connection is broken."""
+        # pylint: disable=unused-argument
+        return kUnknownParameter
+
+    def schedulingType(self):
+        """Return the scheduling type of the node in parallel evaluation."""
+        return MPxNode.kDefaultScheduleType
+
+    def forceCache(self):
+        """Return the data block of the node."""
+        return MDataBlock(self._gfState)
+
+
+class MFnDependencyNode(MFnBase):
+    """Function set of the dependency nodes."""
+
+    def __init__(self, mob=None):
+        MFnBase.__init__(self, mob)
+
+    @property
+    def _state(self):
+        return self._object._data
+
+    def name(self):
+        """Return the node name."""
+        return self._state.name
+
+    def setName(self, name):
+        """Rename the node."""
+        self._state.name = name
+        return name
+
+    def typeName(self):
+        """Return the node type name."""
+        return self._state.node.typeName()
+
+    @property
+    def typeId(self):
+        """The node type id."""
+        return self._state.node.typeId()
+
+    def userNode(self):
+        """Return the Python instance of the node."""
+        return self._state.node
+
+    def attribute(self, name):
+        """Return the attribute with the given long or short name."""
+        for spec in self._state.cells:
+            for candidate in [spec] + spec.descendants():
+                if name in (candidate.longName, candidate.shortName):
+                    return MObject._wrap(candidate)
+        return MObject()
+
+    def hasAttribute(self, name):
+        """Check if the node has an attribute with the given name."""
+        return not self.attribute(name).isNull()
+
+    def findPlug(self, attribute, wantNetworkedPlug=True):
+        """Return the plug of an attribute given by name or MObject."""
+        # pylint: disable=unused-argument
+        if not isinstance(attribute, MObject):
+            attribute = self.attribute(attribute)
+            if attribute.isNull():
+                raise RuntimeError("(kInvalidParameter): No attribute with this name")
+        return MPlug(self._object, attribute)
+
+
+# ================================================================================================
+# Messages
+# ================================================================================================
+
+class _MessageRegistry(object):
+    """Registry of the message callbacks."""
+
+    lock = threading.Lock()
+    nextId = [1]
+    callbacks = OrderedDict()
+
+    @staticmethod
+    def add(kind, function, clientData, node=None):
+        """Register a callback and return its id."""
+        with _MessageRegistry.lock:
+            callbackId = _MessageRegistry.nextId[0]
+            _MessageRegistry.nextId[0] += 1
+            _MessageRegistry.callbacks[callbackId] = (kind, function, clientData, node)
+        return callbackId
+
+    @staticmethod
+    def remove(callbackId):
+        """Remove a callback."""
+        with _MessageRegistry.lock:
+            if callbackId not in _MessageRegistry.callbacks:
+                raise RuntimeError("(kInvalidParameter): Callback %s does not exist" % callbackId)
+            del _MessageRegistry.callbacks[callbackId]
+
+    @staticmethod
+    def find(kind, node=None):
+        """Return the (function, clientData) pairs registered for the message kind."""
+        with _MessageRegistry.lock:
+            return [(entry[1], entry[2]) for entry in _MessageRegistry.callbacks.values()
+                    if entry[0] == kind and (node is None or entry[3] is node)]
+
+    @staticmethod
+    def attributeChanged(state, plug):
+        """Send the attribute set message of a plug."""
+        msg = MNodeMessage.kAttributeSet | MNodeMessage.kIncomingDirection
+        for function, clientData in _MessageRegistry.find("attributeChanged", state):
+            function(msg, plug, MPlug(), clientData)
+
+    @staticmethod
+    def send(kind, *args):
+        """Call every callback of the message kind with the arguments and the client data."""
+        for function, clientData in _MessageRegistry.find(kind):
+            function(*(args + (clientData,)))
+
+
+class MMessage(object):
+    """Base class of the messages."""
+
+    kDefaultAction = 0
+    kDoNotDoAction = 1
+    kDoAction = 2
+
+    @staticmethod
+    def removeCallback(callbackId):
+        """Remove a callback."""
+        _MessageRegistry.remove(callbackId)
+
+    @staticmethod
+    def removeCallbacks(callbackIds):
+        """Remove a list of callbacks."""
+        for callbackId in callbackIds:
+            _MessageRegistry.remove(callbackId)
+
+    @staticmethod
+    def currentCallbackId():
+        """Return the id of the running callback."""
+        return 0
+
+    @staticmethod
+    def nodeCallbacks(node):
+        """Return the ids of the callbacks registered to a node."""
+        with _MessageRegistry.lock:
+            return MCallbackIdArray([callbackId for callbackId, entry in _MessageRegistry.callbacks.items()
+                                     if entry[3] is node._data])
+
+
+class MNodeMessage(MMessage):
+    """Node messages."""
+
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeEval = 0x04
+    kAttributeSet = 0x08
+    kAttributeLocked = 0x10
+    kAttributeUnlocked = 0x20
+    kAttributeAdded = 0x40
+    kAttributeRemoved = 0x80
+    kAttributeRenamed = 0x100
+    kAttributeKeyable = 0x200
+    kAttributeUnkeyable = 0x400
+    kIncomingDirection = 0x800
+    kAttributeArrayAdded = 0x1000
+    kAttributeArrayRemoved = 0x2000
+    kOtherPlugSet = 0x4000
+    kLast = 0x8000
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, clientData=None):
+        """Register a callback called when an attribute of the node changes."""
+        return _MessageRegistry.add("attributeChanged", function, clientData, node._data)
+
+    @staticmethod
+    def addNodeDirtyPlugCallback(node, function, clientData=None):
+        """Register a callback called when a plug of the node is dirtied."""
+        return _MessageRegistry.add("nodeDirtyPlug", function, clientData, node._data)
+
+    @staticmethod
+    def addNodeAboutToDeleteCallback(node, function, clientData=None):
+        """Register a callback called before the node is deleted."""
+        return _MessageRegistry.add("nodeAboutToDelete", function, clientData, node._data)
+
+    @staticmethod
+    def addNodeDestroyedCallback(node, function, clientData=None):
+        """Register a callback called when the node is destroyed."""
+        return _MessageRegistry.add("nodeDestroyed", function, clientData, node._data)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, clientData=None):
+        """Register a callback called before the node is removed."""
+        return _MessageRegistry.add("nodePreRemoval", function, clientData, node._data)
+
+    @staticmethod
+    def addKeyableChangeOverride(plug, function, clientData=None):
+        """Register a callback called when the keyable state of a plug changes."""
+        return _MessageRegistry.add("keyableChange", function, clientData, plug._state)
+
+
+class MDGMessage(MMessage):
+    """Dependency graph messages."""
+
+    @staticmethod
+    def addTimeChangeCallback(function, clientData=None):
+        """Register a callback called when the time changes."""
+        return _MessageRegistry.add("timeChange", function, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType="dependNode", clientData=None):
+        """Register a callback called when a node is removed."""
+        # pylint: disable=unused-argument
+        return _MessageRegistry.add("nodeRemoved", function, clientData)
+
+    @staticmethod
+    def addNodeAddedCallback(function, nodeType="dependNode", clientData=None):
+        """Register a callback called when a node is added."""
+        # pylint: disable=unused-argument
+        return _MessageRegistry.add("nodeAdded", function, clientData)
+
+
+class MEventMessage(MMessage):
+    """Event messages."""
+
+    @staticmethod
+    def addEventCallback(eventName, function, clientData=None):
+        """Register a callback called when the event happens."""
+        return _MessageRegistry.add("event:%s" % eventName, function, clientData)
+
+
+class MUserEventMessage(MMessage):
+    """User event messages."""
+
+    kEvents = set()
+
+    @staticmethod
+    def registerUserEvent(eventName):
+        """Register a user event."""
+        MUserEventMessage.kEvents.add(eventName)
+
+    @staticmethod
+    def isUserEvent(eventName):
+        """Check if the user event is registered."""
+        return eventName in MUserEventMessage.kEvents
+
+    @staticmethod
+    def deregisterUserEvent(eventName):
+        """Deregister a user event."""
+        MUserEventMessage.kEvents.discard(eventName)
+
+    @staticmethod
+    def addUserEventCallback(eventName, function, clientData=None):
+        """Register a callback called when the user event is posted."""
+        return _MessageRegistry.add("user:%s" % eventName, function, clientData)
+
+    @staticmethod
+    def postUserEvent(eventName, clientData=None):
+        """Post a user event."""
+        # pylint: disable=unused-argument
+        for function, callbackData in _MessageRegistry.find("user:%s" % eventName):
+            function(callbackData)
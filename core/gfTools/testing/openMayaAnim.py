@@ -0,0 +1,54 @@
+## @package openMayaAnim
+#  Stand-in of the maya.api.OpenMayaAnim module.
+#
+#  Implements the animation messages used by the gfTools node prototypes.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * Don't import this module directly. Use gfTools.testing.install() to register it
+      as maya.api._OpenMayaAnim_py2 and maya.api.OpenMayaAnim.
+
+Requirements:
+    * NumPy.
+
+Description:
+    The callbacks share the registry of gfTools.testing.openMaya, so om2.MMessage.removeCallback()
+    removes them as well.
+
+This code supports Pylint. Rc file in project.
+"""
+from gfTools.testing.openMaya import MMessage, _MessageRegistry
+
+
+class MAnimMessage(MMessage):
+    """Animation messages."""
+
+    @staticmethod
+    def addAnimKeyframeEditedCallback(function, clientData=None):
+        """Register a callback called when keyframes are edited."""
+        return _MessageRegistry.add("animKeyframeEdited", function, clientData)
+
+    @staticmethod
+    def addAnimCurveEditedCallback(function, clientData=None):
+        """Register a callback called when animation curves are edited."""
+        return _MessageRegistry.add("animCurveEdited", function, clientData)
+
+    @staticmethod
+    def flushAnimKeyframeEditedCallbacks():
+        """Send the pending keyframe edited messages. There are no keyframes, so nothing is sent."""
+        pass
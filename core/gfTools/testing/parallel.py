@@ -0,0 +1,212 @@
+## @package parallel
+#  Parallel evaluation check of the gfTools node prototypes.
+#
+#  Evaluates many instances of every node from a thread pool and compares the outputs with a serial evaluation.
+"""
+Copyright 2020 Giuliano Franca
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+====================================================================================================
+
+How to use:
+    * From a shell, with the core folder in the PYTHONPATH:
+        python -m gfTools.testing.parallel                          (check every node)
+        python -m gfTools.testing.parallel -f Constraint -i 32 -j 8 (32 instances of the matching nodes, 8 threads)
+    * From Python:
+        from gfTools.testing import parallel
+        mismatches = parallel.run()
+
+Requirements:
+    * NumPy.
+
+Description:
+    The Evaluation Manager evaluates the nodes declared kParallel from many threads at the same time, so a
+    node can't keep its state in class attributes or module globals. Every case of gfTools.testing.benchmark
+    creates two sets of instances with the same seeds. For every frame, the first set is driven and pulled
+    one instance after the other and the second set from a thread pool, one task per instance, like the
+    Evaluation Manager does with the nodes of one frame. The outputs of both sets must be the same.
+    Every instance has its own random generator, so the inputs don't depend on the order of the threads.
+    The thread switch interval is lowered during the check to interleave the computes as much as possible.
+    Every node keeps its state per instance and is declared kParallel. The nodes without a case (draw
+    overrides, mesh and surface inputs) can't run outside Maya, so their threaded computes aren't checked.
+
+This code supports Pylint. Rc file in project.
+"""
+from __future__ import print_function
+
+import sys
+import argparse
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from gfTools.testing import benchmark
+from gfTools.testing import openMaya
+
+
+kDefaultInstances = 16
+kDefaultFrames = 10
+kDefaultWorkers = 8
+kTolerance = 1.0e-9
+
+
+def _evaluate(case, node, rng, frame):
+    """Drive one instance and pull all its outputs."""
+    case.drive(node, rng, frame)
+    return [node.pull(path) for path in case.outputs]
+
+
+def _dataValues(mob):
+    """Return the public values of a data object, like the cvs and knots of a curve data."""
+    # pylint: disable=protected-access
+    if mob.isNull():
+        return {}
+    return dict((key, value) for key, value in vars(mob._data).items() if not key.startswith("_"))
+
+
+def _difference(first, second):
+    """Return a description of the difference between two pulled values, None if they are the same."""
+    if isinstance(first, openMaya.MObject) and isinstance(second, openMaya.MObject):
+        return _difference(_dataValues(first), _dataValues(second))
+    if isinstance(first, dict) or isinstance(second, dict):
+        if not isinstance(first, dict) or not isinstance(second, dict) or sorted(first) != sorted(second):
+            return "different compound children"
+        for key in first:
+            difference = _difference(first[key], second[key])
+            if difference:
+                return "%s: %s" % (key, difference)
+        return None
+    if isinstance(first, (list, tuple)) and isinstance(second, (list, tuple)):
+        if len(first) != len(second):
+            return "%s elements, expected %s" % (len(second), len(first))
+        for index, (firstItem, secondItem) in enumerate(zip(first, second)):
+            difference = _difference(firstItem, secondItem)
+            if difference:
+                return "[%s] %s" % (index, difference)
+        return None
+    try:
+        firstArray = np.asarray(first, dtype=np.float64)
+        secondArray = np.asarray(second, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None if first == second else "%r, expected %r" % (second, first)
+    if firstArray.shape != secondArray.shape:
+        return "shape %s, expected %s" % (secondArray.shape, firstArray.shape)
+    if not np.allclose(firstArray, secondArray, rtol=0.0, atol=kTolerance, equal_nan=True):
+        return "max error %g" % np.nanmax(np.abs(firstArray - secondArray))
+    return None
+
+
+def _setSwitchInterval(interval):
+    """Set the thread switch interval and return the previous one."""
+    if hasattr(sys, "setswitchinterval"):
+        previous = sys.getswitchinterval()
+        sys.setswitchinterval(interval)
+        return previous
+    # Python 2 counts bytecode instructions instead of seconds.
+    previous = sys.getcheckinterval()
+    sys.setcheckinterval(1 if interval < 1.0e-3 else 100)
+    return previous
+
+
+def checkCase(case, instances=kDefaultInstances, frames=kDefaultFrames, workers=kDefaultWorkers, seed=0):
+    """Compare the serial and the threaded evaluation of many instances of one case.
+
+    Args:
+        case (BenchmarkCase): The case to check.
+        instances (int): The number of node instances evaluated at each frame.
+        frames (int): The number of frames.
+        workers (int): The number of threads.
+        seed (int): The seed of the first instance, every instance uses the next one.
+
+    Returns:
+        list: The description of every output that doesn't match. Empty if the node is safe.
+    """
+    seeds = range(seed, seed + instances)
+    serialRngs = [np.random.RandomState(each) for each in seeds]
+    threadedRngs = [np.random.RandomState(each) for each in seeds]
+    serialNodes = [case.createNode(rng) for rng in serialRngs]
+    threadedNodes = [case.createNode(rng) for rng in threadedRngs]
+    pool = ThreadPool(workers)
+    previousInterval = _setSwitchInterval(1.0e-6)
+    mismatches = []
+    try:
+        for frame in range(frames):
+            serial = [_evaluate(case, node, rng, frame) for node, rng in zip(serialNodes, serialRngs)]
+            threaded = pool.map(lambda index, frame=frame: _evaluate(case, threadedNodes[index], threadedRngs[index], frame),
+                                range(instances))
+            for index, (expected, result) in enumerate(zip(serial, threaded)):
+                for path, first, second in zip(case.outputs, expected, result):
+                    difference = _difference(first, second)
+                    if difference:
+                        mismatches.append("frame %s, instance %s, %s: %s" % (frame, index, path, difference))
+    finally:
+        _setSwitchInterval(previousInterval)
+        pool.close()
+        pool.join()
+        for node in serialNodes + threadedNodes:
+            node.delete()
+    return mismatches
+
+
+def run(instances=kDefaultInstances, frames=kDefaultFrames, workers=kDefaultWorkers, nameFilter=None, seed=0, cases=None):
+    """Check every case.
+
+    Args:
+        instances (int): The number of node instances per case.
+        frames (int): The number of frames per case.
+        workers (int): The number of threads.
+        nameFilter (str): Check only the cases containing this text in the name.
+        seed (int): The seed of the random inputs.
+        cases (list): The cases to check. Defaults to gfTools.testing.benchmark.kCases.
+
+    Returns:
+        OrderedDict: The mismatches of every case by case name.
+    """
+    results = OrderedDict()
+    for case in benchmark.kCases if cases is None else cases:
+        if nameFilter and nameFilter.lower() not in case.name.lower():
+            continue
+        results[case.name] = checkCase(case, instances, frames, workers, seed)
+    return results
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Returns:
+        int: 1 if any case doesn't match, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Check the parallel evaluation of the gfTools node prototypes.")
+    parser.add_argument("-i", "--instances", type=int, default=kDefaultInstances, help="Node instances per case.")
+    parser.add_argument("-n", "--frames", type=int, default=kDefaultFrames, help="Frames per case.")
+    parser.add_argument("-j", "--workers", type=int, default=kDefaultWorkers, help="Threads of the pool.")
+    parser.add_argument("-f", "--filter", default=None, help="Check only the nodes containing this text.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random inputs.")
+    options = parser.parse_args(args)
+
+    results = run(options.instances, options.frames, options.workers, options.filter, options.seed)
+    failed = False
+    for name, mismatches in results.items():
+        print("%-28s %s" % (name, "FAILED" if mismatches else "ok"))
+        for mismatch in mismatches[:10]:
+            print("    %s" % mismatch)
+        if len(mismatches) > 10:
+            print("    ... %s more" % (len(mismatches) - 10))
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Undoable command to switch a gfSpaceConstraint to another space over a frame range, keeping the
+    world animation of a control. The frames are the keys of the control in the range, see
+    gfTools.spaceSwitch.keyFrames(), and the work is done by gfTools.spaceSwitch.switch(). Its
+    Modifier is kept by the command, so ctrl+z reverts the whole switch at once.
+
+Flags:
+    * constraint (cst): The gfSpaceConstraint node.
+    * control (ctl): The animated control under the constrained object.
+    * space (s): The new space.
+    * startFrame (sf): The first frame of the range. The playback start by default.
+    * endFrame (ef): The last frame of the range. The playback end by default.
+
+Todo:
+    * NDA
+
+Sources:
+    * NDA
+
+This code supports Pylint. Rc file in project.
+"""
+import maya.api._OpenMaya_py2 as om2
+import maya.api._OpenMayaAnim_py2 as oma2
+
+from gfTools import spaceSwitch
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=invalid-name, unnecessary-pass
+    pass
+
+
+class SpaceSwitch(om2.MPxCommand):
+    """ Main class of gfSpaceSwitch command. """
+
+    kCommandName = ""
+
+    kConstraintFlag = ("-cst", "-constraint")
+    kControlFlag = ("-ctl", "-control")
+    kSpaceFlag = ("-s", "-space")
+    kStartFlag = ("-sf", "-startFrame")
+    kEndFlag = ("-ef", "-endFrame")
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxCommand.__init__(self)
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return SpaceSwitch()
+
+    @staticmethod
+    def createSyntax():
+        """ Flags of the command. """
+        syntax = om2.MSyntax()
+        syntax.addFlag(SpaceSwitch.kConstraintFlag[0], SpaceSwitch.kConstraintFlag[1], om2.MSyntax.kString)
+        syntax.addFlag(SpaceSwitch.kControlFlag[0], SpaceSwitch.kControlFlag[1], om2.MSyntax.kString)
+        syntax.addFlag(SpaceSwitch.kSpaceFlag[0], SpaceSwitch.kSpaceFlag[1], om2.MSyntax.kLong)
+        syntax.addFlag(SpaceSwitch.kStartFlag[0], SpaceSwitch.kStartFlag[1], om2.MSyntax.kDouble)
+        syntax.addFlag(SpaceSwitch.kEndFlag[0], SpaceSwitch.kEndFlag[1], om2.MSyntax.kDouble)
+        return syntax
+
+    def isUndoable(self):
+        """ The switch is kept in the undo queue. """
+        # pylint: disable=no-self-use
+        return True
+
+    def doIt(self, args):
+        """ Parse the flags and switch the space. switch() already applies its Modifier. """
+        argData = om2.MArgDatabase(self.syntax(), args)
+        for flag in (SpaceSwitch.kConstraintFlag, SpaceSwitch.kControlFlag, SpaceSwitch.kSpaceFlag):
+            if not argData.isFlagSet(flag[0]):
+                raise ValueError("[gfTools] %s needs the %s flag." % (SpaceSwitch.kCommandName, flag[1]))
+        constraint = argData.flagArgumentString(SpaceSwitch.kConstraintFlag[0], 0)
+        control = argData.flagArgumentString(SpaceSwitch.kControlFlag[0], 0)
+        space = argData.flagArgumentInt(SpaceSwitch.kSpaceFlag[0], 0)
+        unit = om2.MTime.uiUnit()
+        start = oma2.MAnimControl.minTime().asUnits(unit)
+        end = oma2.MAnimControl.maxTime().asUnits(unit)
+        if argData.isFlagSet(SpaceSwitch.kStartFlag[0]):
+            start = argData.flagArgumentDouble(SpaceSwitch.kStartFlag[0], 0)
+        if argData.isFlagSet(SpaceSwitch.kEndFlag[0]):
+            end = argData.flagArgumentDouble(SpaceSwitch.kEndFlag[0], 0)
+
+        frames = spaceSwitch.keyFrames(control, start, end)
+        self.modifier = spaceSwitch.switch(constraint, control, space, frames)
+
+    def redoIt(self):
+        """ Create the animation curves and the keys again. """
+        self.modifier.redoIt()
+
+    def undoIt(self):
+        """ Remove the keys and the animation curves of the switch. """
+        self.modifier.undoIt()
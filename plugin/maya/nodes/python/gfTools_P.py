@@ -43,10 +43,16 @@ Requirements:
 Nodes:
     * gfDebugVector          (MPxLocatorNode): Node to visualize vectors in the viewport.
     * gfPSDVectorAngle       (MPxNode): Calculate weights based on a pose.
+    * gfPSDRBF               (MPxNode): Calculate weights based on a pose with RBF interpolation.
+    * gfPSDVectorAngleArray  (MPxNode): Calculate weights based on many poses in one node.
     * gfIKVChain             (MPxNode): IK Solver to VChain type of rig.
+    * gfIKVChainArray        (MPxNode): IK Solver to many VChain limbs in one node.
+    * gfTwistExtractorArray  (MPxNode): Extract the twist of many rotations in one node.
     * gfBlendTransform       (MPxNode): Blend transformations (SRT) between an array of objects.
     * gfAimConstraint        (MPxNode): Custom aim constraint.
+    * gfAimConstraintArray   (MPxNode): Custom aim constraint of many objects in one node.
     * gfParentConstraint     (MPxNode): Custom parent contraint.
+    * gfParentConstraintArray (MPxNode): Custom parent contraint of many objects in one node.
     * gfAngleMath            (MPxNode): Basic double angle operations.
     * gfAngleScalarMath      (MPxNode): Basic double angle operations with float scalar.
     * gfAngleTrigMath        (MPxNode): Basic double angle trigonometric operations.
@@ -57,6 +63,10 @@ Nodes:
     * gfEulerToVector        (MPxNode): Convert euler rotation to vector.
     * gfVectorToEuler        (MPxNode): Convert vector to euler rotation.
     * gfDecompRowMatrix      (MPxNode): Decompose all rows of a matrix as vector3.
+    * gfCachePlayback        (MPxNode): Play back a channel of a gfTools cache file.
+
+Commands:
+    * gfSpaceSwitch          (MPxCommand): Undoable space switch of a gfSpaceConstraint over a frame range.
 
 Todo:
     * NDA
@@ -75,21 +85,29 @@ import maya.api._OpenMayaRender_py2 as omr2
 
 # gfMenu
 import m_gfToolsMenu as m_Menu
+# gfCommands
+import c_gfSpaceSwitch as c_SpaceSwitch
 # gfDebug
 import n_gfDebugVector as n_DebugVector
 import n_gfDebugMatrix as n_DebugMatrix
 # gfRig
 import n_gfRigMeshController2 as n_MeshController
 import n_gfRigPSDVectorAngle as n_VectorAnglePSD
+import n_gfRigPSDRBF as n_RBFPSD
+import n_gfRigPSDVectorAngleArray as n_VectorAnglePSDArray
 import n_gfRigIKVChain as n_IKVChainSolver
+import n_gfRigIKVChainArray as n_IKVChainArraySolver
 import n_gfRigHelperJoint as n_HelperJoint
 import n_gfRigDistributeAlongSurface as n_DistributeAlongSurface
 import n_gfRigTwistExtractor as n_TwistExtractor
+import n_gfRigTwistExtractorArray as n_TwistExtractorArray
 import n_gfRigQuadraticCurve as n_QuadraticCurve
 # gfUtil
 import n_gfUtilBlendTransform as n_BlendTransform
 import n_gfUtilAimConstraint as n_AimConstraint
+import n_gfUtilAimConstraintArray as n_AimConstraintArray
 import n_gfUtilParentConstraint as n_ParentConstraint
+import n_gfUtilParentConstraintArray as n_ParentConstraintArray
 import n_gfUtilPoleVectorConstraint as n_PoleVectorConstraint
 import n_gfUtilSpaceConstraint as n_SpaceConstraint
 import n_gfUtilAngleMath as n_AngularMath
@@ -103,6 +121,7 @@ import n_gfUtilEulerToVector as n_EulerToVector
 import n_gfUtilVectorToEuler as n_VectorToEuler
 import n_gfUtilDecompRowMatrix as n_DecomposeRowMatrix
 import n_gfUtilFindParamFromCurveLength as n_FindParamFromLength
+import n_gfUtilCachePlayback as n_CachePlayback
 
 import n_gfDebugGeometry as n_DebugGeometry
 # gfMenu
@@ -113,15 +132,21 @@ reload(n_DebugMatrix)
 # gfRig
 reload(n_MeshController)
 reload(n_VectorAnglePSD)
+reload(n_RBFPSD)
+reload(n_VectorAnglePSDArray)
 reload(n_IKVChainSolver)
+reload(n_IKVChainArraySolver)
 reload(n_HelperJoint)
 reload(n_DistributeAlongSurface)
 reload(n_TwistExtractor)
+reload(n_TwistExtractorArray)
 reload(n_QuadraticCurve)
 # gfUtil
 reload(n_BlendTransform)
 reload(n_AimConstraint)
+reload(n_AimConstraintArray)
 reload(n_ParentConstraint)
+reload(n_ParentConstraintArray)
 reload(n_PoleVectorConstraint)
 reload(n_SpaceConstraint)
 reload(n_AngularMath)
@@ -135,9 +160,12 @@ reload(n_EulerToVector)
 reload(n_VectorToEuler)
 reload(n_DecomposeRowMatrix)
 reload(n_FindParamFromLength)
+reload(n_CachePlayback)
 
 reload(n_DebugGeometry)
 
+reload(c_SpaceSwitch)
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -175,6 +203,24 @@ def DEREGISTER_NODE(NODE, PLUGIN, CALLBACKS=None):
         sys.stderr.write("Failed to deregister node: %s" % NODE.kNodeName)
         raise
 
+def REGISTER_COMMAND(COMMAND, PLUGIN):
+    """ Register a MPxCommand. """
+    # pylint: disable=invalid-name
+    try:
+        PLUGIN.registerCommand(COMMAND.kCommandName, COMMAND.creator, COMMAND.createSyntax)
+    except BaseException:
+        sys.stderr.write("Failed to register command: %s" % COMMAND.kCommandName)
+        raise
+
+def DEREGISTER_COMMAND(COMMAND, PLUGIN):
+    """ Deregister a MPxCommand. """
+    # pylint: disable=invalid-name
+    try:
+        PLUGIN.deregisterCommand(COMMAND.kCommandName)
+    except BaseException:
+        sys.stderr.write("Failed to deregister command: %s" % COMMAND.kCommandName)
+        raise
+
 def REGISTER_LOCATOR_NODE(NODE, PLUGIN, DRAWOVERRIDE):
     """ Register a MPxLocatorNode. """
     # pylint: disable=invalid-name
@@ -265,9 +311,18 @@ n_MeshController.MeshController.kNodeID = om2.MTypeId(0x0012f7c2)
 n_VectorAnglePSD.VectorAnglePSD.kNodeName = "gfPSDVectorAngle_P"
 n_VectorAnglePSD.VectorAnglePSD.kNodeClassify = "utility/general"
 n_VectorAnglePSD.VectorAnglePSD.kNodeID = om2.MTypeId(0x0012f7c3)
+n_RBFPSD.RBFPSD.kNodeName = "gfPSDRBF_P"
+n_RBFPSD.RBFPSD.kNodeClassify = "utility/general"
+n_RBFPSD.RBFPSD.kNodeID = om2.MTypeId(0x0012f7dc)
+n_VectorAnglePSDArray.VectorAnglePSDArray.kNodeName = "gfPSDVectorAngleArray_P"
+n_VectorAnglePSDArray.VectorAnglePSDArray.kNodeClassify = "utility/general"
+n_VectorAnglePSDArray.VectorAnglePSDArray.kNodeID = om2.MTypeId(0x0012f7dd)
 n_IKVChainSolver.IKVChainSolver.kNodeName = "gfIKVChain_P"
 n_IKVChainSolver.IKVChainSolver.kNodeClassify = "utility/general"
 n_IKVChainSolver.IKVChainSolver.kNodeID = om2.MTypeId(0x0012f7c4)
+n_IKVChainArraySolver.IKVChainArraySolver.kNodeName = "gfIKVChainArray_P"
+n_IKVChainArraySolver.IKVChainArraySolver.kNodeClassify = "utility/general"
+n_IKVChainArraySolver.IKVChainArraySolver.kNodeID = om2.MTypeId(0x0012f7db)
 n_HelperJoint.HelperJoint.kNodeName = "gfHelperJoint_P"
 n_HelperJoint.HelperJoint.kNodeClassify = "utility/general"
 n_HelperJoint.HelperJoint.kNodeID = om2.MTypeId(0x0012f7c5)
@@ -277,6 +332,9 @@ n_DistributeAlongSurface.DistributeAlongSurface.kNodeID = om2.MTypeId(0x0012f7c6
 n_TwistExtractor.TwistExtractor.kNodeName = "gfTwistExtractor_P"
 n_TwistExtractor.TwistExtractor.kNodeClassify = "utility/general"
 n_TwistExtractor.TwistExtractor.kNodeID = om2.MTypeId(0x0012f7c7)
+n_TwistExtractorArray.TwistExtractorArray.kNodeName = "gfTwistExtractorArray_P"
+n_TwistExtractorArray.TwistExtractorArray.kNodeClassify = "utility/general"
+n_TwistExtractorArray.TwistExtractorArray.kNodeID = om2.MTypeId(0x0012f7de)
 n_QuadraticCurve.QuadraticCurve.kNodeName = "gfQuadraticCurve_P"
 n_QuadraticCurve.QuadraticCurve.kNodeClassify = "utility/general"
 n_QuadraticCurve.QuadraticCurve.kNodeID = om2.MTypeId(0x0012f7c8)
@@ -287,9 +345,15 @@ n_BlendTransform.BlendTransform.kNodeID = om2.MTypeId(0x0012f7c9)
 n_AimConstraint.AimConstraint.kNodeName = "gfAimConstraint_P"
 n_AimConstraint.AimConstraint.kNodeClassify = "utility/general"
 n_AimConstraint.AimConstraint.kNodeID = om2.MTypeId(0x0012f7ca)
+n_AimConstraintArray.AimConstraintArray.kNodeName = "gfAimConstraintArray_P"
+n_AimConstraintArray.AimConstraintArray.kNodeClassify = "utility/general"
+n_AimConstraintArray.AimConstraintArray.kNodeID = om2.MTypeId(0x0012f7e0)
 n_ParentConstraint.ParentConstraint.kNodeName = "gfParentConstraint_P"
 n_ParentConstraint.ParentConstraint.kNodeClassify = "utility/general"
 n_ParentConstraint.ParentConstraint.kNodeID = om2.MTypeId(0x0012f7cb)
+n_ParentConstraintArray.ParentConstraintArray.kNodeName = "gfParentConstraintArray_P"
+n_ParentConstraintArray.ParentConstraintArray.kNodeClassify = "utility/general"
+n_ParentConstraintArray.ParentConstraintArray.kNodeID = om2.MTypeId(0x0012f7df)
 n_PoleVectorConstraint.PoleVectorConstraint.kNodeName = "gfPoleVectorConstraint_P"
 n_PoleVectorConstraint.PoleVectorConstraint.kNodeClassify = "utility/general"
 n_PoleVectorConstraint.PoleVectorConstraint.kNodeID = om2.MTypeId(0x0012f7cc)
@@ -329,12 +393,18 @@ n_DecomposeRowMatrix.DecomposeRowMatrix.kNodeID = om2.MTypeId(0x0012f7d7)
 n_FindParamFromLength.FindParamFromLength.kNodeName = "gfFindParamFromLength_P"
 n_FindParamFromLength.FindParamFromLength.kNodeClassify = "utility/general"
 n_FindParamFromLength.FindParamFromLength.kNodeID = om2.MTypeId(0x0012f7d8)
+n_CachePlayback.CachePlayback.kNodeName = "gfCachePlayback_P"
+n_CachePlayback.CachePlayback.kNodeClassify = "utility/general"
+n_CachePlayback.CachePlayback.kNodeID = om2.MTypeId(0x0012f7da)
 
 n_DebugGeometry.DebugGeometry.kNodeName = "gfDebugGeometry_P"
 n_DebugGeometry.DebugGeometry.kNodeClassify = "drawdb/geometry/customShape"
 n_DebugGeometry.DebugGeometry.kNodeRegistrantID = "gfDebugGeometry_PNodePlugin"
 n_DebugGeometry.DebugGeometry.kNodeID = om2.MTypeId(0x0012f7d9)
 
+# gfCommands
+c_SpaceSwitch.SpaceSwitch.kCommandName = "gfSpaceSwitch_P"
+
 
 def initializePlugin(mobject):
     """ Initializes the plug-in. """
@@ -344,14 +414,20 @@ def initializePlugin(mobject):
     REGISTER_LOCATOR_NODE(n_DebugMatrix.DebugMatrix, mplugin2, n_DebugMatrix.DebugMatrixDrawOverride)
     REGISTER_LOCATOR_NODE(n_MeshController.MeshController, mplugin2, n_MeshController.MeshControllerDrawOverride)
     REGISTER_NODE(n_VectorAnglePSD.VectorAnglePSD, mplugin2)
+    REGISTER_NODE(n_RBFPSD.RBFPSD, mplugin2)
+    REGISTER_NODE(n_VectorAnglePSDArray.VectorAnglePSDArray, mplugin2)
     REGISTER_NODE(n_IKVChainSolver.IKVChainSolver, mplugin2)
+    REGISTER_NODE(n_IKVChainArraySolver.IKVChainArraySolver, mplugin2)
     REGISTER_NODE(n_HelperJoint.HelperJoint, mplugin2)
     REGISTER_NODE(n_DistributeAlongSurface.DistributeAlongSurface, mplugin2)
     REGISTER_NODE(n_TwistExtractor.TwistExtractor, mplugin2)
+    REGISTER_NODE(n_TwistExtractorArray.TwistExtractorArray, mplugin2)
     REGISTER_NODE(n_QuadraticCurve.QuadraticCurve, mplugin2)
     REGISTER_NODE(n_BlendTransform.BlendTransform, mplugin2)
     REGISTER_NODE(n_AimConstraint.AimConstraint, mplugin2)
+    REGISTER_NODE(n_AimConstraintArray.AimConstraintArray, mplugin2)
     REGISTER_NODE(n_ParentConstraint.ParentConstraint, mplugin2)
+    REGISTER_NODE(n_ParentConstraintArray.ParentConstraintArray, mplugin2)
     REGISTER_NODE(n_PoleVectorConstraint.PoleVectorConstraint, mplugin2)
     REGISTER_NODE(n_SpaceConstraint.SpaceConstraint, mplugin2)
     REGISTER_NODE(n_AngularMath.AngularMath, mplugin2)
@@ -365,7 +441,9 @@ def initializePlugin(mobject):
     REGISTER_NODE(n_VectorToEuler.VectorToEuler, mplugin2)
     REGISTER_NODE(n_DecomposeRowMatrix.DecomposeRowMatrix, mplugin2)
     REGISTER_NODE(n_FindParamFromLength.FindParamFromLength, mplugin2)
+    REGISTER_NODE(n_CachePlayback.CachePlayback, mplugin2)
     REGISTER_SURFACESHAPE_NODE(n_DebugGeometry.DebugGeometry, mplugin2, n_DebugGeometry.DebugGeometryUI, n_DebugGeometry.DebugGeometryOverride)
+    REGISTER_COMMAND(c_SpaceSwitch.SpaceSwitch, mplugin2)
     om2.MGlobal.displayInfo("[gfTools_P] Plugin loaded successfully.")
     # m_Menu.MainMenu.loadMenu()
 
@@ -378,16 +456,23 @@ def uninitializePlugin(mobject):
     DEREGISTER_LOCATOR_NODE(n_DebugMatrix.DebugMatrix, mplugin2)
     DEREGISTER_LOCATOR_NODE(n_MeshController.MeshController, mplugin2)
     DEREGISTER_NODE(n_VectorAnglePSD.VectorAnglePSD, mplugin2)
+    DEREGISTER_NODE(n_RBFPSD.RBFPSD, mplugin2)
+    DEREGISTER_NODE(n_VectorAnglePSDArray.VectorAnglePSDArray, mplugin2)
     DEREGISTER_NODE(n_IKVChainSolver.IKVChainSolver, mplugin2)
+    DEREGISTER_NODE(n_IKVChainArraySolver.IKVChainArraySolver, mplugin2)
     DEREGISTER_NODE(n_HelperJoint.HelperJoint, mplugin2)
     DEREGISTER_NODE(n_DistributeAlongSurface.DistributeAlongSurface, mplugin2)
     DEREGISTER_NODE(n_TwistExtractor.TwistExtractor, mplugin2)
+    DEREGISTER_NODE(n_TwistExtractorArray.TwistExtractorArray, mplugin2)
     DEREGISTER_NODE(n_QuadraticCurve.QuadraticCurve, mplugin2)
     DEREGISTER_NODE(n_BlendTransform.BlendTransform, mplugin2)
     DEREGISTER_NODE(n_AimConstraint.AimConstraint, mplugin2)
+    DEREGISTER_NODE(n_AimConstraintArray.AimConstraintArray, mplugin2)
     DEREGISTER_NODE(n_ParentConstraint.ParentConstraint, mplugin2)
+    DEREGISTER_NODE(n_ParentConstraintArray.ParentConstraintArray, mplugin2)
     DEREGISTER_NODE(n_PoleVectorConstraint.PoleVectorConstraint, mplugin2)
-    DEREGISTER_NODE(n_SpaceConstraint.SpaceConstraint, mplugin2, n_SpaceConstraint.SpaceConstraint.kCallbackIDs)
+    n_SpaceConstraint.kDispatcher.clear()
+    DEREGISTER_NODE(n_SpaceConstraint.SpaceConstraint, mplugin2)
     DEREGISTER_NODE(n_AngularMath.AngularMath, mplugin2)
     DEREGISTER_NODE(n_AngularScalarMath.AngularScalarMath, mplugin2)
     DEREGISTER_NODE(n_AngularTrigMath.AngularTrigMath, mplugin2)
@@ -399,6 +484,8 @@ def uninitializePlugin(mobject):
     DEREGISTER_NODE(n_VectorToEuler.VectorToEuler, mplugin2)
     DEREGISTER_NODE(n_DecomposeRowMatrix.DecomposeRowMatrix, mplugin2)
     DEREGISTER_NODE(n_FindParamFromLength.FindParamFromLength, mplugin2)
+    DEREGISTER_NODE(n_CachePlayback.CachePlayback, mplugin2)
     DEREGISTER_SURFACESHAPE_NODE(n_DebugGeometry.DebugGeometry, mplugin2)
+    DEREGISTER_COMMAND(c_SpaceSwitch.SpaceSwitch, mplugin2)
     om2.MGlobal.displayInfo("[gfTools_P] Plugin unloaded successfully.")
     # m_Menu.MainMenu.unloadMenu()
@@ -137,6 +137,11 @@ class DebugGeometry(om2.MPxSurfaceShape):
         """
         return True
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def isBounded(self):
         """isBounded?"""
         return True
@@ -75,6 +75,8 @@ import maya.api._OpenMayaUI_py2 as omui2
 import maya.api._OpenMayaRender_py2 as omr2
 import maya.OpenMayaRender as omr1
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -100,6 +102,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class DebugVector(omui2.MPxLocatorNode):
     """ Main class of gfDebugVector node. """
 
@@ -275,6 +278,11 @@ class DebugVector(omui2.MPxLocatorNode):
                 glFT.glEnd()
         return None
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -112,6 +112,11 @@ class TestNode(om2.MPxNode):
         TestNode.addAttribute(TestNode.outAttr)
         TestNode.attributeAffects(TestNode.inAttr, TestNode.outAttr)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -59,9 +59,10 @@ Sources:
 
 This code supports Pylint. Rc file in project.
 """
-import maya.cmds as cmds
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -87,6 +88,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class DistributeAlongSurface(om2.MPxNode):
     """ Main class of gfDistributeAlongSurface node. """
 
@@ -151,6 +153,11 @@ class DistributeAlongSurface(om2.MPxNode):
         DistributeAlongSurface.attributeAffects(DistributeAlongSurface.inDisplace, DistributeAlongSurface.outTransform)
         DistributeAlongSurface.attributeAffects(DistributeAlongSurface.inAlwaysUniform, DistributeAlongSurface.outTransform)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -215,5 +222,3 @@ class DistributeAlongSurface(om2.MPxNode):
 
         surfaceHandle.setClean()
         outTransHandle.setAllClean()
-
-        cmds.refresh()
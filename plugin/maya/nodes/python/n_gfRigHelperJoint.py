@@ -8,6 +8,7 @@ Redistribution:
 Maya Node:
     [This is a prototype version of the gfRigHelperJoint node. You should be using the related C++ version.]
     This node is a test node and only performs test operations with one input value.
+    All the targets are solved at once by gfTools.kernels.transform.
 
 Requirements:
     Maya 2017 or above.
@@ -17,8 +18,14 @@ Todo:
 
 This code supports Pylint. Rc file in project.
 """
+import numpy as np
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+from gfTools.kernels import transform
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -44,6 +51,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class HelperJoint(om2.MPxNode):
     """ Main class of gfRigHelperJoint node. """
 
@@ -157,6 +165,11 @@ class HelperJoint(om2.MPxNode):
         HelperJoint.attributeAffects(HelperJoint.inPosMult, HelperJoint.outTransform)
         HelperJoint.attributeAffects(HelperJoint.inNegMult, HelperJoint.outTransform)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -167,61 +180,51 @@ class HelperJoint(om2.MPxNode):
         if plug != HelperJoint.outTransform:
             return om2.kUnknownParameter
 
-        mSource = dataBlock.inputValue(HelperJoint.inSource).asMatrix()
-        mtxFn = om2.MTransformationMatrix(mSource)
-        mtxFn.setScale([1.0, 1.0, 1.0], om2.MSpace.kTransform)
-        mSource = mtxFn.asMatrix()
-        mSourceParent = dataBlock.inputValue(HelperJoint.inSourceParent).asMatrix()
+        mSource = HelperJoint.matrixToArray(dataBlock.inputValue(HelperJoint.inSource).asMatrix())
+        vSourceTrans, qSourceRot, _, vSourceShear = transform.decompose(mSource)
+        mSource = transform.compose(vSourceTrans, qSourceRot, shear=vSourceShear)
+        mSourceParent = HelperJoint.matrixToArray(dataBlock.inputValue(HelperJoint.inSourceParent).asMatrix())
 
-        mParInv = dataBlock.inputValue(HelperJoint.inParInvMtx).asMatrix()
+        mParInv = HelperJoint.matrixToArray(dataBlock.inputValue(HelperJoint.inParInvMtx).asMatrix())
         sourceParSca = dataBlock.inputValue(HelperJoint.inSourceParSca).asFloat3()
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.scaleBy(sourceParSca, om2.MSpace.kTransform)
-        mInvSca = mtxFn.asMatrix()
+        mInvSca = transform.compose(scale=sourceParSca)
         targetListHandle = dataBlock.inputArrayValue(HelperJoint.inTargetList)
 
-        outputList = []
-
-        for i in range(len(targetListHandle)):
+        count = len(targetListHandle)
+        posOffset = np.zeros((count, 3))
+        rotOffset = np.zeros((count, 3))
+        targetValues = np.zeros((5, count))
+        for i in range(count):
             targetListHandle.jumpToLogicalElement(i)
             targetHandle = targetListHandle.inputValue()
-            vPosOffset = om2.MVector(targetHandle.child(HelperJoint.inPositionOffset).asFloat3())
-            eRotOffset = om2.MEulerRotation(targetHandle.child(HelperJoint.inRotationOffset).asDouble3())
-            angle = targetHandle.child(HelperJoint.inRotAngle).asAngle().asRadians()
-            restAngle = targetHandle.child(HelperJoint.inRestAngle).asAngle().asRadians()
-            rotInterp = targetHandle.child(HelperJoint.inRotInterp).asFloat()
-            posMult = targetHandle.child(HelperJoint.inPosMult).asFloat()
-            negMult = targetHandle.child(HelperJoint.inNegMult).asFloat()
-
-            mPositionOffset = om2.MMatrix()
-            mPositionOffset[12] = vPosOffset.x
-            mPositionOffset[13] = vPosOffset.y
-            mPositionOffset[14] = vPosOffset.z
-            multTranslation = abs(angle) * posMult
-            if angle < restAngle:
-                multTranslation = abs(angle) * negMult
-            vPosOffset.normalize()
-            mMultiplier = om2.MMatrix()
-            mMultiplier[12] = vPosOffset.x * multTranslation
-            mMultiplier[13] = vPosOffset.y * multTranslation
-            mMultiplier[14] = vPosOffset.z * multTranslation
-            mTargetPoint = mMultiplier * mPositionOffset * mSource
-            mTargetOrient = mInvSca * (mSource * (1.0 - rotInterp)) + (mSourceParent * rotInterp)
-
-            vResultPos = om2.MVector(mTargetPoint[12], mTargetPoint[13], mTargetPoint[14])
-            mtxFn = om2.MTransformationMatrix(mTargetOrient)
-            eResultOri = eRotOffset + mtxFn.rotation(asQuaternion=False)
-            mtxFn = om2.MTransformationMatrix()
-            mtxFn.setRotation(eResultOri)
-            mtxFn.setTranslation(vResultPos, om2.MSpace.kTransform)
-            mResult = mtxFn.asMatrix() * mParInv
-            outputList.append(mResult)
+            posOffset[i] = targetHandle.child(HelperJoint.inPositionOffset).asFloat3()
+            rotOffset[i] = targetHandle.child(HelperJoint.inRotationOffset).asDouble3()
+            targetValues[:, i] = (targetHandle.child(HelperJoint.inRotAngle).asAngle().asRadians(),
+                                  targetHandle.child(HelperJoint.inRestAngle).asAngle().asRadians(),
+                                  targetHandle.child(HelperJoint.inRotInterp).asFloat(),
+                                  targetHandle.child(HelperJoint.inPosMult).asFloat(),
+                                  targetHandle.child(HelperJoint.inNegMult).asFloat())
+        angle, restAngle, rotInterp, posMult, negMult = targetValues
+
+        multTranslation = np.abs(angle) * np.where(angle < restAngle, negMult, posMult)
+        vTargetPoint = posOffset + quaternion.normalizeVector(posOffset) * multTranslation[:, np.newaxis]
+        vResultPos = np.matmul(vTargetPoint, mSource[:3, :3]) + mSource[3, :3]
+        mTargetOrient = ((1.0 - rotInterp)[:, np.newaxis, np.newaxis] * np.matmul(mInvSca, mSource) +
+                         rotInterp[:, np.newaxis, np.newaxis] * mSourceParent)
+
+        eResultOri = rotOffset + transform.decompose(mTargetOrient, euler.kXYZ)[1]
+        outputList = np.matmul(transform.compose(vResultPos, eResultOri, order=euler.kXYZ), mParInv)
 
         outTransHandle = dataBlock.outputArrayValue(HelperJoint.outTransform)
         for i in range(len(outTransHandle)):
             outTransHandle.jumpToLogicalElement(i)
             resultHandle = outTransHandle.outputValue()
-            if i < len(outTransHandle) and i < len(outputList):
-                resultHandle.setMMatrix(outputList[i])
+            if i < len(outputList):
+                resultHandle.setMMatrix(om2.MMatrix(outputList[i].ravel().tolist()))
             else:
                 resultHandle.setMMatrix(om2.MMatrix.kIdentity)
+
+    @staticmethod
+    def matrixToArray(mtx):
+        """ Convert a MMatrix to a 4x4 numpy array. """
+        return np.reshape([mtx[i] for i in range(16)], (4, 4))
@@ -37,10 +37,16 @@ How to use:
 
 Requirements:
     * Maya 2017 or above.
+    * NumPy.
 
 Description:
     IK Solver to VChain type of rig. Can be used to replace the default Maya
     IKRPSolver with the plus of some cartoony options.
+    The math lives in gfTools.kernels.ikVChain, this node only reads the plugs and writes the outChain.
+    The offset, joint orient and rest length plugs are only read again after they are dirtied.
+    Behavior change: with a Snap Up Vector between 0.0 and 1.0 the chain now turns to the blended
+    pole/snap normal. The previous node compared the non normalized blend in isEquivalent, always
+    took the 2*pi - angle branch and could turn the chain to the mirrored side.
 
 Attributes:
     * Root: The world matrix of the root object.
@@ -76,8 +82,13 @@ This code supports Pylint. Rc file in project.
 """
 
 import math
+import numpy as np
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import ikVChain
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -103,6 +114,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class IKVChainSolver(om2.MPxNode):
     """ Main class of gfRigIKVChainSolver node. """
 
@@ -141,6 +153,9 @@ class IKVChainSolver(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
+        self.cachedOffsets = None
+        self.cachedJntOris = None
+        self.cachedRestLengths = None
 
     @staticmethod
     def creator():
@@ -336,6 +351,39 @@ class IKVChainSolver(om2.MPxNode):
         IKVChainSolver.attributeAffects(IKVChainSolver.inSquashMultStart, IKVChainSolver.outChain)
         IKVChainSolver.attributeAffects(IKVChainSolver.inSquashMultEnd, IKVChainSolver.outChain)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached offsets, joint orients or rest lengths being dirtied. """
+        # pylint: disable=unused-argument
+        attribute = nodeUtils.topAttribute(plugBeingDirtied)
+        if attribute == IKVChainSolver.inOffset:
+            self.cachedOffsets = None
+        elif attribute == IKVChainSolver.inJntOri:
+            self.cachedJntOris = None
+        elif attribute in (IKVChainSolver.inRestLenStart, IKVChainSolver.inRestLenEnd):
+            self.cachedRestLengths = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if not context.isNormal():
+            return
+        if evaluationNode.dirtyPlugExists(IKVChainSolver.inOffset):
+            self.cachedOffsets = None
+        if evaluationNode.dirtyPlugExists(IKVChainSolver.inJntOri):
+            self.cachedJntOris = None
+        if (evaluationNode.dirtyPlugExists(IKVChainSolver.inRestLenStart) or
+                evaluationNode.dirtyPlugExists(IKVChainSolver.inRestLenEnd)):
+            self.cachedRestLengths = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -345,245 +393,84 @@ class IKVChainSolver(om2.MPxNode):
         if plug != IKVChainSolver.outChain:
             return om2.kUnknownParameter
 
-        # Get Basis Quaternion
         mRoot = dataBlock.inputValue(IKVChainSolver.inRoot).asMatrix()
         mHandle = dataBlock.inputValue(IKVChainSolver.inHandle).asMatrix()
         mPoleVector = dataBlock.inputValue(IKVChainSolver.inPoleVector).asMatrix()
-        pvMode = dataBlock.inputValue(IKVChainSolver.inPvMode).asShort()
-        prefAngle = dataBlock.inputValue(IKVChainSolver.inPreferredAngle).asAngle().asRadians()
-        twist = dataBlock.inputValue(IKVChainSolver.inTwist).asAngle().asRadians()
-        snap = dataBlock.inputValue(IKVChainSolver.inSnapUpVector).asFloat()
-        mSnap = dataBlock.inputValue(IKVChainSolver.inSnap).asMatrix()
-        flip = dataBlock.inputValue(IKVChainSolver.inFlip).asBool()
-
-        vRoot = om2.MVector(mRoot[12], mRoot[13], mRoot[14])
-        vHandle = om2.MVector(mHandle[12], mHandle[13], mHandle[14])
-        vPoleVector = om2.MVector(mPoleVector[12], mPoleVector[13], mPoleVector[14])
-        vSnap = om2.MVector(mSnap[12], mSnap[13], mSnap[14])
-
-        primAxis = om2.MVector.kXaxisVector
-        secAxis = om2.MVector.kYaxisVector
-        if flip:
-            primAxis = -om2.MVector.kXaxisVector
-            secAxis = -om2.MVector.kYaxisVector
-        binAxis = primAxis ^ secAxis
-        qBasis = om2.MQuaternion()
-
-        vAim = vHandle - vRoot
-        nAim = vAim.normal()
-        qAim = om2.MQuaternion(primAxis, nAim)
-        qBasis *= qAim
-
-        vStartSnap = vSnap - vRoot
-        vEndSnap = vSnap - vHandle
-
-        if pvMode == 0:
-            vUp = vPoleVector - vRoot
-        else:
-            qTwist = om2.MQuaternion(prefAngle + twist, nAim)
-            vUp = secAxis.rotateBy(qTwist)
-        nNormalPole = vUp - ((vUp * nAim) * nAim)
-        nNormalPole.normalize()
-        if snap > 0.0:
-            nNormalSnap = vStartSnap - ((vStartSnap * nAim) * nAim)
-            nNormalSnap.normalize()
-            nNormal = (1.0 - snap) * nNormalPole + snap * nNormalSnap
-        else:
-            nNormal = nNormalPole
-
-        nUp = secAxis.rotateBy(qAim)
-        angle = nUp.angle(nNormal)
-        qNormal = om2.MQuaternion(angle, nAim)
-        if not nNormal.isEquivalent(nUp.rotateBy(qNormal), 1.0e-5):
-            angle = 2.0 * math.pi - angle
-            qNormal = om2.MQuaternion(angle, nAim)
-        qBasis *= qNormal
-
-
-        # Solver Triangle
-        restStartLen = dataBlock.inputValue(IKVChainSolver.inRestLenStart).asFloat()
-        restEndLen = dataBlock.inputValue(IKVChainSolver.inRestLenEnd).asFloat()
-        compressionLimit = dataBlock.inputValue(IKVChainSolver.inCompressionLimit).asFloat()
-        softVal = dataBlock.inputValue(IKVChainSolver.inSoftness).asFloat()
-
-        startSnapLen = vStartSnap.length()
-        endSnapLen = vEndSnap.length()
-
-        startLen = (1.0 - snap) * restStartLen + snap * startSnapLen
-        endLen = (1.0 - snap) * restEndLen + snap * endSnapLen
-        chainLen = (1.0 - snap) * (restStartLen + restEndLen) + snap * (startSnapLen + endSnapLen)
-        handleLen = vAim.length()
-
-        rigidLen = max(min(handleLen, chainLen), chainLen * compressionLimit)
-        dc = chainLen
-        da = (1.0 - softVal) * dc
-        if handleLen > da and softVal > 0.0:
-            ds = dc - da
-            softLen = ds * (1.0 - math.pow(math.e, (da - handleLen) / ds)) + da
-            solverLen = (1.0 - snap) * softLen + snap * rigidLen
-        else:
-            solverLen = rigidLen
-
-
-        # Pre Calculations
-        startLenSquared = math.pow(startLen, 2.0)
-        endLenSquared = math.pow(endLen, 2.0)
-        solverLenSquared = math.pow(solverLen, 2.0)
-        stretch = dataBlock.inputValue(IKVChainSolver.inStretch).asDouble()
-        squashMultStart = dataBlock.inputValue(IKVChainSolver.inSquashMultStart).asFloat2()
-        squashMultEnd = dataBlock.inputValue(IKVChainSolver.inSquashMultEnd).asFloat2()
-        if stretch > 0.0:
-            clampStretch = dataBlock.inputValue(IKVChainSolver.inClampStretch).asDouble()
-            clampValue = dataBlock.inputValue(IKVChainSolver.inClampValue).asDouble()
-            squash = dataBlock.inputValue(IKVChainSolver.inSquash).asDouble()
-            if handleLen > da and softVal > 0.0:
-                scaleFactor = handleLen / solverLen
-            else:
-                scaleFactor = handleLen / chainLen
-            if handleLen >= da:
-                clampFactor = (1.0 - clampStretch) * scaleFactor + clampStretch * min(scaleFactor, clampValue)
-                stretchFactor = (1.0 - stretch) + stretch * clampFactor
-            else:
-                stretchFactor = 1.0
-            squashFactor = (1.0 - squash) + squash * (1.0 / math.sqrt(stretchFactor))
-        else:
-            stretchFactor = 1.0
-            squashFactor = 1.0
-
-        hierarchyMode = dataBlock.inputValue(IKVChainSolver.inHierarchyMode).asBool()
-        useScale = dataBlock.inputValue(IKVChainSolver.inUseScale).asBool()
-        outChainHandle = dataBlock.outputArrayValue(IKVChainSolver.outChain)
-        offsetHandle = dataBlock.inputArrayValue(IKVChainSolver.inOffset)
-        jntOriHandle = dataBlock.inputArrayValue(IKVChainSolver.inJntOri)
         mParInv = dataBlock.inputValue(IKVChainSolver.inParInvMtx).asMatrix()
-        srtList = []
-        offsetList = []
-        jntOriList = []
-
-        for i in range(len(offsetHandle)):
-            offsetHandle.jumpToLogicalElement(i)
-            eOff = om2.MEulerRotation(offsetHandle.inputValue().asDouble3())
-            qOff = eOff.asQuaternion()
-            offsetList.append(qOff)
-
-        for i in range(len(jntOriHandle)):
-            jntOriHandle.jumpToLogicalElement(i)
-            eOri = om2.MEulerRotation(jntOriHandle.inputValue().asDouble3())
-            qOri = eOri.asQuaternion()
-            jntOriList.append(qOri)
-
-
-        # First Output
-        # Scale
-        firstStretch = stretchFactor
-        firstScaX = firstStretch
-        if not useScale:
-            firstStretch = 1.0
-        firstSquash = [squashFactor * squashMultStart[0], squashFactor * squashMultStart[1]]
-        firstSca = [firstStretch, firstSquash[0], firstSquash[1]]
-        # Rotation
-        betaCosPure = (startLenSquared + solverLenSquared - endLenSquared) / (2.0 * startLen * solverLen)
-        betaCos = min(max(betaCosPure, -1.0), 1.0)
-        beta = math.acos(betaCos)
-        qBeta = om2.MQuaternion(beta, binAxis)
-        qFirstRotW = qBeta * qBasis
-        qFirstRot = om2.MQuaternion()
-        if len(offsetList) >= 1:
-            qFirstRot *= offsetList[0].invertIt()
-        qFirstRot *= qFirstRotW
-        if len(jntOriList) >= 1:
-            qFirstRot *= jntOriList[0].invertIt()
-        # Translation
-        vFirstPos = vRoot
-        # Matrix Output
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.setScale(firstSca, om2.MSpace.kTransform)
-        mtxFn.setRotation(qFirstRot)
-        mtxFn.setTranslation(vFirstPos, om2.MSpace.kTransform)
-        mFirst = mtxFn.asMatrix()
-        mFirst *= mParInv
-        srtList.append(mFirst)
-
-
-        # Second Output
-        # Scale
-        secondStretch = stretchFactor
-        secondScaX = secondStretch
-        if not useScale:
-            secondStretch = 1.0
-        secondSquash = [squashFactor * squashMultEnd[0], squashFactor * squashMultEnd[1]]
-        secondSca = [secondStretch, secondSquash[0], secondSquash[1]]
-        # Rotation
-        gammaCosPure = (startLenSquared + endLenSquared - solverLenSquared) / (2.0 * startLen * endLen)
-        gammaCos = min(max(gammaCosPure, -1.0), 1.0)
-        gamma = math.acos(gammaCos)
-        gammaCmp = gamma + beta - math.pi
-        qGamma = om2.MQuaternion(gammaCmp, binAxis)
-        qSecondRotW = qGamma * qBasis
-        qSecondRot = om2.MQuaternion()
-        if len(offsetList) >= 2:
-            qSecondRot *= offsetList[1].invertIt()
-        qSecondRot *= qSecondRotW
-        if hierarchyMode:
-            qSecondRot *= qFirstRotW.invertIt()
-            if len(offsetList) >= 1:
-                qSecondRot *= offsetList[0].invertIt()
-        if len(jntOriList) >= 2:
-            qSecondRot *= jntOriList[1].invertIt()
-        # Translation
-        if hierarchyMode:
-            vSecondPos = primAxis * startLen
-            if not useScale:
-                vSecondPos *= firstScaX
-        else:
-            vSecondOri = nAim.rotateBy(om2.MQuaternion(beta, nAim ^ nNormal)) * startLen
-            if not useScale:
-                vSecondOri *= firstScaX
-            vSecondPos = vRoot + vSecondOri
-        # Matrix Output
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.setScale(secondSca, om2.MSpace.kTransform)
-        mtxFn.setRotation(qSecondRot)
-        mtxFn.setTranslation(vSecondPos, om2.MSpace.kTransform)
-        mSecond = mtxFn.asMatrix()
-        if not hierarchyMode:
-            mSecond *= mParInv
-        srtList.append(mSecond)
-
-
-        # Third Output
-        # Rotation
-        qThirdRot = qBasis
-        if hierarchyMode:
-            qThirdRot *= qSecondRotW.invertIt()
-            if len(offsetList) >= 2:
-                qThirdRot *= offsetList[1].invertIt()
-        # Translation
-        if hierarchyMode:
-            vThirdPos = primAxis * endLen
-            if not useScale:
-                vThirdPos *= secondScaX
-        else:
-            vThirdPos = vRoot + nAim * solverLen
-            if not useScale:
-                vThirdPos = vRoot + nAim * solverLen * stretchFactor
-        # Matrix Output
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.setRotation(qThirdRot)
-        mtxFn.setTranslation(vThirdPos, om2.MSpace.kTransform)
-        mThird = mtxFn.asMatrix()
-        if not hierarchyMode:
-            mThird *= mParInv
-        srtList.append(mThird)
+        mSnap = dataBlock.inputValue(IKVChainSolver.inSnap).asMatrix()
 
+        # The rest pose values are only read again after their plugs are dirtied.
+        isNormal = dataBlock.context().isNormal()
+        offsets = self.cachedOffsets if isNormal else None
+        if offsets is None:
+            offsets = IKVChainSolver.eulerArrayToQuaternions(dataBlock.inputArrayValue(IKVChainSolver.inOffset))
+            if isNormal:
+                self.cachedOffsets = offsets
+        jntOris = self.cachedJntOris if isNormal else None
+        if jntOris is None:
+            jntOris = IKVChainSolver.eulerArrayToQuaternions(dataBlock.inputArrayValue(IKVChainSolver.inJntOri))
+            if isNormal:
+                self.cachedJntOris = jntOris
+        restLengths = self.cachedRestLengths if isNormal else None
+        if restLengths is None:
+            restLengths = (dataBlock.inputValue(IKVChainSolver.inRestLenStart).asFloat(),
+                           dataBlock.inputValue(IKVChainSolver.inRestLenEnd).asFloat())
+            if isNormal:
+                self.cachedRestLengths = restLengths
+
+        srtList = ikVChain.solve(
+            IKVChainSolver.matrixToArray(mRoot),
+            IKVChainSolver.matrixToArray(mHandle),
+            IKVChainSolver.matrixToArray(mPoleVector),
+            parentInverse=IKVChainSolver.matrixToArray(mParInv),
+            snap=IKVChainSolver.matrixToArray(mSnap),
+            offsets=offsets,
+            jointOrients=jntOris,
+            restLengthStart=restLengths[0],
+            restLengthEnd=restLengths[1],
+            preferredAngle=dataBlock.inputValue(IKVChainSolver.inPreferredAngle).asAngle().asRadians(),
+            twist=dataBlock.inputValue(IKVChainSolver.inTwist).asAngle().asRadians(),
+            pvMode=dataBlock.inputValue(IKVChainSolver.inPvMode).asShort(),
+            hierarchyMode=dataBlock.inputValue(IKVChainSolver.inHierarchyMode).asBool(),
+            flip=dataBlock.inputValue(IKVChainSolver.inFlip).asBool(),
+            useStretchAsScale=dataBlock.inputValue(IKVChainSolver.inUseScale).asBool(),
+            compressionLimit=dataBlock.inputValue(IKVChainSolver.inCompressionLimit).asFloat(),
+            snapUpVector=dataBlock.inputValue(IKVChainSolver.inSnapUpVector).asFloat(),
+            softness=dataBlock.inputValue(IKVChainSolver.inSoftness).asFloat(),
+            stretch=dataBlock.inputValue(IKVChainSolver.inStretch).asDouble(),
+            clampStretch=dataBlock.inputValue(IKVChainSolver.inClampStretch).asDouble(),
+            clampValue=dataBlock.inputValue(IKVChainSolver.inClampValue).asDouble(),
+            squash=dataBlock.inputValue(IKVChainSolver.inSquash).asDouble(),
+            squashMultStart=dataBlock.inputValue(IKVChainSolver.inSquashMultStart).asFloat2(),
+            squashMultEnd=dataBlock.inputValue(IKVChainSolver.inSquashMultEnd).asFloat2()
+        )[0]
 
         # Set outputs
+        outChainHandle = dataBlock.outputArrayValue(IKVChainSolver.outChain)
         for i in range(len(outChainHandle)):
             outChainHandle.jumpToLogicalElement(i)
             resultHandle = outChainHandle.outputValue()
-            if i < len(outChainHandle) and i < len(srtList):
-                resultHandle.setMMatrix(srtList[i])
+            if i < len(srtList):
+                resultHandle.setMMatrix(om2.MMatrix(srtList[i].ravel().tolist()))
             else:
                 resultHandle.setMMatrix(om2.MMatrix.kIdentity)
 
         outChainHandle.setAllClean()
+
+    @staticmethod
+    def matrixToArray(mtx):
+        """ Convert a MMatrix to a 4x4 numpy array. """
+        return np.reshape([mtx[i] for i in range(16)], (4, 4))
+
+    @staticmethod
+    def eulerArrayToQuaternions(arrayHandle):
+        """
+        Convert the first two elements of an angle3 array handle to a (2, 4) array of quaternions.
+        Missing elements are returned as identity quaternions.
+        """
+        quats = [[0.0, 0.0, 0.0, 1.0], [0.0, 0.0, 0.0, 1.0]]
+        for i in range(min(len(arrayHandle), 2)):
+            arrayHandle.jumpToLogicalElement(i)
+            qRot = om2.MEulerRotation(arrayHandle.inputValue().asDouble3()).asQuaternion()
+            quats[i] = [qRot.x, qRot.y, qRot.z, qRot.w]
+        return np.array(quats)
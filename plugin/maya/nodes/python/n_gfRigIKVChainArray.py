@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Array version of gfIKVChain. Every element of the limb compound has the inputs of one gfIKVChain
+    node and drives the outChain of the outLimb element with the same index. All the limbs are solved
+    together by gfTools.kernels.ikVChain, so a character needs one node instead of one per limb.
+    The offset and joint orient arrays of gfIKVChain are split in start and mid attributes.
+    The outLimb elements without a limb are set to identity matrices.
+
+Attributes:
+    * Limb: The array of limbs. Every element has:
+        * Root, Handle, Pole Vector, Parent Inverse Matrix and Snap: The world matrices of gfIKVChain.
+        * Start Offset, Mid Offset: The offset rotations of the start and mid outputs.
+        * Start Joint Orient, Mid Joint Orient: The joint orients of the start and mid outputs.
+        * The settings of gfIKVChain: Rest Length Start, Rest Length End, Preferred Angle, Twist,
+          Pv Mode, Hierarchy Mode, Flip Orientation, Use Stretch As Scale, Compression Limit,
+          Snap Up Vector, Softness, Stretch, Clamp Stretch, Clamp Value, Squash, Squash Mult Start
+          and Squash Mult End.
+    * Out Limb: The array of solved limbs. Every element has:
+        * Out Chain: The output matrices of the limb chain.
+
+Todo:
+    * NDA
+
+Sources:
+    * https://www.desmos.com/calculator/wthlznq4aj
+
+This code supports Pylint. Rc file in project.
+"""
+import math
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import profiling
+from gfTools.kernels import euler
+from gfTools.kernels import ikVChain
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=C0103, W0107
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class IKVChainArraySolver(om2.MPxNode):
+    """ Main class of gfRigIKVChainArraySolver node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inLimb = om2.MObject()
+    inRoot = om2.MObject()
+    inHandle = om2.MObject()
+    inPoleVector = om2.MObject()
+    inParInvMtx = om2.MObject()
+    inSnap = om2.MObject()
+    inStartOffset = om2.MObject()
+    inMidOffset = om2.MObject()
+    inStartJntOri = om2.MObject()
+    inMidJntOri = om2.MObject()
+    inRestLenStart = om2.MObject()
+    inRestLenEnd = om2.MObject()
+    inPreferredAngle = om2.MObject()
+    inTwist = om2.MObject()
+    inPvMode = om2.MObject()
+    inHierarchyMode = om2.MObject()
+    inFlip = om2.MObject()
+    inUseScale = om2.MObject()
+    inCompressionLimit = om2.MObject()
+    inSnapUpVector = om2.MObject()
+    inSoftness = om2.MObject()
+    inStretch = om2.MObject()
+    inClampStretch = om2.MObject()
+    inClampValue = om2.MObject()
+    inSquash = om2.MObject()
+    inSquashMultStart = om2.MObject()
+    inSquashMultEnd = om2.MObject()
+    outLimb = om2.MObject()
+    outChain = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return IKVChainArraySolver()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to IKVChainArraySolver class. Instances of IKVChainArraySolver will use these attributes to
+        create plugs for use in the compute() method.
+        """
+        mAttr = om2.MFnMatrixAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        eAttr = om2.MFnEnumAttribute()
+        uAttr = om2.MFnUnitAttribute()
+        cAttr = om2.MFnCompoundAttribute()
+
+        IKVChainArraySolver.inRoot = mAttr.create("root", "root", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        IKVChainArraySolver.inHandle = mAttr.create("handle", "handle", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        IKVChainArraySolver.inPoleVector = mAttr.create("poleVector", "pole", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        IKVChainArraySolver.inParInvMtx = mAttr.create("parentInverseMatrix", "pim", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        IKVChainArraySolver.inSnap = mAttr.create("snap", "snap", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        startOffX = uAttr.create("startOffsetX", "soffx", om2.MFnUnitAttribute.kAngle, 0.0)
+        startOffY = uAttr.create("startOffsetY", "soffy", om2.MFnUnitAttribute.kAngle, 0.0)
+        startOffZ = uAttr.create("startOffsetZ", "soffz", om2.MFnUnitAttribute.kAngle, 0.0)
+        IKVChainArraySolver.inStartOffset = nAttr.create("startOffset", "soff", startOffX, startOffY, startOffZ)
+        INPUT_ATTR(nAttr)
+
+        midOffX = uAttr.create("midOffsetX", "moffx", om2.MFnUnitAttribute.kAngle, 0.0)
+        midOffY = uAttr.create("midOffsetY", "moffy", om2.MFnUnitAttribute.kAngle, 0.0)
+        midOffZ = uAttr.create("midOffsetZ", "moffz", om2.MFnUnitAttribute.kAngle, 0.0)
+        IKVChainArraySolver.inMidOffset = nAttr.create("midOffset", "moff", midOffX, midOffY, midOffZ)
+        INPUT_ATTR(nAttr)
+
+        startJntOriX = uAttr.create("startJointOrientX", "sjox", om2.MFnUnitAttribute.kAngle, 0.0)
+        startJntOriY = uAttr.create("startJointOrientY", "sjoy", om2.MFnUnitAttribute.kAngle, 0.0)
+        startJntOriZ = uAttr.create("startJointOrientZ", "sjoz", om2.MFnUnitAttribute.kAngle, 0.0)
+        IKVChainArraySolver.inStartJntOri = nAttr.create("startJointOrient", "sjo", startJntOriX, startJntOriY, startJntOriZ)
+        INPUT_ATTR(nAttr)
+
+        midJntOriX = uAttr.create("midJointOrientX", "mjox", om2.MFnUnitAttribute.kAngle, 0.0)
+        midJntOriY = uAttr.create("midJointOrientY", "mjoy", om2.MFnUnitAttribute.kAngle, 0.0)
+        midJntOriZ = uAttr.create("midJointOrientZ", "mjoz", om2.MFnUnitAttribute.kAngle, 0.0)
+        IKVChainArraySolver.inMidJntOri = nAttr.create("midJointOrient", "mjo", midJntOriX, midJntOriY, midJntOriZ)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inRestLenStart = nAttr.create("restLengthStart", "rls", om2.MFnNumericData.kFloat, 1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inRestLenEnd = nAttr.create("restLengthEnd", "rle", om2.MFnNumericData.kFloat, 1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inPreferredAngle = uAttr.create("preferredAngle", "pa", om2.MFnUnitAttribute.kAngle, 0.0)
+        uAttr.setMin(0.0)
+        uAttr.setMax(2.0 * math.pi)
+        INPUT_ATTR(uAttr)
+
+        IKVChainArraySolver.inTwist = uAttr.create("twist", "twist", om2.MFnUnitAttribute.kAngle, 0.0)
+        INPUT_ATTR(uAttr)
+
+        IKVChainArraySolver.inPvMode = eAttr.create("pvMode", "pvm", 0)
+        eAttr.addField("Manual", 0)
+        eAttr.addField("Auto", 1)
+        INPUT_ATTR(eAttr)
+
+        IKVChainArraySolver.inHierarchyMode = nAttr.create("hierarchyMode", "hm", om2.MFnNumericData.kBoolean, True)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inFlip = nAttr.create("flipOrientation", "fori", om2.MFnNumericData.kBoolean, False)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inUseScale = nAttr.create("useStretchAsScale", "usca", om2.MFnNumericData.kBoolean, False)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inCompressionLimit = nAttr.create("compressionLimit", "cl", om2.MFnNumericData.kFloat, 0.1)
+        nAttr.setMin(0.001)
+        nAttr.setMax(0.4)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inSnapUpVector = nAttr.create("snapUpVector", "supv", om2.MFnNumericData.kFloat, 0.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inSoftness = nAttr.create("softness", "soft", om2.MFnNumericData.kFloat, 0.0)
+        nAttr.setMin(0.0)
+        nAttr.setSoftMax(0.2)
+        nAttr.setMax(1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inStretch = nAttr.create("stretch", "st", om2.MFnNumericData.kDouble, 0.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inClampStretch = nAttr.create("clampStretch", "cst", om2.MFnNumericData.kDouble, 0.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inClampValue = nAttr.create("clampValue", "cstv", om2.MFnNumericData.kDouble, 1.5)
+        nAttr.setMin(1.0)
+        nAttr.setSoftMax(1.8)
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inSquash = nAttr.create("squash", "sq", om2.MFnNumericData.kDouble, 0.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        INPUT_ATTR(nAttr)
+
+        startSqX = nAttr.create("squashMultStartX", "sqmsx", om2.MFnNumericData.kFloat, 1.0)
+        startSqY = nAttr.create("squashMultStartY", "sqmsy", om2.MFnNumericData.kFloat, 1.0)
+        IKVChainArraySolver.inSquashMultStart = nAttr.create("squashMultStart", "sqms", startSqX, startSqY)
+        nAttr.setMin([0.001, 0.001])
+        INPUT_ATTR(nAttr)
+
+        endSqX = nAttr.create("squashMultEndX", "sqmex", om2.MFnNumericData.kFloat, 1.0)
+        endSqY = nAttr.create("squashMultEndY", "sqmey", om2.MFnNumericData.kFloat, 1.0)
+        IKVChainArraySolver.inSquashMultEnd = nAttr.create("squashMultEnd", "sqme", endSqX, endSqY)
+        nAttr.setMin([0.001, 0.001])
+        INPUT_ATTR(nAttr)
+
+        IKVChainArraySolver.inLimb = cAttr.create("limb", "limb")
+        for child in IKVChainArraySolver.limbChildren():
+            cAttr.addChild(child)
+        cAttr.array = True
+        INPUT_ATTR(cAttr)
+
+        IKVChainArraySolver.outChain = mAttr.create("outChain", "oc", om2.MFnMatrixAttribute.kDouble)
+        mAttr.array = True
+        OUTPUT_ATTR(mAttr)
+
+        IKVChainArraySolver.outLimb = cAttr.create("outLimb", "olimb")
+        cAttr.addChild(IKVChainArraySolver.outChain)
+        cAttr.array = True
+        OUTPUT_ATTR(cAttr)
+
+        IKVChainArraySolver.addAttribute(IKVChainArraySolver.inLimb)
+        IKVChainArraySolver.addAttribute(IKVChainArraySolver.outLimb)
+        for child in [IKVChainArraySolver.inLimb] + IKVChainArraySolver.limbChildren():
+            IKVChainArraySolver.attributeAffects(child, IKVChainArraySolver.outLimb)
+            IKVChainArraySolver.attributeAffects(child, IKVChainArraySolver.outChain)
+
+    @staticmethod
+    def limbChildren():
+        """ Return the child attributes of the limb compound. """
+        return [
+            IKVChainArraySolver.inRoot, IKVChainArraySolver.inHandle, IKVChainArraySolver.inPoleVector,
+            IKVChainArraySolver.inParInvMtx, IKVChainArraySolver.inSnap,
+            IKVChainArraySolver.inStartOffset, IKVChainArraySolver.inMidOffset,
+            IKVChainArraySolver.inStartJntOri, IKVChainArraySolver.inMidJntOri,
+            IKVChainArraySolver.inRestLenStart, IKVChainArraySolver.inRestLenEnd,
+            IKVChainArraySolver.inPreferredAngle, IKVChainArraySolver.inTwist, IKVChainArraySolver.inPvMode,
+            IKVChainArraySolver.inHierarchyMode, IKVChainArraySolver.inFlip, IKVChainArraySolver.inUseScale,
+            IKVChainArraySolver.inCompressionLimit, IKVChainArraySolver.inSnapUpVector, IKVChainArraySolver.inSoftness,
+            IKVChainArraySolver.inStretch, IKVChainArraySolver.inClampStretch, IKVChainArraySolver.inClampValue,
+            IKVChainArraySolver.inSquash, IKVChainArraySolver.inSquashMultStart, IKVChainArraySolver.inSquashMultEnd
+        ]
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        # pylint: disable=too-many-locals
+        if plug not in (IKVChainArraySolver.outLimb, IKVChainArraySolver.outChain):
+            return om2.kUnknownParameter
+
+        # Gather the limbs in flat lists, one item per limb, and solve them in one call.
+        indices = []
+        matrices = []
+        angles = []
+        values = []
+        limbHandle = dataBlock.inputArrayValue(IKVChainArraySolver.inLimb)
+        for i in range(len(limbHandle)):
+            limbHandle.jumpToPhysicalElement(i)
+            indices.append(limbHandle.elementLogicalIndex())
+            handle = limbHandle.inputValue()
+            matrices.append([IKVChainArraySolver.matrixToList(handle.child(attr).asMatrix()) for attr in (
+                IKVChainArraySolver.inRoot, IKVChainArraySolver.inHandle, IKVChainArraySolver.inPoleVector,
+                IKVChainArraySolver.inParInvMtx, IKVChainArraySolver.inSnap)])
+            angles.append([handle.child(attr).asDouble3() for attr in (
+                IKVChainArraySolver.inStartOffset, IKVChainArraySolver.inMidOffset,
+                IKVChainArraySolver.inStartJntOri, IKVChainArraySolver.inMidJntOri)])
+            squashMultStart = handle.child(IKVChainArraySolver.inSquashMultStart).asFloat2()
+            squashMultEnd = handle.child(IKVChainArraySolver.inSquashMultEnd).asFloat2()
+            values.append([
+                handle.child(IKVChainArraySolver.inRestLenStart).asFloat(),
+                handle.child(IKVChainArraySolver.inRestLenEnd).asFloat(),
+                handle.child(IKVChainArraySolver.inPreferredAngle).asAngle().asRadians(),
+                handle.child(IKVChainArraySolver.inTwist).asAngle().asRadians(),
+                handle.child(IKVChainArraySolver.inPvMode).asShort(),
+                handle.child(IKVChainArraySolver.inHierarchyMode).asBool(),
+                handle.child(IKVChainArraySolver.inFlip).asBool(),
+                handle.child(IKVChainArraySolver.inUseScale).asBool(),
+                handle.child(IKVChainArraySolver.inCompressionLimit).asFloat(),
+                handle.child(IKVChainArraySolver.inSnapUpVector).asFloat(),
+                handle.child(IKVChainArraySolver.inSoftness).asFloat(),
+                handle.child(IKVChainArraySolver.inStretch).asDouble(),
+                handle.child(IKVChainArraySolver.inClampStretch).asDouble(),
+                handle.child(IKVChainArraySolver.inClampValue).asDouble(),
+                handle.child(IKVChainArraySolver.inSquash).asDouble(),
+                squashMultStart[0], squashMultStart[1], squashMultEnd[0], squashMultEnd[1]
+            ])
+
+        chains = {}
+        if indices:
+            matrices = np.reshape(matrices, (len(indices), 5, 4, 4))
+            quats = euler.toQuaternion(np.reshape(angles, (len(indices), 4, 3)), euler.kXYZ, dtype=np.float64)
+            values = np.array(values, dtype=np.float64)
+            srtList = ikVChain.solve(
+                matrices[:, 0], matrices[:, 1], matrices[:, 2],
+                parentInverse=matrices[:, 3],
+                snap=matrices[:, 4],
+                offsets=quats[:, 0:2],
+                jointOrients=quats[:, 2:4],
+                restLengthStart=values[:, 0],
+                restLengthEnd=values[:, 1],
+                preferredAngle=values[:, 2],
+                twist=values[:, 3],
+                pvMode=values[:, 4],
+                hierarchyMode=values[:, 5],
+                flip=values[:, 6],
+                useStretchAsScale=values[:, 7],
+                compressionLimit=values[:, 8],
+                snapUpVector=values[:, 9],
+                softness=values[:, 10],
+                stretch=values[:, 11],
+                clampStretch=values[:, 12],
+                clampValue=values[:, 13],
+                squash=values[:, 14],
+                squashMultStart=values[:, 15:17],
+                squashMultEnd=values[:, 17:19]
+            )
+            chains = dict(zip(indices, srtList.reshape(len(indices), 3, 16).tolist()))
+
+        # Set outputs
+        outLimbHandle = dataBlock.outputArrayValue(IKVChainArraySolver.outLimb)
+        for i in range(len(outLimbHandle)):
+            outLimbHandle.jumpToPhysicalElement(i)
+            chain = chains.get(outLimbHandle.elementLogicalIndex(), [])
+            outChainHandle = om2.MArrayDataHandle(outLimbHandle.outputValue().child(IKVChainArraySolver.outChain))
+            for j in range(len(outChainHandle)):
+                outChainHandle.jumpToPhysicalElement(j)
+                index = outChainHandle.elementLogicalIndex()
+                resultHandle = outChainHandle.outputValue()
+                if index < len(chain):
+                    resultHandle.setMMatrix(om2.MMatrix(chain[index]))
+                else:
+                    resultHandle.setMMatrix(om2.MMatrix.kIdentity)
+            outChainHandle.setAllClean()
+
+        outLimbHandle.setAllClean()
+
+    @staticmethod
+    def matrixToList(mtx):
+        """ Convert a MMatrix to a list of 16 floats. """
+        return [mtx[i] for i in range(16)]
@@ -99,12 +99,11 @@ class MeshController(omui2.MPxLocatorNode):
     inMesh = om2.MObject()
     inColor = om2.MObject()
 
-    ctrlVertices = []
-    bBox = om2.MBoundingBox()
-
     def __init__(self):
         """ Constructor. """
         omui2.MPxLocatorNode.__init__(self)
+        self.ctrlVertices = []
+        self.bBox = om2.MBoundingBox()
 
     def postConstructor(self):
         """ Post Constructor. """
@@ -158,7 +157,7 @@ class MeshController(omui2.MPxLocatorNode):
 
     @staticmethod
     def getGeometryPoints(meshMob, indexStr, offset, transform):
-        """ Find the info of the geometry who will be drawed. """
+        """ Find the info of the geometry who will be drawed. Returns the polygons points and their bounding box. """
         # vtxNormals = []
         # vtxPositions = []
 
@@ -232,8 +231,12 @@ class MeshController(omui2.MPxLocatorNode):
                     outPolyVtxPos.append(outPnt)
                 outPnts.append(outPolyVtxPos)
 
-        MeshController.ctrlVertices = outPnts
-        MeshController.bBox = bBox
+        return outPnts, bBox
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
 
     def compute(self, plug, dataBlock):
         """
@@ -264,7 +267,7 @@ class MeshController(omui2.MPxLocatorNode):
         # color = om2.MPlug(thisMob, MeshController.inColor).asMDataHandle().asFloatVector()
 
         # # If plugs are dirty calculate the geometry points
-        # MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
+        # self.ctrlVertices, self.bBox = MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
 
         # view.beginGL()
 
@@ -289,7 +292,7 @@ class MeshController(omui2.MPxLocatorNode):
 
         # if style == view.kFlatShaded or style == view.kGouraudShaded:
         #     glFT.glColor4f(color.x, color.y, color.z, alpha)
-        #     for poly in MeshController.ctrlVertices:
+        #     for poly in self.ctrlVertices:
         #         glFT.glBegin(omr1.MGL_POLYGON)
         #         for pnt in poly:
         #             glFT.glVertex3f(pnt.x, pnt.y, pnt.z)
@@ -298,7 +301,7 @@ class MeshController(omui2.MPxLocatorNode):
         # if style == view.kWireFrame:
         #     glFT.glColor4f(color.x, color.y, color.z, 1.0)
         #     glFT.glBegin(omr1.MGL_LINES)
-        #     for poly in MeshController.ctrlVertices:
+        #     for poly in self.ctrlVertices:
         #         for i, pnt in enumerate(poly):
         #             glFT.glVertex3f(pnt.x, pnt.y, pnt.z)
         #             if i == len(poly) - 1:
@@ -322,7 +325,7 @@ class MeshController(omui2.MPxLocatorNode):
 
     def boundingBox(self):
         """Return the boundingBox"""
-        if not MeshController.ctrlVertices:
+        if not self.ctrlVertices:
             thisMob = self.thisMObject()
             thisPath = om2.MDagPath.getAPathTo(thisMob)
             transformPath = om2.MDagPath.getAPathTo(om2.MFnDagNode(thisPath).parent(0))
@@ -330,8 +333,8 @@ class MeshController(omui2.MPxLocatorNode):
             indexStr = om2.MPlug(thisMob, MeshController.inIndexList).asString()
             offset = om2.MPlug(thisMob, MeshController.inOffset).asFloat()
             mesh = om2.MPlug(thisMob, MeshController.inMesh).asMDataHandle().asMesh()
-            MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
-        return MeshController.bBox
+            self.ctrlVertices, self.bBox = MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
+        return self.bBox
 
     def preEvaluation(self, context, evaluationNode):
         """ Called before this node is evaluated by Evaluation Manager.
@@ -391,16 +394,7 @@ class MeshControllerDrawOverride(omr2.MPxDrawOverride):
     def boundingBox(self, objPath, cameraPath):
         """ Return the boundingBox """
         # pylint: disable=unused-argument
-        if not MeshController.ctrlVertices:
-            thisMob = objPath.node()
-            thisPath = om2.MDagPath.getAPathTo(thisMob)
-            transformPath = om2.MDagPath.getAPathTo(om2.MFnDagNode(thisPath).parent(0))
-            mWorldInv = transformPath.inclusiveMatrixInverse()
-            indexStr = om2.MPlug(thisMob, MeshController.inIndexList).asString()
-            offset = om2.MPlug(thisMob, MeshController.inOffset).asFloat()
-            mesh = om2.MPlug(thisMob, MeshController.inMesh).asMDataHandle().asMesh()
-            MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
-        return MeshController.bBox
+        return om2.MFnDependencyNode(objPath.node()).userNode().boundingBox()
 
     def prepareForDraw(self, objPath, cameraPath, frameContext, oldData):
         """
@@ -427,9 +421,10 @@ class MeshControllerDrawOverride(omr2.MPxDrawOverride):
         color = om2.MPlug(node, MeshController.inColor).asMDataHandle().asFloatVector()
 
         # If plugs are dirty calculate the geometry points
-        MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
+        controller = om2.MFnDependencyNode(node).userNode()
+        controller.ctrlVertices, controller.bBox = MeshController.getGeometryPoints(mesh, indexStr, offset, mWorldInv)
 
-        data.fVtxPositions = MeshController.ctrlVertices
+        data.fVtxPositions = controller.ctrlVertices
 
         status = omr2.MGeometryUtilities.displayStatus(objPath)
         if status == omr2.MGeometryUtilities.kDormant:
@@ -65,6 +65,8 @@ import maya.api._OpenMaya_py2 as om2
 import maya.api._OpenMayaUI_py2 as omui2
 import maya.api._OpenMayaRender_py2 as omr2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -90,6 +92,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class MeshController(omui2.MPxLocatorNode):
     """ Main class of gfMeshController node. """
 
@@ -104,14 +107,13 @@ class MeshController(omui2.MPxLocatorNode):
     inColor = om2.MObject()
     inXray = om2.MObject()
 
-    meshVtxPositions = om2.MPointArray()
-    meshVtxIndices = om2.MUintArray()
-    meshVtxNormals = om2.MVectorArray()
-    bBox = om2.MBoundingBox()
-
     def __init__(self):
         """ Constructor. """
         omui2.MPxLocatorNode.__init__(self)
+        self.meshVtxPositions = om2.MPointArray()
+        self.meshVtxIndices = om2.MUintArray()
+        self.meshVtxNormals = om2.MVectorArray()
+        self.bBox = om2.MBoundingBox()
 
     def postConstructor(self):
         """ Post Constructor. """
@@ -155,6 +157,11 @@ class MeshController(omui2.MPxLocatorNode):
         MeshController.addAttribute(MeshController.inColor)
         MeshController.addAttribute(MeshController.inXray)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+
+Description:
+    Calculate weights based on a pose with radial basis function interpolation.
+    A pose is the direction from the base to the source, in the space of the base. The targets are
+    the pose matrices in the space of the base, like the matrix of locators parented to the base. The
+    weight matrix of the targets (gfTools.kernels.rbf.solve()) is kept until the targets or the kernel
+    settings change, so each evaluation is one distance vector and one matrix product.
+
+Attributes:
+    * Base: The base world matrix of the pose.
+    * Source: The tip world matrix of the pose.
+    * Target: The list of matrices of the target poses, in the space of the base.
+    * Target Envelope: The list of envelope of the input targets.
+    * Kernel: The radial basis function. Can be Gaussian, Inverse Multiquadric or Linear.
+    * Radius: The angle where the kernel falls off.
+    * Regularization: Smooth the interpolation. The target poses no longer give exactly 1.0.
+    * Clamp Weights: Clamp the output weights between 0.0 and 1.0.
+    * Out Weights: The output list of the weights.
+
+Todo:
+    * NDA
+
+Sources:
+    * NDA
+
+This code supports Pylint. Rc file in project.
+"""
+
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import rbf
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=C0103, w0107
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class RBFPSD(om2.MPxNode):
+    """ Main class of gfRigPSDRBF node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inBase = om2.MObject()
+    inSource = om2.MObject()
+    inTarget = om2.MObject()
+    inTargetEnvelope = om2.MObject()
+    inKernel = om2.MObject()
+    inRadius = om2.MObject()
+    inRegularization = om2.MObject()
+    inClamp = om2.MObject()
+    outWeights = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+        self.cachedSolve = None
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return RBFPSD()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to RBFPSD class. Instances of RBFPSD will use these attributes to create plugs
+        for use in the compute() method.
+        """
+        mAttr = om2.MFnMatrixAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        eAttr = om2.MFnEnumAttribute()
+
+        RBFPSD.inBase = mAttr.create("base", "base", om2.MFnMatrixAttribute.kFloat)
+        INPUT_ATTR(mAttr)
+
+        RBFPSD.inSource = mAttr.create("source", "source", om2.MFnMatrixAttribute.kFloat)
+        INPUT_ATTR(mAttr)
+
+        RBFPSD.inTarget = mAttr.create("target", "target", om2.MFnMatrixAttribute.kFloat)
+        mAttr.array = True
+        INPUT_ATTR(mAttr)
+
+        RBFPSD.inTargetEnvelope = nAttr.create("targetEnvelope", "te", om2.MFnNumericData.kFloat, 1.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        RBFPSD.inKernel = eAttr.create("kernel", "kernel", rbf.kGaussian)
+        eAttr.addField("Gaussian", rbf.kGaussian)
+        eAttr.addField("Inverse Multiquadric", rbf.kInverseMultiquadric)
+        eAttr.addField("Linear", rbf.kLinear)
+        INPUT_ATTR(eAttr)
+
+        RBFPSD.inRadius = nAttr.create("radius", "radius", om2.MFnNumericData.kFloat, 60.0)
+        nAttr.setMin(0.001)
+        nAttr.setMax(180.0)
+        INPUT_ATTR(nAttr)
+
+        RBFPSD.inRegularization = nAttr.create("regularization", "reg", om2.MFnNumericData.kFloat, 0.0)
+        nAttr.setMin(0.0)
+        INPUT_ATTR(nAttr)
+
+        RBFPSD.inClamp = nAttr.create("clampWeights", "cw", om2.MFnNumericData.kBoolean, True)
+        INPUT_ATTR(nAttr)
+
+        RBFPSD.outWeights = nAttr.create("outWeights", "ow", om2.MFnNumericData.kFloat, 0.0)
+        nAttr.array = True
+        OUTPUT_ATTR(nAttr)
+
+        RBFPSD.addAttribute(RBFPSD.inBase)
+        RBFPSD.addAttribute(RBFPSD.inSource)
+        RBFPSD.addAttribute(RBFPSD.inTarget)
+        RBFPSD.addAttribute(RBFPSD.inTargetEnvelope)
+        RBFPSD.addAttribute(RBFPSD.inKernel)
+        RBFPSD.addAttribute(RBFPSD.inRadius)
+        RBFPSD.addAttribute(RBFPSD.inRegularization)
+        RBFPSD.addAttribute(RBFPSD.inClamp)
+        RBFPSD.addAttribute(RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inBase, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inSource, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inTarget, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inTargetEnvelope, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inKernel, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inRadius, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inRegularization, RBFPSD.outWeights)
+        RBFPSD.attributeAffects(RBFPSD.inClamp, RBFPSD.outWeights)
+
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the RBF solve when the targets or the kernel settings are dirtied. """
+        # pylint: disable=unused-argument
+        if nodeUtils.topAttribute(plugBeingDirtied) in (RBFPSD.inTarget, RBFPSD.inKernel, RBFPSD.inRadius,
+                                                        RBFPSD.inRegularization):
+            self.cachedSolve = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if not context.isNormal():
+            return
+        for attribute in (RBFPSD.inTarget, RBFPSD.inKernel, RBFPSD.inRadius, RBFPSD.inRegularization):
+            if evaluationNode.dirtyPlugExists(attribute):
+                self.cachedSolve = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        if plug != RBFPSD.outWeights:
+            return om2.kUnknownParameter
+
+        kernel = dataBlock.inputValue(RBFPSD.inKernel).asShort()
+        radius = np.radians(dataBlock.inputValue(RBFPSD.inRadius).asFloat())
+
+        # The targets are only read and solved again after they or the kernel settings are dirtied.
+        isNormal = dataBlock.context().isNormal()
+        solved = self.cachedSolve if isNormal else None
+        if solved is None:
+            targets = nodeUtils.readArray(dataBlock.inputArrayValue(RBFPSD.inTarget), nodeUtils.matrixPosition, (0.0, 0.0, 0.0))
+            regularization = dataBlock.inputValue(RBFPSD.inRegularization).asFloat()
+            solved = (targets, rbf.solve(targets, kernel, radius, regularization))
+            if isNormal:
+                self.cachedSolve = solved
+        targets, solveMatrix = solved
+
+        mBase = RBFPSD.matrixToArray(dataBlock.inputValue(RBFPSD.inBase).asFloatMatrix())
+        mSource = RBFPSD.matrixToArray(dataBlock.inputValue(RBFPSD.inSource).asFloatMatrix())
+        vPose = np.dot(mSource, np.linalg.inv(mBase))[3, :3]
+        weights = rbf.evaluate(solveMatrix, targets, vPose, kernel, radius)
+
+        envelopes = nodeUtils.readArray(dataBlock.inputArrayValue(RBFPSD.inTargetEnvelope), om2.MDataHandle.asFloat, 1.0)
+        count = len(targets)
+        envelopes = np.concatenate([envelopes[:count], np.ones(max(count - len(envelopes), 0))])
+        weights = weights * envelopes
+        if dataBlock.inputValue(RBFPSD.inClamp).asBool():
+            weights = np.clip(weights, 0.0, 1.0)
+        weights = weights.tolist()
+
+        outWeightsHandle = dataBlock.outputArrayValue(RBFPSD.outWeights)
+        for i in range(len(outWeightsHandle)):
+            outWeightsHandle.jumpToPhysicalElement(i)
+            index = outWeightsHandle.elementLogicalIndex()
+            outWeightsHandle.outputValue().setFloat(weights[index] if index < count else 0.0)
+        outWeightsHandle.setAllClean()
+
+    @staticmethod
+    def matrixToArray(mtx):
+        """ Convert a MMatrix or MFloatMatrix to a 4x4 numpy array. """
+        return np.reshape([mtx[i] for i in range(16)], (4, 4))
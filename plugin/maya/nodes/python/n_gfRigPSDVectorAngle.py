@@ -43,6 +43,8 @@ Requirements:
 Description:
     Calculate weights based on a pose. The weights are calculated by the angle between
     world position of objects.
+    The weights of all the targets are calculated at once. The ramp is sampled into a lookup table
+    (gfTools.kernels.ramp.lookupTable()) that is kept until the ramp is dirtied.
 
 Attributes:
     * Base: The base world matrix of the pose.
@@ -61,9 +63,13 @@ Sources:
 This code supports Pylint. Rc file in project.
 """
 
-import math
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import ramp
+from gfTools.kernels import vectorAngle
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -89,6 +95,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class VectorAnglePSD(om2.MPxNode):
     """ Main class of gfRigPSDVectorAngle node. """
 
@@ -107,6 +114,7 @@ class VectorAnglePSD(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
+        self.cachedRampTable = None
 
     def postConstructor(self):
         """ Post Constructor. """
@@ -179,71 +187,61 @@ class VectorAnglePSD(om2.MPxNode):
         VectorAnglePSD.attributeAffects(VectorAnglePSD.inTargetFalloff, VectorAnglePSD.outWeights)
         VectorAnglePSD.attributeAffects(VectorAnglePSD.inRampWeights, VectorAnglePSD.outWeights)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the ramp table when the ramp weights are dirtied. """
+        # pylint: disable=unused-argument
+        if nodeUtils.topAttribute(plugBeingDirtied) == VectorAnglePSD.inRampWeights:
+            self.cachedRampTable = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if context.isNormal() and evaluationNode.dirtyPlugExists(VectorAnglePSD.inRampWeights):
+            self.cachedRampTable = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
             * plug is a connection point related to one of our node attributes (either an input or an output).
             * dataBlock contains the data on which we will base our computations.
         """
-        # pylint: disable=R0201
         if plug != VectorAnglePSD.outWeights:
             return om2.kUnknownParameter
 
-        mBase = dataBlock.inputValue(VectorAnglePSD.inBase).asFloatMatrix()
-        mSource = dataBlock.inputValue(VectorAnglePSD.inSource).asFloatMatrix()
+        # The ramp is only sampled again after it is dirtied.
+        isNormal = dataBlock.context().isNormal()
+        rampTable = self.cachedRampTable if isNormal else None
+        if rampTable is None:
+            rampAttr = om2.MRampAttribute(self.thisMObject(), VectorAnglePSD.inRampWeights)
+            _, positions, values, interps = rampAttr.getEntries()
+            rampTable = ramp.lookupTable(list(zip(positions, values, interps)))
+            if isNormal:
+                self.cachedRampTable = rampTable
+
+        vBase = nodeUtils.matrixPosition(dataBlock.inputValue(VectorAnglePSD.inBase))
+        vSource = nodeUtils.matrixPosition(dataBlock.inputValue(VectorAnglePSD.inSource))
+        targets = nodeUtils.readArray(dataBlock.inputArrayValue(VectorAnglePSD.inTarget),
+                                      nodeUtils.matrixPosition, (0.0, 0.0, 0.0))
+        envelopes = nodeUtils.readArray(dataBlock.inputArrayValue(VectorAnglePSD.inTargetEnvelope),
+                                        om2.MDataHandle.asFloat, 0.0)
+        falloffs = nodeUtils.readArray(dataBlock.inputArrayValue(VectorAnglePSD.inTargetFalloff),
+                                       om2.MDataHandle.asFloat, 0.0)
+        count = min(len(targets), len(envelopes), len(falloffs))
+        weights = vectorAngle.coneWeights(vBase, vSource, targets[:count], envelopes[:count], falloffs[:count])
+        weights = ramp.evaluateTable(rampTable, weights).tolist()
 
-        targetHandle = dataBlock.inputArrayValue(VectorAnglePSD.inTarget)
-        targetEnvelopeHandle = dataBlock.inputArrayValue(VectorAnglePSD.inTargetEnvelope)
-        targetFalloffHandle = dataBlock.inputArrayValue(VectorAnglePSD.inTargetFalloff)
         outWeightsHandle = dataBlock.outputArrayValue(VectorAnglePSD.outWeights)
-
-        vBase = om2.MFloatVector(mBase[12], mBase[13], mBase[14])
-        vSource = om2.MFloatVector(mSource[12], mSource[13], mSource[14])
-
-        vCurPose = vSource - vBase
-        nCurPose = vCurPose.normal()
-
-        targetList = []
-        envelopeList = []
-        falloffList = []
-
-        for i in range(len(targetHandle)):
-            targetHandle.jumpToLogicalElement(i)
-            mtx = targetHandle.inputValue().asFloatMatrix()
-            vec = om2.MFloatVector(mtx[12], mtx[13], mtx[14])
-            vTargetPose = vec - vBase
-            nTargetPose = vTargetPose.normal()
-            targetList.append(nTargetPose)
-
-        for i in range(len(targetEnvelopeHandle)):
-            targetEnvelopeHandle.jumpToLogicalElement(i)
-            env = targetEnvelopeHandle.inputValue().asFloat()
-            envelopeList.append(env)
-
-        for i in range(len(targetFalloffHandle)):
-            targetFalloffHandle.jumpToLogicalElement(i)
-            fall = targetFalloffHandle.inputValue().asFloat()
-            falloffList.append(fall)
-
         for i in range(len(outWeightsHandle)):
-            outWeightsHandle.jumpToLogicalElement(i)
-            resultHandle = outWeightsHandle.outputValue()
-            if (i < len(outWeightsHandle) and
-                    i < len(targetHandle) and
-                    i < len(targetEnvelopeHandle) and
-                    i < len(targetFalloffHandle)):
-                theta = math.acos(targetList[i] * nCurPose)
-                ratio = min(max(theta/math.radians(falloffList[i]), -1.0), 1.0)
-                if ratio == 0.0:
-                    weight = envelopeList[i] * 1.0
-                elif ratio > 0.0:
-                    weight = envelopeList[i] * (1.0 - ratio)
-                elif ratio < 0.0:
-                    weight = envelopeList[i] * (1.0 + ratio)
-
-                thisMob = self.thisMObject()
-                rampAttr = om2.MRampAttribute(thisMob, VectorAnglePSD.inRampWeights)
-                resultWeight = rampAttr.getValueAtPosition(weight)
-                resultHandle.setFloat(resultWeight)
-            else:
-                resultHandle.setFloat(0.0)
+            outWeightsHandle.jumpToPhysicalElement(i)
+            index = outWeightsHandle.elementLogicalIndex()
+            outWeightsHandle.outputValue().setFloat(weights[index] if index < count else 0.0)
+        outWeightsHandle.setAllClean()
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Array version of gfPSDVectorAngle. Every element of the driver compound has the inputs of one
+    gfPSDVectorAngle node and drives the outWeights of the outDriver element with the same index.
+    The angles, falloff ratios and envelopes of all the targets of all the drivers are calculated in
+    one pass, so a face or body corrective system needs one node instead of one per driver.
+    All the drivers share one ramp, sampled into a lookup table (gfTools.kernels.ramp.lookupTable())
+    that is kept until the ramp is dirtied.
+
+Attributes:
+    * Driver: The array of drivers. Every element has:
+        * Base: The base world matrix of the pose.
+        * Source: The tip world matrix of the pose.
+        * Target: The list of world matrix of the target objects.
+        * Target Envelope: The list of envelope of the input targets.
+        * Target Falloff: The rest angle between the target and the source.
+    * Ramp Weights: The ramp applied to the weights of all the drivers.
+    * Out Driver: The array of driver weights. Every element has:
+        * Out Weights: The output list of the weights.
+
+Todo:
+    * NDA
+
+Sources:
+    * https://www.desmos.com/calculator/nfggjvzpkn
+
+This code supports Pylint. Rc file in project.
+"""
+
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import ramp
+from gfTools.kernels import vectorAngle
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=C0103, w0107
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=C0103
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class VectorAnglePSDArray(om2.MPxNode):
+    """ Main class of gfRigPSDVectorAngleArray node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inDriver = om2.MObject()
+    inBase = om2.MObject()
+    inSource = om2.MObject()
+    inTarget = om2.MObject()
+    inTargetEnvelope = om2.MObject()
+    inTargetFalloff = om2.MObject()
+    inRampWeights = om2.MObject()
+    outDriver = om2.MObject()
+    outWeights = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+        self.cachedRampTable = None
+
+    def postConstructor(self):
+        """ Post Constructor. """
+        thisMob = self.thisMObject()
+        attr = VectorAnglePSDArray.inRampWeights
+        rampAttr = om2.MRampAttribute(thisMob, attr)
+        pos = om2.MFloatArray()
+        val = om2.MFloatArray()
+        interp = om2.MIntArray()
+        pos.append(1.0)
+        val.append(1.0)
+        interp.append(om2.MRampAttribute.kLinear)
+        rampAttr.addEntries(pos, val, interp)
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return VectorAnglePSDArray()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to VectorAnglePSDArray class. Instances of VectorAnglePSDArray will use these attributes
+        to create plugs for use in the compute() method.
+        """
+        mAttr = om2.MFnMatrixAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        cAttr = om2.MFnCompoundAttribute()
+        rAttr = om2.MRampAttribute()
+
+        VectorAnglePSDArray.inBase = mAttr.create("base", "base", om2.MFnMatrixAttribute.kFloat)
+        INPUT_ATTR(mAttr)
+
+        VectorAnglePSDArray.inSource = mAttr.create("source", "source", om2.MFnMatrixAttribute.kFloat)
+        INPUT_ATTR(mAttr)
+
+        VectorAnglePSDArray.inTarget = mAttr.create("target", "target", om2.MFnMatrixAttribute.kFloat)
+        mAttr.array = True
+        INPUT_ATTR(mAttr)
+
+        VectorAnglePSDArray.inTargetEnvelope = nAttr.create("targetEnvelope", "te", om2.MFnNumericData.kFloat, 1.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(1.0)
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        VectorAnglePSDArray.inTargetFalloff = nAttr.create("targetFalloff", "tf", om2.MFnNumericData.kFloat, 90.0)
+        nAttr.setMin(0.0)
+        nAttr.setMax(180.0)
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        VectorAnglePSDArray.inDriver = cAttr.create("driver", "drv")
+        cAttr.addChild(VectorAnglePSDArray.inBase)
+        cAttr.addChild(VectorAnglePSDArray.inSource)
+        cAttr.addChild(VectorAnglePSDArray.inTarget)
+        cAttr.addChild(VectorAnglePSDArray.inTargetEnvelope)
+        cAttr.addChild(VectorAnglePSDArray.inTargetFalloff)
+        cAttr.array = True
+        INPUT_ATTR(cAttr)
+
+        VectorAnglePSDArray.inRampWeights = rAttr.createCurveRamp("rampWeights", "rw")
+
+        VectorAnglePSDArray.outWeights = nAttr.create("outWeights", "ow", om2.MFnNumericData.kFloat, 0.0)
+        nAttr.array = True
+        OUTPUT_ATTR(nAttr)
+
+        VectorAnglePSDArray.outDriver = cAttr.create("outDriver", "odrv")
+        cAttr.addChild(VectorAnglePSDArray.outWeights)
+        cAttr.array = True
+        OUTPUT_ATTR(cAttr)
+
+        VectorAnglePSDArray.addAttribute(VectorAnglePSDArray.inDriver)
+        VectorAnglePSDArray.addAttribute(VectorAnglePSDArray.inRampWeights)
+        VectorAnglePSDArray.addAttribute(VectorAnglePSDArray.outDriver)
+        for attribute in (VectorAnglePSDArray.inDriver, VectorAnglePSDArray.inBase, VectorAnglePSDArray.inSource,
+                          VectorAnglePSDArray.inTarget, VectorAnglePSDArray.inTargetEnvelope,
+                          VectorAnglePSDArray.inTargetFalloff, VectorAnglePSDArray.inRampWeights):
+            VectorAnglePSDArray.attributeAffects(attribute, VectorAnglePSDArray.outDriver)
+            VectorAnglePSDArray.attributeAffects(attribute, VectorAnglePSDArray.outWeights)
+
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the ramp table when the ramp weights are dirtied. """
+        # pylint: disable=unused-argument
+        if nodeUtils.topAttribute(plugBeingDirtied) == VectorAnglePSDArray.inRampWeights:
+            self.cachedRampTable = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if context.isNormal() and evaluationNode.dirtyPlugExists(VectorAnglePSDArray.inRampWeights):
+            self.cachedRampTable = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        # pylint: disable=too-many-locals
+        if plug not in (VectorAnglePSDArray.outDriver, VectorAnglePSDArray.outWeights):
+            return om2.kUnknownParameter
+
+        # The ramp is only sampled again after it is dirtied.
+        isNormal = dataBlock.context().isNormal()
+        rampTable = self.cachedRampTable if isNormal else None
+        if rampTable is None:
+            rampAttr = om2.MRampAttribute(self.thisMObject(), VectorAnglePSDArray.inRampWeights)
+            _, positions, values, interps = rampAttr.getEntries()
+            rampTable = ramp.lookupTable(list(zip(positions, values, interps)))
+            if isNormal:
+                self.cachedRampTable = rampTable
+
+        # Gather the drivers, one item per driver, and pad their targets to the longest driver.
+        indices = []
+        bases = []
+        sources = []
+        targetList = []
+        driverHandle = dataBlock.inputArrayValue(VectorAnglePSDArray.inDriver)
+        for i in range(len(driverHandle)):
+            driverHandle.jumpToPhysicalElement(i)
+            indices.append(driverHandle.elementLogicalIndex())
+            handle = driverHandle.inputValue()
+            bases.append(nodeUtils.matrixPosition(handle.child(VectorAnglePSDArray.inBase)))
+            sources.append(nodeUtils.matrixPosition(handle.child(VectorAnglePSDArray.inSource)))
+            targets = nodeUtils.readArray(om2.MArrayDataHandle(handle.child(VectorAnglePSDArray.inTarget)),
+                                          nodeUtils.matrixPosition, (0.0, 0.0, 0.0))
+            envelopes = nodeUtils.readArray(
+                om2.MArrayDataHandle(handle.child(VectorAnglePSDArray.inTargetEnvelope)), om2.MDataHandle.asFloat, 0.0)
+            falloffs = nodeUtils.readArray(
+                om2.MArrayDataHandle(handle.child(VectorAnglePSDArray.inTargetFalloff)), om2.MDataHandle.asFloat, 0.0)
+            targetList.append((targets, envelopes, falloffs))
+
+        counts = [min(len(targets), len(envelopes), len(falloffs)) for targets, envelopes, falloffs in targetList]
+        size = max(counts) if counts else 0
+        targets = np.zeros((len(indices), size, 3))
+        envelopes = np.zeros((len(indices), size))
+        falloffs = np.zeros((len(indices), size))
+        for i, count in enumerate(counts):
+            targets[i, :count] = targetList[i][0][:count]
+            envelopes[i, :count] = targetList[i][1][:count]
+            falloffs[i, :count] = targetList[i][2][:count]
+        weights = vectorAngle.coneWeights(np.reshape(bases, (-1, 3)), np.reshape(sources, (-1, 3)),
+                                          targets, envelopes, falloffs)
+        weights = ramp.evaluateTable(rampTable, weights).tolist()
+        driverWeights = dict((index, row[:count]) for index, row, count in zip(indices, weights, counts))
+
+        # Set outputs
+        outDriverHandle = dataBlock.outputArrayValue(VectorAnglePSDArray.outDriver)
+        for i in range(len(outDriverHandle)):
+            outDriverHandle.jumpToPhysicalElement(i)
+            weights = driverWeights.get(outDriverHandle.elementLogicalIndex(), [])
+            outWeightsHandle = om2.MArrayDataHandle(outDriverHandle.outputValue().child(VectorAnglePSDArray.outWeights))
+            for j in range(len(outWeightsHandle)):
+                outWeightsHandle.jumpToPhysicalElement(j)
+                index = outWeightsHandle.elementLogicalIndex()
+                outWeightsHandle.outputValue().setFloat(weights[index] if index < len(weights) else 0.0)
+            outWeightsHandle.setAllClean()
+
+        outDriverHandle.setAllClean()
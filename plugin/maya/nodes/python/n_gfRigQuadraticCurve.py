@@ -67,6 +67,8 @@ This code supports Pylint. Rc file in project.
 import math
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -92,6 +94,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class QuadraticCurve(om2.MPxNode):
     """ Main class of gfQuadraticCurve node. """
 
@@ -190,6 +193,11 @@ class QuadraticCurve(om2.MPxNode):
         QuadraticCurve.attributeAffects(QuadraticCurve.inSlide, QuadraticCurve.outTransforms)
         QuadraticCurve.attributeAffects(QuadraticCurve.inPreferredAngle, QuadraticCurve.outTransforms)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -39,9 +39,13 @@ How to use:
 
 Requirements:
     * Maya 2017 or above.
+    * NumPy.
 
 Description:
     Extract a twist channel from an Euler Rotation.
+    The rotation is split in a twist around its x axis followed by the swing of the x axis
+    (gfTools.kernels.quaternion.extractTwist()), so the twist comes straight from the quaternion of the
+    rotation.
 
 Attributes:
     * Target World Matrix: The world matrix of the target object.
@@ -69,7 +73,11 @@ This code supports Pylint. Rc file in project.
 """
 import maya.api._OpenMaya_py2 as om2
 
-kPI = 3.1415926535897932384626433832795
+from gfTools import profiling
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+
+kAimAxis = (1.0, 0.0, 0.0)
 
 
 def maya_useNewAPI():
@@ -96,6 +104,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class TwistExtractor(om2.MPxNode):
     """ Main class of gfTwistExtractor node. """
 
@@ -115,6 +124,7 @@ class TwistExtractor(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
+        self.cachedTwist = None
 
     @staticmethod
     def creator():
@@ -194,84 +204,80 @@ class TwistExtractor(om2.MPxNode):
         TwistExtractor.attributeAffects(TwistExtractor.inInvTwist, TwistExtractor.outTwistDist)
         TwistExtractor.attributeAffects(TwistExtractor.inRevDist, TwistExtractor.outTwistDist)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached twist when any input is dirtied. """
+        # pylint: disable=unused-argument
+        self.cachedTwist = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        # pylint: disable=unused-argument
+        self.cachedTwist = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
             * plug is a connection point related to one of our node attributes (either an input or an output).
             * dataBlock contains the data on which we will base our computations.
         """
-        rotation = dataBlock.inputValue(TwistExtractor.inRotation).asDouble3()
-        rotOrder = dataBlock.inputValue(TwistExtractor.inRotationOrder).asShort()
-        eRoll = om2.MEulerRotation(rotation, rotOrder)
-        useUpObj = dataBlock.inputValue(TwistExtractor.inUseUpVec).asBool()
-        revTwist = dataBlock.inputValue(TwistExtractor.inInvTwist).asBool()
-
-        # Non flip ROO = XYZ
-        # Not working = XZY
-        twistOrder = om2.MEulerRotation.kXYZ
-        eRoll.reorderIt(twistOrder)
-
-        # Non-Roll orientation
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.rotateBy(eRoll, om2.MSpace.kWorld)
-        mRoll = mtxFn.asMatrix()
-
-        qNonRoll = om2.MQuaternion()
-
-        nAim = om2.MVector(mRoll[0], mRoll[1], mRoll[2])
-        nAim.normalize()
-        nAimAxis = om2.MVector.kXaxisVector
-        qAim = om2.MQuaternion(nAimAxis, nAim)
-        qNonRoll *= qAim
-
-        if useUpObj:
-            vUp = om2.MVector(dataBlock.inputValue(TwistExtractor.inUpVec).asFloat3())
-            nNormal = vUp - ((vUp * nAim) * nAim)
-            nNormal.normalize()
-            nUp = om2.MVector.kYaxisVector.rotateBy(qAim)
-            angle = nUp.angle(nNormal)
-            qNormal = om2.MQuaternion(angle, nAim)
-            if not nNormal.isEquivalent(nUp.rotateBy(qNormal), 1.0e-5):
-                angle = 2.0 * kPI - angle
-                qNormal = om2.MQuaternion(angle, nAim)
-            qNonRoll *= qNormal
-        eNonRoll = qNonRoll.asEulerRotation()
-        eNonRoll = om2.MEulerRotation(eNonRoll.x, eNonRoll.y, eNonRoll.z, twistOrder)
-
-        # Extract Twist from orientations
-        qRoll = eRoll.asQuaternion()
-        qExtract180 = qNonRoll * qRoll.inverse()
-        eExtract180 = qExtract180.asEulerRotation()
-        twist = -eExtract180.x
-        if revTwist:
-            twist *= -1.0
+        if plug not in (TwistExtractor.outTwist, TwistExtractor.outTwistDist):
+            return om2.kUnknownParameter
+
+        # Both outputs come from the same twist. The first request computes and sets clean
+        # both of them, the twist is kept until an input is dirtied.
+        isNormal = dataBlock.context().isNormal()
+        twist = self.cachedTwist if isNormal else None
+        if twist is None:
+            twist = TwistExtractor.computeTwist(dataBlock)
+            if isNormal:
+                self.cachedTwist = twist
 
         # Output Twist
-        if plug == TwistExtractor.outTwist:
-            outTwistHdle = dataBlock.outputValue(TwistExtractor.outTwist)
-            outTwistHdle.setMAngle(om2.MAngle(twist))
-            outTwistHdle.setClean()
+        outTwistHdle = dataBlock.outputValue(TwistExtractor.outTwist)
+        outTwistHdle.setMAngle(om2.MAngle(twist))
+        outTwistHdle.setClean()
 
         # Output Twist Distribution
-        if plug == TwistExtractor.outTwistDist:
-            invDist = dataBlock.inputValue(TwistExtractor.inRevDist).asBool()
-            outTwistDistHdle = dataBlock.outputArrayValue(TwistExtractor.outTwistDist)
-            outputs = len(outTwistDistHdle)
-            step = twist / (outputs - 1) if outputs > 1 else twist
-            outList = []
-            outList.extend(range(outputs))
-            if not invDist:
-                outList.reverse()
-            # pylint: disable=consider-using-enumerate
-            for i in range(len(outList)):
-                outTwistDistHdle.jumpToLogicalElement(i)
-                resultHdle = outTwistDistHdle.outputValue()
-                result = step * outList[i] if outputs > 1 else twist
-                resultHdle.setMAngle(om2.MAngle(result))
-            outTwistDistHdle.setAllClean()
+        invDist = dataBlock.inputValue(TwistExtractor.inRevDist).asBool()
+        outTwistDistHdle = dataBlock.outputArrayValue(TwistExtractor.outTwistDist)
+        outputs = len(outTwistDistHdle)
+        step = twist / (outputs - 1) if outputs > 1 else twist
+        outList = []
+        outList.extend(range(outputs))
+        if not invDist:
+            outList.reverse()
+        # pylint: disable=consider-using-enumerate
+        for i in range(len(outList)):
+            outTwistDistHdle.jumpToLogicalElement(i)
+            resultHdle = outTwistDistHdle.outputValue()
+            result = step * outList[i] if outputs > 1 else twist
+            resultHdle.setMAngle(om2.MAngle(result))
+        outTwistDistHdle.setAllClean()
 
         return
 
+    @staticmethod
+    def computeTwist(dataBlock):
+        """ Extract the twist angle (in radians) of the input rotation. """
+        rotation = dataBlock.inputValue(TwistExtractor.inRotation).asDouble3()
+        rotOrder = dataBlock.inputValue(TwistExtractor.inRotationOrder).asShort()
+        useUpObj = dataBlock.inputValue(TwistExtractor.inUseUpVec).asBool()
+        vUp = dataBlock.inputValue(TwistExtractor.inUpVec).asFloat3()
+        revTwist = dataBlock.inputValue(TwistExtractor.inInvTwist).asBool()
+        twist = float(quaternion.extractTwist(euler.toQuaternion(rotation, rotOrder), kAimAxis, vUp, useUpObj))
+        return -twist if revTwist else twist
+
+
 
 # # Working! To be revised later
 # qRollHalf = (eRoll * 0.5).asQuaternion()
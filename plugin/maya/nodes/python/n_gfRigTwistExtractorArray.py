@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Array version of gfTwistExtractor. Every element of the joint compound has the inputs of one
+    gfTwistExtractor node and drives the outJoint element with the same index. The twist of all the
+    joints is extracted in one pass with gfTools.kernels.quaternion.extractTwist(), so the forearms,
+    upper arms, thighs and neck of a character need one node instead of one per joint.
+    The outJoint elements without a joint are set to zero.
+
+Attributes:
+    * Joint: The array of joints. Every element has:
+        * Rotation: The euler rotation to extract the twist from.
+        * Rotation Order: The rotation order of the rotation.
+        * Use Up Vector: Measure the twist from the up vector.
+        * Up Vector: The up vector of the joint.
+        * Inverse Twist: Invert the twist of the joint.
+        * Reverse Distribution: Reverse the twist distribution of the joint.
+    * Out Joint: The array of twists. Every element has:
+        * Twist: The output twist channel of the joint.
+        * Twist Distribution: The twist distributed along the elements of this array.
+
+Todo:
+    * Add support to 360 degrees twist extraction.
+
+Sources:
+    * https://vimeo.com/149066264
+    * https://vimeo.com/316148014
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import profiling
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+
+kAimAxis = (1.0, 0.0, 0.0)
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=invalid-name, unnecessary-pass
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class TwistExtractorArray(om2.MPxNode):
+    """ Main class of gfTwistExtractorArray node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inJoint = om2.MObject()
+    inRotation = om2.MObject()
+    inRotationOrder = om2.MObject()
+    inUseUpVec = om2.MObject()
+    inUpVec = om2.MObject()
+    inInvTwist = om2.MObject()
+    inRevDist = om2.MObject()
+    outJoint = om2.MObject()
+    outTwist = om2.MObject()
+    outTwistDist = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return TwistExtractorArray()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to TwistExtractorArray class. Instances of TwistExtractorArray will use these attributes
+        to create plugs for use in the compute() method.
+        """
+        uAttr = om2.MFnUnitAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        eAttr = om2.MFnEnumAttribute()
+        cAttr = om2.MFnCompoundAttribute()
+
+        rotX = uAttr.create("rotationX", "rotx", om2.MFnUnitAttribute.kAngle, 0.0)
+        rotY = uAttr.create("rotationY", "roty", om2.MFnUnitAttribute.kAngle, 0.0)
+        rotZ = uAttr.create("rotationZ", "rotz", om2.MFnUnitAttribute.kAngle, 0.0)
+        TwistExtractorArray.inRotation = nAttr.create("rotation", "rot", rotX, rotY, rotZ)
+        INPUT_ATTR(nAttr)
+
+        TwistExtractorArray.inRotationOrder = eAttr.create("rotationOrder", "roo", 0)
+        eAttr.addField("xyz", 0)
+        eAttr.addField("yzx", 1)
+        eAttr.addField("zxy", 2)
+        eAttr.addField("xzy", 3)
+        eAttr.addField("yxz", 4)
+        eAttr.addField("zyx", 5)
+        INPUT_ATTR(eAttr)
+
+        TwistExtractorArray.inUseUpVec = nAttr.create("useUpVector", "useup", om2.MFnNumericData.kBoolean, False)
+        INPUT_ATTR(nAttr)
+
+        TwistExtractorArray.inUpVec = nAttr.createPoint("upVector", "upVector")
+        nAttr.default = (0.0, 1.0, 0.0)
+        INPUT_ATTR(nAttr)
+
+        TwistExtractorArray.inInvTwist = nAttr.create("inverseTwist", "itwist", om2.MFnNumericData.kBoolean, False)
+        INPUT_ATTR(nAttr)
+
+        TwistExtractorArray.inRevDist = nAttr.create("reverseDistribution", "rdist", om2.MFnNumericData.kBoolean, False)
+        INPUT_ATTR(nAttr)
+
+        TwistExtractorArray.inJoint = cAttr.create("joint", "jnt")
+        cAttr.addChild(TwistExtractorArray.inRotation)
+        cAttr.addChild(TwistExtractorArray.inRotationOrder)
+        cAttr.addChild(TwistExtractorArray.inUseUpVec)
+        cAttr.addChild(TwistExtractorArray.inUpVec)
+        cAttr.addChild(TwistExtractorArray.inInvTwist)
+        cAttr.addChild(TwistExtractorArray.inRevDist)
+        cAttr.array = True
+        INPUT_ATTR(cAttr)
+
+        TwistExtractorArray.outTwist = uAttr.create("twist", "twist", om2.MFnUnitAttribute.kAngle, 0.0)
+        OUTPUT_ATTR(uAttr)
+
+        TwistExtractorArray.outTwistDist = uAttr.create("twistDistribution", "twistd", om2.MFnUnitAttribute.kAngle, 0.0)
+        uAttr.array = True
+        OUTPUT_ATTR(uAttr)
+
+        TwistExtractorArray.outJoint = cAttr.create("outJoint", "ojnt")
+        cAttr.addChild(TwistExtractorArray.outTwist)
+        cAttr.addChild(TwistExtractorArray.outTwistDist)
+        cAttr.array = True
+        OUTPUT_ATTR(cAttr)
+
+        TwistExtractorArray.addAttribute(TwistExtractorArray.inJoint)
+        TwistExtractorArray.addAttribute(TwistExtractorArray.outJoint)
+        for attribute in (TwistExtractorArray.inJoint, TwistExtractorArray.inRotation, rotX, rotY, rotZ,
+                          TwistExtractorArray.inRotationOrder, TwistExtractorArray.inUseUpVec,
+                          TwistExtractorArray.inUpVec, TwistExtractorArray.inInvTwist, TwistExtractorArray.inRevDist):
+            for output in (TwistExtractorArray.outJoint, TwistExtractorArray.outTwist, TwistExtractorArray.outTwistDist):
+                TwistExtractorArray.attributeAffects(attribute, output)
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        if plug not in (TwistExtractorArray.outJoint, TwistExtractorArray.outTwist, TwistExtractorArray.outTwistDist):
+            return om2.kUnknownParameter
+
+        # Gather the joints, one row per joint.
+        indices = []
+        rotations = []
+        rotOrders = []
+        useUpObjs = []
+        upVectors = []
+        revTwists = []
+        revDists = {}
+        jointHandle = dataBlock.inputArrayValue(TwistExtractorArray.inJoint)
+        for i in range(len(jointHandle)):
+            jointHandle.jumpToPhysicalElement(i)
+            index = jointHandle.elementLogicalIndex()
+            handle = jointHandle.inputValue()
+            indices.append(index)
+            rotations.append(handle.child(TwistExtractorArray.inRotation).asDouble3())
+            rotOrders.append(handle.child(TwistExtractorArray.inRotationOrder).asShort())
+            useUpObjs.append(handle.child(TwistExtractorArray.inUseUpVec).asBool())
+            upVectors.append(handle.child(TwistExtractorArray.inUpVec).asFloat3())
+            revTwists.append(handle.child(TwistExtractorArray.inInvTwist).asBool())
+            revDists[index] = handle.child(TwistExtractorArray.inRevDist).asBool()
+
+        qRolls = euler.toQuaternion(np.reshape(rotations, (-1, 3)), np.asarray(rotOrders, dtype=np.intp))
+        twists = quaternion.extractTwist(qRolls, kAimAxis, np.reshape(upVectors, (-1, 3)), np.asarray(useUpObjs, dtype=bool))
+        twists = np.where(np.asarray(revTwists, dtype=bool), -twists, twists)
+        twists = dict(zip(indices, twists.tolist()))
+
+        # Set outputs
+        outJointHandle = dataBlock.outputArrayValue(TwistExtractorArray.outJoint)
+        for i in range(len(outJointHandle)):
+            outJointHandle.jumpToPhysicalElement(i)
+            index = outJointHandle.elementLogicalIndex()
+            twist = twists.get(index, 0.0)
+            outHandle = outJointHandle.outputValue()
+            outHandle.child(TwistExtractorArray.outTwist).setMAngle(om2.MAngle(twist))
+
+            # Same distribution of gfTwistExtractor, from the twist at the first element to zero at the last one.
+            outTwistDistHandle = om2.MArrayDataHandle(outHandle.child(TwistExtractorArray.outTwistDist))
+            outputs = len(outTwistDistHandle)
+            step = twist / (outputs - 1) if outputs > 1 else twist
+            for j in range(outputs):
+                outTwistDistHandle.jumpToPhysicalElement(j)
+                distIndex = outTwistDistHandle.elementLogicalIndex()
+                distIndex = distIndex if revDists.get(index, False) else outputs - 1 - distIndex
+                result = step * distIndex if outputs > 1 else twist
+                outTwistDistHandle.outputValue().setMAngle(om2.MAngle(result))
+            outTwistDistHandle.setAllClean()
+
+        outJointHandle.setAllClean()
@@ -39,9 +39,11 @@ How to use:
 
 Requirements:
     * Maya 2017 or above.
+    * NumPy.
 
 Description:
     Custom aim constraint. Aim an object to another.
+    The aim and up vector frame comes from gfTools.kernels.lookAt, shared with gfAimConstraintArray.
 
 Attributes:
     * Up Vector Type: The type of calculation of the up vector.
@@ -66,8 +68,12 @@ Sources:
 This code supports Pylint. Rc file in project.
 """
 import math
+import numpy as np
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+from gfTools.kernels import lookAt
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -93,6 +99,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class AimConstraint(om2.MPxNode):
     """ Main class of gfUtilAimConstraint node. """
 
@@ -217,6 +224,11 @@ class AimConstraint(om2.MPxNode):
         AimConstraint.attributeAffects(AimConstraint.inConstJntOri, AimConstraint.outConstraint)
         AimConstraint.attributeAffects(AimConstraint.inConstRotOrder, AimConstraint.outConstraint)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -228,66 +240,22 @@ class AimConstraint(om2.MPxNode):
             return om2.kUnknownParameter
 
         upVecType = dataBlock.inputValue(AimConstraint.inUpVecType).asShort()
-        eOffset = om2.MEulerRotation(dataBlock.inputValue(AimConstraint.inOffset).asDouble3())
-        qOffset = eOffset.asQuaternion()
+        offset = dataBlock.inputValue(AimConstraint.inOffset).asDouble3()
+        worldUpVector = dataBlock.inputValue(AimConstraint.inWorldUpVector).asFloat3()
+        mWorldUp = dataBlock.inputValue(AimConstraint.inWorldUpMtx).asMatrix()
+        angleUp = dataBlock.inputValue(AimConstraint.inAngleUp).asAngle().asRadians()
         mTargetW = dataBlock.inputValue(AimConstraint.inTargetWMtx).asMatrix()
         targetWeight = dataBlock.inputValue(AimConstraint.inTargetWeight).asDouble()
         mConstW = dataBlock.inputValue(AimConstraint.inConstWMtx).asMatrix()
         mConstParInv = dataBlock.inputValue(AimConstraint.inConstParInvMtx).asMatrix()
-        eConstJntOri = om2.MEulerRotation(dataBlock.inputValue(AimConstraint.inConstJntOri).asDouble3())
-        qConstJntOri = eConstJntOri.asQuaternion()
+        constJntOri = dataBlock.inputValue(AimConstraint.inConstJntOri).asDouble3()
         constRotOrder = dataBlock.inputValue(AimConstraint.inConstRotOrder).asShort()
 
-        vTarget = om2.MVector(mTargetW[12], mTargetW[13], mTargetW[14])
-        vConst = om2.MVector(mConstW[12], mConstW[13], mConstW[14])
-        mtxFn = om2.MTransformationMatrix(mConstParInv)
-        qConstParInv = mtxFn.rotation(asQuaternion=True)
-
-        primAxis = om2.MVector.kXaxisVector
-        secAxis = om2.MVector.kYaxisVector
-        qAimConst = om2.MQuaternion()
-
-        nAim = vTarget - vConst
-        nAim.normalize()
-        qAim = om2.MQuaternion(primAxis, nAim)
-        qAimConst *= qAim
-
-        if upVecType != 0:
-            if upVecType == 1:
-                # World Up
-                nWorldUp = om2.MVector(dataBlock.inputValue(AimConstraint.inWorldUpVector).asFloat3())
-                nWorldUp.normalize()
-                vUp = nWorldUp
-            elif upVecType == 2:
-                # Object Up
-                mWorldUp = dataBlock.inputValue(AimConstraint.inWorldUpMtx).asMatrix()
-                vWorldUp = om2.MVector(mWorldUp[12], mWorldUp[13], mWorldUp[14])
-                vUp = vWorldUp - vConst
-            elif upVecType == 3:
-                # Angle Up
-                angleUp = dataBlock.inputValue(AimConstraint.inAngleUp).asAngle().asRadians()
-                qTwist = om2.MQuaternion(angleUp, nAim)
-                vUp = secAxis.rotateBy(qTwist)
-            nNormal = vUp - ((vUp * nAim) * nAim)
-            nNormal.normalize()
-
-            nUp = secAxis.rotateBy(qAim)
-            angle = nUp.angle(nNormal)
-            qNormal = om2.MQuaternion(angle, nAim)
-            if not nNormal.isEquivalent(nUp.rotateBy(qNormal), 1.0e-5):
-                angle = 2.0 * math.pi - angle
-                qNormal = om2.MQuaternion(angle, nAim)
-            qAimConst *= qNormal
-
-        qResult = om2.MQuaternion()
-        qResult *= qOffset.invertIt()
-        qResult *= qAimConst
-        qResult *= qConstParInv
-        qResult *= qConstJntOri.invertIt()
-        eResult = qResult.asEulerRotation()
-        eResult.reorderIt(constRotOrder)
-        eResult *= targetWeight
-        vResult = eResult.asVector()
+        result = lookAt.constraintRotation(
+            (mConstW[12], mConstW[13], mConstW[14]), (mTargetW[12], mTargetW[13], mTargetW[14]),
+            np.reshape(list(mConstParInv), (4, 4)), upVecType, worldUpVector, (mWorldUp[12], mWorldUp[13], mWorldUp[14]),
+            angleUp, offset, constJntOri, constRotOrder, targetWeight)
+
         outConstraintHandle = dataBlock.outputValue(AimConstraint.outConstraint)
-        outConstraintHandle.setMVector(vResult)
+        outConstraintHandle.setMVector(om2.MVector(result.tolist()))
         outConstraintHandle.setClean()
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Array version of gfAimConstraint. Every element of the constrained compound has the inputs of one
+    gfAimConstraint node and drives the constraint element with the same index. The aim and up vector
+    frames of all the elements are built in one call of gfTools.kernels.lookAt, so eyes, antennae or
+    pistons need one node instead of one per aimed object.
+    The constraint elements without a constrained object are set to zero.
+
+Attributes:
+    * Constrained: The array of aimed objects. Every element has:
+        * Up Vector Type: The type of calculation of the up vector.
+        * Offset: The matrix offset between the source and target objects.
+        * World Up Vector: The scene world up vector.
+        * World Up Matrix: The world matrix of the up object.
+        * Angle Up: The angle of the up vector around the aim.
+        * Target World Matrix: The world matrix of the target object.
+        * Target Weight: The weight of calculation.
+        * Constraint World Matrix: The world matrix of the constrainted object.
+        * Constraint Parent Inverse Matrix: The world inverse matrix of the parent of the constrainted object.
+        * Constraint Joint Orient: The joint orient of the constrainted object (if exists).
+        * Constraint Rotate Order: The rotate order of the constrainted object.
+    * Constraint: The array of result euler rotations.
+
+Todo:
+    * NDA
+
+Sources:
+    * NDA
+
+This code supports Pylint. Rc file in project.
+"""
+import math
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import profiling
+from gfTools.kernels import lookAt
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=invalid-name, unnecessary-pass
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class AimConstraintArray(om2.MPxNode):
+    """ Main class of gfUtilAimConstraintArray node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inConstrained = om2.MObject()
+    inUpVecType = om2.MObject()
+    inOffset = om2.MObject()
+    inWorldUpVector = om2.MObject()
+    inWorldUpMtx = om2.MObject()
+    inAngleUp = om2.MObject()
+    inTargetWMtx = om2.MObject()
+    inTargetWeight = om2.MObject()
+    inConstWMtx = om2.MObject()
+    inConstParInvMtx = om2.MObject()
+    inConstJntOri = om2.MObject()
+    inConstRotOrder = om2.MObject()
+    outConstraint = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return AimConstraintArray()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to AimConstraintArray class. Instances of AimConstraintArray will use these attributes
+        to create plugs for use in the compute() method.
+        """
+        eAttr = om2.MFnEnumAttribute()
+        mAttr = om2.MFnMatrixAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        uAttr = om2.MFnUnitAttribute()
+        cAttr = om2.MFnCompoundAttribute()
+
+        AimConstraintArray.inUpVecType = eAttr.create("upVectorType", "upt", 0)
+        eAttr.addField("None", 0)
+        eAttr.addField("World Up", 1)
+        eAttr.addField("Object Up", 2)
+        eAttr.addField("Angle Up", 3)
+        INPUT_ATTR(eAttr)
+
+        offsetX = uAttr.create("offsetX", "offsetX", om2.MFnUnitAttribute.kAngle, 0.0)
+        offsetY = uAttr.create("offsetY", "offsetY", om2.MFnUnitAttribute.kAngle, 0.0)
+        offsetZ = uAttr.create("offsetZ", "offsetZ", om2.MFnUnitAttribute.kAngle, 0.0)
+        AimConstraintArray.inOffset = nAttr.create("offset", "offset", offsetX, offsetY, offsetZ)
+        INPUT_ATTR(nAttr)
+
+        AimConstraintArray.inWorldUpVector = nAttr.createPoint("worldUpVector", "wuv")
+        nAttr.default = (0.0, 1.0, 0.0)
+        INPUT_ATTR(nAttr)
+
+        AimConstraintArray.inWorldUpMtx = mAttr.create("worldUpMatrix", "wum", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        AimConstraintArray.inAngleUp = uAttr.create("angleUp", "angle", om2.MFnUnitAttribute.kAngle, 0.0)
+        uAttr.setMin(0.0)
+        uAttr.setMax(2.0 * math.pi)
+        INPUT_ATTR(uAttr)
+
+        AimConstraintArray.inTargetWMtx = mAttr.create("targetWorldMatrix", "twmtx", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        AimConstraintArray.inTargetWeight = nAttr.create("targetWeight", "tw", om2.MFnNumericData.kDouble, 1.0)
+        INPUT_ATTR(nAttr)
+
+        AimConstraintArray.inConstWMtx = mAttr.create("constraintWorldMatrix", "cwmtx", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        AimConstraintArray.inConstParInvMtx = mAttr.create("constraintParentInverseMatrix", "cpim", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        jntOriX = uAttr.create("constraintJointOrientX", "cjorx", om2.MFnUnitAttribute.kAngle, 0.0)
+        jntOriY = uAttr.create("constraintJointOrientY", "cjory", om2.MFnUnitAttribute.kAngle, 0.0)
+        jntOriZ = uAttr.create("constraintJointOrientZ", "cjorz", om2.MFnUnitAttribute.kAngle, 0.0)
+        AimConstraintArray.inConstJntOri = nAttr.create("constraintJointOrient", "cjor", jntOriX, jntOriY, jntOriZ)
+        INPUT_ATTR(nAttr)
+
+        AimConstraintArray.inConstRotOrder = eAttr.create("constraintRotateOrder", "cro", 0)
+        eAttr.addField("xyz", 0)
+        eAttr.addField("yzx", 1)
+        eAttr.addField("zxy", 2)
+        eAttr.addField("xzy", 3)
+        eAttr.addField("yxz", 4)
+        eAttr.addField("zyx", 5)
+        INPUT_ATTR(eAttr)
+
+        AimConstraintArray.inConstrained = cAttr.create("constrained", "cnsd")
+        cAttr.addChild(AimConstraintArray.inUpVecType)
+        cAttr.addChild(AimConstraintArray.inOffset)
+        cAttr.addChild(AimConstraintArray.inWorldUpVector)
+        cAttr.addChild(AimConstraintArray.inWorldUpMtx)
+        cAttr.addChild(AimConstraintArray.inAngleUp)
+        cAttr.addChild(AimConstraintArray.inTargetWMtx)
+        cAttr.addChild(AimConstraintArray.inTargetWeight)
+        cAttr.addChild(AimConstraintArray.inConstWMtx)
+        cAttr.addChild(AimConstraintArray.inConstParInvMtx)
+        cAttr.addChild(AimConstraintArray.inConstJntOri)
+        cAttr.addChild(AimConstraintArray.inConstRotOrder)
+        cAttr.array = True
+        INPUT_ATTR(cAttr)
+
+        outConstraintX = uAttr.create("constraintX", "cx", om2.MFnUnitAttribute.kAngle, 0.0)
+        outConstraintY = uAttr.create("constraintY", "cy", om2.MFnUnitAttribute.kAngle, 0.0)
+        outConstraintZ = uAttr.create("constraintZ", "cz", om2.MFnUnitAttribute.kAngle, 0.0)
+        AimConstraintArray.outConstraint = nAttr.create("constraint", "const", outConstraintX, outConstraintY, outConstraintZ)
+        nAttr.array = True
+        OUTPUT_ATTR(nAttr)
+
+        AimConstraintArray.addAttribute(AimConstraintArray.inConstrained)
+        AimConstraintArray.addAttribute(AimConstraintArray.outConstraint)
+        for attribute in (AimConstraintArray.inConstrained, AimConstraintArray.inUpVecType, AimConstraintArray.inOffset,
+                          offsetX, offsetY, offsetZ, AimConstraintArray.inWorldUpVector, AimConstraintArray.inWorldUpMtx,
+                          AimConstraintArray.inAngleUp, AimConstraintArray.inTargetWMtx, AimConstraintArray.inTargetWeight,
+                          AimConstraintArray.inConstWMtx, AimConstraintArray.inConstParInvMtx,
+                          AimConstraintArray.inConstJntOri, jntOriX, jntOriY, jntOriZ, AimConstraintArray.inConstRotOrder):
+            AimConstraintArray.attributeAffects(attribute, AimConstraintArray.outConstraint)
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        # pylint: disable=no-self-use, too-many-locals
+        if plug != AimConstraintArray.outConstraint:
+            return om2.kUnknownParameter
+
+        # Gather the aimed objects, one row per object, and solve them in one call.
+        indices = []
+        upVecTypes = []
+        offsets = []
+        worldUpVectors = []
+        angleUps = []
+        targetWeights = []
+        jntOris = []
+        rotOrders = []
+        positions = []
+        parInvs = []
+        constrainedHandle = dataBlock.inputArrayValue(AimConstraintArray.inConstrained)
+        for i in range(len(constrainedHandle)):
+            constrainedHandle.jumpToPhysicalElement(i)
+            indices.append(constrainedHandle.elementLogicalIndex())
+            handle = constrainedHandle.inputValue()
+            upVecTypes.append(handle.child(AimConstraintArray.inUpVecType).asShort())
+            offsets.append(handle.child(AimConstraintArray.inOffset).asDouble3())
+            worldUpVectors.append(handle.child(AimConstraintArray.inWorldUpVector).asFloat3())
+            angleUps.append(handle.child(AimConstraintArray.inAngleUp).asAngle().asRadians())
+            targetWeights.append(handle.child(AimConstraintArray.inTargetWeight).asDouble())
+            jntOris.append(handle.child(AimConstraintArray.inConstJntOri).asDouble3())
+            rotOrders.append(handle.child(AimConstraintArray.inConstRotOrder).asShort())
+            # Only the positions of the world up, target and constrained matrices are used.
+            for attr in (AimConstraintArray.inWorldUpMtx, AimConstraintArray.inTargetWMtx, AimConstraintArray.inConstWMtx):
+                mtx = handle.child(attr).asMatrix()
+                positions.append((mtx[12], mtx[13], mtx[14]))
+            parInvs.append(list(handle.child(AimConstraintArray.inConstParInvMtx).asMatrix()))
+
+        results = {}
+        if indices:
+            positions = np.reshape(positions, (len(indices), 3, 3))
+            result = lookAt.constraintRotation(
+                positions[:, 2], positions[:, 1], np.reshape(parInvs, (-1, 4, 4)), np.asarray(upVecTypes, dtype=np.intp),
+                np.reshape(worldUpVectors, (-1, 3)), positions[:, 0], np.asarray(angleUps, dtype=np.float64),
+                np.reshape(offsets, (-1, 3)), np.reshape(jntOris, (-1, 3)), np.asarray(rotOrders, dtype=np.intp),
+                np.asarray(targetWeights, dtype=np.float64))
+            results = dict(zip(indices, result.tolist()))
+
+        # Set outputs
+        outConstraintHandle = dataBlock.outputArrayValue(AimConstraintArray.outConstraint)
+        for i in range(len(outConstraintHandle)):
+            outConstraintHandle.jumpToPhysicalElement(i)
+            result = results.get(outConstraintHandle.elementLogicalIndex(), [0.0, 0.0, 0.0])
+            outConstraintHandle.outputValue().setMVector(om2.MVector(result))
+
+        outConstraintHandle.setAllClean()
@@ -62,6 +62,8 @@ This code supports Pylint. Rc file in project.
 import math
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -87,6 +89,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class AngularMath(om2.MPxNode):
     """ Main class of gfUtilAngularMath node. """
 
@@ -146,6 +149,11 @@ class AngularMath(om2.MPxNode):
         AngularMath.attributeAffects(AngularMath.inAngle1, AngularMath.outAngle)
         AngularMath.attributeAffects(AngularMath.inAngle2, AngularMath.outAngle)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
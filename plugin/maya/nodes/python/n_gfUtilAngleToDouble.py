@@ -58,6 +58,8 @@ This code supports Pylint. Rc file in project.
 
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -83,6 +85,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class AngleToDouble(om2.MPxNode):
     """ Main class of gfUtilAngleToDouble node. """
 
@@ -122,6 +125,11 @@ class AngleToDouble(om2.MPxNode):
         AngleToDouble.addAttribute(AngleToDouble.outDouble)
         AngleToDouble.attributeAffects(AngleToDouble.inAngle, AngleToDouble.outDouble)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
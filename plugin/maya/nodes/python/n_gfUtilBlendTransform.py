@@ -42,6 +42,13 @@ Requirements:
 
 Description:
     Blend transformations (SRT) between an array of objects.
+    The rotations of all the elements are reordered and blended at once by gfTools.kernels.euler.
+    Every input array is read once into a numpy array and all the elements are blended together. The rotate
+    orders are kept until their plugs are dirtied.
+    The Weighted blend mode blends any number of transforms in one node, instead of a chain of two way
+    blends. The translations and scales are weighted sums and the rotations are weighted Euler sums or
+    weighted quaternion averages (gfTools.kernels.quaternion.average()). Without weight normalization, the
+    rotations blend towards the identity when the weights add up to less than 1.0.
 
 Attributes:
     * Blender: The weight value of the blend.
@@ -55,6 +62,10 @@ Attributes:
     * Scale 2: The scale value of the second object to be blended.
     * Rotate Order 2: The rotation order of the second object to be blended.
     * Out Rotate Order: The rotation order of the output object.
+    * Blend Mode: Two Way blends transform 1 and transform 2 with the blender. Weighted blends all the transforms.
+    * Normalize Weights: Divide the weights by their sum in the Weighted mode.
+    * Weight: The weight of each transform in the Weighted mode.
+    * Transform: The translate, rotate, scale and rotate order arrays of each transform in the Weighted mode.
     * Out Translate: The translate value of the output object.
     * Out Rotate: The rotate value of the output object.
     * Out Scale: The scale value of the output object.
@@ -70,8 +81,14 @@ Sources:
 This code supports Pylint. Rc file in project.
 """
 
+import numpy as np
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import euler
+from gfTools.kernels import quaternion
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -97,6 +114,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class BlendTransform(om2.MPxNode):
     """ Main class of gfUtilBlendTransform node. """
 
@@ -117,6 +135,14 @@ class BlendTransform(om2.MPxNode):
     inRot2Order = om2.MObject()
     inTransform2 = om2.MObject()
     inOutRotOrder = om2.MObject()
+    inBlendMode = om2.MObject()
+    inNormalize = om2.MObject()
+    inWeight = om2.MObject()
+    inTrans = om2.MObject()
+    inRot = om2.MObject()
+    inSca = om2.MObject()
+    inRotOrder = om2.MObject()
+    inTransform = om2.MObject()
     outTrans = om2.MObject()
     outRot = om2.MObject()
     outSca = om2.MObject()
@@ -126,6 +152,9 @@ class BlendTransform(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
+        self.cachedResult = None
+        self.cachedRotOrders = None
+        self.cachedSpaceRotOrders = None
 
     @staticmethod
     def creator():
@@ -226,6 +255,51 @@ class BlendTransform(om2.MPxNode):
         eAttr.array = True
         INPUT_ATTR(eAttr)
 
+        BlendTransform.inBlendMode = eAttr.create("blendMode", "bmode", 0)
+        eAttr.addField("Two Way", 0)
+        eAttr.addField("Weighted", 1)
+        INPUT_ATTR(eAttr)
+
+        BlendTransform.inNormalize = nAttr.create("normalizeWeights", "nweights", om2.MFnNumericData.kBoolean, True)
+        INPUT_ATTR(nAttr)
+
+        BlendTransform.inWeight = nAttr.create("weight", "w", om2.MFnNumericData.kFloat, 1.0)
+        nAttr.setMin(0.0)
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        BlendTransform.inTrans = nAttr.createPoint("translate", "t")
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        rotX = uAttr.create("rotateX", "rox", om2.MFnUnitAttribute.kAngle, 0.0)
+        rotY = uAttr.create("rotateY", "roy", om2.MFnUnitAttribute.kAngle, 0.0)
+        rotZ = uAttr.create("rotateZ", "roz", om2.MFnUnitAttribute.kAngle, 0.0)
+        BlendTransform.inRot = nAttr.create("rotate", "ro", rotX, rotY, rotZ)
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        BlendTransform.inSca = nAttr.createPoint("scale", "sca")
+        nAttr.array = True
+        INPUT_ATTR(nAttr)
+
+        BlendTransform.inRotOrder = eAttr.create("rotateOrder", "rro", 0)
+        eAttr.addField("xyz", 0)
+        eAttr.addField("yzx", 1)
+        eAttr.addField("zxy", 2)
+        eAttr.addField("xzy", 3)
+        eAttr.addField("yxz", 4)
+        eAttr.addField("zyx", 5)
+        eAttr.array = True
+        INPUT_ATTR(eAttr)
+
+        BlendTransform.inTransform = cAttr.create("transform", "tr")
+        cAttr.addChild(BlendTransform.inTrans)
+        cAttr.addChild(BlendTransform.inRot)
+        cAttr.addChild(BlendTransform.inSca)
+        cAttr.addChild(BlendTransform.inRotOrder)
+        cAttr.array = True
+
         BlendTransform.outTrans = nAttr.createPoint("outTranslate", "ot")
         nAttr.array = True
         OUTPUT_ATTR(nAttr)
@@ -252,6 +326,10 @@ class BlendTransform(om2.MPxNode):
         BlendTransform.addAttribute(BlendTransform.inTransform1)
         BlendTransform.addAttribute(BlendTransform.inTransform2)
         BlendTransform.addAttribute(BlendTransform.inOutRotOrder)
+        BlendTransform.addAttribute(BlendTransform.inBlendMode)
+        BlendTransform.addAttribute(BlendTransform.inNormalize)
+        BlendTransform.addAttribute(BlendTransform.inWeight)
+        BlendTransform.addAttribute(BlendTransform.inTransform)
         BlendTransform.addAttribute(BlendTransform.outTrans)
         BlendTransform.addAttribute(BlendTransform.outRot)
         BlendTransform.addAttribute(BlendTransform.outSca)
@@ -270,108 +348,216 @@ class BlendTransform(om2.MPxNode):
         BlendTransform.attributeAffects(BlendTransform.inBlender, BlendTransform.outSca)
         BlendTransform.attributeAffects(BlendTransform.inSca1, BlendTransform.outSca)
         BlendTransform.attributeAffects(BlendTransform.inSca2, BlendTransform.outSca)
+        for attribute in (BlendTransform.inBlendMode, BlendTransform.inNormalize, BlendTransform.inWeight):
+            BlendTransform.attributeAffects(attribute, BlendTransform.outTrans)
+            BlendTransform.attributeAffects(attribute, BlendTransform.outRot)
+            BlendTransform.attributeAffects(attribute, BlendTransform.outSca)
+        BlendTransform.attributeAffects(BlendTransform.inTrans, BlendTransform.outTrans)
+        BlendTransform.attributeAffects(BlendTransform.inRot, BlendTransform.outRot)
+        BlendTransform.attributeAffects(BlendTransform.inRotOrder, BlendTransform.outRot)
+        BlendTransform.attributeAffects(BlendTransform.inSca, BlendTransform.outSca)
         BlendTransform.attributeAffects(BlendTransform.inBlender, BlendTransform.outVis)
         BlendTransform.attributeAffects(BlendTransform.inBlender, BlendTransform.outRevVis)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached result and the rotate orders of the dirtied transforms. """
+        # pylint: disable=unused-argument
+        self.cachedResult = None
+        attribute = plugBeingDirtied.attribute()
+        topAttribute = nodeUtils.topAttribute(plugBeingDirtied)
+        if topAttribute == BlendTransform.inOutRotOrder or attribute in (
+                BlendTransform.inRot1Order, BlendTransform.inRot2Order, BlendTransform.inTransform1, BlendTransform.inTransform2):
+            self.cachedRotOrders = None
+        if topAttribute == BlendTransform.inTransform and attribute in (BlendTransform.inRotOrder, BlendTransform.inTransform):
+            self.cachedSpaceRotOrders = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        self.cachedResult = None
+        if not context.isNormal():
+            return
+        if (evaluationNode.dirtyPlugExists(BlendTransform.inRot1Order) or
+                evaluationNode.dirtyPlugExists(BlendTransform.inRot2Order) or
+                evaluationNode.dirtyPlugExists(BlendTransform.inOutRotOrder)):
+            self.cachedRotOrders = None
+        if (evaluationNode.dirtyPlugExists(BlendTransform.inRotOrder) or
+                evaluationNode.dirtyPlugExists(BlendTransform.inTransform)):
+            self.cachedSpaceRotOrders = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
             * plug is a connection point related to one of our node attributes (either an input or an output).
             * dataBlock contains the data on which we will base our computations.
         """
-        # pylint: disable=R0201
+        if plug not in (BlendTransform.outTrans, BlendTransform.outRot, BlendTransform.outSca,
+                        BlendTransform.outVis, BlendTransform.outRevVis):
+            return om2.kUnknownParameter
+
+        # The first request computes and sets clean all the outputs, the result is kept until
+        # an input is dirtied. The rotate orders are only read again after their plugs are dirtied.
+        isNormal = dataBlock.context().isNormal()
+        result = self.cachedResult if isNormal else None
+        if result is None:
+            rotOrders = self.cachedRotOrders if isNormal else None
+            if rotOrders is None:
+                rotOrders = tuple(nodeUtils.readArray(dataBlock.inputArrayValue(attribute),
+                                                      om2.MDataHandle.asShort, 0, np.intp)
+                                  for attribute in (BlendTransform.inRot1Order, BlendTransform.inRot2Order,
+                                                    BlendTransform.inOutRotOrder))
+                if isNormal:
+                    self.cachedRotOrders = rotOrders
+            if dataBlock.inputValue(BlendTransform.inBlendMode).asShort() == 0:
+                result = BlendTransform.computeResult(dataBlock, rotOrders)
+            else:
+                spaceRotOrders = self.cachedSpaceRotOrders if isNormal else None
+                if spaceRotOrders is None:
+                    spaceRotOrders = BlendTransform.readSpaceRotateOrders(dataBlock)
+                    if isNormal:
+                        self.cachedSpaceRotOrders = spaceRotOrders
+                result = BlendTransform.computeWeightedResult(dataBlock, rotOrders[2], spaceRotOrders)
+            if isNormal:
+                self.cachedResult = result
+        outTrans, outRot, outSca, vis, revVis = result
+
+        BlendTransform.writeArray(dataBlock.outputArrayValue(BlendTransform.outTrans), outTrans.tolist(),
+                                  lambda handle, value: handle.setMFloatVector(om2.MFloatVector(value)))
+        BlendTransform.writeArray(dataBlock.outputArrayValue(BlendTransform.outRot), outRot.tolist(),
+                                  lambda handle, value: handle.setMVector(om2.MVector(value)))
+        BlendTransform.writeArray(dataBlock.outputArrayValue(BlendTransform.outSca), outSca.tolist(),
+                                  lambda handle, value: handle.setMFloatVector(om2.MFloatVector(value)))
+
+        outVisHandle = dataBlock.outputValue(BlendTransform.outVis)
+        outRevVisHandle = dataBlock.outputValue(BlendTransform.outRevVis)
+        outVisHandle.setBool(vis)
+        outRevVisHandle.setBool(revVis)
+        outVisHandle.setClean()
+        outRevVisHandle.setClean()
+
+    @staticmethod
+    def computeResult(dataBlock, rotOrders):
+        """
+        Compute the blended transforms of all the elements at once.
+        Returns the (N, 3) translation, rotation and scale arrays and the visibility values.
+        """
         blender = dataBlock.inputValue(BlendTransform.inBlender).asFloat()
-        if plug == BlendTransform.outTrans:
-            trans1Handle = dataBlock.inputArrayValue(BlendTransform.inTrans1)
-            trans2Handle = dataBlock.inputArrayValue(BlendTransform.inTrans2)
-            outTransHandle = dataBlock.outputArrayValue(BlendTransform.outTrans)
-            outList = []
-            for i in range(min(len(trans1Handle), len(trans2Handle))):
-                trans1Handle.jumpToLogicalElement(i)
-                trans2Handle.jumpToLogicalElement(i)
-                vTrans1 = trans1Handle.inputValue().asFloatVector()
-                vTrans2 = trans2Handle.inputValue().asFloatVector()
-                vOut = (1.0 - blender) * vTrans1 + blender * vTrans2
-                outList.append(vOut)
-            for i in range(len(outTransHandle)):
-                outTransHandle.jumpToLogicalElement(i)
-                resultHandle = outTransHandle.outputValue()
-                if i < len(outTransHandle) and i < len(outList):
-                    resultHandle.setMFloatVector(outList[i])
-                else:
-                    resultHandle.setMFloatVector(om2.MFloatVector())
-            outTransHandle.setAllClean()
-
-        elif plug == BlendTransform.outRot:
-            rotInterp = dataBlock.inputValue(BlendTransform.inRotInterp).asShort()
-            rot1Handle = dataBlock.inputArrayValue(BlendTransform.inRot1)
-            rot2Handle = dataBlock.inputArrayValue(BlendTransform.inRot2)
-            outRotHandle = dataBlock.outputArrayValue(BlendTransform.outRot)
-            rotOrder1Handle = dataBlock.inputArrayValue(BlendTransform.inRot1Order)
-            rotOrder2Handle = dataBlock.inputArrayValue(BlendTransform.inRot2Order)
-            outRotOrderHandle = dataBlock.inputArrayValue(BlendTransform.inOutRotOrder)
-            outList = []
-            for i in range(min(len(rot1Handle), len(rot2Handle))):
-                rot1Handle.jumpToLogicalElement(i)
-                rot2Handle.jumpToLogicalElement(i)
-                rotOrder1 = BlendTransform.checkRotateOrderArrayHandle(rotOrder1Handle, i)
-                rotOrder2 = BlendTransform.checkRotateOrderArrayHandle(rotOrder2Handle, i)
-                outRotOrder = BlendTransform.checkRotateOrderArrayHandle(outRotOrderHandle, i)
-                rot1 = rot1Handle.inputValue().asVector()
-                rot2 = rot2Handle.inputValue().asVector()
-                eRot1 = om2.MEulerRotation(rot1, rotOrder1)
-                eRot2 = om2.MEulerRotation(rot2, rotOrder2)
-                eRot1.reorderIt(outRotOrder)
-                eRot2.reorderIt(outRotOrder)
-                if rotInterp == 0:
-                    vRot1 = eRot1.asVector()
-                    vRot2 = eRot2.asVector()
-                    vOut = (1.0 - blender) * vRot1 + blender * vRot2
-                else:
-                    qRot1 = eRot1.asQuaternion()
-                    qRot2 = eRot2.asQuaternion()
-                    eSlerp = om2.MQuaternion.slerp(qRot1, qRot2, blender).asEulerRotation()
-                    eSlerp.reorderIt(outRotOrder)
-                    vOut = eSlerp.asVector()
-                outList.append(vOut)
-            for i in range(len(outRotHandle)):
-                outRotHandle.jumpToLogicalElement(i)
-                resultHandle = outRotHandle.outputValue()
-                if i < len(outRotHandle) and i < len(outList):
-                    resultHandle.setMVector(outList[i])
-                else:
-                    resultHandle.setMVector(om2.MVector())
-            outRotHandle.setAllClean()
-
-        elif plug == BlendTransform.outSca:
-            sca1Handle = dataBlock.inputArrayValue(BlendTransform.inSca1)
-            sca2Handle = dataBlock.inputArrayValue(BlendTransform.inSca2)
-            outScaHandle = dataBlock.outputArrayValue(BlendTransform.outSca)
-            outList = []
-            for i in range(min(len(sca1Handle), len(sca2Handle))):
-                sca1Handle.jumpToLogicalElement(i)
-                sca2Handle.jumpToLogicalElement(i)
-                vSca1 = sca1Handle.inputValue().asFloatVector()
-                vSca2 = sca2Handle.inputValue().asFloatVector()
-                vOut = (1.0 - blender) * vSca1 + blender * vSca2
-                outList.append(vOut)
-            for i in range(len(outScaHandle)):
-                outScaHandle.jumpToLogicalElement(i)
-                resultHandle = outScaHandle.outputValue()
-                if i < len(outScaHandle) and i < len(outList):
-                    resultHandle.setMFloatVector(outList[i])
-                else:
-                    resultHandle.setMFloatVector(om2.MFloatVector())
-            outScaHandle.setAllClean()
-
-        elif plug in (BlendTransform.outVis, BlendTransform.outRevVis):
-            outVisHandle = dataBlock.outputValue(BlendTransform.outVis)
-            outRevVisHandle = dataBlock.outputValue(BlendTransform.outRevVis)
-            vis, revVis = BlendTransform.visibilityCalculation(blender)
-            outVisHandle.setBool(vis)
-            outRevVisHandle.setBool(revVis)
-            outVisHandle.setClean()
-            outRevVisHandle.setClean()
+
+        trans1 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inTrans1),
+                                     om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0))
+        trans2 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inTrans2),
+                                     om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0))
+        count = min(len(trans1), len(trans2))
+        outTrans = (1.0 - blender) * trans1[:count] + blender * trans2[:count]
+
+        rotInterp = dataBlock.inputValue(BlendTransform.inRotInterp).asShort()
+        rot1 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inRot1),
+                                   om2.MDataHandle.asDouble3, (0.0, 0.0, 0.0))
+        rot2 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inRot2),
+                                   om2.MDataHandle.asDouble3, (0.0, 0.0, 0.0))
+        count = min(len(rot1), len(rot2))
+        # Missing rotate orders are kXYZ.
+        orders = np.zeros((3, count), dtype=np.intp)
+        for i, order in enumerate(rotOrders):
+            orders[i, :min(len(order), count)] = order[:count]
+        rot1 = euler.reorder(rot1[:count], orders[0], orders[2])
+        rot2 = euler.reorder(rot2[:count], orders[1], orders[2])
+        if rotInterp == 0:
+            outRot = (1.0 - blender) * rot1 + blender * rot2
+        else:
+            qRot1 = euler.toQuaternion(rot1, orders[2])
+            qRot2 = euler.toQuaternion(rot2, orders[2])
+            outRot = euler.fromQuaternion(quaternion.slerp(qRot1, qRot2, blender), orders[2])
+
+        sca1 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inSca1),
+                                   om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0))
+        sca2 = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inSca2),
+                                   om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0))
+        count = min(len(sca1), len(sca2))
+        outSca = (1.0 - blender) * sca1[:count] + blender * sca2[:count]
+
+        vis, revVis = BlendTransform.visibilityCalculation(blender)
+        return outTrans, np.reshape(outRot, (count, 3)), outSca, vis, revVis
+
+    @staticmethod
+    def computeWeightedResult(dataBlock, outRotOrders, spaceRotOrders):
+        """
+        Compute the weighted blend of all the transforms and all the elements at once.
+        Returns the (N, 3) translation, rotation and scale arrays and the visibility values.
+        """
+        blender = dataBlock.inputValue(BlendTransform.inBlender).asFloat()
+        normalize = dataBlock.inputValue(BlendTransform.inNormalize).asBool()
+        rotInterp = dataBlock.inputValue(BlendTransform.inRotInterp).asShort()
+        weightList = nodeUtils.readArray(dataBlock.inputArrayValue(BlendTransform.inWeight),
+                                         om2.MDataHandle.asFloat, 1.0)
+
+        # Only the existing transforms are blended, the missing weights are 1.0.
+        indices = []
+        transList = []
+        rotList = []
+        scaList = []
+        transformHandle = dataBlock.inputArrayValue(BlendTransform.inTransform)
+        for i in range(len(transformHandle)):
+            transformHandle.jumpToPhysicalElement(i)
+            indices.append(transformHandle.elementLogicalIndex())
+            elementHandle = transformHandle.inputValue()
+            transList.append(nodeUtils.readArray(om2.MArrayDataHandle(elementHandle.child(BlendTransform.inTrans)),
+                                                 om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0)))
+            rotList.append(nodeUtils.readArray(om2.MArrayDataHandle(elementHandle.child(BlendTransform.inRot)),
+                                               om2.MDataHandle.asDouble3, (0.0, 0.0, 0.0)))
+            scaList.append(nodeUtils.readArray(om2.MArrayDataHandle(elementHandle.child(BlendTransform.inSca)),
+                                               om2.MDataHandle.asFloat3, (0.0, 0.0, 0.0)))
+        vis, revVis = BlendTransform.visibilityCalculation(blender)
+        if not indices:
+            return np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 3)), vis, revVis
+        weights = np.array([weightList[index] if index < len(weightList) else 1.0 for index in indices])
+        total = np.sum(weights)
+        if normalize and total > 0.0:
+            weights = weights / total
+
+        count = min([len(trans) for trans in transList])
+        outTrans = np.einsum("k,kni->ni", weights, np.reshape([trans[:count] for trans in transList], (len(indices), count, 3)))
+        count = min([len(sca) for sca in scaList])
+        outSca = np.einsum("k,kni->ni", weights, np.reshape([sca[:count] for sca in scaList], (len(indices), count, 3)))
+
+        # Every rotation is reordered to the output rotate order, missing rotate orders are kXYZ.
+        count = min([len(rot) for rot in rotList])
+        orders = np.zeros((len(indices) + 1, count), dtype=np.intp)
+        orders[-1, :min(len(outRotOrders), count)] = outRotOrders[:count]
+        for i, index in enumerate(indices):
+            order = spaceRotOrders.get(index, orders[-1, :0])
+            orders[i, :min(len(order), count)] = order[:count]
+        rots = euler.reorder(np.reshape([rot[:count] for rot in rotList], (len(indices), count, 3)), orders[:-1], orders[-1])
+        if rotInterp == 0:
+            outRot = np.einsum("k,kni->ni", weights, rots)
+        else:
+            quats = np.swapaxes(euler.toQuaternion(rots, orders[-1]), 0, 1)
+            if not normalize and np.sum(weights) < 1.0:
+                quats = np.concatenate([quats, quaternion.identity((count, 1))], axis=1)
+                weights = np.append(weights, 1.0 - np.sum(weights))
+            outRot = euler.fromQuaternion(quaternion.average(quats, weights), orders[-1])
+        return outTrans, np.reshape(outRot, (count, 3)), outSca, vis, revVis
+
+    @staticmethod
+    def readSpaceRotateOrders(dataBlock):
+        """ Read the rotate orders of every transform of the Weighted mode, by logical index. """
+        spaceRotOrders = {}
+        transformHandle = dataBlock.inputArrayValue(BlendTransform.inTransform)
+        for i in range(len(transformHandle)):
+            transformHandle.jumpToPhysicalElement(i)
+            rotOrderHandle = om2.MArrayDataHandle(transformHandle.inputValue().child(BlendTransform.inRotOrder))
+            spaceRotOrders[transformHandle.elementLogicalIndex()] = nodeUtils.readArray(
+                rotOrderHandle, om2.MDataHandle.asShort, 0, np.intp)
+        return spaceRotOrders
 
     @staticmethod
     def visibilityCalculation(blender):
@@ -395,15 +581,13 @@ class BlendTransform(om2.MPxNode):
         return vis, revVis
 
     @staticmethod
-    def checkRotateOrderArrayHandle(arrayHandle, iterValue):
+    def writeArray(arrayHandle, values, setter):
         """
-        Check if rotate order MArrayDataHandle is done. If it is return default kXYZ, otherwise
-        return the input value.
+        Set all the elements of an output array handle by physical index and set it clean.
+        Elements without a value are set to zero.
         """
-        index = len(arrayHandle)
-        if index > 0 and iterValue <= index:
-            arrayHandle.jumpToLogicalElement(iterValue)
-            value = arrayHandle.inputValue().asShort()
-        else:
-            value = 0
-        return value
+        for i in range(len(arrayHandle)):
+            arrayHandle.jumpToPhysicalElement(i)
+            index = arrayHandle.elementLogicalIndex()
+            setter(arrayHandle.outputValue(), values[index] if index < len(values) else (0.0, 0.0, 0.0))
+        arrayHandle.setAllClean()
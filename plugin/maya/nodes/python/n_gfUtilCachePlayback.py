@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Play back one channel of a gfTools cache file (gfTools.cache) instead of computing it. The cache
+    is memory mapped, so only the frames that are played are read from the disk. Matrix channels
+    (like the outChain of gfIKVChain) are written to the out matrix elements, any other channel is
+    flattened to the out value elements. The cache file is only opened again when the Cache File is set,
+    so set it again to play back a cache written again to the same path. A file that can't be read is
+    reported once on the "gfTools" Python logger and the outputs are left at their defaults.
+
+Attributes:
+    * Cache File: The path of the cache file.
+    * Channel: The name of the channel to play back. Empty plays the first channel of the cache.
+    * Frame: The frame to play back. Connect the time1.outTime to it.
+    * Interpolation: Hold the previous cached frame or blend the two cached frames around the frame.
+    * Out Matrix: The cached matrices.
+    * Out Value: The cached values.
+
+Todo:
+    * NDA
+
+Sources:
+    * NDA
+
+This code supports Pylint. Rc file in project.
+"""
+import logging
+
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import cache
+from gfTools import profiling
+
+
+kLogger = logging.getLogger("gfTools")
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=invalid-name, unnecessary-pass
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class CachePlayback(om2.MPxNode):
+    """ Main class of gfUtilCachePlayback node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inCacheFile = om2.MObject()
+    inChannel = om2.MObject()
+    inFrame = om2.MObject()
+    inInterpolation = om2.MObject()
+    outMatrix = om2.MObject()
+    outValue = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+        self.cache = None
+        self.cachePath = None
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return CachePlayback()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to CachePlayback class. Instances of CachePlayback will use these attributes to create plugs
+        for use in the compute() method.
+        """
+        tAttr = om2.MFnTypedAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        eAttr = om2.MFnEnumAttribute()
+        mAttr = om2.MFnMatrixAttribute()
+
+        CachePlayback.inCacheFile = tAttr.create("cacheFile", "cf", om2.MFnData.kString)
+        INPUT_ATTR(tAttr)
+        tAttr.keyable = False
+        tAttr.usedAsFilename = True
+
+        CachePlayback.inChannel = tAttr.create("channel", "ch", om2.MFnData.kString)
+        INPUT_ATTR(tAttr)
+        tAttr.keyable = False
+
+        CachePlayback.inFrame = nAttr.create("frame", "frame", om2.MFnNumericData.kDouble, 0.0)
+        INPUT_ATTR(nAttr)
+
+        CachePlayback.inInterpolation = eAttr.create("interpolation", "interp", cache.kLinear)
+        eAttr.addField("None", cache.kNone)
+        eAttr.addField("Linear", cache.kLinear)
+        INPUT_ATTR(eAttr)
+
+        CachePlayback.outMatrix = mAttr.create("outMatrix", "omtx", om2.MFnMatrixAttribute.kDouble)
+        mAttr.array = True
+        OUTPUT_ATTR(mAttr)
+
+        CachePlayback.outValue = nAttr.create("outValue", "oval", om2.MFnNumericData.kDouble, 0.0)
+        nAttr.array = True
+        OUTPUT_ATTR(nAttr)
+
+        CachePlayback.addAttribute(CachePlayback.inCacheFile)
+        CachePlayback.addAttribute(CachePlayback.inChannel)
+        CachePlayback.addAttribute(CachePlayback.inFrame)
+        CachePlayback.addAttribute(CachePlayback.inInterpolation)
+        CachePlayback.addAttribute(CachePlayback.outMatrix)
+        CachePlayback.addAttribute(CachePlayback.outValue)
+        CachePlayback.attributeAffects(CachePlayback.inCacheFile, CachePlayback.outMatrix)
+        CachePlayback.attributeAffects(CachePlayback.inChannel, CachePlayback.outMatrix)
+        CachePlayback.attributeAffects(CachePlayback.inFrame, CachePlayback.outMatrix)
+        CachePlayback.attributeAffects(CachePlayback.inInterpolation, CachePlayback.outMatrix)
+        CachePlayback.attributeAffects(CachePlayback.inCacheFile, CachePlayback.outValue)
+        CachePlayback.attributeAffects(CachePlayback.inChannel, CachePlayback.outValue)
+        CachePlayback.attributeAffects(CachePlayback.inFrame, CachePlayback.outValue)
+        CachePlayback.attributeAffects(CachePlayback.inInterpolation, CachePlayback.outValue)
+
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Open the cache file again when the cache file path is set. """
+        # pylint: disable=unused-argument
+        if plugBeingDirtied == CachePlayback.inCacheFile:
+            self.cachePath = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if context.isNormal() and evaluationNode.dirtyPlugExists(CachePlayback.inCacheFile):
+            self.cachePath = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        if plug not in (CachePlayback.outMatrix, CachePlayback.outValue):
+            return om2.kUnknownParameter
+
+        matrices = []
+        values = []
+        cacheData = self.loadCache(dataBlock.inputValue(CachePlayback.inCacheFile).asString())
+        if cacheData is not None and cacheData.names():
+            channel = dataBlock.inputValue(CachePlayback.inChannel).asString() or cacheData.names()[0]
+            if channel in cacheData.names():
+                frame = dataBlock.inputValue(CachePlayback.inFrame).asDouble()
+                interp = dataBlock.inputValue(CachePlayback.inInterpolation).asShort()
+                result = cacheData.sample(channel, frame, interp)
+                if cacheData.kind(channel) == cache.kMatrix:
+                    matrices = result.reshape(-1, 16).tolist()
+                else:
+                    values = result.ravel().tolist()
+
+        # Both outputs come from the same sample, set both of them.
+        outMatrixHandle = dataBlock.outputArrayValue(CachePlayback.outMatrix)
+        for i in range(len(outMatrixHandle)):
+            outMatrixHandle.jumpToPhysicalElement(i)
+            index = outMatrixHandle.elementLogicalIndex()
+            resultHandle = outMatrixHandle.outputValue()
+            if index < len(matrices):
+                resultHandle.setMMatrix(om2.MMatrix(matrices[index]))
+            else:
+                resultHandle.setMMatrix(om2.MMatrix.kIdentity)
+        outMatrixHandle.setAllClean()
+
+        outValueHandle = dataBlock.outputArrayValue(CachePlayback.outValue)
+        for i in range(len(outValueHandle)):
+            outValueHandle.jumpToPhysicalElement(i)
+            index = outValueHandle.elementLogicalIndex()
+            resultHandle = outValueHandle.outputValue()
+            if index < len(values):
+                resultHandle.setDouble(values[index])
+            else:
+                resultHandle.setDouble(0.0)
+        outValueHandle.setAllClean()
+
+    def loadCache(self, path):
+        """
+        Return the cache of the path, opening it only when the path was set since the last call. Returns None
+        if the path is empty or the file can't be read.
+        """
+        if path != self.cachePath:
+            self.cachePath = path
+            self.cache = None
+            if path:
+                try:
+                    self.cache = cache.load(path)
+                except (IOError, OSError, ValueError) as err:
+                    # The compute runs from the Evaluation Manager threads, Python logging is safe there.
+                    kLogger.error("[gfTools] gfCachePlayback can't read the cache %s: %s", path, err)
+        return self.cache
@@ -62,6 +62,8 @@ This code supports Pylint. Rc file in project.
 
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -87,6 +89,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class DecomposeRowMatrix(om2.MPxNode):
     """ Main class of gfUtilDecompRowMtx node. """
 
@@ -153,6 +156,11 @@ class DecomposeRowMatrix(om2.MPxNode):
         DecomposeRowMatrix.attributeAffects(DecomposeRowMatrix.inMatrix, DecomposeRowMatrix.outRow4)
         DecomposeRowMatrix.attributeAffects(DecomposeRowMatrix.inNormalizeOutput, DecomposeRowMatrix.outRow4)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -64,6 +64,8 @@ This code supports Pylint. Rc file in project.
 
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -89,6 +91,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class EulerMath(om2.MPxNode):
     """ Main class of gfUtilEulerMath node. """
 
@@ -199,6 +202,11 @@ class EulerMath(om2.MPxNode):
         EulerMath.attributeAffects(EulerMath.inEuler2RotOrder, EulerMath.outEuler)
         EulerMath.attributeAffects(EulerMath.inResRotOrder, EulerMath.outEuler)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
@@ -61,6 +61,8 @@ This code supports Pylint. Rc file in project.
 """
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -86,6 +88,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class FindParamFromLength(om2.MPxNode):
     """ Main class of gfFindParamFromLength node. """
 
@@ -132,6 +135,11 @@ class FindParamFromLength(om2.MPxNode):
         FindParamFromLength.attributeAffects(FindParamFromLength.inCurve, FindParamFromLength.outParam)
         FindParamFromLength.attributeAffects(FindParamFromLength.inArcLength, FindParamFromLength.outParam)
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
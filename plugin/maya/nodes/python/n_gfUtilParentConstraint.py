@@ -39,10 +39,13 @@ How to use:
 
 Requirements:
     * Maya 2017 or above.
+    * NumPy.
 
 Description:
     Custom parent contraint. Parent one object to another. Can be used as point, orient
     or scale constraint.
+    The targets are blended without shear: translations and scales linearly and rotations with
+    a weighted quaternion average. The weights are normalized.
 
 Attributes:
     * Contraint Joint Orient: The joint orient of the constrainted object.
@@ -65,8 +68,12 @@ Sources:
 This code supports Pylint. Rc file in project.
 """
 
+import numpy as np
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+from gfTools.kernels import transform
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -92,6 +99,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class ParentConstraint(om2.MPxNode):
     """ Main class of gfUtilParentConstraint node. """
 
@@ -116,6 +124,7 @@ class ParentConstraint(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
+        self.cachedResult = None
 
     @staticmethod
     def creator():
@@ -238,58 +247,83 @@ class ParentConstraint(om2.MPxNode):
         # ParentConstraint.attributeAffects(ParentConstraint.inTargetRotOrder, ParentConstraint.outConstSca)
         ParentConstraint.attributeAffects(ParentConstraint.inTargetWeight, ParentConstraint.outConstSca)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached result when any input is dirtied. """
+        # pylint: disable=unused-argument
+        self.cachedResult = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        # pylint: disable=unused-argument
+        self.cachedResult = None
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
             * plug is a connection point related to one of our node attributes (either an input or an output).
             * dataBlock contains the data on which we will base our computations.
         """
-        # pylint: disable=no-self-use
-        eConstJntOri = om2.MEulerRotation(dataBlock.inputValue(ParentConstraint.inConstraintJntOri).asDouble3())
+        if plug not in (ParentConstraint.outConstTrans, ParentConstraint.outConstRot, ParentConstraint.outConstSca):
+            return om2.kUnknownParameter
+
+        # All the outputs come from the same matrix. The first request computes and sets clean
+        # all of them, the result is kept until an input is dirtied.
+        isNormal = dataBlock.context().isNormal()
+        result = self.cachedResult if isNormal else None
+        if result is None:
+            result = ParentConstraint.computeResult(dataBlock)
+            if isNormal:
+                self.cachedResult = result
+        outTrans, outRot, outSca = result
+
+        outTransHandle = dataBlock.outputValue(ParentConstraint.outConstTrans)
+        outTransHandle.set3Float(outTrans[0], outTrans[1], outTrans[2])
+        outTransHandle.setClean()
+
+        outRotHandle = dataBlock.outputValue(ParentConstraint.outConstRot)
+        outRotHandle.setMVector(om2.MVector(outRot))
+        outRotHandle.setClean()
+
+        outScaHandle = dataBlock.outputValue(ParentConstraint.outConstSca)
+        outScaHandle.set3Float(outSca[0], outSca[1], outSca[2])
+        outScaHandle.setClean()
+
+    @staticmethod
+    def computeResult(dataBlock):
+        """
+        Compute the weighted result of the targets.
+        Returns the translation (list), the rotation (list) and the scale (list).
+        """
+        constJntOri = dataBlock.inputValue(ParentConstraint.inConstraintJntOri).asDouble3()
         mConstParInv = dataBlock.inputValue(ParentConstraint.inConstraintParInvMtx).asMatrix()
         constRotOrder = dataBlock.inputValue(ParentConstraint.inConstraintRotOrder).asShort()
         constParSca = dataBlock.inputValue(ParentConstraint.inConstraintParSca).asFloat3()
         targetListHandle = dataBlock.inputArrayValue(ParentConstraint.inTargetList)
-        mTargetsAdded = om2.MMatrix()
-        mtxFn = om2.MTransformationMatrix()
-        mtxFn.scaleBy(constParSca, om2.MSpace.kTransform)
-        mInvSca = mtxFn.asMatrix()
 
+        offsets = []
+        worlds = []
+        weights = []
         for i in range(len(targetListHandle)):
-            targetListHandle.jumpToLogicalElement(i)
+            targetListHandle.jumpToPhysicalElement(i)
             targetHandle = targetListHandle.inputValue()
-            # targetJntOri = om2.MEulerRotation(targetHandle.child(ParentConstraint.inTargetJntOri).asDouble3())
-            # targetRotOrder = targetHandle.child(ParentConstraint.inTargetRotOrder).asShort()
-            mTargetW = targetHandle.child(ParentConstraint.inTargetWorldMatrix).asMatrix()
-            mOffset = targetHandle.child(ParentConstraint.inTargetOffset).asMatrix()
-            targetWeight = targetHandle.child(ParentConstraint.inTargetWeight).asFloat()
-
-            mTarget = mOffset * (mTargetW * targetWeight)
-            if mTargetsAdded == om2.MMatrix():
-                mTargetsAdded = mTarget
-            else:
-                mTargetsAdded += mTarget
-
-        mResult = mTargetsAdded * mConstParInv * mInvSca
-
-        if plug == ParentConstraint.outConstTrans:
-            outTransHandle = dataBlock.outputValue(ParentConstraint.outConstTrans)
-            outTrans = om2.MFloatVector(mResult[12], mResult[13], mResult[14])
-            outTransHandle.setMFloatVector(outTrans)
-            outTransHandle.setClean()
-        if plug == ParentConstraint.outConstRot:
-            outRotHandle = dataBlock.outputValue(ParentConstraint.outConstRot)
-            mtxFn = om2.MTransformationMatrix(mResult)
-            eRotMtx = mtxFn.rotation(asQuaternion=False)
-            qRotMtx = eRotMtx.asQuaternion()
-            qConstJntOri = eConstJntOri.asQuaternion()
-            qOutRot = qRotMtx * qConstJntOri.invertIt()
-            outRot = qOutRot.asEulerRotation().reorderIt(constRotOrder)
-            outRotHandle.setMVector(outRot.asVector())
-            outRotHandle.setClean()
-        if plug == ParentConstraint.outConstSca:
-            outScaHandle = dataBlock.outputValue(ParentConstraint.outConstSca)
-            mtxFn = om2.MTransformationMatrix(mResult)
-            outSca = mtxFn.scale(om2.MSpace.kWorld)
-            outScaHandle.set3Float(outSca[0], outSca[1], outSca[2])
-            outScaHandle.setClean()
+            offsets.append(list(targetHandle.child(ParentConstraint.inTargetOffset).asMatrix()))
+            worlds.append(list(targetHandle.child(ParentConstraint.inTargetWorldMatrix).asMatrix()))
+            weights.append(targetHandle.child(ParentConstraint.inTargetWeight).asFloat())
+
+        # Offset * world of every target in one product, then one blend and one decomposition
+        # give all the outputs.
+        targets = np.matmul(np.reshape(offsets, (-1, 4, 4)), np.reshape(worlds, (-1, 4, 4)))
+        outTrans, outRot, outSca = transform.localValues(
+            transform.blend(targets, weights), np.reshape(list(mConstParInv), (4, 4)), constParSca, constJntOri,
+            constRotOrder)
+        return outTrans.tolist(), outRot.tolist(), outSca.tolist()
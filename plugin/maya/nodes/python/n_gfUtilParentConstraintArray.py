@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2019 Giuliano França
+
+MIT License
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+====================================================================================================
+
+Disclaimer:
+    THIS PLUGIN IS JUST A PROTOTYPE. YOU MUST USE THE C++ RELEASE PLUGIN FOR PRODUCTION.
+    YOU CAN FIND THE C++ RELEASE PLUGIN FOR YOUR SPECIFIC PLATFORM IN RELEASES FOLDER:
+    "gfTools > plug-ins > release"
+
+How to use:
+    * Copy the parent folder to the MAYA_SCRIPT_PATH.
+    * To find MAYA_SCRIPT_PATH paste this command in a Python tab:
+        import os; os.environ["MAYA_SCRIPT_PATH"].split(";")
+    * In Maya, go to Windows > Settings/Preferences > Plug-in Manager.
+    * Browse for "gfTools > plug-ins > dev > python"
+    * Find gfTools_P.py and import it.
+
+Requirements:
+    * Maya 2017 or above.
+    * NumPy.
+
+Description:
+    Array version of gfParentConstraint. Every element of the constrained compound has the inputs
+    of one constrained object of gfParentConstraint and drives the outConstrained element with the
+    same index. All the constrained objects share the same target list, so the targets are blended
+    once and the outputs of all the objects are solved in one pass. The blended targets are kept
+    until a target is dirtied.
+    The outConstrained elements without a constrained object are set to the identity transform.
+
+Attributes:
+    * Constrained: The array of constrained objects. Every element has:
+        * Contraint Joint Orient: The joint orient of the constrainted object.
+        * Constraint Rotate Order: The rotate order of the constrainted object.
+        * Constraint Parent Inverse Matrix: The world inverse matrix of the parent of the constrainted object.
+        * Constraint Parent Scale: The scale of the parent of the constrainted object.
+    * Target World Matrix: The world matrix of the parent.
+    * Target Offset: The offset matrix of the constraint object in this parent world matrix.
+    * Target Weight: The weight of this target matrix.
+    * Out Constrained: The array of outputs. Every element has:
+        * Constraint Translate: The output translation for the constrainted object.
+        * Constraint Rotate: The output rotate for the constrainted object.
+        * Constraint Scale: The output scale for the constrainted object.
+
+Todo:
+    * NDA
+
+Sources:
+    * NDA
+
+This code supports Pylint. Rc file in project.
+"""
+import numpy as np
+import maya.api._OpenMaya_py2 as om2
+
+from gfTools import nodeUtils
+from gfTools import profiling
+from gfTools.kernels import transform
+
+
+def maya_useNewAPI():
+    """ Function to Maya recognize the use of the Python API 2.0. """
+    # pylint: disable=invalid-name, unnecessary-pass
+    pass
+
+
+def INPUT_ATTR(FNATTR):
+    """ Configure a input attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = True
+    FNATTR.readable = True
+    FNATTR.storable = True
+    FNATTR.keyable = True
+
+
+def OUTPUT_ATTR(FNATTR):
+    """ Configure a output attribute. """
+    # pylint: disable=invalid-name
+    FNATTR.writable = False
+    FNATTR.readable = True
+    FNATTR.storable = False
+    FNATTR.keyable = False
+
+
+@profiling.profiled
+class ParentConstraintArray(om2.MPxNode):
+    """ Main class of gfUtilParentConstraintArray node. """
+
+    kNodeName = ""
+    kNodeClassify = ""
+    kNodeID = ""
+
+    inConstrained = om2.MObject()
+    inConstraintJntOri = om2.MObject()
+    inConstraintRotOrder = om2.MObject()
+    inConstraintParInvMtx = om2.MObject()
+    inConstraintParSca = om2.MObject()
+    inTargetWorldMatrix = om2.MObject()
+    inTargetOffset = om2.MObject()
+    inTargetWeight = om2.MObject()
+    inTargetList = om2.MObject()
+    outConstrained = om2.MObject()
+    outConstTrans = om2.MObject()
+    outConstRot = om2.MObject()
+    outConstSca = om2.MObject()
+
+    def __init__(self):
+        """ Constructor. """
+        om2.MPxNode.__init__(self)
+        self.cachedTargets = None
+
+    @staticmethod
+    def creator():
+        """ Maya creator function. """
+        return ParentConstraintArray()
+
+    @staticmethod
+    def initialize():
+        """
+        Defines the set of attributes for this node. The attributes declared in this function are assigned
+        as static members to ParentConstraintArray class. Instances of ParentConstraintArray will use these attributes
+        to create plugs for use in the compute() method.
+        """
+        mAttr = om2.MFnMatrixAttribute()
+        nAttr = om2.MFnNumericAttribute()
+        uAttr = om2.MFnUnitAttribute()
+        eAttr = om2.MFnEnumAttribute()
+        cAttr = om2.MFnCompoundAttribute()
+
+        constJntOriX = uAttr.create("constraintJointOrientX", "cjorx", om2.MFnUnitAttribute.kAngle, 0.0)
+        constJntOriY = uAttr.create("constraintJointOrientY", "cjory", om2.MFnUnitAttribute.kAngle, 0.0)
+        constJntOriZ = uAttr.create("constraintJointOrientZ", "cjorz", om2.MFnUnitAttribute.kAngle, 0.0)
+        ParentConstraintArray.inConstraintJntOri = nAttr.create("constraintJointOrient", "cjor", constJntOriX, constJntOriY, constJntOriZ)
+        INPUT_ATTR(nAttr)
+
+        ParentConstraintArray.inConstraintRotOrder = eAttr.create("constraintRotateOrder", "croo", 0)
+        eAttr.addField("xyz", 0)
+        eAttr.addField("yzx", 1)
+        eAttr.addField("zxy", 2)
+        eAttr.addField("xzy", 3)
+        eAttr.addField("yxz", 4)
+        eAttr.addField("zyx", 5)
+        INPUT_ATTR(eAttr)
+
+        ParentConstraintArray.inConstraintParInvMtx = mAttr.create("constraintParentInverseMatrix", "cpim", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        ParentConstraintArray.inConstraintParSca = nAttr.createPoint("constraintParentScale", "cps")
+        nAttr.default = (1.0, 1.0, 1.0)
+        INPUT_ATTR(nAttr)
+
+        ParentConstraintArray.inConstrained = cAttr.create("constrained", "cnsd")
+        cAttr.addChild(ParentConstraintArray.inConstraintJntOri)
+        cAttr.addChild(ParentConstraintArray.inConstraintRotOrder)
+        cAttr.addChild(ParentConstraintArray.inConstraintParInvMtx)
+        cAttr.addChild(ParentConstraintArray.inConstraintParSca)
+        cAttr.array = True
+        INPUT_ATTR(cAttr)
+
+        ParentConstraintArray.inTargetWorldMatrix = mAttr.create("targetWorldMatrix", "twmtx", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        ParentConstraintArray.inTargetOffset = mAttr.create("targetOffset", "toff", om2.MFnMatrixAttribute.kDouble)
+        INPUT_ATTR(mAttr)
+
+        ParentConstraintArray.inTargetWeight = nAttr.create("targetWeight", "twght", om2.MFnNumericData.kFloat, 1.0)
+        INPUT_ATTR(nAttr)
+
+        ParentConstraintArray.inTargetList = cAttr.create("targetList", "tlist")
+        cAttr.addChild(ParentConstraintArray.inTargetWorldMatrix)
+        cAttr.addChild(ParentConstraintArray.inTargetOffset)
+        cAttr.addChild(ParentConstraintArray.inTargetWeight)
+        cAttr.array = True
+
+        ParentConstraintArray.outConstTrans = nAttr.createPoint("constraintTranslate", "ctrans")
+        OUTPUT_ATTR(nAttr)
+
+        outConstRotX = uAttr.create("constraintRotateX", "crox", om2.MFnUnitAttribute.kAngle, 0.0)
+        outConstRotY = uAttr.create("constraintRotateY", "croy", om2.MFnUnitAttribute.kAngle, 0.0)
+        outConstRotZ = uAttr.create("constraintRotateZ", "croz", om2.MFnUnitAttribute.kAngle, 0.0)
+        ParentConstraintArray.outConstRot = nAttr.create("constraintRotate", "cro", outConstRotX, outConstRotY, outConstRotZ)
+        OUTPUT_ATTR(nAttr)
+
+        ParentConstraintArray.outConstSca = nAttr.createPoint("constraintScale", "csca")
+        nAttr.default = (1.0, 1.0, 1.0)
+        OUTPUT_ATTR(nAttr)
+
+        ParentConstraintArray.outConstrained = cAttr.create("outConstrained", "ocnsd")
+        cAttr.addChild(ParentConstraintArray.outConstTrans)
+        cAttr.addChild(ParentConstraintArray.outConstRot)
+        cAttr.addChild(ParentConstraintArray.outConstSca)
+        cAttr.array = True
+        OUTPUT_ATTR(cAttr)
+
+        ParentConstraintArray.addAttribute(ParentConstraintArray.inConstrained)
+        ParentConstraintArray.addAttribute(ParentConstraintArray.inTargetList)
+        ParentConstraintArray.addAttribute(ParentConstraintArray.outConstrained)
+        for attribute in (ParentConstraintArray.inConstrained, ParentConstraintArray.inConstraintJntOri,
+                          constJntOriX, constJntOriY, constJntOriZ, ParentConstraintArray.inConstraintRotOrder,
+                          ParentConstraintArray.inConstraintParInvMtx, ParentConstraintArray.inConstraintParSca,
+                          ParentConstraintArray.inTargetList, ParentConstraintArray.inTargetWorldMatrix,
+                          ParentConstraintArray.inTargetOffset, ParentConstraintArray.inTargetWeight):
+            for output in (ParentConstraintArray.outConstrained, ParentConstraintArray.outConstTrans,
+                           ParentConstraintArray.outConstRot, ParentConstraintArray.outConstSca):
+                ParentConstraintArray.attributeAffects(attribute, output)
+
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached targets when the target list is dirtied. """
+        # pylint: disable=unused-argument
+        if nodeUtils.topAttribute(plugBeingDirtied) == ParentConstraintArray.inTargetList:
+            self.cachedTargets = None
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        if not context.isNormal():
+            return
+        for attribute in (ParentConstraintArray.inTargetList, ParentConstraintArray.inTargetWorldMatrix,
+                          ParentConstraintArray.inTargetOffset, ParentConstraintArray.inTargetWeight):
+            if evaluationNode.dirtyPlugExists(attribute):
+                self.cachedTargets = None
+                break
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
+    def compute(self, plug, dataBlock):
+        """
+        Node computation method:
+            * plug is a connection point related to one of our node attributes (either an input or an output).
+            * dataBlock contains the data on which we will base our computations.
+        """
+        if plug not in (ParentConstraintArray.outConstrained, ParentConstraintArray.outConstTrans,
+                        ParentConstraintArray.outConstRot, ParentConstraintArray.outConstSca):
+            return om2.kUnknownParameter
+
+        # The targets are shared by all the constrained objects, they are only blended again after they are dirtied.
+        isNormal = dataBlock.context().isNormal()
+        mTargets = self.cachedTargets if isNormal else None
+        if mTargets is None:
+            mTargets = ParentConstraintArray.blendTargets(dataBlock)
+            if isNormal:
+                self.cachedTargets = mTargets
+
+        # Gather the constrained objects, one row per object, and solve them in one call.
+        indices = []
+        jntOris = []
+        rotOrders = []
+        parInvs = []
+        parScales = []
+        constrainedHandle = dataBlock.inputArrayValue(ParentConstraintArray.inConstrained)
+        for i in range(len(constrainedHandle)):
+            constrainedHandle.jumpToPhysicalElement(i)
+            indices.append(constrainedHandle.elementLogicalIndex())
+            handle = constrainedHandle.inputValue()
+            jntOris.append(handle.child(ParentConstraintArray.inConstraintJntOri).asDouble3())
+            rotOrders.append(handle.child(ParentConstraintArray.inConstraintRotOrder).asShort())
+            parInvs.append(list(handle.child(ParentConstraintArray.inConstraintParInvMtx).asMatrix()))
+            parScales.append(handle.child(ParentConstraintArray.inConstraintParSca).asFloat3())
+
+        results = {}
+        if indices:
+            outTrans, outRot, outSca = transform.localValues(
+                mTargets, np.reshape(parInvs, (-1, 4, 4)), np.reshape(parScales, (-1, 3)),
+                np.reshape(jntOris, (-1, 3)), np.asarray(rotOrders, dtype=np.intp))
+            results = dict(zip(indices, zip(outTrans.tolist(), outRot.tolist(), outSca.tolist())))
+
+        # Set outputs
+        outConstrainedHandle = dataBlock.outputArrayValue(ParentConstraintArray.outConstrained)
+        for i in range(len(outConstrainedHandle)):
+            outConstrainedHandle.jumpToPhysicalElement(i)
+            outTrans, outRot, outSca = results.get(outConstrainedHandle.elementLogicalIndex(),
+                                                   ([0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 1.0, 1.0]))
+            outHandle = outConstrainedHandle.outputValue()
+            outHandle.child(ParentConstraintArray.outConstTrans).set3Float(outTrans[0], outTrans[1], outTrans[2])
+            outHandle.child(ParentConstraintArray.outConstRot).setMVector(om2.MVector(outRot))
+            outHandle.child(ParentConstraintArray.outConstSca).set3Float(outSca[0], outSca[1], outSca[2])
+
+        outConstrainedHandle.setAllClean()
+
+    @staticmethod
+    def blendTargets(dataBlock):
+        """ Return the blended world matrix of the targets as a (4, 4) array. """
+        offsets = []
+        worlds = []
+        weights = []
+        targetListHandle = dataBlock.inputArrayValue(ParentConstraintArray.inTargetList)
+        for i in range(len(targetListHandle)):
+            targetListHandle.jumpToPhysicalElement(i)
+            targetHandle = targetListHandle.inputValue()
+            offsets.append(list(targetHandle.child(ParentConstraintArray.inTargetOffset).asMatrix()))
+            worlds.append(list(targetHandle.child(ParentConstraintArray.inTargetWorldMatrix).asMatrix()))
+            weights.append(targetHandle.child(ParentConstraintArray.inTargetWeight).asFloat())
+
+        targets = np.matmul(np.reshape(offsets, (-1, 4, 4)), np.reshape(worlds, (-1, 4, 4)))
+        return transform.blend(targets, weights)
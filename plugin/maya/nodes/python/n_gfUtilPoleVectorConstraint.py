@@ -67,6 +67,8 @@ This code supports Pylint. Rc file in project.
 """
 import maya.api._OpenMaya_py2 as om2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -92,6 +94,7 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class PoleVectorConstraint(om2.MPxNode):
     """ Main class of gfUtilPoleVectorConstraint node. """
 
@@ -185,6 +188,11 @@ class PoleVectorConstraint(om2.MPxNode):
         return om2.MPxNode.connectionMade(self, plug, otherPlug, asSrc)
 
 
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
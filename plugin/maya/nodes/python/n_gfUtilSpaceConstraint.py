@@ -42,6 +42,9 @@ Requirements:
 
 Description:
     Custom aim constraint. Aim an object to another.
+    The space is matched when the space plug is set or its animation curve is edited, never during
+    playback. One time changed callback shared by all the nodes (SpaceDispatcher) only stores the
+    space of the nodes whose space plug was dirtied, so the next match starts from the right space.
 
 Attributes:
     * Up Vector Type: The type of calculation of the up vector.
@@ -65,9 +68,14 @@ Sources:
 
 This code supports Pylint. Rc file in project.
 """
+import threading
+import weakref
+
 import maya.api._OpenMaya_py2 as om2
 import maya.api._OpenMayaAnim_py2 as oma2
 
+from gfTools import profiling
+
 
 def maya_useNewAPI():
     """ Function to Maya recognize the use of the Python API 2.0. """
@@ -93,14 +101,13 @@ def OUTPUT_ATTR(FNATTR):
     FNATTR.keyable = False
 
 
+@profiling.profiled
 class SpaceConstraint(om2.MPxNode):
     """ Main class of gfUtilSpaceConstraint node. """
 
     kNodeName = ""
     kNodeClassify = ""
     kNodeID = ""
-    kCallbackIDs = om2.MCallbackIdArray()
-    kCallbackNodes = om2.MObjectArray()
 
     inSpace = om2.MObject()
     inOffset = om2.MObject()
@@ -115,8 +122,11 @@ class SpaceConstraint(om2.MPxNode):
     def __init__(self):
         """ Constructor. """
         om2.MPxNode.__init__(self)
-        self.lastSpace = 0
+        self.lastSpace = None
         self.constraintObject = None
+        self.cachedResult = None
+        self.cachedOffsets = {}
+        self.callbackIDs = om2.MCallbackIdArray()
 
     @staticmethod
     def creator():
@@ -207,224 +217,74 @@ class SpaceConstraint(om2.MPxNode):
         """ Post Constructor. """
         thisMob = self.thisMObject()
 
-        # # Add space match callback
-        # callback = om2.MNodeMessage.addAttributeChangedCallback(thisMob, SpaceConstraint.spaceMatchCallback, self)
-        # SpaceConstraint.kCallbackIDs.append(callback)
-        # SpaceConstraint.kCallbackNodes.append(thisMob)
-
-        # spacePlug = om2.MPlug(thisMob, SpaceConstraint.inSpace)
-        # callback = om2.MNodeMessage.addKeyableChangeOverride(spacePlug, SpaceConstraint.spaceMatchCallback2, self)
-        # SpaceConstraint.kCallbackIDs.append(callback)
-        # SpaceConstraint.kCallbackNodes.append(thisMob)
-        # om2.MGlobal.displayInfo("Node callback: %s" % str(callback))
-        # om2.MGlobal.displayInfo("All callbacks: %s" % str(SpaceConstraint.kCallbackIDs))
-
-        # callback = om2.MNodeMessage.addNodeDirtyPlugCallback(thisMob, SpaceConstraint.spaceMatchCallback2, self)
-        # SpaceConstraint.kCallbackIDs.append(callback)
-        # SpaceConstraint.kCallbackNodes.append(thisMob)
-        # om2.MGlobal.displayInfo("Node callback: %s" % str(callback))
-        # om2.MGlobal.displayInfo("All callbacks: %s" % str(SpaceConstraint.kCallbackIDs))
-
-        # om2.MUserEventMessage.registerUserEvent("preCompute")
-        # callback1 = om2.MUserEventMessage.addUserEventCallback("preCompute", SpaceConstraint.spaceMatchCallback3, self)
-        # callback1 = om2.MDGMessage.addTimeChangeCallback(SpaceConstraint.spaceMatchCallback3, self)
-        # callback2 = om2.MNodeMessage.addAttributeChangedCallback(thisMob, SpaceConstraint.spaceMatchCallback4, self)
-        # SpaceConstraint.kCallbackIDs.append(callback1)
-        # SpaceConstraint.kCallbackIDs.append(callback2)
-        # SpaceConstraint.kCallbackNodes.append(thisMob)
-        # om2.MGlobal.displayInfo("All callbacks: %s" % str(SpaceConstraint.kCallbackIDs))
-        callback1 = oma2.MAnimMessage.addAnimKeyframeEditedCallback(SpaceConstraint.spaceMatchCallback5, self)
-        callback2 = om2.MDGMessage.addTimeChangeCallback(SpaceConstraint.spaceMatchCallback3, self)
-        SpaceConstraint.kCallbackIDs.append(callback1)
-        SpaceConstraint.kCallbackIDs.append(callback2)
-        SpaceConstraint.kCallbackNodes.append(thisMob)
-        om2.MGlobal.displayInfo("All callbacks: %s" % str(SpaceConstraint.kCallbackIDs))
-
-        # TODO: Using MDGMessage.timeChanged won't work because of jump in time. Instead use MAnimMessage to track keyframes.
-        # TODO: If the time in a animation curve change, and the plug is animated, read the anim curve and set the space match.
+        # The time changed and keyframe edited callbacks are shared by all the nodes (see SpaceDispatcher).
+        # Only the attribute changed and destroyed callbacks belong to this instance.
+        kDispatcher.add(self)
+        self.callbackIDs.append(om2.MNodeMessage.addAttributeChangedCallback(thisMob, SpaceConstraint.spaceChangedCallback, self))
+        self.callbackIDs.append(om2.MNodeMessage.addNodeDestroyedCallback(thisMob, SpaceConstraint.nodeDestroyedCallback, self))
 
-    @staticmethod
-    def spaceMatchCallback3(time, clientData):
-        """Test"""
-        om2.MGlobal.displayInfo("Updating animation...")
-        oma2.MAnimMessage.flushAnimKeyframeEditedCallbacks()
-        # thisMob = clientData.thisMObject()
-        # spacePlug = om2.MPlug(thisMob, SpaceConstraint.inSpace)
-        # oldSpaceValue = str(spacePlug.asShort())
-        # clientData.setDependentsDirty()
-        # spacePlug = om2.MPlug(thisMob, SpaceConstraint.inSpace)
-        # newSpaceValue = str(spacePlug.asShort())
-        # om2.MGlobal.displayInfo("[timeChanged] Old space value: %s | Current space value: %s" % (oldSpaceValue, newSpaceValue))
+        # TODO: If the time in a animation curve change, and the plug is animated, read the anim curve and set the space match.
 
     @staticmethod
-    def spaceMatchCallback5(editedKeys, clientData):
-        """Test"""
-        om2.MGlobal.displayInfo("Hello ma friend!")
-        return True
+    def spaceChangedCallback(msg, plug, otherPlug, clientData):
+        """ Match the space when the space plug is set. Maya doesn't send this message during playback or scrubbing. """
+        # pylint: disable=unused-argument
+        if msg & om2.MNodeMessage.kAttributeSet and plug == SpaceConstraint.inSpace:
+            kDispatcher.match([clientData])
 
     @staticmethod
-    def spaceMatchCallback4(msg, plug, otherPlug, clientData):
-        """Test"""
-        thisMob = clientData.thisMObject()
-        if msg == 2056:
-            if plug == SpaceConstraint.inSpace:
-                spacePlug = om2.MPlug(thisMob, SpaceConstraint.inSpace)
-                om2.MGlobal.displayInfo("[attributeChanged] Current space value: %s" % str(spacePlug.asShort()))
+    def nodeDestroyedCallback(clientData):
+        """ Remove the callbacks of a destroyed node. """
+        om2.MMessage.removeCallbacks(clientData.callbackIDs)
+        clientData.callbackIDs.clear()
+        kDispatcher.remove(clientData)
 
-    @staticmethod
-    def spaceMatchCallback2(node, plug, clientData):
-        """Node dirty callback. Works, but not quite. """
-        # 1- Check if space plug is dirty.
-        if plug == SpaceConstraint.inSpace:
-            # 2- Check if clientData is valid.
-            thisMob = clientData.thisMObject()
-            if not isinstance(clientData, SpaceConstraint):
-                om2.MGlobal.displayError("[gfTools] gfSpaceConstraint don't recognize the clientData for space matching. Callback functionality skipped.")
-                return
-            # 3- Check if automatic space matching is enable.
-            match = om2.MPlug(thisMob, SpaceConstraint.inSpaceMatch).asBool()
-            if not match:
-                return
-            # 4- Check if space attribute changed.
-            lastValue = clientData.lastSpace
-            curValue = plug.asShort()
-            spacePlug = om2.MPlug(thisMob, SpaceConstraint.inSpace)
-            om2.MGlobal.displayInfo("Current space value: %s" % str(spacePlug.asShort()))
-            if curValue == lastValue:
-                return
-            # 5- Check if any output is been used and get the output object.
-            allClear = clientData.checkOutputConnections(thisMob)
-            # 6- Check the inputs.
-            targetPlug = om2.MPlug(thisMob, SpaceConstraint.inTarget)
-            offsetPlug = om2.MPlug(thisMob, SpaceConstraint.inOffset)
-            offsetMatchPlug = om2.MPlug(thisMob, SpaceConstraint.inOffsetMatches)
-            numTarget = targetPlug.numElements() - 1
-            if curValue > numTarget:
-                curValue = numTarget
-            # 7- If the node have necessary connections...
-            if not allClear and (numTarget + 1) > 0:
-                outObj = clientData.constraintObject
-                if outObj.hasFn(om2.MFn.kDagNode):
-                    # 8- Get the last world matrix of the target.
-                    lastOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(lastValue)
-                    lastOffsetMatchObj = lastOffsetMatchPlug.asMObject()
-                    mtxDataFn = om2.MFnMatrixData(lastOffsetMatchObj)
-                    mOffsetMatch = mtxDataFn.matrix()
-                    lastOffsetPlug = offsetPlug.elementByLogicalIndex(lastValue)
-                    lastOffsetObj = lastOffsetPlug.asMObject()
-                    mtxDataFn = om2.MFnMatrixData(lastOffsetObj)
-                    mOffset = mtxDataFn.matrix()
-                    lastTargetPlug = targetPlug.elementByLogicalIndex(lastValue)
-                    lastTargetObj = lastTargetPlug.asMObject()
-                    mtxDataFn = om2.MFnMatrixData(lastTargetObj)
-                    mTarget = mtxDataFn.matrix()
-                    mLastOutputW = mOffsetMatch * mOffset * mTarget
-                    # 9- Get the current world matrix of the target.
-                    curTargetPlug = targetPlug.elementByLogicalIndex(curValue)
-                    curTargetObj = curTargetPlug.asMObject()
-                    mtxDataFn = om2.MFnMatrixData(curTargetObj)
-                    mTarget = mtxDataFn.matrix()
-                    curOffsetPlug = offsetPlug.elementByLogicalIndex(curValue)
-                    curOffsetObj = curOffsetPlug.asMObject()
-                    mtxDataFn = om2.MFnMatrixData(curOffsetObj)
-                    mOffset = mtxDataFn.matrix()
-                    mCurOutputW = mOffset * mTarget
-                    # 10- Get the result of the match and set it into the plug.
-                    mResult = mLastOutputW * mCurOutputW.inverse()
-                    curOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(curValue)
-                    curOffsetMatchHdle = curOffsetMatchPlug.asMDataHandle()
-                    curOffsetMatchHdle.setMMatrix(mResult)
-                    curOffsetMatchPlug.setMDataHandle(curOffsetMatchHdle)
-                    # 11- Clean the offset match plug from last value.
-                    lastOffsetMatchHdle = lastOffsetMatchPlug.asMDataHandle()
-                    lastOffsetMatchHdle.setMMatrix(om2.MMatrix())
-                    lastOffsetMatchPlug.setMDataHandle(lastOffsetMatchHdle)
-                    om2.MGlobal.displayInfo("Performing space matching...")
-            # 12- Store the current space value in class to be accessed later on.
-            clientData.lastSpace = curValue
+    def updateSpace(self, match):
+        """
+        Store the space and, if match is True, match the space of the constrained object if the space
+        changed since the last update. The first update only stores the space. Returns True if the space changed.
+        """
+        thisMob = self.thisMObject()
+        curSpace = om2.MPlug(thisMob, SpaceConstraint.inSpace).asShort()
+        numTarget = om2.MPlug(thisMob, SpaceConstraint.inTarget).numElements() - 1
+        if curSpace > numTarget:
+            curSpace = numTarget
+        lastSpace = self.lastSpace
+        if curSpace == lastSpace or curSpace < 0:
+            return False
+        self.lastSpace = curSpace
+        if match and lastSpace is not None and om2.MPlug(thisMob, SpaceConstraint.inSpaceMatch).asBool():
+            self.matchSpace(lastSpace, curSpace)
+        return True
 
-    @staticmethod
-    def spaceMatchCallback(msg, plug, otherPlug, clientData):
+    def matchSpace(self, lastSpace, curSpace):
         """
-        The callback function.
-        Note: Attribute Changed messages will not be generated while Maya is either in playback or scrubbing modes.
-        If you need to do something during playback or scrubbing you will have to register a callback for the
-        timeChanged message which is the only message that is sent during those modes.
-            * msg [MNodeMessage::AttributeMessage] is the kind of attribute change triggering the callback.
-            * plug [MPlug] is the node's plug where the connection changed.
-            * otherPlug [MPlug] is the plug opposite the node's plug where the connection changed.
-            * clientData [void*] is the user defined data passed to this callback function.
+        Set the offset match of the current space to keep the constrained object in the world
+        position of the last space, and clean the offset match of the last space.
         """
-        # pylint: disable=unused-argument
-        # 6144 = create input array element.
-        # 16385 = connecting output.
-        # 16386 = disconnecting output.
-        # 2052 = change output in compute method.
-        # 2056 = set attribute.
-        # 10240 = delete element plug from array attribute.
-        # 18434 = disconnect input plug.
-        # 18433 = connect input plug.
-
-        thisMob = clientData.thisMObject()
-        if not isinstance(clientData, SpaceConstraint):
-            # SpaceConstraint *pMesh = static_cast<SpaceConstraint *>(clientData);
-            om2.MGlobal.displayError("[gfTools] gfSpaceConstraint don't recognize the clientData for space match callback. Callback functionality skiped.")
-            return
-        match = om2.MPlug(thisMob, SpaceConstraint.inSpaceMatch).asBool()
-        if not match:
+        thisMob = self.thisMObject()
+        if self.checkOutputConnections(thisMob) or not self.constraintObject.hasFn(om2.MFn.kDagNode):
             return
-        if msg == 2056:
-            if plug == SpaceConstraint.inSpace:
-                lastValue = clientData.lastSpace
-                curValue = plug.asShort()
-                # 1- Get the output plug
-                allClear = clientData.checkOutputConnections(thisMob)
-                # 2- Check if the curValue is valid. If it is not, get the last valid.
-                targetPlug = om2.MPlug(thisMob, SpaceConstraint.inTarget)
-                offsetPlug = om2.MPlug(thisMob, SpaceConstraint.inOffset)
-                offsetMatchPlug = om2.MPlug(thisMob, SpaceConstraint.inOffsetMatches)
-                numTarget = targetPlug.numElements() - 1
-                if curValue > numTarget:
-                    curValue = numTarget
-                # 3- If the node have necessary connections...
-                if not allClear and (numTarget + 1) > 0:
-                    outObj = clientData.constraintObject
-                    if outObj.hasFn(om2.MFn.kDagNode):
-                        # 4- Get the last world matrix of the target
-                        lastOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(lastValue)
-                        lastOffsetMatchObj = lastOffsetMatchPlug.asMObject()
-                        mtxDataFn = om2.MFnMatrixData(lastOffsetMatchObj)
-                        mOffsetMatch = mtxDataFn.matrix()
-                        lastOffsetPlug = offsetPlug.elementByLogicalIndex(lastValue)
-                        lastOffsetObj = lastOffsetPlug.asMObject()
-                        mtxDataFn = om2.MFnMatrixData(lastOffsetObj)
-                        mOffset = mtxDataFn.matrix()
-                        lastTargetPlug = targetPlug.elementByLogicalIndex(lastValue)
-                        lastTargetObj = lastTargetPlug.asMObject()
-                        mtxDataFn = om2.MFnMatrixData(lastTargetObj)
-                        mTarget = mtxDataFn.matrix()
-                        mLastOutputW = mOffsetMatch * mOffset * mTarget
-                        # 5- Get the current world matrix of the target
-                        curTargetPlug = targetPlug.elementByLogicalIndex(curValue)
-                        curTargetObj = curTargetPlug.asMObject()
-                        mtxDataFn = om2.MFnMatrixData(curTargetObj)
-                        mTarget = mtxDataFn.matrix()
-                        curOffsetPlug = offsetPlug.elementByLogicalIndex(curValue)
-                        curOffsetObj = curOffsetPlug.asMObject()
-                        mtxDataFn = om2.MFnMatrixData(curOffsetObj)
-                        mOffset = mtxDataFn.matrix()
-                        mCurOutputW = mOffset * mTarget
-                        # 6- Get the result of the match and set it into the plug
-                        mResult = mLastOutputW * mCurOutputW.inverse()
-                        curOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(curValue)
-                        curOffsetMatchHdle = curOffsetMatchPlug.asMDataHandle()
-                        curOffsetMatchHdle.setMMatrix(mResult)
-                        curOffsetMatchPlug.setMDataHandle(curOffsetMatchHdle)
-                        # 7- Clean the offset match plug from last value
-                        lastOffsetMatchHdle = lastOffsetMatchPlug.asMDataHandle()
-                        lastOffsetMatchHdle.setMMatrix(om2.MMatrix())
-                        lastOffsetMatchPlug.setMDataHandle(lastOffsetMatchHdle)
-                clientData.lastSpace = curValue
+        targetPlug = om2.MPlug(thisMob, SpaceConstraint.inTarget)
+        offsetPlug = om2.MPlug(thisMob, SpaceConstraint.inOffset)
+        offsetMatchPlug = om2.MPlug(thisMob, SpaceConstraint.inOffsetMatches)
+        # Last world matrix of the constrained object.
+        lastOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(lastSpace)
+        mOffsetMatch = om2.MFnMatrixData(lastOffsetMatchPlug.asMObject()).matrix()
+        mOffset = om2.MFnMatrixData(offsetPlug.elementByLogicalIndex(lastSpace).asMObject()).matrix()
+        mTarget = om2.MFnMatrixData(targetPlug.elementByLogicalIndex(lastSpace).asMObject()).matrix()
+        mLastOutputW = mOffsetMatch * mOffset * mTarget
+        # Current world matrix of the constrained object without offset match.
+        mOffset = om2.MFnMatrixData(offsetPlug.elementByLogicalIndex(curSpace).asMObject()).matrix()
+        mTarget = om2.MFnMatrixData(targetPlug.elementByLogicalIndex(curSpace).asMObject()).matrix()
+        mCurOutputW = mOffset * mTarget
+        curOffsetMatchPlug = offsetMatchPlug.elementByLogicalIndex(curSpace)
+        curOffsetMatchHdle = curOffsetMatchPlug.asMDataHandle()
+        curOffsetMatchHdle.setMMatrix(mLastOutputW * mCurOutputW.inverse())
+        curOffsetMatchPlug.setMDataHandle(curOffsetMatchHdle)
+        lastOffsetMatchHdle = lastOffsetMatchPlug.asMDataHandle()
+        lastOffsetMatchHdle.setMMatrix(om2.MMatrix())
+        lastOffsetMatchPlug.setMDataHandle(lastOffsetMatchHdle)
 
     def checkOutputConnections(self, thisMob):
         """
@@ -522,66 +382,199 @@ class SpaceConstraint(om2.MPxNode):
             pass
         return om2.MPxNode.connectionBroken(self, plug, otherPlug, asSrc)
 
+    def setDependentsDirty(self, plugBeingDirtied, affectedPlugs):
+        """ Clear the cached result and the offsets of the dirtied spaces. """
+        # pylint: disable=unused-argument
+        self.cachedResult = None
+        attribute = plugBeingDirtied.attribute()
+        if attribute == SpaceConstraint.inSpace:
+            kDispatcher.markDirty(self)
+        elif attribute in (SpaceConstraint.inOffset, SpaceConstraint.inOffsetMatches):
+            if plugBeingDirtied.isElement:
+                self.cachedOffsets.pop(plugBeingDirtied.logicalIndex(), None)
+            else:
+                self.cachedOffsets = {}
+
+    def preEvaluation(self, context, evaluationNode):
+        """ Called before this node is evaluated by Evaluation Manager.
+            * context [MDGContext] is the context which the evaluation is happening.
+            * evaluationNode [MEvaluationNode] the evaluation node which contains information
+                about the dirty plugs that are about to be evaluated for the context.
+                Should be only used to query information.
+        """
+        self.cachedResult = None
+        if not context.isNormal():
+            return
+        if evaluationNode.dirtyPlugExists(SpaceConstraint.inSpace):
+            kDispatcher.markDirty(self)
+        if (evaluationNode.dirtyPlugExists(SpaceConstraint.inOffset) or
+                evaluationNode.dirtyPlugExists(SpaceConstraint.inOffsetMatches)):
+            self.cachedOffsets = {}
+
+    def schedulingType(self):
+        """ Scheduling type of the node in the Evaluation Manager. """
+        # pylint: disable=no-self-use
+        return om2.MPxNode.kParallel
+
     def compute(self, plug, dataBlock):
         """
         Node computation method:
             * plug is a connection point related to one of our node attributes (either an input or an output).
             * dataBlock contains the data on which we will base our computations.
         """
-        # pylint: disable=no-self-use
-        # if not dataBlock.isClean(SpaceConstraint.inSpace):
-        #     om2.MGlobal.displayInfo("\tSpace attribute is dirty.")
-        #     om2.MUserEventMessage.postUserEvent("preCompute", self)
+        if plug not in (SpaceConstraint.outConstTrans, SpaceConstraint.outConstRot, SpaceConstraint.outConstSca):
+            return om2.kUnknownParameter
+
+        # All the outputs come from the same matrix. The first request computes and sets clean
+        # all of them, the result is kept until an input is dirtied.
+        isNormal = dataBlock.context().isNormal()
+        result = self.cachedResult if isNormal else None
+        if result is None:
+            result = SpaceConstraint.computeResult(dataBlock, self.cachedOffsets if isNormal else {})
+            if isNormal:
+                self.cachedResult = result
+        vTrans, vRot, outSca = result
+
+        outTransHdle = dataBlock.outputValue(SpaceConstraint.outConstTrans)
+        outTransHdle.setMFloatVector(vTrans)
+        outTransHdle.setClean()
+
+        outRotHdle = dataBlock.outputValue(SpaceConstraint.outConstRot)
+        outRotHdle.setMVector(vRot)
+        outRotHdle.setClean()
+
+        outScaHdle = dataBlock.outputValue(SpaceConstraint.outConstSca)
+        outScaHdle.set3Float(outSca[0], outSca[1], outSca[2])
+        outScaHdle.setClean()
 
+    @staticmethod
+    def computeResult(dataBlock, offsets):
+        """
+        Compute the constraint result of the current space.
+        Only the elements of the current space are read. The offsets argument is a dictionary of the offset
+        match * offset products by space, missing products are read and added to it.
+        Returns the translation (MFloatVector), the rotation (MVector) and the scale (list).
+        """
         curSpace = dataBlock.inputValue(SpaceConstraint.inSpace).asShort()
+        targetHandle = dataBlock.inputArrayValue(SpaceConstraint.inTarget)
+        offsetHandle = dataBlock.inputArrayValue(SpaceConstraint.inOffset)
+        numSpaces = min(len(offsetHandle), len(targetHandle))
 
-        offsetMatchHdle = dataBlock.inputArrayValue(SpaceConstraint.inOffsetMatches)
-        offsetHdle = dataBlock.inputArrayValue(SpaceConstraint.inOffset)
-        targetHdle = dataBlock.inputArrayValue(SpaceConstraint.inTarget)
-        offsetMatchList = []
-        offsetList = []
-        targetList = []
-
-        for i in range(len(offsetMatchHdle)):
-            offsetMatchHdle.jumpToLogicalElement(i)
-            mOffMatch = offsetMatchHdle.inputValue().asMatrix()
-            offsetMatchList.append(mOffMatch)
-
-        for i in range(len(offsetHdle)):
-            offsetHdle.jumpToLogicalElement(i)
-            mOff = offsetHdle.inputValue().asMatrix()
-            offsetList.append(mOff)
-
-        for i in range(len(targetHdle)):
-            targetHdle.jumpToLogicalElement(i)
-            mTgt = targetHdle.inputValue().asMatrix()
-            targetList.append(mTgt)
-
-        if len(offsetList) == 0 or len(targetList) == 0:
+        if numSpaces == 0:
             mResult = om2.MMatrix()
         else:
-            minRequired = min(len(offsetList), len(targetList)) - 1
-            if curSpace > minRequired:
-                curSpace = minRequired
-            mResult = offsetMatchList[curSpace] * offsetList[curSpace] * targetList[curSpace]
+            if curSpace > numSpaces - 1:
+                curSpace = numSpaces - 1
+            # Only the target animates, the offsets of a space are kept until they change.
+            mOffset = offsets.get(curSpace)
+            if mOffset is None:
+                offsetMatchHandle = dataBlock.inputArrayValue(SpaceConstraint.inOffsetMatches)
+                mOffMatch = SpaceConstraint.elementMatrix(offsetMatchHandle, curSpace)
+                mOff = SpaceConstraint.elementMatrix(offsetHandle, curSpace)
+                mOffset = mOffMatch * mOff
+                offsets[curSpace] = mOffset
+            mTgt = SpaceConstraint.elementMatrix(targetHandle, curSpace)
+            mResult = mOffset * mTgt
 
         mtxFn = om2.MTransformationMatrix(mResult)
+        vTrans = om2.MFloatVector(om2.MVector(mResult[12], mResult[13], mResult[14]))
+        vRot = mtxFn.rotation(asQuaternion=False).asVector()
+        outSca = mtxFn.scale(om2.MSpace.kWorld)
+        return vTrans, vRot, outSca
 
-        if plug == SpaceConstraint.outConstTrans:
-            vTransD = om2.MVector(mResult[12], mResult[13], mResult[14])
-            vTrans = om2.MFloatVector(vTransD)
-            outTransHdle = dataBlock.outputValue(SpaceConstraint.outConstTrans)
-            outTransHdle.setMFloatVector(vTrans)
-            outTransHdle.setClean()
-
-        if plug == SpaceConstraint.outConstRot:
-            eRot = mtxFn.rotation(asQuaternion=False)
-            outRotHdle = dataBlock.outputValue(SpaceConstraint.outConstRot)
-            outRotHdle.setMVector(eRot.asVector())
-            outRotHdle.setClean()
-
-        if plug == SpaceConstraint.outConstSca:
-            outSca = mtxFn.scale(om2.MSpace.kWorld)
-            outScaHdle = dataBlock.outputValue(SpaceConstraint.outConstSca)
-            outScaHdle.set3Float(outSca[0], outSca[1], outSca[2])
-            outScaHdle.setClean()
+    @staticmethod
+    def elementMatrix(arrayHandle, index):
+        """ Return the matrix of an element of a matrix array handle. Missing elements are identity matrices. """
+        try:
+            arrayHandle.jumpToLogicalElement(index)
+        except RuntimeError:
+            return om2.MMatrix()
+        return arrayHandle.inputValue().asMatrix()
+
+
+class SpaceDispatcher(object):
+    """
+    Shared callbacks of the gfSpaceConstraint nodes. The time changed and keyframe edited callbacks are
+    registered once, with the first node, and removed with the last one or when the plugin is unloaded.
+    The nodes mark themselves when their space plug is dirtied, and the time changed message only stores
+    the space of the marked nodes, in one batch. The keyframe edited message matches the space of the
+    nodes driven by the edited curves. The nodes are kept by weak references.
+    """
+
+    def __init__(self):
+        """ Constructor. """
+        self.nodes = weakref.WeakSet()
+        self.dirtyNodes = weakref.WeakSet()
+        self.lock = threading.Lock()
+        self.callbackIDs = om2.MCallbackIdArray()
+
+    def add(self, node):
+        """ Register a node, adding the shared callbacks with the first one. """
+        self.nodes.add(node)
+        if len(self.callbackIDs) == 0:
+            self.callbackIDs.append(om2.MDGMessage.addTimeChangeCallback(SpaceDispatcher.timeChangedCallback, self))
+            self.callbackIDs.append(oma2.MAnimMessage.addAnimKeyframeEditedCallback(SpaceDispatcher.keyframeEditedCallback,
+                                                                                     self))
+
+    def remove(self, node):
+        """ Unregister a node, removing the shared callbacks with the last one. """
+        self.nodes.discard(node)
+        with self.lock:
+            self.dirtyNodes.discard(node)
+        if len(self.nodes) == 0:
+            self.removeCallbacks()
+
+    def clear(self):
+        """ Unregister all the nodes and remove the shared callbacks. Called when the plugin is unloaded. """
+        self.nodes.clear()
+        with self.lock:
+            self.dirtyNodes.clear()
+        self.removeCallbacks()
+
+    def removeCallbacks(self):
+        """ Remove the shared callbacks. """
+        if len(self.callbackIDs) > 0:
+            om2.MMessage.removeCallbacks(self.callbackIDs)
+            self.callbackIDs.clear()
+
+    def markDirty(self, node):
+        """ Mark a node to be updated by the next message. Safe to call during parallel evaluation. """
+        with self.lock:
+            self.dirtyNodes.add(node)
+
+    def update(self):
+        """ Store the space of the marked nodes, without matching it. Returns the list of nodes whose space changed. """
+        with self.lock:
+            nodes = list(self.dirtyNodes)
+            self.dirtyNodes.clear()
+        return [node for node in nodes if node.updateSpace(False)]
+
+    def match(self, nodes):
+        """ Match the space of the nodes and unmark them. Returns the list of nodes whose space changed. """
+        with self.lock:
+            for node in nodes:
+                self.dirtyNodes.discard(node)
+        return [node for node in nodes if node.updateSpace(True)]
+
+    @staticmethod
+    def timeChangedCallback(time, clientData):
+        """ Store the space of the nodes whose space plug was dirtied since the last message. """
+        # pylint: disable=unused-argument
+        oma2.MAnimMessage.flushAnimKeyframeEditedCallbacks()
+        # No plug is set during playback, the space is only matched by the attribute changed and keyframe
+        # edited messages, which Maya doesn't send while playing or scrubbing.
+        clientData.update()
+
+    @staticmethod
+    def keyframeEditedCallback(editedKeys, clientData):
+        """ Match the space of the nodes whose space plug is driven by an edited animation curve. """
+        curves = [oma2.MFnKeyframeDelta(key).paramCurve for key in editedKeys]
+        nodes = []
+        for node in list(clientData.nodes):
+            sources = om2.MPlug(node.thisMObject(), SpaceConstraint.inSpace).connectedTo(True, False)
+            if sources and any(sources[0].node() == curve for curve in curves):
+                nodes.append(node)
+        clientData.match(nodes)
+
+
+kDispatcher = SpaceDispatcher()